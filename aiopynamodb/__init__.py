@@ -8,3 +8,37 @@ A simple async abstraction over DynamoDB
 __author__ = 'Jharrod LaFon'
 __license__ = 'MIT'
 __version__ = '1.0.0'
+
+from typing import List
+from typing import Optional
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from aiopynamodb.batch import BatchGetRequest
+    from aiopynamodb.batch import MultiBatchWrite
+    from aiopynamodb.connection import Connection
+    from aiopynamodb.models import BatchGetResult
+    from aiopynamodb.sessions import Session
+
+
+def session(connection: Optional['Connection'] = None, atomic: bool = False) -> 'Session':
+    """
+    Returns a new :class:`~aiopynamodb.sessions.Session`, to be used as :code:`async with aiopynamodb.session() as s:`
+    """
+    from aiopynamodb.sessions import Session  # imported here so that importing the package needs no dependencies
+    return Session(connection=connection, atomic=atomic)
+
+
+async def batch_get(*requests: 'BatchGetRequest', connection: Optional['Connection'] = None) -> List['BatchGetResult']:
+    """
+    Gets the keys of several models with shared requests, see :func:`aiopynamodb.batch.batch_get`
+    """
+    from aiopynamodb.batch import batch_get as _batch_get
+    return await _batch_get(*requests, connection=connection)
+
+
+def batch_write(connection: Optional['Connection'] = None, auto_commit: bool = True) -> 'MultiBatchWrite':
+    """
+    Returns a new :class:`~aiopynamodb.batch.MultiBatchWrite`, to be used as :code:`async with aiopynamodb.batch_write() as batch:`
+    """
+    from aiopynamodb.batch import MultiBatchWrite
+    return MultiBatchWrite(connection=connection, auto_commit=auto_commit)
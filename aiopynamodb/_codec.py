@@ -0,0 +1,228 @@
+"""
+Compiled serializers and deserializers for attribute containers.
+
+The generic :meth:`~aiopynamodb.attributes.AttributeContainer._container_serialize` and
+:meth:`~aiopynamodb.attributes.AttributeContainer._container_deserialize` walk the class attributes
+and go through the attribute descriptors for every item. For a given class the attribute names,
+types and defaults never change, so the first time a class is (de)serialized we generate
+specialized functions with all of that inlined: a serializer, a deserializer and a decoder into a
+plain dictionary (used by the 'dict' result mode of the model read operations).
+
+Anything the generated code can't prove to be equivalent (custom descriptors, custom getters,
+overridden ``__init__`` etc.) is delegated to the attribute itself, and "raw" map attributes are
+never compiled, so they always use the generic path.
+"""
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from aiopynamodb.attributes import Attribute
+from aiopynamodb.attributes import AttributeContainer
+from aiopynamodb.attributes import ListAttribute
+from aiopynamodb.attributes import MapAttribute
+from aiopynamodb.attributes import _decode_to_python
+from aiopynamodb.constants import NULL
+from aiopynamodb.exceptions import AttributeNullError
+
+# Modules whose __init__ implementations only reset the attribute values, which the generated
+# deserializer does itself. Classes with a custom __init__ are still instantiated through it.
+_CONTAINER_MODULES = ('aiopynamodb.attributes', 'aiopynamodb.models')
+
+
+class ContainerCodec:
+    """
+    A serializer and deserializer generated for a single :class:`~aiopynamodb.attributes.AttributeContainer` class.
+    """
+
+    def __init__(
+        self,
+        container_cls: Type[AttributeContainer],
+        serialize: Callable[[Any, bool], Dict[str, Dict[str, Any]]],
+        deserialize: Callable[[Any, Dict[str, Dict[str, Any]]], None],
+        to_dict: Callable[[Dict[str, Dict[str, Any]]], Dict[str, Any]],
+        source: str,
+    ) -> None:
+        self.container_cls = container_cls
+        self.serialize = serialize
+        self.deserialize = deserialize
+        self.to_dict = to_dict
+        self.source = source
+        self._skip_init = _uses_container_init(container_cls)
+
+    def instantiate(self, attribute_values: Dict[str, Dict[str, Any]]) -> Any:
+        """
+        Returns a new instance of the container class populated from DynamoDB attribute values.
+        """
+        cls = self.container_cls
+        if self._skip_init:
+            instance = cls.__new__(cls)
+            if isinstance(instance, MapAttribute):
+                object.__setattr__(instance, 'attribute_kwargs', {})
+        else:
+            instance = cls(_user_instantiated=False)
+        self.deserialize(instance, attribute_values)
+        return instance
+
+
+def _uses_container_init(cls: type) -> bool:
+    for klass in cls.__mro__:
+        if '__init__' in vars(klass):
+            return klass.__module__ in _CONTAINER_MODULES
+    return False
+
+
+def _has_plain_get(attr: Attribute) -> bool:
+    return type(attr).__get__ in (Attribute.__get__, MapAttribute.__get__)
+
+
+def _has_plain_set(attr: Attribute) -> bool:
+    return type(attr).__set__ is Attribute.__set__
+
+
+def compile_container_codec(cls: Type[AttributeContainer]) -> Optional[ContainerCodec]:
+    """
+    Generates a codec for the given class, or returns None if the class has to use the generic path.
+    """
+    if issubclass(cls, MapAttribute) and cls.is_raw():
+        return None
+
+    namespace: Dict[str, Any] = {
+        'AttributeNullError': AttributeNullError,
+        'MapAttribute': MapAttribute,
+        'new_attribute_values': cls._attribute_values_cls,
+    }
+    ser: List[str] = [
+        'def serialize(self, null_check):',
+        '    values = self.attribute_values',
+        '    rval = {}',
+    ]
+    des: List[str] = [
+        'def deserialize(self, attribute_values):',
+        '    self.attribute_values = values = new_attribute_values()',
+    ]
+    to_dict: List[str] = [
+        'def to_dict(attribute_values):',
+        '    result = {}',
+    ]
+    if cls._get_discriminator_attribute() is not None:
+        des.append('    self._set_discriminator()')
+
+    for idx, (name, attr) in enumerate(cls.get_attributes().items()):
+        ref = f'attr_{idx}'
+        namespace[ref] = attr
+        _add_serializer_lines(ser, ref, name, attr)
+        _add_default_lines(des, namespace, ref, name, attr)
+
+    for idx, (name, attr) in enumerate(cls.get_attributes().items()):
+        _add_deserializer_lines(des, f'attr_{idx}', name, attr)
+        _add_to_dict_lines(to_dict, namespace, f'attr_{idx}', name, attr)
+
+    ser.append('    return rval')
+    to_dict.append('    return result')
+    source = '\n\n'.join('\n'.join(lines) for lines in (ser, des, to_dict)) + '\n'
+    exec(compile(source, f'<{cls.__qualname__} codec>', 'exec'), namespace)
+    return ContainerCodec(cls, namespace['serialize'], namespace['deserialize'], namespace['to_dict'], source)
+
+
+def _add_serializer_lines(lines: List[str], ref: str, name: str, attr: Attribute) -> None:
+    if _has_plain_get(attr):
+        lines.append(f'    value = values.get({name!r})')
+    else:
+        lines.append(f'    value = {ref}.__get__(self, type(self))')
+    if isinstance(attr, (ListAttribute, MapAttribute)):
+        serialize = f'{ref}.serialize(value, null_check=null_check)'
+    elif type(attr).serialize is Attribute.serialize:
+        serialize = 'value'
+    else:
+        serialize = f'{ref}.serialize(value)'
+    # Map values are validated whatever the attribute, as in `_generic_container_serialize`
+    lines += [
+        '    if value is not None:',
+        '        try:',
+        '            if isinstance(value, MapAttribute) and not value.validate(null_check=null_check):',
+        f'                raise ValueError({"Attribute {!r} is not correctly typed".format(name)!r})',
+        f'            attr_value = {serialize}',
+        '        except AttributeNullError as e:',
+        f'            e.prepend_path({name!r})',
+        '            raise',
+    ]
+    lines += [
+        '        if attr_value is not None:',
+        f'            rval[{attr.attr_name!r}] = {{{attr.attr_type!r}: attr_value}}',
+    ]
+    if not attr.null:
+        lines += [
+            '        elif null_check:',
+            f'            raise AttributeNullError({name!r})',
+            '    elif null_check:',
+            f'        raise AttributeNullError({name!r})',
+        ]
+
+
+def _add_default_lines(lines: List[str], namespace: Dict[str, Any], ref: str, name: str, attr: Attribute) -> None:
+    # Mirrors `_set_defaults(_user_instantiated=False)`: only `default` applies to loaded items.
+    if attr.default is None:
+        return
+    namespace[f'{ref}_default'] = attr.default
+    if callable(attr.default):
+        lines.append(f'    value = {ref}_default()')
+    else:
+        lines.append(f'    value = {ref}_default')
+    lines.append('    if value is not None:')
+    if _has_plain_set(attr):
+        lines.append(f'        values[{name!r}] = value')
+    else:
+        lines.append(f'        {ref}.__set__(self, value)')
+
+
+def _add_deserializer_lines(lines: List[str], ref: str, name: str, attr: Attribute) -> None:
+    attr_type = attr.attr_type
+    lines += [
+        f'    attribute_value = attribute_values.get({attr.attr_name!r})',
+        f'    if attribute_value and {NULL!r} not in attribute_value:',
+    ]
+    if type(attr).get_value is Attribute.get_value:
+        lines += [
+            f'        if {attr_type!r} in attribute_value:',
+            f'            value = attribute_value[{attr_type!r}]',
+            '        else:',
+            f'            value = {ref}.get_value(attribute_value)',
+        ]
+    else:
+        lines.append(f'        value = {ref}.get_value(attribute_value)')
+    if type(attr).deserialize is not Attribute.deserialize:
+        lines.append(f'        value = {ref}.deserialize(value)')
+    if _has_plain_set(attr):
+        lines.append(f'        values[{name!r}] = value')
+    else:
+        lines.append(f'        {ref}.__set__(self, value)')
+
+
+def _add_to_dict_lines(lines: List[str], namespace: Dict[str, Any], ref: str, name: str, attr: Attribute) -> None:
+    attr_type = attr.attr_type
+    lines += [
+        f'    attribute_value = attribute_values.get({attr.attr_name!r})',
+        f'    if attribute_value and {NULL!r} not in attribute_value:',
+    ]
+    if isinstance(attr, (ListAttribute, MapAttribute)):
+        namespace['decode_to_python'] = _decode_to_python
+        lines.append(f'        result[{name!r}] = decode_to_python({ref}, attribute_value)')
+    else:
+        if type(attr).get_value is Attribute.get_value:
+            lines += [
+                f'        if {attr_type!r} in attribute_value:',
+                f'            value = attribute_value[{attr_type!r}]',
+                '        else:',
+                f'            value = {ref}.get_value(attribute_value)',
+            ]
+        else:
+            lines.append(f'        value = {ref}.get_value(attribute_value)')
+        if type(attr).deserialize is not Attribute.deserialize:
+            lines.append(f'        value = {ref}.deserialize(value)')
+        lines.append(f'        result[{name!r}] = value')
+    if attr.default is not None:
+        namespace[f'{ref}_default'] = attr.default
+        lines += [
+            '    else:',
+            f'        value = {ref}_default()' if callable(attr.default) else f'        value = {ref}_default',
+            '        if value is not None:',
+            f'            result[{name!r}] = value',
+        ]
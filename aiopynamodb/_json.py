@@ -0,0 +1,136 @@
+"""
+The JSON backend of the JSON attributes, number attributes and simple dictionary conversions.
+
+The backend is chosen with the `json_backend` setting: 'json' (the standard library, the default), 'orjson',
+'ujson' or 'auto', which picks the first of orjson and ujson that is installed and falls back to the standard
+library. A configured backend that is not installed is replaced by the standard library, with a warning.
+
+Values the fast backends can't handle (integers wider than 64 bits, strings with control characters, or types
+they don't support) are encoded and decoded with the standard library instead, so every backend decodes the same
+values, and rejects the same types with a TypeError, except that orjson encodes UUID and Enum values, which the
+standard library rejects. orjson encodes NaN and infinite floats as null, so values that hold one are encoded with
+the standard library as well, as NaN and Infinity like the other backends.
+
+orjson encodes JSON without whitespace and without escaping non-ASCII characters. ujson encodes JSON without
+whitespace, and escapes non-ASCII characters like the standard library.
+"""
+import json
+import logging
+import re
+import warnings
+from importlib import import_module
+from json.encoder import encode_basestring_ascii  # type: ignore[attr-defined]
+from typing import Any, Callable, Union
+
+from aiopynamodb.settings import get_settings_value
+
+log = logging.getLogger(__name__)
+
+JSON_BACKENDS = ('auto', 'orjson', 'ujson', 'json')
+
+backend_name = 'json'
+dumps: Callable[[Any], str] = json.dumps
+loads: Callable[[Union[str, bytes]], Any]
+
+# Encodes a string as a JSON string. Used by the streaming encoders, the output of which does not depend on the backend.
+encode_string: Callable[[str], str] = encode_basestring_ascii
+
+
+def _std_loads(value: Union[str, bytes]) -> Any:
+    return json.loads(value, strict=False)
+
+
+# orjson decodes the integers wider than 64 bits as floats, so documents that may hold one are left to the standard library
+_LONG_DIGITS = re.compile('[0-9]{19}')
+_LONG_DIGITS_BYTES = re.compile(b'[0-9]{19}')
+
+
+def _has_non_finite_float(value: Any) -> bool:
+    if isinstance(value, float):
+        # value - value is nan for infinities and nan
+        return value - value != 0
+    if isinstance(value, dict):
+        return any(_has_non_finite_float(key) or _has_non_finite_float(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite_float(item) for item in value)
+    return False
+
+
+def _make_orjson_backend(orjson: Any):
+    # datetimes and dataclasses are left to the standard library, which rejects them
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def orjson_dumps(value: Any) -> str:
+        try:
+            encoded = orjson.dumps(value, option=options)
+        except TypeError:
+            return json.dumps(value)
+        # orjson encodes NaN and infinite floats (as values or keys) as null, so only documents with a null may hold one
+        if b'null' in encoded and _has_non_finite_float(value):
+            return json.dumps(value)
+        return encoded.decode()
+
+    def orjson_loads(value: Union[str, bytes]) -> Any:
+        if (_LONG_DIGITS_BYTES if isinstance(value, bytes) else _LONG_DIGITS).search(value):  # type: ignore
+            return _std_loads(value)
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            return _std_loads(value)
+
+    return orjson_dumps, orjson_loads
+
+
+def _make_ujson_backend(ujson: Any):
+    def ujson_dumps(value: Any) -> str:
+        try:
+            return ujson.dumps(value, escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            return json.dumps(value)
+
+    def ujson_loads(value: Union[str, bytes]) -> Any:
+        try:
+            return ujson.loads(value)
+        except ValueError:
+            return _std_loads(value)
+
+    return ujson_dumps, ujson_loads
+
+
+def set_backend(name: str) -> str:
+    """
+    Selects the JSON backend, returning the name of the backend in use.
+
+    :raises ImportError: If the backend (other than 'auto') is not installed
+    """
+    global backend_name, dumps, loads
+    if name not in JSON_BACKENDS:
+        raise ValueError("json_backend must be one of {}".format(JSON_BACKENDS))
+    candidates = ('orjson', 'ujson', 'json') if name == 'auto' else (name,)
+    for candidate in candidates:
+        if candidate == 'json':
+            dumps, loads = json.dumps, _std_loads
+        else:
+            try:
+                module = import_module(candidate)
+            except ImportError:
+                if name == 'auto':
+                    continue
+                raise
+            factory = _make_orjson_backend if candidate == 'orjson' else _make_ujson_backend
+            dumps, loads = factory(module)
+        backend_name = candidate
+        break
+    log.debug("Using the %s JSON backend", backend_name)
+    return backend_name
+
+
+def _set_configured_backend(name: str) -> str:
+    try:
+        return set_backend(name)
+    except ImportError:
+        warnings.warn("The {} JSON backend is not installed, using the standard library instead".format(name))
+        return set_backend('json')
+
+
+_set_configured_backend(get_settings_value('json_backend'))
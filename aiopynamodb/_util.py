@@ -1,9 +1,16 @@
-import json
 from base64 import b64decode
 from base64 import b64encode
+from decimal import Decimal
+from itertools import chain
 from typing import Any
 from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
 
+from aiopynamodb import _json
 from aiopynamodb.constants import BINARY
 from aiopynamodb.constants import BINARY_SET
 from aiopynamodb.constants import BOOLEAN
@@ -16,6 +23,33 @@ from aiopynamodb.constants import STRING
 from aiopynamodb.constants import STRING_SET
 
 
+def encode_number(value: Any) -> str:
+    """
+    Encodes a number as JSON. Integers and finite floats are formatted directly (the shortest representation
+    of a float round-trips exactly), and other values go through the JSON backend.
+    """
+    value_type = type(value)
+    if value_type is int:
+        return int.__repr__(value)
+    if value_type is float and value - value == 0:
+        # value - value is nan for infinities and nan, which JSON encodes as 'Infinity' and 'NaN'
+        return float.__repr__(value)
+    return _json.dumps(value)
+
+
+def decode_number(value: str) -> Any:
+    """
+    Decodes a JSON number, to an int if it has no fraction or exponent and to a float otherwise.
+    """
+    try:
+        if '.' in value or 'e' in value or 'E' in value:
+            return float(value)
+        return int(value)
+    except ValueError:
+        # 'NaN', 'Infinity' and '-Infinity', or an invalid number
+        return _json.loads(value)
+
+
 def attr_value_to_simple_dict(attribute_value: Dict[str, Any], force: bool) -> Any:
     attr_type, attr_value = next(iter(attribute_value.items()))
     if attr_type == LIST:
@@ -29,7 +63,7 @@ def attr_value_to_simple_dict(attribute_value: Dict[str, Any], force: bool) -> A
     if attr_type == STRING:
         return attr_value
     if attr_type == NUMBER:
-        return json.loads(attr_value)
+        return decode_number(attr_value)
     if attr_type == BINARY:
         if force:
             return b64encode(attr_value).decode()
@@ -44,18 +78,66 @@ def attr_value_to_simple_dict(attribute_value: Dict[str, Any], force: bool) -> A
         raise ValueError("String set attributes are not supported")
     if attr_type == NUMBER_SET:
         if force:
-            return [json.loads(v) for v in attr_value]
+            return [decode_number(v) for v in attr_value]
         raise ValueError("Number set attributes are not supported")
     raise ValueError("Unknown attribute type: {}".format(attr_type))
 
 
+def attr_values_to_json(attribute_values: Mapping[str, Dict[str, Any]], force: bool) -> str:
+    """
+    Returns the JSON of the simple dictionary of the attribute values (see attr_value_to_simple_dict),
+    encoded straight from the attribute values: numbers are written as they are stored, without being decoded.
+    """
+    parts: List[str] = []
+    _append_map_json(attribute_values, force, parts)
+    return ''.join(parts)
+
+
+def _append_map_json(attribute_values: Mapping[str, Dict[str, Any]], force: bool, parts: List[str]) -> None:
+    encode_string = _json.encode_string
+    separator = '{'
+    for name, attribute_value in attribute_values.items():
+        parts.append(separator)
+        parts.append(encode_string(name))
+        parts.append(':')
+        _append_attr_value_json(attribute_value, force, parts)
+        separator = ','
+    parts.append('}' if separator == ',' else '{}')
+
+
+def _append_attr_value_json(attribute_value: Dict[str, Any], force: bool, parts: List[str]) -> None:
+    attr_type, attr_value = next(iter(attribute_value.items()))
+    if attr_type == STRING:
+        parts.append(_json.encode_string(attr_value))
+    elif attr_type == NUMBER:
+        parts.append(attr_value)
+    elif attr_type == BOOLEAN:
+        parts.append('true' if attr_value else 'false')
+    elif attr_type == NULL:
+        parts.append('null')
+    elif attr_type == MAP:
+        _append_map_json(attr_value, force, parts)
+    elif attr_type == LIST:
+        separator = '['
+        for element in attr_value:
+            parts.append(separator)
+            _append_attr_value_json(element, force, parts)
+            separator = ','
+        parts.append(']' if separator == ',' else '[]')
+    elif attr_type == NUMBER_SET and force:
+        parts.append('[' + ','.join(attr_value) + ']')
+    else:
+        # Binary and set values are converted (or rejected) the same way as in simple dictionaries
+        parts.append(_json.dumps(attr_value_to_simple_dict(attribute_value, force)))
+
+
 def simple_dict_to_attr_value(value: Any) -> Dict[str, Any]:
     if value is None:
         return {NULL: True}
     if value is True or value is False:
         return {BOOLEAN: value}
     if isinstance(value, (int, float)):
-        return {NUMBER: json.dumps(value)}
+        return {NUMBER: encode_number(value)}
     if isinstance(value, str):
         return {STRING: value}
     if isinstance(value, list):
@@ -93,3 +175,109 @@ def bin_decode_attr(attr: Dict[str, Any]) -> None:
     elif LIST in attr:
         for sub_attr in attr[LIST]:
             bin_decode_attr(sub_attr)
+
+
+def attr_value_size(attribute_value: Dict[str, Any]) -> int:
+    """
+    Returns the size of an attribute value as DynamoDB counts it towards the item size limit.
+    """
+    attr_type, attr_value = next(iter(attribute_value.items()))
+    if attr_type == STRING:
+        return len(attr_value.encode())
+    if attr_type == NUMBER:
+        return _number_size(attr_value)
+    if attr_type == BINARY:
+        return _binary_size(attr_value)
+    if attr_type in (BOOLEAN, NULL):
+        return 1
+    if attr_type == STRING_SET:
+        return sum(len(v.encode()) for v in attr_value)
+    if attr_type == NUMBER_SET:
+        return sum(_number_size(v) for v in attr_value)
+    if attr_type == BINARY_SET:
+        return sum(_binary_size(v) for v in attr_value)
+    # Lists and maps take 3 bytes, plus 1 byte per element
+    if attr_type == LIST:
+        return 3 + sum(attr_value_size(v) + 1 for v in attr_value)
+    if attr_type == MAP:
+        return 3 + sum(len(k.encode()) + attr_value_size(v) + 1 for k, v in attr_value.items())
+    raise ValueError("Unknown attribute type: {}".format(attr_type))
+
+
+def item_size(attribute_values: Mapping[str, Dict[str, Any]]) -> int:
+    """
+    Returns the size of an item as DynamoDB computes it: the lengths of the attribute names plus the sizes of the values.
+    """
+    return sum(len(name.encode()) + attr_value_size(value) for name, value in attribute_values.items())
+
+
+def _number_size(value: str) -> int:
+    # Numbers take 1 byte per two significant digits, plus 1 byte (and 1 more when negative)
+    mantissa = value.lower().split('e')[0]
+    digits = mantissa.lstrip('+-').replace('.', '').strip('0')
+    return (len(digits) + 1) // 2 + 1 + mantissa.startswith('-')
+
+
+def _binary_size(value: Any) -> int:
+    return len(value.encode() if isinstance(value, str) else value)
+
+
+def attr_value_changes(
+    old: Dict[str, Any],
+    new: Dict[str, Any],
+    path: List[str],
+) -> Iterator[Tuple[List[str], Optional[Dict[str, Any]]]]:
+    """
+    Yields the changes between two attribute values as (document path, new value) pairs, where a new value of None
+    means that the path was removed. Maps are compared key by key and lists of the same length element by element,
+    so that only the nested values which changed are yielded. Maps with keys that can't be used in document paths
+    are yielded as a whole.
+    """
+    if old is new or attr_values_equal(old, new):
+        return
+    if MAP in old and MAP in new and all(_is_plain_path_segment(key) for key in chain(old[MAP], new[MAP])):
+        old_map, new_map = old[MAP], new[MAP]
+        for key, value in new_map.items():
+            if key in old_map:
+                yield from attr_value_changes(old_map[key], value, path + [key])
+            else:
+                yield path + [key], value
+        for key in old_map:
+            if key not in new_map:
+                yield path + [key], None
+    elif LIST in old and LIST in new and len(old[LIST]) == len(new[LIST]):
+        for idx, (old_value, new_value) in enumerate(zip(old[LIST], new[LIST])):
+            yield from attr_value_changes(old_value, new_value, path[:-1] + ['{}[{}]'.format(path[-1], idx)])
+    else:
+        yield path, new
+
+
+def attr_values_equal(old: Dict[str, Any], new: Dict[str, Any]) -> bool:
+    """
+    Returns whether two attribute values are equal as DynamoDB stores them: numbers are compared by value and
+    sets regardless of the order of their elements.
+    """
+    if old == new:
+        return True
+    (old_type, old_value), = old.items()
+    (new_type, new_value), = new.items()
+    if old_type != new_type:
+        return False
+    if old_type == NUMBER:
+        return Decimal(old_value) == Decimal(new_value)
+    if old_type == NUMBER_SET:
+        return {Decimal(v) for v in old_value} == {Decimal(v) for v in new_value}
+    if old_type in (STRING_SET, BINARY_SET):
+        return set(old_value) == set(new_value)
+    if old_type == LIST:
+        return len(old_value) == len(new_value) and all(map(attr_values_equal, old_value, new_value))
+    if old_type == MAP:
+        return old_value.keys() == new_value.keys() and all(
+            attr_values_equal(value, new_value[key]) for key, value in old_value.items()
+        )
+    return False
+
+
+def _is_plain_path_segment(key: str) -> bool:
+    # Map keys that look like list dereferences can't be used in document paths
+    return bool(key) and '[' not in key and ']' not in key
@@ -2,9 +2,9 @@
 PynamoDB attributes
 """
 import base64
-import calendar
 import collections.abc
-import json
+import math
+import struct
 import time
 import warnings
 from base64 import b64encode, b64decode
@@ -12,24 +12,38 @@ from copy import deepcopy
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
+from importlib import import_module
 from inspect import getfullargspec
 from inspect import getmembers
 from typing import Any, Callable, Dict, Generic, List, Mapping, Optional, TypeVar, Type, Union, Set, overload, Iterable
+from typing import Iterator
+from typing import MutableMapping
 from typing import TYPE_CHECKING
+from typing import cast
 
+from aiopynamodb import _json
 from aiopynamodb._util import attr_value_to_simple_dict
 from aiopynamodb._util import bin_decode_attr
 from aiopynamodb._util import bin_encode_attr
+from aiopynamodb._util import decode_number
+from aiopynamodb._util import encode_number
 from aiopynamodb._util import simple_dict_to_attr_value
+from aiopynamodb.compression import CompressionCodec
+from aiopynamodb.compression import compress
+from aiopynamodb.compression import decompress
+from aiopynamodb.compression import get_codec
 from aiopynamodb.constants import BINARY
 from aiopynamodb.constants import BINARY_SET
 from aiopynamodb.constants import BOOLEAN
+from aiopynamodb.constants import COMPRESSION_THRESHOLD
 from aiopynamodb.constants import DATETIME_FORMAT
 from aiopynamodb.constants import LIST
 from aiopynamodb.constants import MAP
 from aiopynamodb.constants import NULL
 from aiopynamodb.constants import NUMBER
 from aiopynamodb.constants import NUMBER_SET
+from aiopynamodb.constants import SHARD_BY_RANGE_KEY
+from aiopynamodb.constants import SHARD_BY_VALUES
 from aiopynamodb.constants import STRING
 from aiopynamodb.constants import STRING_SET
 from aiopynamodb.exceptions import AttributeDeserializationError
@@ -38,6 +52,7 @@ from aiopynamodb.expressions.operand import Path
 
 
 if TYPE_CHECKING:
+    from aiopynamodb._codec import ContainerCodec
     from aiopynamodb.expressions.condition import (
         BeginsWith, Between, Comparison, Contains, NotExists, Exists, In
     )
@@ -60,6 +75,24 @@ _A = TypeVar('_A', bound='Attribute')
 _IMMUTABLE_TYPES = (str, int, float, datetime, timedelta, bytes, bool, tuple, frozenset, type(None))
 _IMMUTABLE_TYPE_NAMES = ', '.join(map(lambda x: x.__name__, _IMMUTABLE_TYPES))
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_SECOND = timedelta(seconds=1)
+
+# numpy is optional, so it is imported dynamically to give it the same type whether it is installed or not.
+numpy: Any
+try:
+    numpy = import_module('numpy')
+except ImportError:
+    numpy = None
+
+_NDARRAY_MARKER = b'\x93N'
+_NDARRAY_FORMAT_VERSION = 1
+_NDARRAY_DTYPE_KINDS = 'biufc'
+_NDARRAY_ALIGNMENT = 8
+
+# Marks container classes whose codec has not been generated yet (see `AttributeContainer._get_container_codec`).
+_NOT_COMPILED: Any = object()
+
 
 class Attribute(Generic[_T]):
     """
@@ -281,24 +314,163 @@ class Attribute(Generic[_T]):
         return Path(self).delete(*values)
 
 
+class SlottedAttributeValues(MutableMapping[str, Any]):
+    """
+    Compact storage for the attribute values of a container declared with :code:`compact_storage=True`.
+
+    Each container class gets its own subclass with one slot per declared attribute, which replaces
+    the per-instance `attribute_values` dictionary. An unset slot is equivalent to a missing key.
+    """
+    __slots__ = ()
+    _owner: Type['AttributeContainer']
+    _fields: Dict[str, Any]
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._fields[key].__get__(self)
+        except (KeyError, AttributeError):
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        field = self._fields.get(key)
+        if field is None:
+            return default
+        try:
+            return field.__get__(self)
+        except AttributeError:
+            return default
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        try:
+            field = self._fields[key]
+        except KeyError:
+            raise KeyError("{} has no attribute '{}'".format(self._owner.__name__, key)) from None
+        field.__set__(self, value)
+
+    def __delitem__(self, key: str) -> None:
+        try:
+            self._fields[key].__delete__(self)
+        except (KeyError, AttributeError):
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        for name, field in self._fields.items():
+            try:
+                field.__get__(self)
+            except AttributeError:
+                continue
+            yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def __reduce__(self):
+        return _restore_slotted_attribute_values, (self._owner, dict(self))
+
+
+def _restore_slotted_attribute_values(owner: Type['AttributeContainer'], values: Dict[str, Any]) -> MutableMapping[str, Any]:
+    attribute_values = owner._attribute_values_cls()
+    attribute_values.update(values)
+    return attribute_values
+
+
+def _make_slotted_attribute_values_cls(owner: Type['AttributeContainer']) -> Type[SlottedAttributeValues]:
+    # Slots are named by position so that attribute names can never shadow the mapping methods.
+    names = list(owner.get_attributes())
+    slots = tuple('_{}'.format(idx) for idx in range(len(names)))
+    values_cls: Type[SlottedAttributeValues] = type(f'{owner.__name__}AttributeValues', (SlottedAttributeValues,), {
+        '__slots__': slots,
+        '__module__': owner.__module__,
+        '__qualname__': f'{owner.__qualname__}.AttributeValues',
+        '_owner': owner,
+    })
+    values_cls._fields = {name: getattr(values_cls, slot) for name, slot in zip(names, slots)}
+    return values_cls
+
+
+class LazyAttributeValues(MutableMapping[str, Any]):
+    """
+    Attribute values of a container loaded with :code:`lazy=True`.
+
+    Attributes are kept in their DynamoDB form until they are first read, at which point they are
+    decoded and cached. Serializing the container reuses the DynamoDB form of attributes that were
+    never read or assigned instead of decoding and encoding them again.
+    """
+
+    def __init__(
+        self,
+        attributes: Dict[str, 'Attribute'],
+        values: MutableMapping[str, Any],
+        raw_values: Dict[str, Dict[str, Any]],
+    ) -> None:
+        self._attributes = attributes
+        self._values = values
+        self._raw_values = raw_values
+
+    def _decode(self, key: str) -> Any:
+        attr = self._attributes[key]
+        value = attr.deserialize(attr.get_value(self._raw_values[key]))
+        del self._raw_values[key]
+        self._values[key] = value
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._raw_values:
+            return self._decode(key)
+        return self._values[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._raw_values:
+            return self._decode(key)
+        return self._values.get(key, default)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._raw_values.pop(key, None)
+        self._values[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if self._raw_values.pop(key, None) is None:
+            del self._values[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._raw_values or key in self._values
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._values
+        yield from self._raw_values
+
+    def __len__(self) -> int:
+        return len(self._values) + len(self._raw_values)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
 class AttributeContainerMeta(type):
     _attributes: Dict[str, Attribute]
+    _container_codec: Optional['ContainerCodec']
+    _compact_storage: bool
+    _attribute_values_cls: Type[MutableMapping[str, Any]]
 
-    def __new__(cls, name, bases, namespace, discriminator=None):
-        # Defined so that the discriminator can be set in the class definition.
+    def __new__(cls, name, bases, namespace, discriminator=None, compact_storage=None):
+        # Defined so that the discriminator and storage can be set in the class definition.
         return super().__new__(cls, name, bases, namespace)
 
-    def __init__(self, name, bases, namespace, discriminator=None):
+    def __init__(self, name, bases, namespace, discriminator=None, compact_storage=None):
         super().__init__(name, bases, namespace)
-        AttributeContainerMeta._initialize_attributes(self, discriminator)
+        AttributeContainerMeta._initialize_attributes(self, discriminator, compact_storage)
 
     @staticmethod
-    def _initialize_attributes(cls, discriminator_value):
+    def _initialize_attributes(cls, discriminator_value, compact_storage=None):
         """
         Initialize attributes on the class.
         """
         cls._attributes = {}
         cls._dynamo_to_python_attrs = {}
+        cls._container_codec = _NOT_COMPILED
 
         for name, attribute in getmembers(cls, lambda o: isinstance(o, Attribute)):
             cls._attributes[name] = attribute
@@ -316,19 +488,28 @@ class AttributeContainerMeta(type):
                 raise ValueError("{} does not have a discriminator attribute".format(cls.__name__))
             cls._attributes[cls._discriminator].register_class(cls, discriminator_value)
 
+        # Compact storage is inherited by subclasses unless they opt out.
+        if compact_storage is None:
+            compact_storage = getattr(cls, '_compact_storage', False)
+        cls._compact_storage = compact_storage
+        cls._attribute_values_cls = _make_slotted_attribute_values_cls(cls) if compact_storage else dict
+
 
 class AttributeContainer(metaclass=AttributeContainerMeta):
     """
     Base class for models and maps.
     """
+    _compact_storage: bool
+    _attribute_values_cls: Type[MutableMapping[str, Any]]
 
     def __init__(self, _user_instantiated: bool = True, **attributes: Attribute) -> None:
         # The `attribute_values` dictionary is used by the Attribute data descriptors in cls._attributes
         # to store the values that are bound to this instance. Attributes store values in the dictionary
         # using the `python_attr_name` as the dictionary key. "Raw" (i.e. non-subclassed) MapAttribute
         # instances do not have any Attributes defined and instead use this dictionary to store their
-        # collection of name-value pairs.
-        self.attribute_values: Dict[str, Any] = {}
+        # collection of name-value pairs. Classes declared with `compact_storage=True` use a slotted
+        # mapping (see `SlottedAttributeValues`) instead of a dictionary.
+        self.attribute_values: MutableMapping[str, Any] = self._attribute_values_cls()
         self._set_discriminator()
         self._set_defaults(_user_instantiated=_user_instantiated)
         self._set_attributes(**attributes)
@@ -391,12 +572,44 @@ class AttributeContainer(metaclass=AttributeContainerMeta):
                 raise ValueError("Attribute {} specified does not exist".format(attr_name))
             setattr(self, attr_name, attr_value)
 
+    @classmethod
+    def _get_container_codec(cls) -> Optional['ContainerCodec']:
+        """
+        Returns the serializer and deserializer compiled for this class,
+        or None if this class uses the generic implementation.
+        """
+        codec = cls._container_codec
+        if codec is _NOT_COMPILED:
+            from aiopynamodb._codec import compile_container_codec  # prevent circular import -- codecs import attributes
+            codec = cls._container_codec = compile_container_codec(cls)
+        return codec
+
     def _container_serialize(self, null_check: bool = True) -> Dict[str, Dict[str, Any]]:
         """
         Serialize attribute values for DynamoDB
         """
+        if isinstance(self.attribute_values, LazyAttributeValues):
+            return self._generic_container_serialize(null_check=null_check, raw_values=self.attribute_values._raw_values)
+        codec = type(self)._get_container_codec()
+        if codec is not None:
+            return codec.serialize(self, null_check)
+        return self._generic_container_serialize(null_check=null_check)
+
+    def _generic_container_serialize(
+        self,
+        null_check: bool = True,
+        raw_values: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Serialize attribute values for DynamoDB by going through each attribute's descriptor
+
+        :param raw_values: Attributes that are still in their DynamoDB form, by python attribute name
+        """
         attribute_values: Dict[str, Dict[str, Any]] = {}
         for name, attr in self.get_attributes().items():
+            if raw_values and name in raw_values:
+                attribute_values[attr.attr_name] = raw_values[name]
+                continue
             value = getattr(self, name)
             try:
                 if isinstance(value, MapAttribute) and not value.validate(null_check=null_check):
@@ -424,7 +637,17 @@ class AttributeContainer(metaclass=AttributeContainerMeta):
         """
         Sets attributes sent back from DynamoDB on this object
         """
-        self.attribute_values = {}
+        codec = type(self)._get_container_codec()
+        if codec is not None:
+            codec.deserialize(self, attribute_values)
+        else:
+            self._generic_container_deserialize(attribute_values)
+
+    def _generic_container_deserialize(self, attribute_values: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Sets attributes sent back from DynamoDB on this object by going through each attribute's descriptor
+        """
+        self.attribute_values = self._attribute_values_cls()
         self._set_discriminator()
         self._set_defaults(_user_instantiated=False)
         for name, attr in self.get_attributes().items():
@@ -433,6 +656,26 @@ class AttributeContainer(metaclass=AttributeContainerMeta):
                 value = attr.deserialize(attr.get_value(attribute_value))
                 setattr(self, name, value)
 
+    def _lazy_container_deserialize(self, attribute_values: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Sets attributes sent back from DynamoDB on this object, deferring the decoding of each
+        attribute until it is first read
+        """
+        self.attribute_values = values = self._attribute_values_cls()
+        self._set_discriminator()
+        self._set_defaults(_user_instantiated=False)
+        raw_values: Dict[str, Dict[str, Any]] = {}
+        for name, attr in self.get_attributes().items():
+            attribute_value = attribute_values.get(attr.attr_name)
+            if attribute_value and NULL not in attribute_value:
+                if _is_lazy_loadable(attr):
+                    values.pop(name, None)
+                    raw_values[name] = attribute_value
+                else:
+                    setattr(self, name, attr.deserialize(attr.get_value(attribute_value)))
+        if raw_values:
+            self.attribute_values = LazyAttributeValues(self.get_attributes(), values, raw_values)
+
     @classmethod
     def _update_attribute_types(cls, attribute_values: Dict[str, Dict[str, Any]]):
         """
@@ -476,15 +719,46 @@ class AttributeContainer(metaclass=AttributeContainerMeta):
         return None
 
     @classmethod
-    def _instantiate(cls: Type[_ACT], attribute_values: Dict[str, Dict[str, Any]]) -> _ACT:
+    def _instantiate(cls: Type[_ACT], attribute_values: Dict[str, Dict[str, Any]], lazy: bool = False) -> _ACT:
         stored_cls = cls._get_discriminator_class(attribute_values)
         if stored_cls and not issubclass(stored_cls, cls):
             raise ValueError("Cannot instantiate a {} from the returned class: {}".format(
                 cls.__name__, stored_cls.__name__))
+        if lazy:
+            instance = (stored_cls or cls)(_user_instantiated=False)
+            instance._lazy_container_deserialize(attribute_values)
+            return instance
+        codec = (stored_cls or cls)._get_container_codec()
+        if codec is not None:
+            return codec.instantiate(attribute_values)
         instance = (stored_cls or cls)(_user_instantiated=False)
-        AttributeContainer._container_deserialize(instance, attribute_values)
+        AttributeContainer._generic_container_deserialize(instance, attribute_values)
         return instance
 
+    @classmethod
+    def _to_python_dict(cls, attribute_values: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Decodes DynamoDB attribute values into a dictionary keyed by python attribute name, without
+        instantiating the container. Nested typed maps are decoded into dictionaries as well.
+        """
+        stored_cls = cls._get_discriminator_class(attribute_values)
+        if stored_cls and not issubclass(stored_cls, cls):
+            raise ValueError("Cannot instantiate a {} from the returned class: {}".format(
+                cls.__name__, stored_cls.__name__))
+        codec = (stored_cls or cls)._get_container_codec()
+        if codec is not None:
+            return codec.to_dict(attribute_values)
+        result: Dict[str, Any] = {}
+        for name, attr in (stored_cls or cls).get_attributes().items():
+            attribute_value = attribute_values.get(attr.attr_name)
+            if attribute_value and NULL not in attribute_value:
+                result[name] = _decode_to_python(attr, attribute_value)
+            elif attr.default is not None:
+                value = attr.default() if callable(attr.default) else attr.default
+                if value is not None:
+                    result[name] = value
+        return result
+
     def to_dynamodb_dict(self) -> Dict[str, Dict[str, Any]]:
         """
         Returns the contents of this instance as a JSON-serializable mapping,
@@ -665,9 +939,27 @@ class BinarySetAttribute(Attribute[Set[bytes]]):
 class UnicodeAttribute(Attribute[str]):
     """
     A unicode attribute
+
+    :param shards: If set on the hash key of a model, the items of each hash key are spread over this many
+      shards, stored under the hash keys ``<hash key>#shard#<shard>`` (see :mod:`aiopynamodb.sharding`).
+      The model must have a range key.
+    :param shard_by: How the shard of an item is picked: 'range_key' (the default) derives it from the
+      range key of the item, 'random' picks a random shard when the item is first saved.
     """
     attr_type = STRING
 
+    def __init__(self, *args: Any, shards: Optional[int] = None, shard_by: str = SHARD_BY_RANGE_KEY, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        if shards is not None:
+            if not self.is_hash_key:
+                raise ValueError("Only hash keys can be sharded")
+            if shards < 1:
+                raise ValueError("shards must be greater than zero")
+        if shard_by not in SHARD_BY_VALUES:
+            raise ValueError("shard_by must be one of {}".format(SHARD_BY_VALUES))
+        self.shards = shards
+        self.shard_by = shard_by
+
 
 class UnicodeSetAttribute(Attribute[Set[str]]):
     """
@@ -703,14 +995,177 @@ class JSONAttribute(Attribute[Any]):
         """
         if value is None:
             return None
-        encoded = json.dumps(value)
+        encoded = _json.dumps(value)
         return encoded
 
     def deserialize(self, value):
         """
         Deserializes JSON
         """
-        return json.loads(value, strict=False)
+        return _json.loads(value)
+
+
+class CompressedBinaryAttribute(Attribute[bytes]):
+    """
+    A binary attribute stored compressed.
+
+    Values are stored with a header recording their codec (see :mod:`aiopynamodb.compression`), and values
+    without the header are read as is, so a :class:`BinaryAttribute` (with :code:`legacy_encoding=False`)
+    can be changed to a compressed attribute without migrating the stored values.
+
+    :param codec: The name of a registered codec ('zlib', 'lzma', 'zstd' or 'lz4'), or a codec instance
+    :param threshold: Values shorter than this many bytes are stored uncompressed
+    """
+    attr_type = BINARY
+
+    def __init__(
+        self,
+        *args: Any,
+        codec: Union[str, CompressionCodec] = 'zlib',
+        threshold: int = COMPRESSION_THRESHOLD,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.codec = get_codec(codec)
+        self.threshold = threshold
+
+    def serialize(self, value):
+        return compress(value, self.codec, self.threshold)
+
+    def deserialize(self, value):
+        return decompress(value)
+
+
+class CompressedJSONAttribute(CompressedBinaryAttribute):
+    """
+    A JSON attribute stored compressed, as binary.
+
+    Values stored by a :class:`JSONAttribute` (as strings) are read as well, so a JSON attribute can be
+    changed to a compressed attribute without migrating the stored values.
+    """
+
+    def get_value(self, value: Dict[str, Any]) -> Any:
+        if STRING in value:
+            return value[STRING]
+        return super().get_value(value)
+
+    def serialize(self, value):
+        if value is None:
+            return None
+        return super().serialize(_json.dumps(value).encode('utf-8'))
+
+    def deserialize(self, value):
+        if isinstance(value, str):
+            return _json.loads(value)
+        return _json.loads(super().deserialize(value))
+
+
+class NDArrayAttribute(Attribute[Any]):
+    """
+    A numpy array attribute, stored as binary.
+
+    Arrays are stored as a header recording their dtype and shape, followed by their elements in little-endian
+    byte order, optionally compressed (see :mod:`aiopynamodb.compression`). Uncompressed arrays are decoded
+    with :func:`numpy.frombuffer`, without copying the elements, so the arrays read are read-only.
+    Requires numpy (``pip install aiopynamodb[numpy]``).
+
+    :param dtype: The dtype of the arrays (boolean or numeric). Values are converted to it when serialized.
+    :param shape: The shape of the arrays, if fixed. Dimensions given as None can have any length.
+    :param codec: The name of a registered codec, or a codec instance, to store the arrays compressed
+    :param threshold: With a codec, arrays shorter than this many bytes are stored uncompressed
+    """
+    attr_type = BINARY
+
+    def __init__(
+        self,
+        *args: Any,
+        dtype: Any = 'float64',
+        shape: Optional[Iterable[Optional[int]]] = None,
+        codec: Optional[Union[str, CompressionCodec]] = None,
+        threshold: int = COMPRESSION_THRESHOLD,
+        **kwargs: Any,
+    ) -> None:
+        if numpy is None:
+            raise ImportError("NDArrayAttribute requires numpy: pip install aiopynamodb[numpy]")
+        super().__init__(*args, **kwargs)
+        self.dtype = numpy.dtype(dtype)
+        if self.dtype.kind not in _NDARRAY_DTYPE_KINDS:
+            raise ValueError("NDArrayAttribute only stores boolean and numeric arrays, not {}".format(self.dtype))
+        self.shape = tuple(shape) if shape is not None else None
+        self.codec = get_codec(codec) if codec is not None else None
+        self.threshold = threshold
+        self._stored_dtype = self.dtype.newbyteorder('<')
+        self._dtype_header = self._stored_dtype.str.encode('ascii')
+
+    def serialize(self, value):
+        array = numpy.asarray(value, dtype=self._stored_dtype, order='C')
+        if self.shape is not None and (
+            array.ndim != len(self.shape)
+            or any(dim is not None and dim != length for dim, length in zip(self.shape, array.shape))
+        ):
+            raise ValueError("Expected an array of shape {}, got {}".format(self.shape, array.shape))
+        header = _NDARRAY_MARKER + bytes((_NDARRAY_FORMAT_VERSION, array.ndim, len(self._dtype_header)))
+        header += self._dtype_header + struct.pack('<{}I'.format(array.ndim), *array.shape)
+        # The elements are aligned, for the arrays that are read from the stored value
+        header += b'\x00' * (-len(header) % _NDARRAY_ALIGNMENT)
+        data = b''.join((header, array.ravel().view(numpy.uint8)))
+        if self.codec is None:
+            return data
+        return compress(data, self.codec, self.threshold)
+
+    def deserialize(self, value):
+        data = decompress(value)
+        dtype, shape, offset = self._read_header(data)
+        array = numpy.frombuffer(data, dtype=dtype, count=math.prod(shape), offset=offset).reshape(shape)
+        if dtype != self.dtype:
+            array = array.astype(self.dtype)
+        return array
+
+    def stack(self, values: Iterable[Any]) -> Any:
+        """
+        Decodes the arrays of a page of items into one array, with one row per item.
+
+        The elements are copied once, into the stacked array, which is writable.
+
+        :param values: The serialized arrays, or the raw items (read with `result_mode='raw'`) holding them
+        :raises ValueError: If an item has no array, or the arrays differ in shape or dtype
+        """
+        buffers = []
+        for value in values:
+            if isinstance(value, dict):
+                if self.attr_name not in value:
+                    raise ValueError("Attribute {} is missing from an item".format(self.attr_name))
+                value = self.get_value(value[self.attr_name])
+            buffers.append(decompress(value))
+        if not buffers:
+            if self.shape is not None and None not in self.shape:
+                return numpy.empty((0,) + self.shape, dtype=self.dtype)
+            return numpy.empty(0, dtype=self.dtype)
+
+        headers = [self._read_header(data) for data in buffers]
+        dtype, shape, _ = headers[0]
+        if any(header[:2] != (dtype, shape) for header in headers):
+            raise ValueError("Arrays of different shapes or dtypes can't be stacked")
+        size = math.prod(shape) * dtype.itemsize
+        stacked = bytearray().join(
+            memoryview(data)[offset:offset + size] for data, (_, _, offset) in zip(buffers, headers)
+        )
+        array = numpy.frombuffer(stacked, dtype=dtype).reshape((len(buffers),) + shape)
+        if dtype != self.dtype:
+            array = array.astype(self.dtype)
+        return array
+
+    @staticmethod
+    def _read_header(data: bytes):
+        if data[:2] != _NDARRAY_MARKER:
+            raise ValueError("Not an NDArrayAttribute value")
+        version, ndim, dtype_length = data[2], data[3], data[4]
+        if version > _NDARRAY_FORMAT_VERSION:
+            raise ValueError("Unsupported array format version: {}".format(version))
+        dtype = numpy.dtype(bytes(data[5:5 + dtype_length]).decode('ascii'))
+        shape = struct.unpack_from('<{}I'.format(ndim), data, 5 + dtype_length)
+        end = 5 + dtype_length + 4 * ndim
+        return dtype, shape, end + (-end % _NDARRAY_ALIGNMENT)
 
 
 class BooleanAttribute(Attribute[bool]):
@@ -741,13 +1196,13 @@ class NumberAttribute(Attribute[float]):
         """
         Encode numbers as JSON
         """
-        return json.dumps(value)
+        return encode_number(value)
 
     def deserialize(self, value):
         """
         Decode numbers from JSON
         """
-        return json.loads(value)
+        return decode_number(value)
 
 
 class NumberSetAttribute(Attribute[Set[float]]):
@@ -761,13 +1216,13 @@ class NumberSetAttribute(Attribute[Set[float]]):
         """
         Encodes a set of numbers as a JSON list. Encodes empty sets as "None".
         """
-        return [json.dumps(v) for v in value] or None
+        return [encode_number(v) for v in value] or None
 
     def deserialize(self, value):
         """
         Returns a set from a JSON list of numbers.
         """
-        return {json.loads(v) for v in value}
+        return {decode_number(v) for v in value}
 
 
 class VersionAttribute(NumberAttribute):
@@ -817,15 +1272,23 @@ class TTLAttribute(Attribute[datetime]):
         """
         if value is None:
             return
+        if type(value) is datetime and value.tzinfo is timezone.utc and not value.microsecond:
+            return value
+        return datetime.fromtimestamp(self._to_timestamp(value), tz=timezone.utc)
+
+    @staticmethod
+    def _to_timestamp(value: Union[datetime, timedelta]) -> int:
+        """
+        Returns the Unix time of the value in whole seconds
+        """
         if isinstance(value, timedelta):
-            value = int(time.time() + value.total_seconds())
-        elif isinstance(value, datetime):
+            return int(time.time() + value.total_seconds())
+        if isinstance(value, datetime):
             if value.tzinfo is None:
                 raise ValueError("datetime must be timezone-aware")
-            value = calendar.timegm(value.utctimetuple())
-        else:
-            raise ValueError("TTLAttribute value must be a timedelta or datetime")
-        return datetime.fromtimestamp(value, tz=timezone.utc)
+            # Floors to the second, like the time tuple of the datetime
+            return (value - _EPOCH) // _ONE_SECOND
+        raise ValueError("TTLAttribute value must be a timedelta or datetime")
 
     def __set__(self, instance, value):
         """
@@ -839,14 +1302,13 @@ class TTLAttribute(Attribute[datetime]):
         """
         if value is None:
             return None
-        return json.dumps(calendar.timegm(self._normalize(value).utctimetuple()))
+        return str(self._to_timestamp(value))
 
     def deserialize(self, value):
         """
         Deserializes a timestamp (Unix time) as a UTC datetime.
         """
-        timestamp = json.loads(value)
-        return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+        return datetime.fromtimestamp(decode_number(value), tz=timezone.utc)
 
 
 class UTCDateTimeAttribute(Attribute[datetime]):
@@ -859,12 +1321,7 @@ class UTCDateTimeAttribute(Attribute[datetime]):
         """
         Takes a datetime object and returns a string
         """
-        if value.tzinfo is None:
-            value = value.replace(tzinfo=timezone.utc)
-        # Padding of years under 1000 is inconsistent and depends on system strftime:
-        # https://bugs.python.org/issue13305
-        fmt = value.astimezone(timezone.utc).strftime(DATETIME_FORMAT).zfill(31)
-        return fmt
+        return self._fast_format_utc_date_string(value)
 
     def deserialize(self, value):
         """
@@ -872,6 +1329,20 @@ class UTCDateTimeAttribute(Attribute[datetime]):
         """
         return self._fast_parse_utc_date_string(value)
 
+    @staticmethod
+    def _fast_format_utc_date_string(value: datetime) -> str:
+        # Formats datetimes as '%Y-%m-%dT%H:%M:%S.%f+0000', ~3x faster than strftime.
+        # Naive datetimes are taken to be in UTC. Years are zero-padded to 4 digits, which strftime
+        # does inconsistently across systems: https://bugs.python.org/issue13305
+        if value.tzinfo is not timezone.utc:
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            else:
+                value = value.astimezone(timezone.utc)
+        return '%04d-%02d-%02dT%02d:%02d:%02d.%06d+0000' % (
+            value.year, value.month, value.day, value.hour, value.minute, value.second, value.microsecond,
+        )
+
     @staticmethod
     def _fast_parse_utc_date_string(date_string: str) -> datetime:
         # Method to quickly parse strings formatted with '%Y-%m-%dT%H:%M:%S.%f+0000'.
@@ -904,8 +1375,10 @@ class NullAttribute(Attribute[None]):
 
 
 class MetaMapAttribute(AttributeContainerMeta):
-    def __init__(self, name, bases, namespace, discriminator=None):
-        super().__init__(name, bases, namespace, discriminator=discriminator)
+    def __init__(self, name, bases, namespace, discriminator=None, compact_storage=None):
+        super().__init__(name, bases, namespace, discriminator=discriminator, compact_storage=compact_storage)
+        if self._compact_storage and cast(Type[MapAttribute], self).is_raw():
+            raise ValueError("{} stores undeclared attributes and cannot use compact storage".format(self.__name__))
         for attr_name, attr in self._attributes.items():
             if isinstance(attr, (BinaryAttribute, BinarySetAttribute)) and attr.legacy_encoding:
                 raise ValueError(
@@ -1175,7 +1648,7 @@ class MapAttribute(Attribute[Mapping[_KT, _VT]], AttributeContainer, metaclass=M
             if not isinstance(values, type(self)):
                 # Copy the values onto an instance of the class for serialization.
                 instance = type(self)()
-                instance.attribute_values = {}  # clear any defaults
+                instance.attribute_values = instance._attribute_values_cls()  # clear any defaults
                 for name in values:
                     if name in self.get_attributes():
                         setattr(instance, name, values[name])
@@ -1235,7 +1708,7 @@ class DynamicMapAttribute(MapAttribute):
         if not isinstance(values, type(self)):
             # Copy the values onto an instance of the class for serialization.
             instance = type(self)()
-            instance.attribute_values = {}  # clear any defaults
+            instance.attribute_values = instance._attribute_values_cls()  # clear any defaults
             instance._set_attributes(**values)
             values = instance
 
@@ -1266,6 +1739,31 @@ class DynamicMapAttribute(MapAttribute):
         return True
 
 
+def _decode_to_python(attr: Attribute, attribute_value: Dict[str, Any]) -> Any:
+    if isinstance(attr, MapAttribute) and not attr.is_raw():
+        return type(attr)._to_python_dict(attr.get_value(attribute_value))
+    if isinstance(attr, ListAttribute) and attr.element_type and issubclass(attr.element_type, MapAttribute) \
+            and not attr.element_type.is_raw():
+        element_type = attr.element_type
+        elements: List[Optional[Dict[str, Any]]] = []
+        for idx, element in enumerate(attr.get_value(attribute_value)):
+            if NULL in element:
+                elements.append(None)
+            elif MAP in element:
+                elements.append(element_type._to_python_dict(element[MAP]))
+            else:
+                raise AttributeDeserializationError(f'{attr.attr_name}[{idx}]', MAP)
+        return elements
+    value = attr.deserialize(attr.get_value(attribute_value))
+    return value.as_dict() if isinstance(value, MapAttribute) else value
+
+
+def _is_lazy_loadable(attr: Attribute) -> bool:
+    # Decoded values are cached without going through the attribute's `__set__`, which is only
+    # equivalent for setters that leave deserialized values unchanged.
+    return type(attr).__set__ in (Attribute.__set__, MapAttribute.__set__, VersionAttribute.__set__, TTLAttribute.__set__)
+
+
 def _get_class_for_serialize(value: Any) -> Attribute:
     if value is None:
         return NullAttribute()
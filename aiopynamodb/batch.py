@@ -0,0 +1,218 @@
+"""
+Batch operations across several models.
+
+DynamoDB accepts the keys and items of many tables in a single BatchGetItem or BatchWriteItem request.
+:func:`batch_get` and :class:`MultiBatchWrite` pack the keys and items of several models into shared
+requests of up to 100 keys or 25 items, and route the unprocessed keys and items back to their table.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from aiopynamodb.connection import Connection
+from aiopynamodb.constants import BATCH_GET_PAGE_LIMIT
+from aiopynamodb.constants import DELETE
+from aiopynamodb.constants import KEYS
+from aiopynamodb.constants import PUT
+from aiopynamodb.constants import RESPONSES
+from aiopynamodb.constants import RESULT_MODEL
+from aiopynamodb.constants import UNPROCESSED_ITEMS
+from aiopynamodb.constants import UNPROCESSED_KEYS
+from aiopynamodb.exceptions import PutError
+from aiopynamodb.models import BatchGetResult, Model, _KeyType, _PendingWrites
+from aiopynamodb.settings import get_settings_value
+
+log = logging.getLogger(__name__)
+
+_M = TypeVar('_M', bound=Model)
+
+
+@dataclass
+class BatchGetRequest(Generic[_M]):
+    """
+    The keys to get for a model in :func:`batch_get`, with the options of :meth:`~aiopynamodb.models.Model.batch_get`.
+    """
+    model: Type[_M]
+    keys: Iterable[_KeyType]
+    consistent_read: Optional[bool] = None
+    attributes_to_get: Optional[Sequence[str]] = None
+    lazy: Optional[bool] = None
+    result_mode: str = RESULT_MODEL
+
+
+async def batch_get(*requests: BatchGetRequest, connection: Optional[Connection] = None) -> List[BatchGetResult]:
+    """
+    Gets the keys of several models with shared BatchGetItem requests.
+
+    Returns a :class:`~aiopynamodb.models.BatchGetResult` per request, in the order of the requests.
+    A table is read by one request at a time, so requests for the same table are sent in separate pages.
+
+    :param connection: The connection the requests are sent with. Defaults to the connection of the first model.
+    """
+    if not requests:
+        return []
+    if connection is None:
+        connection = requests[0].model._get_connection().connection
+    map_fns = [request.model._get_result_map_fn(request.result_mode, request.lazy) for request in requests]
+    request_keys: List[List[_KeyType]] = [[] for _ in requests]
+    request_identities: List[List[Tuple]] = [[] for _ in requests]
+    found: List[Dict[Tuple, Any]] = [{} for _ in requests]
+
+    # The keys to read, with the index of their request
+    queue: List[Tuple[int, Dict[str, Any]]] = []
+    for idx, request in enumerate(requests):
+        model = request.model
+        seen = set()
+        for item in request.keys:
+            key = model._batch_get_key(item)
+            identity = model._get_key_identity(key)
+            if identity in seen:
+                continue
+            seen.add(identity)
+            request_keys[idx].append(item)
+            request_identities[idx].append(identity)
+            cached = model._lookup_cached(key, request.consistent_read, request.attributes_to_get)
+            if cached is not None:
+                if cached[1] is not None:
+                    found[idx][identity] = map_fns[idx](cached[1])
+                continue
+            queue.append((idx, key))
+
+    while queue:
+        page, queue = _next_batch_get_page(requests, queue)
+        log.debug("Fetching a BatchGetItem page of %d tables", len(page))
+        data = await connection.batch_get_items({
+            table_name: requests[idx].model._get_connection().get_batch_get_request(
+                keys,
+                consistent_read=requests[idx].consistent_read,
+                attributes_to_get=requests[idx].attributes_to_get,
+            )
+            for table_name, (idx, keys) in page.items()
+        })
+        for table_name, (idx, keys) in page.items():
+            request = requests[idx]
+            model = request.model
+            items = data.get(RESPONSES, {}).get(table_name, [])
+            unprocessed_keys = data.get(UNPROCESSED_KEYS, {}).get(table_name, {}).get(KEYS, [])
+            identities = {model._get_key_identity(key) for key in keys}
+            identities.difference_update(model._get_key_identity(key) for key in unprocessed_keys)
+            model._cache_batch_page(identities, items, request.attributes_to_get)
+            for item in items:
+                found[idx][model._get_key_identity(item)] = map_fns[idx](item)
+            queue[:0] = [(idx, key) for key in unprocessed_keys]
+    return [
+        BatchGetResult(request.model, request_keys[idx], request_identities[idx], found[idx])
+        for idx, request in enumerate(requests)
+    ]
+
+
+def _next_batch_get_page(
+    requests: Sequence[BatchGetRequest],
+    queue: List[Tuple[int, Dict[str, Any]]],
+) -> Tuple[Dict[str, Tuple[int, List[Dict[str, Any]]]], List[Tuple[int, Dict[str, Any]]]]:
+    """
+    Takes up to 100 keys from the queue, returning the keys by table (with the index of their request) and the rest
+    of the queue. A table can only appear once in a BatchGetItem request, so it takes the keys of a single request.
+    """
+    page: Dict[str, Tuple[int, List[Dict[str, Any]]]] = {}
+    rest = []
+    count = 0
+    for idx, key in queue:
+        table_name = requests[idx].model.Meta.table_name
+        entry = page.get(table_name)
+        if count < BATCH_GET_PAGE_LIMIT and (entry is None or entry[0] == idx):
+            page.setdefault(table_name, (idx, []))[1].append(key)
+            count += 1
+        else:
+            rest.append((idx, key))
+    return page, rest
+
+
+class MultiBatchWrite(_PendingWrites):
+    """
+    A context manager for batch writes of items of several models.
+
+    Items are packed into shared BatchWriteItem requests of up to 25 items, whatever their table, and the
+    items left unprocessed are sent again up to `max_retry_attempts` times. The requests that are still
+    unprocessed are left in `failed_operations`, by table.
+
+    :param connection: The connection the requests are sent with. Defaults to the connection of the first model.
+    :param auto_commit: If False, adding more items than a request can hold raises a ValueError instead
+      of sending the pending items
+    """
+
+    def __init__(
+        self,
+        connection: Optional[Connection] = None,
+        auto_commit: bool = True,
+        max_retry_attempts: Optional[int] = None,
+    ) -> None:
+        super().__init__(auto_commit=auto_commit)
+        self._connection = connection
+        self.max_retry_attempts = (
+            max_retry_attempts if max_retry_attempts is not None else get_settings_value('max_retry_attempts')
+        )
+        self.failed_operations: Dict[str, List[Dict[str, Any]]] = {}
+
+    async def __aenter__(self) -> 'MultiBatchWrite':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.commit()
+
+    async def save(self, put_item: Model) -> None:
+        """
+        Adds an item to be put.
+
+        :raises aiopynamodb.exceptions.SizeLimitExceededError: If the item exceeds the DynamoDB item size limit
+        """
+        data = put_item.serialize()
+        size = type(put_item)._check_item_size(data)
+        await self._add_operation({"action": PUT, "item": put_item, "data": data, "size": size})
+
+    async def delete(self, del_item: Model) -> None:
+        """
+        Adds an item to be deleted.
+        """
+        data = del_item._get_keys()
+        size = type(del_item)._get_key_size(data)
+        await self._add_operation({"action": DELETE, "item": del_item, "data": data, "size": size})
+
+    async def commit(self) -> None:
+        """
+        Writes all of the pending items
+        """
+        operations = self._take_pending_operations()
+        if not operations:
+            return
+        request_items: Dict[str, List[Dict[str, Any]]] = {}
+        for operation in operations:
+            model = type(operation['item'])
+            table_connection = model._get_connection()
+            if operation['action'] == PUT:
+                write_requests = table_connection.get_batch_write_request(put_items=[operation['data']])
+            else:
+                write_requests = table_connection.get_batch_write_request(delete_items=[operation['data']])
+            request_items.setdefault(model.Meta.table_name, []).extend(write_requests)
+
+        connection = self._connection or type(operations[0]['item'])._get_connection().connection
+        log.debug("Committing a batch operation on %d tables", len(request_items))
+        try:
+            data = await connection.batch_write_items(request_items)
+            retries = 0
+            unprocessed_items = (data or {}).get(UNPROCESSED_ITEMS)
+            while unprocessed_items:
+                retries += 1
+                if retries >= self.max_retry_attempts:
+                    for table_name, write_requests in unprocessed_items.items():
+                        self.failed_operations.setdefault(table_name, []).extend(write_requests)
+                    raise PutError("Failed to batch write items: max_retry_attempts exceeded")
+                log.info(
+                    "Resending %d unprocessed items for batch operation (retry %d)",
+                    sum(len(write_requests) for write_requests in unprocessed_items.values()), retries,
+                )
+                data = await connection.batch_write_items(unprocessed_items)
+                unprocessed_items = (data or {}).get(UNPROCESSED_ITEMS)
+        finally:
+            for operation in operations:
+                type(operation['item'])._invalidate_cached([operation['data']], exists=operation['action'] == PUT)
@@ -0,0 +1,418 @@
+"""
+Read-through item caches.
+
+A model whose `Meta.cache` is set to an :class:`ItemCache` serves :meth:`~aiopynamodb.models.Model.get` and
+:meth:`~aiopynamodb.models.Model.batch_get` from the cache, and only reads the items that are not cached (or
+expired) from DynamoDB. Reads with `consistent_read=True` or `attributes_to_get` always go to DynamoDB.
+Items are cached in their DynamoDB form, so every read returns a new instance.
+
+Writes made through the model (`save`, `update`, `delete`, batch writes and transactions) update or invalidate
+the cached items; writes made by other processes are only seen once the cached items expire.
+
+A model whose `Meta.negative_cache` is set to a :class:`NegativeLookupCache` answers reads of keys that were
+recently found missing, or that its :class:`BloomFilter` of existing keys does not contain, without a request.
+"""
+import asyncio
+import functools
+import hashlib
+import logging
+import math
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple, Type, TYPE_CHECKING
+
+from aiopynamodb.constants import ITEM_COUNT
+from aiopynamodb.constants import RESULT_RAW
+
+if TYPE_CHECKING:
+    from aiopynamodb.models import Model
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters of an :class:`ItemCache`.
+
+    `stale_hits` are the hits served from expired items while they were revalidated, and are included in `hits`.
+    """
+    hits: int = 0
+    misses: int = 0
+    stale_hits: int = 0
+    evictions: int = 0
+    revalidations: int = 0
+    revalidation_errors: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ItemCache:
+    """
+    Base class of the item caches.
+
+    Subclasses implement the storage (`_get`, `_set`, `_delete` and `clear`); this class implements the
+    expiration, the revalidation of stale items and the statistics.
+
+    :param ttl: The number of seconds items are served for after they were cached. None means no expiration.
+    :param stale_ttl: The number of seconds expired items are still served for, while they are read
+      again from DynamoDB in the background (stale-while-revalidate).
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        stale_ttl: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self.stats = CacheStats()
+        self._revalidations: Dict[Hashable, asyncio.Future] = {}
+
+    def _get(self, key: Hashable) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """
+        Returns the time an item was cached at and the item, or None if the item is not cached.
+        """
+        raise NotImplementedError
+
+    def _set(self, key: Hashable, cached_at: float, item: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def _delete(self, key: Hashable) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """
+        Removes all the items from the cache.
+        """
+        raise NotImplementedError
+
+    def lookup(self, key: Hashable) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Returns the cached item for a key (or None) and whether the item is stale and should be revalidated.
+        """
+        entry = self._get(key)
+        if entry is not None:
+            cached_at, item = entry
+            age = self.clock() - cached_at
+            if self.ttl is None or age < self.ttl:
+                self.stats.hits += 1
+                return item, False
+            if age < self.ttl + self.stale_ttl:
+                self.stats.hits += 1
+                self.stats.stale_hits += 1
+                return item, True
+            self._delete(key)
+        self.stats.misses += 1
+        return None, False
+
+    def set(self, key: Hashable, item: Dict[str, Any]) -> None:
+        """
+        Caches an item in its DynamoDB form.
+        """
+        self._cancel_revalidation(key)
+        self._set(key, self.clock(), item)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Removes an item from the cache.
+        """
+        self._cancel_revalidation(key)
+        self._delete(key)
+
+    def revalidate(self, key: Hashable, load: Callable[[], Awaitable[Optional[Dict[str, Any]]]]) -> None:
+        """
+        Reads a stale item again in the background, unless it is already being read.
+
+        :param load: Returns the item read from DynamoDB, or None if it does not exist anymore
+        """
+        if key in self._revalidations:
+            return
+        self.stats.revalidations += 1
+        future = asyncio.ensure_future(self._revalidate(key, load))
+        self._revalidations[key] = future
+        future.add_done_callback(functools.partial(self._revalidation_done, key))
+
+    async def _revalidate(self, key: Hashable, load: Callable[[], Awaitable[Optional[Dict[str, Any]]]]) -> None:
+        try:
+            item = await load()
+        except Exception:
+            # The stale item keeps being served until it expires, and the next read retries.
+            self.stats.revalidation_errors += 1
+            log.debug("Failed to revalidate cached item %s", key, exc_info=True)
+            return
+        if item is None:
+            self._delete(key)
+        else:
+            self._set(key, self.clock(), item)
+
+    def _revalidation_done(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._revalidations.get(key) is future:
+            del self._revalidations[key]
+
+    def _cancel_revalidation(self, key: Hashable) -> None:
+        # A revalidation that started before a write could otherwise cache the item as it was before the write.
+        future = self._revalidations.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+
+class LRUItemCache(ItemCache):
+    """
+    An in-process item cache holding up to `max_size` items, evicting the least recently used items first.
+    """
+
+    def __init__(self, max_size: int = 1024, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        if max_size < 1:
+            raise ValueError("max_size must be greater than zero")
+        self.max_size = max_size
+        self._items: 'OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _get(self, key: Hashable) -> Optional[Tuple[float, Dict[str, Any]]]:
+        entry = self._items.get(key)
+        if entry is not None:
+            self._items.move_to_end(key)
+        return entry
+
+    def _set(self, key: Hashable, cached_at: float, item: Dict[str, Any]) -> None:
+        self._items[key] = (cached_at, item)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _delete(self, key: Hashable) -> None:
+        self._items.pop(key, None)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+@dataclass
+class NegativeCacheStats:
+    """
+    Counters of a :class:`NegativeLookupCache`.
+
+    `hits` are the lookups answered locally as missing, of which `filter_hits` by the Bloom filter;
+    `misses` are the lookups that had to be read from DynamoDB.
+    """
+    hits: int = 0
+    filter_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class BloomFilter:
+    """
+    A set of keys that can tell for sure that a key was never added, using a fixed amount of memory.
+
+    A key that was added is always reported as contained; a key that was not is reported as contained
+    with a probability of about `false_positive_rate` while no more than `capacity` keys were added.
+
+    :param capacity: The number of keys the filter is sized for
+    :param false_positive_rate: The expected rate of false positives once `capacity` keys were added
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be greater than zero")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of keys added, including the keys added more than once.
+        """
+        return self.count
+
+    def __contains__(self, key: Hashable) -> bool:
+        return all(self._bits[bit >> 3] & (1 << (bit & 7)) for bit in self._bit_positions(key))
+
+    def add(self, key: Hashable) -> None:
+        for bit in self._bit_positions(key):
+            self._bits[bit >> 3] |= 1 << (bit & 7)
+        self.count += 1
+
+    def update(self, keys: Iterable[Hashable]) -> None:
+        for key in keys:
+            self.add(key)
+
+    @property
+    def size_in_bytes(self) -> int:
+        """
+        The memory used by the bits of the filter.
+        """
+        return len(self._bits)
+
+    @property
+    def current_false_positive_rate(self) -> float:
+        """
+        The expected rate of false positives for the number of keys added so far.
+        """
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def _bit_positions(self, key: Hashable) -> Iterable[int]:
+        # Double hashing: the k positions are derived from the two halves of a single digest.
+        digest = hashlib.blake2b(_encode_key(key), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.num_bits for i in range(self.num_hashes))
+
+
+def _encode_key(key: Hashable) -> bytes:
+    # Equal numbers have to hash the same whatever form they were read in, e.g. '1' and '1.0'.
+    parts = key if isinstance(key, tuple) else (key,)
+    encoded = []
+    for part in parts:
+        if isinstance(part, Decimal):
+            encoded.append(b'N' + str(part.normalize()).encode())
+        elif isinstance(part, bytes):
+            encoded.append(b'B' + part)
+        else:
+            encoded.append(b'S' + str(part).encode())
+    return b'\x00'.join(encoded)
+
+
+class NegativeLookupCache:
+    """
+    Remembers the keys that were recently read and found missing, and optionally keeps a :class:`BloomFilter`
+    of the keys that exist, so that reads of missing keys raise `DoesNotExist` without a request.
+
+    The Bloom filter is loaded with :meth:`load_key_filter` and the model adds the keys it writes to it. It
+    can't know about the items created by other processes, which would be reported as missing: only use
+    a key filter for tables written by this process, or reload it periodically.
+    Reads with `consistent_read=True` always go to DynamoDB.
+
+    :param ttl: The number of seconds a missing key is remembered for
+    :param max_size: The maximum number of missing keys remembered, the oldest being forgotten first
+    :param key_filter: A Bloom filter of all the keys that exist in the table
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        max_size: int = 10000,
+        key_filter: Optional[BloomFilter] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be greater than zero")
+        self.ttl = ttl
+        self.max_size = max_size
+        self.key_filter = key_filter
+        self.clock = clock
+        self.stats = NegativeCacheStats()
+        self._misses: 'OrderedDict[Hashable, float]' = OrderedDict()
+        # The filter being loaded, which has to receive the keys written meanwhile
+        self._loading_filter: Optional[BloomFilter] = None
+
+    def __len__(self) -> int:
+        """
+        Returns the number of missing keys remembered.
+        """
+        return len(self._misses)
+
+    def is_missing(self, key: Hashable) -> bool:
+        """
+        Returns whether a key is known not to exist.
+        """
+        missed_at = self._misses.get(key)
+        if missed_at is not None:
+            if self.clock() - missed_at < self.ttl:
+                self.stats.hits += 1
+                return True
+            del self._misses[key]
+        if self.key_filter is not None and key not in self.key_filter:
+            self.stats.hits += 1
+            self.stats.filter_hits += 1
+            return True
+        self.stats.misses += 1
+        return False
+
+    def add_missing(self, key: Hashable) -> None:
+        """
+        Remembers that a key was read and found missing.
+        """
+        self._misses[key] = self.clock()
+        self._misses.move_to_end(key)
+        while len(self._misses) > self.max_size:
+            self._misses.popitem(last=False)
+            self.stats.evictions += 1
+
+    def add_existing(self, key: Hashable) -> None:
+        """
+        Records that an item with the key was read or written.
+        """
+        self._misses.pop(key, None)
+        for key_filter in (self.key_filter, self._loading_filter):
+            if key_filter is not None:
+                key_filter.add(key)
+
+    def clear(self) -> None:
+        """
+        Forgets the missing keys; the key filter is kept.
+        """
+        self._misses.clear()
+
+    @property
+    def memory_usage(self) -> int:
+        """
+        An estimate of the memory used, in bytes, by the missing keys and the key filter.
+        """
+        size = sys.getsizeof(self._misses) + sum(sys.getsizeof(key) for key in self._misses)
+        if self.key_filter is not None:
+            size += self.key_filter.size_in_bytes
+        return size
+
+    async def load_key_filter(
+        self,
+        model_cls: Type['Model'],
+        capacity: Optional[int] = None,
+        false_positive_rate: float = 0.01,
+        **scan_kwargs: Any,
+    ) -> BloomFilter:
+        """
+        Builds the key filter from a scan of the keys of the table, and uses it once complete.
+
+        :param capacity: The number of keys to size the filter for. Defaults to twice the item count of the table,
+          leaving room for the items created later.
+        :param scan_kwargs: Additional arguments to :meth:`~aiopynamodb.models.Model.scan`, e.g. `rate_limit`
+        """
+        if capacity is None:
+            capacity = max(1000, 2 * (await model_cls.describe_table()).get(ITEM_COUNT, 0))
+        key_filter = BloomFilter(capacity, false_positive_rate)
+        key_names = [
+            attr.attr_name for attr in (model_cls._hash_key_attribute(), model_cls._range_key_attribute()) if attr is not None
+        ]
+        self._loading_filter = key_filter
+        try:
+            async for item in model_cls.scan(attributes_to_get=key_names, result_mode=RESULT_RAW, **scan_kwargs):
+                key_filter.add(model_cls._get_key_identity(item))  # type: ignore[arg-type]
+        finally:
+            self._loading_filter = None
+        self.key_filter = key_filter
+        log.debug("Loaded a filter of %d keys (%d bytes) for %s", len(key_filter), key_filter.size_in_bytes, model_cls.__name__)
+        return key_filter
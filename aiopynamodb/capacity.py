@@ -0,0 +1,232 @@
+"""
+Item size and capacity unit estimates.
+
+The estimates follow the DynamoDB pricing rules: a write consumes one write unit per KB of the item
+(rounded up), a strongly consistent read one read unit per 4 KB and an eventually consistent read
+half as much. Every secondary index that the item is written to costs additional write units for the
+index entry, which is made of the index key, the table key and the projected attributes, plus
+100 bytes of overhead. Items that lack an index key attribute are not written to that index.
+"""
+import math
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any, Dict, Iterable, List, Sequence, Type, TYPE_CHECKING
+
+from aiopynamodb._util import attr_value_size
+from aiopynamodb._util import item_size
+from aiopynamodb.constants import ALL
+from aiopynamodb.constants import INCLUDE
+from aiopynamodb.indexes import GlobalSecondaryIndex
+from aiopynamodb.indexes import Index
+if TYPE_CHECKING:
+    from aiopynamodb.models import Model
+
+WRITE_UNIT_SIZE = 1024
+READ_UNIT_SIZE = 4 * 1024
+INDEX_ENTRY_OVERHEAD = 100
+
+
+@dataclass
+class IndexCapacity:
+    """
+    The cost of writing an item to a secondary index.
+
+    `size` and `write_units` are 0 when the item lacks an index key attribute and is not written to the index.
+    """
+    index_name: str
+    is_global: bool
+    size: int
+    write_units: int
+
+
+@dataclass
+class CapacityEstimate:
+    """
+    The size of an item and the capacity units consumed by reading and writing it.
+
+    `write_units` is the cost of a put or a delete of the item in the table, excluding the indexes.
+    """
+    size: int
+    write_units: int
+    strong_read_units: int
+    eventual_read_units: float
+    indexes: List[IndexCapacity] = field(default_factory=list)
+
+    @property
+    def index_write_units(self) -> int:
+        return sum(index.write_units for index in self.indexes)
+
+    @property
+    def total_write_units(self) -> int:
+        """
+        The cost of a put or a delete of the item, including the writes to the secondary indexes.
+        """
+        return self.write_units + self.index_write_units
+
+
+@dataclass
+class IndexCapacityReport:
+    """
+    The cost of the writes to a secondary index for a sample of items.
+    """
+    index_name: str
+    is_global: bool
+    item_count: int
+    mean_size: float
+    mean_write_units: float
+
+
+@dataclass
+class CapacityReport:
+    """
+    Item sizes and capacity units for a sample of items.
+
+    Means are over all the items of the sample, except for `IndexCapacityReport.mean_size` which is over the items
+    written to the index. `attribute_sizes` has the mean size of each attribute (name included), largest first.
+    """
+    item_count: int
+    min_size: int
+    mean_size: float
+    max_size: int
+    mean_write_units: float
+    mean_total_write_units: float
+    max_total_write_units: int
+    mean_strong_read_units: float
+    mean_eventual_read_units: float
+    indexes: List[IndexCapacityReport]
+    attribute_sizes: Dict[str, float]
+
+    def __str__(self) -> str:
+        lines = [
+            "{} items, size min/mean/max: {}/{:.0f}/{} bytes".format(
+                self.item_count, self.min_size, self.mean_size, self.max_size),
+            "Write units per put or delete: {:.2f} (table), {:.2f} (with indexes, max {})".format(
+                self.mean_write_units, self.mean_total_write_units, self.max_total_write_units),
+            "Read units per get: {:.2f} (strong), {:.2f} (eventual)".format(
+                self.mean_strong_read_units, self.mean_eventual_read_units),
+        ]
+        for index in self.indexes:
+            lines.append("{} {}: {} of {} items, {:.0f} bytes, {:.2f} write units".format(
+                'GSI' if index.is_global else 'LSI', index.index_name, index.item_count, self.item_count,
+                index.mean_size, index.mean_write_units))
+        lines.append("Largest attributes: {}".format(', '.join(
+            '{} ({:.0f} bytes)'.format(name, size) for name, size in list(self.attribute_sizes.items())[:5])))
+        return '\n'.join(lines)
+
+
+def write_units(size: int) -> int:
+    """
+    Returns the write capacity units consumed by writing an item of the given size.
+    """
+    return max(1, math.ceil(size / WRITE_UNIT_SIZE))
+
+
+def read_units(size: int) -> int:
+    """
+    Returns the read capacity units consumed by a strongly consistent read of an item of the given size.
+    """
+    return max(1, math.ceil(size / READ_UNIT_SIZE))
+
+
+def estimate_capacity(model_cls: Type['Model'], attribute_values: Dict[str, Dict[str, Any]]) -> CapacityEstimate:
+    """
+    Returns the size and capacity units of a serialized item of the given model.
+    """
+    size = item_size(attribute_values)
+    strong_read_units = read_units(size)
+    table_key_names = [
+        attr.attr_name for attr in (model_cls._hash_key_attribute(), model_cls._range_key_attribute()) if attr is not None
+    ]
+    return CapacityEstimate(
+        size=size,
+        write_units=write_units(size),
+        strong_read_units=strong_read_units,
+        eventual_read_units=strong_read_units / 2,
+        indexes=[
+            _estimate_index_capacity(index, attribute_values, table_key_names)
+            for index in model_cls._indexes.values()
+        ],
+    )
+
+
+def capacity_report(estimates: Sequence[CapacityEstimate], attribute_sizes: Dict[str, int]) -> CapacityReport:
+    """
+    Returns the report of the capacity estimates of a sample of items.
+
+    :param attribute_sizes: The total size of each attribute over the sample
+    """
+    count = len(estimates)
+    if not count:
+        raise ValueError("The sample is empty")
+    indexes: Dict[str, List[IndexCapacity]] = {}
+    for estimate in estimates:
+        for index_capacity in estimate.indexes:
+            indexes.setdefault(index_capacity.index_name, []).append(index_capacity)
+    index_reports = []
+    for index_name, capacities in indexes.items():
+        written = [capacity for capacity in capacities if capacity.write_units]
+        index_reports.append(IndexCapacityReport(
+            index_name=index_name,
+            is_global=capacities[0].is_global,
+            item_count=len(written),
+            mean_size=sum(capacity.size for capacity in written) / len(written) if written else 0,
+            mean_write_units=sum(capacity.write_units for capacity in written) / count,
+        ))
+    return CapacityReport(
+        item_count=count,
+        min_size=min(estimate.size for estimate in estimates),
+        mean_size=sum(estimate.size for estimate in estimates) / count,
+        max_size=max(estimate.size for estimate in estimates),
+        mean_write_units=sum(estimate.write_units for estimate in estimates) / count,
+        mean_total_write_units=sum(estimate.total_write_units for estimate in estimates) / count,
+        max_total_write_units=max(estimate.total_write_units for estimate in estimates),
+        mean_strong_read_units=sum(estimate.strong_read_units for estimate in estimates) / count,
+        mean_eventual_read_units=sum(estimate.eventual_read_units for estimate in estimates) / count,
+        indexes=index_reports,
+        attribute_sizes={
+            name: size / count for name, size in sorted(attribute_sizes.items(), key=lambda item: item[1], reverse=True)
+        },
+    )
+
+
+def estimate_sample_capacity(model_cls: Type['Model'], items: Iterable[Any]) -> CapacityReport:
+    """
+    Returns the report of the capacity estimates of a sample of items, which can be model instances
+    or serialized items (as returned with :code:`result_mode='raw'`).
+    """
+    estimates = []
+    attribute_sizes: Dict[str, int] = {}
+    for item in items:
+        if isinstance(item, dict):
+            item_cls, attribute_values = model_cls, item
+        else:
+            item_cls, attribute_values = type(item), item.serialize(null_check=False)
+        estimates.append(estimate_capacity(item_cls, attribute_values))
+        for name, value in attribute_values.items():
+            attribute_sizes[name] = attribute_sizes.get(name, 0) + len(name.encode()) + attr_value_size(value)
+    return capacity_report(estimates, attribute_sizes)
+
+
+def _estimate_index_capacity(
+    index: Index,
+    attribute_values: Dict[str, Dict[str, Any]],
+    table_key_names: List[str],
+) -> IndexCapacity:
+    index_name = index.Meta.index_name
+    is_global = isinstance(index, GlobalSecondaryIndex)
+    index_key_names = [
+        attr.attr_name for attr in index.Meta.attributes.values() if attr.is_hash_key or attr.is_range_key
+    ]
+    if any(name not in attribute_values for name in index_key_names):
+        return IndexCapacity(index_name=index_name, is_global=is_global, size=0, write_units=0)
+
+    projection = index.Meta.projection
+    if projection.projection_type == ALL:
+        projected = attribute_values
+    else:
+        projected_names = set(index_key_names + table_key_names)
+        if projection.projection_type == INCLUDE:
+            projected_names.update(projection.non_key_attributes)
+        projected = {name: value for name, value in attribute_values.items() if name in projected_names}
+    size = INDEX_ENTRY_OVERHEAD + item_size(projected)
+    return IndexCapacity(index_name=index_name, is_global=is_global, size=size, write_units=write_units(size))
@@ -0,0 +1,124 @@
+"""
+Storage of the items that exceed the DynamoDB item size limit, for models with `large_items = True` in their `Meta`.
+
+An item over the limit is stored as a manifest record under the key of the item, and chunk records under the same
+partition key. The manifest holds the key, version and TTL attributes of the item, and the `__chunks` attribute: the
+id and number of its chunks. The other attributes are encoded as DynamoDB JSON, compressed and split across the chunk
+records, which have the sort keys ``<sort key>#chunk#<chunk id>#<index>`` (and the TTL attribute of the item).
+
+Chunks are written before the manifest that refers to them, and the chunks of the previous version of the item are
+deleted once its manifest has been replaced, so a manifest is never written without its chunks. The chunks written
+by a save that fails (while writing its chunks or its manifest) are deleted, unless a consistent read shows that the
+failed write of the manifest was applied.
+"""
+import json
+import uuid
+from base64 import b64encode
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from aiopynamodb._util import bin_decode_attr
+from aiopynamodb.compression import compress
+from aiopynamodb.compression import decompress
+from aiopynamodb.compression import get_codec
+from aiopynamodb.constants import BINARY
+from aiopynamodb.constants import COMPRESSION_THRESHOLD
+from aiopynamodb.constants import LARGE_ITEM_CHUNK
+from aiopynamodb.constants import LARGE_ITEM_CHUNK_SIZE
+from aiopynamodb.constants import LARGE_ITEM_KEY_SEPARATOR
+from aiopynamodb.constants import LARGE_ITEM_MANIFEST
+from aiopynamodb.constants import MAP
+from aiopynamodb.constants import NUMBER
+from aiopynamodb.constants import STRING
+
+_MANIFEST_ID = 'id'
+_MANIFEST_COUNT = 'count'
+
+
+def chunk_prefix(range_key: str, chunk_id: Optional[str] = None) -> str:
+    """
+    Returns the prefix of the sort keys of the chunks of an item, or of the chunks with the given id
+    """
+    if chunk_id is None:
+        return range_key + LARGE_ITEM_KEY_SEPARATOR
+    return '{}{}{}#'.format(range_key, LARGE_ITEM_KEY_SEPARATOR, chunk_id)
+
+
+def chunk_range_keys(range_key: str, chunk_id: str, count: int) -> List[str]:
+    """
+    Returns the sort keys of the chunks of an item, in order
+    """
+    prefix = chunk_prefix(range_key, chunk_id)
+    return ['{}{:05d}'.format(prefix, index) for index in range(count)]
+
+
+def get_manifest(item: Optional[Dict[str, Any]]) -> Optional[Tuple[str, int]]:
+    """
+    Returns the chunk id and the number of chunks of a stored item, or None if it is not stored in chunks
+    """
+    manifest = item.get(LARGE_ITEM_MANIFEST) if item else None
+    if manifest is None:
+        return None
+    return manifest[MAP][_MANIFEST_ID][STRING], int(manifest[MAP][_MANIFEST_COUNT][NUMBER])
+
+
+def split_item(
+    item: Dict[str, Dict[str, Any]],
+    hash_key_name: str,
+    range_key_name: str,
+    manifest_names: Iterable[str] = (),
+    ttl_name: Optional[str] = None,
+    chunk_size: int = LARGE_ITEM_CHUNK_SIZE,
+) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Dict[str, Any]]]]:
+    """
+    Splits a serialized item into the attributes of its manifest record and its chunk records
+
+    :param manifest_names: The attributes that are stored in the manifest, besides the key
+    """
+    key_names = (hash_key_name, range_key_name)
+    payload = compress(
+        json.dumps(
+            {name: value for name, value in item.items() if name not in key_names},
+            separators=(',', ':'),
+            default=_encode_binary,
+        ).encode('utf-8'),
+        get_codec('zlib'),
+        COMPRESSION_THRESHOLD,
+    )
+    chunk_id = uuid.uuid4().hex
+    range_keys = chunk_range_keys(item[range_key_name][STRING], chunk_id, -(-len(payload) // chunk_size))
+    chunks = []
+    for index, range_key in enumerate(range_keys):
+        chunk = {
+            hash_key_name: item[hash_key_name],
+            range_key_name: {STRING: range_key},
+            LARGE_ITEM_CHUNK: {BINARY: payload[index * chunk_size:(index + 1) * chunk_size]},
+        }
+        if ttl_name is not None and ttl_name in item:
+            chunk[ttl_name] = item[ttl_name]
+        chunks.append(chunk)
+
+    manifest = {name: item[name] for name in manifest_names if name in item and name not in key_names}
+    manifest[LARGE_ITEM_MANIFEST] = {MAP: {
+        _MANIFEST_ID: {STRING: chunk_id},
+        _MANIFEST_COUNT: {NUMBER: str(len(chunks))},
+    }}
+    return manifest, chunks
+
+
+def join_item(manifest: Dict[str, Dict[str, Any]], chunks: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Returns the item stored in a manifest record and its chunk records (in order).
+    The item keeps the `__chunks` attribute of the manifest.
+    """
+    item = json.loads(decompress(b''.join(chunk[LARGE_ITEM_CHUNK][BINARY] for chunk in chunks)))
+    for value in item.values():
+        bin_decode_attr(value)
+    item.update(manifest)
+    return item
+
+
+def _encode_binary(value: Any) -> str:
+    # Binary values only appear as the values of B and BS attributes, which `bin_decode_attr` decodes
+    if isinstance(value, (bytes, bytearray)):
+        return b64encode(value).decode()
+    raise TypeError("Object of type {} is not JSON serializable".format(type(value).__name__))
@@ -0,0 +1,331 @@
+"""
+Columnar materialization of query and scan results.
+
+Instead of instantiating a model per item, :meth:`~aiopynamodb.pagination.ResultIterator.columnar`
+and :meth:`~aiopynamodb.pagination.ResultIterator.to_columns` decode pages of results straight into
+one buffer per attribute. Numbers, booleans and dates are stored in typed buffers that numpy
+(and through it Arrow or pandas) can wrap without copying; all other attributes are stored as
+lists of decoded Python values, with nested maps decoded into dictionaries.
+
+Number attributes are stored as int64 when all their values are integers that fit, and as float64
+otherwise, unless some of the integers are wider than 53 bits: those columns hold the ints and floats
+the attribute decodes, so that no integer is rounded.
+
+numpy is optional. When it is installed, the values and null masks of each column are numpy arrays;
+otherwise typed columns are :class:`array.array` buffers and the null masks are :class:`bytearray`\\s.
+"""
+from array import array
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Type
+from typing import cast
+
+from aiopynamodb._util import decode_number
+from aiopynamodb.attributes import Attribute
+from aiopynamodb.attributes import AttributeContainer
+from aiopynamodb.attributes import BooleanAttribute
+from aiopynamodb.attributes import NumberAttribute
+from aiopynamodb.attributes import TTLAttribute
+from aiopynamodb.attributes import UTCDateTimeAttribute
+from aiopynamodb.attributes import VersionAttribute
+from aiopynamodb.attributes import _decode_to_python
+from aiopynamodb.constants import BOOLEAN
+from aiopynamodb.constants import NULL
+from aiopynamodb.constants import NUMBER
+from aiopynamodb.constants import STRING
+
+# numpy is optional, so it is imported dynamically to give it the same type whether it is installed or not.
+numpy: Any
+try:
+    numpy = import_module('numpy')
+except ImportError:
+    numpy = None
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+_MAX_EXACT_FLOAT_INTEGER = 2 ** 53
+
+
+class Column:
+    """
+    The values of a single attribute for the rows of a :class:`ColumnBatch`.
+
+    :attr values: The decoded values. Null entries hold a placeholder (zero or None) and are flagged in `mask`.
+    :attr mask: One entry per row, true where the attribute is null or missing.
+    :attr dtype: The numpy dtype of `values`: 'float64', 'int64', 'bool', 'datetime64[us]', 'datetime64[s]' or 'object'.
+    """
+
+    def __init__(self, name: str, values: Any, mask: Any, dtype: str) -> None:
+        self.name = name
+        self.values = values
+        self.mask = mask
+        self.dtype = dtype
+
+    def __len__(self) -> int:
+        return len(self.mask)
+
+    def to_pylist(self) -> List[Any]:
+        """
+        Returns the column as a list of Python values, with None for nulls.
+        """
+        if self.dtype == 'object':
+            return list(self.values)
+        if self.dtype.startswith('datetime64'):
+            unit = _ONE_MICROSECOND if self.dtype == 'datetime64[us]' else timedelta(seconds=1)
+            values = self.values.view('int64') if numpy is not None else self.values
+            return [None if null else _EPOCH + int(value) * unit for value, null in zip(values, self.mask)]
+        convert = bool if self.dtype == 'bool' else (float if self.dtype == 'float64' else int)
+        return [None if null else convert(value) for value, null in zip(self.values, self.mask)]
+
+    def __repr__(self) -> str:
+        return '{}({!r}, dtype={!r}, length={})'.format(type(self).__name__, self.name, self.dtype, len(self))
+
+
+class ColumnBatch:
+    """
+    A batch of query or scan results stored column by column.
+    """
+
+    def __init__(self, columns: Dict[str, Column], num_rows: int) -> None:
+        self.columns = columns
+        self.num_rows = num_rows
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def to_pydict(self) -> Dict[str, List[Any]]:
+        """
+        Returns the batch as a dictionary of python attribute name to a list of values, with None for nulls.
+        """
+        return {name: column.to_pylist() for name, column in self.columns.items()}
+
+    def to_arrow(self) -> Any:
+        """
+        Returns the batch as a :code:`pyarrow.RecordBatch`. Requires pyarrow.
+
+        Typed columns are passed to pyarrow as numpy arrays with their null masks, which pyarrow can
+        do without converting the values one by one.
+        """
+        import pyarrow
+
+        arrays = []
+        for column in self.columns.values():
+            if numpy is not None and column.dtype != 'object':
+                arrays.append(pyarrow.array(column.values, mask=column.mask))
+            else:
+                arrays.append(pyarrow.array(column.to_pylist()))
+        return pyarrow.RecordBatch.from_arrays(arrays, names=self.column_names)
+
+    def to_pandas(self) -> Any:
+        """
+        Returns the batch as a :code:`pandas.DataFrame`. Requires pandas and pyarrow.
+        """
+        return self.to_arrow().to_pandas()
+
+    def __repr__(self) -> str:
+        return '{}(num_rows={}, columns={})'.format(type(self).__name__, self.num_rows, self.column_names)
+
+
+class _ColumnBuilder:
+    def __init__(self, name: str, attr: Attribute) -> None:
+        self.name = name
+        self.attr = attr
+        self.attr_name = attr.attr_name
+        self.mask = bytearray()
+
+    def extend(self, items: Sequence[Dict[str, Dict[str, Any]]]) -> None:
+        raise NotImplementedError
+
+    def build(self) -> Column:
+        raise NotImplementedError
+
+
+class _TypedColumnBuilder(_ColumnBuilder):
+    def __init__(
+        self,
+        name: str,
+        attr: Attribute,
+        typecode: str,
+        dtype: str,
+        attr_type: str,
+        convert: Callable[[Any], Any],
+    ) -> None:
+        super().__init__(name, attr)
+        self.values = array(typecode)
+        self.dtype = dtype
+        self.attr_type = attr_type
+        self.convert = convert
+
+    def extend(self, items: Sequence[Dict[str, Dict[str, Any]]]) -> None:
+        attr_name, attr_type, convert = self.attr_name, self.attr_type, self.convert
+        values, mask = self.values, self.mask
+        for item in items:
+            attribute_value = item.get(attr_name)
+            if not attribute_value or NULL in attribute_value:
+                values.append(0)
+                mask.append(1)
+                continue
+            value = attribute_value.get(attr_type)
+            if value is None:
+                value = self.attr.get_value(attribute_value)
+            values.append(convert(value))
+            mask.append(0)
+
+    def build(self) -> Column:
+        return _typed_column(self.name, self.values, self.mask, self.dtype)
+
+
+class _NumberColumnBuilder(_ColumnBuilder):
+    """
+    Builds an int64 column when all the numbers are integers that fit, and a float64 column otherwise, unless
+    some integers are too wide to be stored exactly as floats: the column then holds the numbers as the attribute
+    decodes them.
+    """
+
+    def __init__(self, name: str, attr: Attribute) -> None:
+        super().__init__(name, attr)
+        # The serialized numbers, converted once all of them are known
+        self.values: List[str] = []
+
+    def extend(self, items: Sequence[Dict[str, Dict[str, Any]]]) -> None:
+        attr_name, values, mask = self.attr_name, self.values, self.mask
+        for item in items:
+            attribute_value = item.get(attr_name)
+            if not attribute_value or NULL in attribute_value:
+                values.append('0')
+                mask.append(1)
+                continue
+            value = attribute_value.get(NUMBER)
+            if value is None:
+                value = self.attr.get_value(attribute_value)
+            values.append(value)
+            mask.append(0)
+
+    def build(self) -> Column:
+        try:
+            return _typed_column(self.name, array('q', map(int, self.values)), self.mask, 'int64')
+        except (ValueError, OverflowError):
+            # Fractions and exponents, or integers wider than 64 bits
+            pass
+        if not any(map(_is_inexact_float, self.values)):
+            return _typed_column(self.name, array('d', map(float, self.values)), self.mask, 'float64')
+        values = [None if null else decode_number(value) for value, null in zip(self.values, self.mask)]
+        return _object_column(self.name, values, self.mask)
+
+
+class _ObjectColumnBuilder(_ColumnBuilder):
+    def __init__(self, name: str, attr: Attribute) -> None:
+        super().__init__(name, attr)
+        self.values: List[Any] = []
+
+    def extend(self, items: Sequence[Dict[str, Dict[str, Any]]]) -> None:
+        attr, attr_name = self.attr, self.attr_name
+        values, mask = self.values, self.mask
+        for item in items:
+            attribute_value = item.get(attr_name)
+            if not attribute_value or NULL in attribute_value:
+                values.append(None)
+                mask.append(1)
+            else:
+                values.append(_decode_to_python(attr, attribute_value))
+                mask.append(0)
+
+    def build(self) -> Column:
+        return _object_column(self.name, self.values, self.mask)
+
+
+def _typed_column(name: str, values: array, mask: bytearray, dtype: str) -> Column:
+    if numpy is None:
+        return Column(name, values, mask, dtype)
+    return Column(name, numpy.frombuffer(values, dtype=dtype), numpy.frombuffer(mask, dtype=bool), dtype)
+
+
+def _object_column(name: str, values: List[Any], mask: bytearray) -> Column:
+    if numpy is None:
+        return Column(name, values, mask, 'object')
+    array_values = numpy.empty(len(values), dtype=object)
+    array_values[:] = values
+    return Column(name, array_values, numpy.frombuffer(mask, dtype=bool), 'object')
+
+
+def _is_inexact_float(value: str) -> bool:
+    # Integers wider than 53 bits can't be stored exactly as floats (fractions are decoded to floats anyway)
+    if len(value) <= 15:
+        return False
+    number = decode_number(value)
+    return isinstance(number, int) and abs(number) > _MAX_EXACT_FLOAT_INTEGER
+
+
+def _datetime_to_microseconds(attr: UTCDateTimeAttribute) -> Callable[[str], int]:
+    def convert(value: str) -> int:
+        return (attr.deserialize(value) - _EPOCH) // _ONE_MICROSECOND
+    return convert
+
+
+def _make_column_builder(name: str, attr: Attribute) -> _ColumnBuilder:
+    # Only the library's own attribute types are known to decode to numbers, booleans or dates.
+    attr_cls = type(attr)
+    if attr_cls is NumberAttribute:
+        return _NumberColumnBuilder(name, attr)
+    if attr_cls is VersionAttribute:
+        return _TypedColumnBuilder(name, attr, 'q', 'int64', NUMBER, attr.deserialize)
+    if attr_cls is BooleanAttribute:
+        return _TypedColumnBuilder(name, attr, 'b', 'bool', BOOLEAN, bool)
+    if attr_cls is TTLAttribute:
+        return _TypedColumnBuilder(name, attr, 'q', 'datetime64[s]', NUMBER, int)
+    if attr_cls is UTCDateTimeAttribute:
+        convert = _datetime_to_microseconds(cast(UTCDateTimeAttribute, attr))
+        return _TypedColumnBuilder(name, attr, 'q', 'datetime64[us]', STRING, convert)
+    return _ObjectColumnBuilder(name, attr)
+
+
+class ColumnBatchBuilder:
+    """
+    Accumulates raw DynamoDB items into column buffers for the attributes of a container class.
+    """
+
+    def __init__(self, container_cls: Type[AttributeContainer], attributes: Optional[Iterable[str]] = None) -> None:
+        self.container_cls = container_cls
+        class_attributes = container_cls.get_attributes()
+        if attributes is None:
+            names = list(class_attributes)
+        else:
+            names = list(attributes)
+            for name in names:
+                if name not in class_attributes:
+                    raise ValueError("Attribute {} specified does not exist".format(name))
+        self.names = names
+        # The items of models with a sharded hash key hold the stored hash keys, with the shard
+        self._unshard_item: Optional[Callable[[Dict[str, Dict[str, Any]]], Dict[str, Dict[str, Any]]]] = None
+        if getattr(container_cls, '_hash_key_shards', None) is not None:
+            self._unshard_item = getattr(container_cls, '_unshard_item')
+        self.reset()
+
+    def reset(self) -> None:
+        attributes = self.container_cls.get_attributes()
+        self._builders = [_make_column_builder(name, attributes[name]) for name in self.names]
+        self.num_rows = 0
+
+    def extend(self, items: Sequence[Dict[str, Dict[str, Any]]]) -> None:
+        if self._unshard_item is not None:
+            items = [self._unshard_item(item) for item in items]
+        for builder in self._builders:
+            builder.extend(items)
+        self.num_rows += len(items)
+
+    def build(self) -> ColumnBatch:
+        """
+        Returns the accumulated rows as a batch and starts a new one.
+        """
+        batch = ColumnBatch({builder.name: builder.build() for builder in self._builders}, self.num_rows)
+        self.reset()
+        return batch
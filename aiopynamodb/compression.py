@@ -0,0 +1,214 @@
+"""
+Compression codecs for :class:`~aiopynamodb.attributes.CompressedBinaryAttribute` and
+:class:`~aiopynamodb.attributes.CompressedJSONAttribute`.
+
+Compressed values start with a 4 byte header: a 2 byte marker, the version of the format and the id of the codec
+that compressed the value. Values shorter than the threshold of their attribute, and values that do not shrink,
+are stored with the header of the `none` codec. Values without the header are returned as is, so attributes that
+held uncompressed values can be changed to compressed attributes without migrating the table.
+
+zlib and lzma are always available. The zstd and lz4 codecs need the optional `zstandard` and `lz4` packages
+(``pip install aiopynamodb[zstd]`` or ``pip install aiopynamodb[lz4]``). Other codecs can be added with
+:func:`register_codec`.
+"""
+import lzma
+import zlib
+from importlib import import_module
+from typing import Any, Dict, Type, TypeVar, Union
+
+COMPRESSION_MARKER = b'\xc5\x9a'
+COMPRESSION_FORMAT_VERSION = 1
+COMPRESSION_HEADER_SIZE = len(COMPRESSION_MARKER) + 2
+
+_C = TypeVar('_C', bound=Type['CompressionCodec'])
+
+_codecs_by_name: Dict[str, Type['CompressionCodec']] = {}
+_codecs_by_id: Dict[int, Type['CompressionCodec']] = {}
+_default_codecs: Dict[Type['CompressionCodec'], 'CompressionCodec'] = {}
+
+
+class CompressionCodec:
+    """
+    A compression algorithm, identified in the header of the values it compresses by `codec_id` (1 to 255).
+    """
+    name: str
+    codec_id: int
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def decompress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return '{}()'.format(type(self).__name__)
+
+
+def register_codec(codec_cls: _C) -> _C:
+    """
+    Registers a codec class, so that attributes can name it and values compressed with it can be read.
+    Can be used as a class decorator.
+    """
+    if not 0 < codec_cls.codec_id < 256:
+        raise ValueError("Codec ids are between 1 and 255: {}".format(codec_cls.codec_id))
+    registered = _codecs_by_id.get(codec_cls.codec_id)
+    if registered is not None and registered is not codec_cls:
+        raise ValueError("Codec id {} is already used by {}".format(codec_cls.codec_id, registered.__name__))
+    _codecs_by_name[codec_cls.name] = codec_cls
+    _codecs_by_id[codec_cls.codec_id] = codec_cls
+    return codec_cls
+
+
+def get_codec(codec: Union[str, CompressionCodec]) -> CompressionCodec:
+    """
+    Returns the codec with the given name (with its default settings), or the given codec
+    """
+    if isinstance(codec, CompressionCodec):
+        return codec
+    if codec not in _codecs_by_name:
+        raise ValueError("Unknown compression codec: {}".format(codec))
+    return _get_default_codec(_codecs_by_name[codec])
+
+
+def _get_default_codec(codec_cls: Type[CompressionCodec]) -> CompressionCodec:
+    codec = _default_codecs.get(codec_cls)
+    if codec is None:
+        codec = _default_codecs[codec_cls] = codec_cls()
+    return codec
+
+
+def compress(data: bytes, codec: CompressionCodec, threshold: int = 0) -> bytes:
+    """
+    Returns the data with the compression header, compressed unless it is shorter than `threshold` bytes
+    or does not shrink.
+    """
+    if len(data) >= threshold:
+        compressed = codec.compress(data)
+        if len(compressed) < len(data):
+            return COMPRESSION_MARKER + bytes((COMPRESSION_FORMAT_VERSION, codec.codec_id)) + compressed
+    return COMPRESSION_MARKER + bytes((COMPRESSION_FORMAT_VERSION, NoCompressionCodec.codec_id)) + data
+
+
+def decompress(data: bytes) -> bytes:
+    """
+    Returns the data of a value written by :func:`compress`, or the value as is if it has no compression header.
+    """
+    if len(data) < COMPRESSION_HEADER_SIZE or not data.startswith(COMPRESSION_MARKER):
+        return data
+    version, codec_id = data[2], data[3]
+    if version > COMPRESSION_FORMAT_VERSION:
+        raise ValueError("Unsupported compression format version: {}".format(version))
+    if codec_id not in _codecs_by_id:
+        raise ValueError("Unknown compression codec id: {}".format(codec_id))
+    return _get_default_codec(_codecs_by_id[codec_id]).decompress(data[COMPRESSION_HEADER_SIZE:])
+
+
+def is_compressed(data: bytes) -> bool:
+    """
+    Returns True if the data has a compression header
+    """
+    return len(data) >= COMPRESSION_HEADER_SIZE and data.startswith(COMPRESSION_MARKER)
+
+
+class NoCompressionCodec(CompressionCodec):
+    """
+    Stores values as is. Used for the values below the threshold of their attribute.
+    """
+    name = 'none'
+    codec_id = 0
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+
+# Id 0 is reserved for uncompressed values, so it is registered without register_codec
+_codecs_by_name[NoCompressionCodec.name] = _codecs_by_id[NoCompressionCodec.codec_id] = NoCompressionCodec
+
+
+@register_codec
+class ZlibCodec(CompressionCodec):
+    """
+    zlib (deflate) compression, from the standard library.
+    """
+    name = 'zlib'
+    codec_id = 1
+
+    def __init__(self, level: int = 6) -> None:
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+@register_codec
+class LzmaCodec(CompressionCodec):
+    """
+    LZMA (xz) compression, from the standard library. Compresses better than zlib, at a higher CPU cost.
+    """
+    name = 'lzma'
+    codec_id = 2
+
+    def __init__(self, preset: int = 6) -> None:
+        self.preset = preset
+
+    def compress(self, data: bytes) -> bytes:
+        return lzma.compress(data, format=lzma.FORMAT_XZ, preset=self.preset)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lzma.decompress(data, format=lzma.FORMAT_XZ)
+
+
+@register_codec
+class ZstdCodec(CompressionCodec):
+    """
+    Zstandard compression. Requires the `zstandard` package.
+    """
+    name = 'zstd'
+    codec_id = 3
+
+    def __init__(self, level: int = 3) -> None:
+        zstandard = _import_optional('zstandard', 'zstd')
+        self.level = level
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompressor.decompress(data)
+
+
+@register_codec
+class LZ4Codec(CompressionCodec):
+    """
+    LZ4 frame compression: very fast, with a lower compression ratio. Requires the `lz4` package.
+    """
+    name = 'lz4'
+    codec_id = 4
+
+    def __init__(self, compression_level: int = 0) -> None:
+        self._lz4_frame = _import_optional('lz4.frame', 'lz4')
+        self.compression_level = compression_level
+
+    def compress(self, data: bytes) -> bytes:
+        return self._lz4_frame.compress(data, compression_level=self.compression_level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._lz4_frame.decompress(data)
+
+
+def _import_optional(module_name: str, extra: str) -> Any:
+    try:
+        return import_module(module_name)
+    except ImportError as e:
+        raise ImportError(
+            "The {} codec requires the {} package: pip install aiopynamodb[{}]".format(
+                extra, module_name.split('.')[0], extra)
+        ) from e
@@ -1019,6 +1019,29 @@ class Connection(object):
         except BOTOCORE_EXCEPTIONS as e:
             raise TransactGetError("Failed to get transaction items", e)
 
+    def get_batch_write_request(
+            self,
+            table_name: str,
+            put_items: Optional[Any] = None,
+            delete_items: Optional[Any] = None,
+    ) -> List[Dict]:
+        """
+        Returns the write requests of a table in a BatchWriteItem operation
+        """
+        put_items_list = []
+        if put_items:
+            for item in put_items:
+                put_items_list.append({
+                    PUT_REQUEST: self.get_item_attribute_map(table_name, item, pythonic_key=False)
+                })
+        delete_items_list = []
+        if delete_items:
+            for item in delete_items:
+                delete_items_list.append({
+                    DELETE_REQUEST: self.get_item_attribute_map(table_name, item, item_key=KEY, pythonic_key=False)
+                })
+        return delete_items_list + put_items_list
+
     async def batch_write_item(
             self,
             table_name: str,
@@ -1032,69 +1055,96 @@ class Connection(object):
         """
         if put_items is None and delete_items is None:
             raise ValueError("Either put_items or delete_items must be specified")
+        return await self.batch_write_items(
+            {table_name: self.get_batch_write_request(table_name, put_items=put_items, delete_items=delete_items)},
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+
+    async def batch_write_items(
+            self,
+            request_items: Dict[str, List[Dict]],
+            return_consumed_capacity: Optional[str] = None,
+            return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the batch_write_item operation on several tables
+
+        :param request_items: The write requests of each table, see :meth:`get_batch_write_request`
+        """
         operation_kwargs: Dict[str, Any] = {
-            REQUEST_ITEMS: {
-                table_name: []
-            }
+            REQUEST_ITEMS: request_items
         }
         if return_consumed_capacity:
             operation_kwargs.update(self.get_consumed_capacity_map(return_consumed_capacity))
         if return_item_collection_metrics:
             operation_kwargs.update(self.get_item_collection_map(return_item_collection_metrics))
-        put_items_list = []
-        if put_items:
-            for item in put_items:
-                put_items_list.append({
-                    PUT_REQUEST: self.get_item_attribute_map(table_name, item, pythonic_key=False)
-                })
-        delete_items_list = []
-        if delete_items:
-            for item in delete_items:
-                delete_items_list.append({
-                    DELETE_REQUEST: self.get_item_attribute_map(table_name, item, item_key=KEY, pythonic_key=False)
-                })
-        operation_kwargs[REQUEST_ITEMS][table_name] = delete_items_list + put_items_list
         try:
             return await self.dispatch(BATCH_WRITE_ITEM, operation_kwargs)
         except BOTOCORE_EXCEPTIONS as e:
             raise PutError("Failed to batch write items: {}".format(e), e)
 
-    async def batch_get_item(
+    def get_batch_get_request(
             self,
             table_name: str,
-            keys: Sequence[str],
+            keys: Sequence[Any],
             consistent_read: Optional[bool] = None,
-            return_consumed_capacity: Optional[str] = None,
             attributes_to_get: Optional[Any] = None,
     ) -> Dict:
         """
-        Performs the batch get item operation
+        Returns the request of a table in a BatchGetItem operation
         """
-        operation_kwargs: Dict[str, Any] = {
-            REQUEST_ITEMS: {
-                table_name: {}
-            }
-        }
-
         args_map: Dict[str, Any] = {}
         name_placeholders: Dict[str, str] = {}
         if consistent_read:
             args_map[CONSISTENT_READ] = consistent_read
-        if return_consumed_capacity:
-            operation_kwargs.update(self.get_consumed_capacity_map(return_consumed_capacity))
         if attributes_to_get is not None:
             projection_expression = create_projection_expression(attributes_to_get, name_placeholders)
             args_map[PROJECTION_EXPRESSION] = projection_expression
         if name_placeholders:
             args_map[EXPRESSION_ATTRIBUTE_NAMES] = self._reverse_dict(name_placeholders)
-        operation_kwargs[REQUEST_ITEMS][table_name].update(args_map)
 
         keys_map: Dict[str, List] = {KEYS: []}
         for key in keys:
             keys_map[KEYS].append(
                 self.get_item_attribute_map(table_name, key)[ITEM]
             )
-        operation_kwargs[REQUEST_ITEMS][table_name].update(keys_map)
+        args_map.update(keys_map)
+        return args_map
+
+    async def batch_get_item(
+            self,
+            table_name: str,
+            keys: Sequence[str],
+            consistent_read: Optional[bool] = None,
+            return_consumed_capacity: Optional[str] = None,
+            attributes_to_get: Optional[Any] = None,
+    ) -> Dict:
+        """
+        Performs the batch get item operation
+        """
+        return await self.batch_get_items(
+            {table_name: self.get_batch_get_request(
+                table_name, keys, consistent_read=consistent_read, attributes_to_get=attributes_to_get,
+            )},
+            return_consumed_capacity=return_consumed_capacity,
+        )
+
+    async def batch_get_items(
+            self,
+            request_items: Dict[str, Dict],
+            return_consumed_capacity: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the batch get item operation on several tables
+
+        :param request_items: The request of each table, see :meth:`get_batch_get_request`
+        """
+        operation_kwargs: Dict[str, Any] = {
+            REQUEST_ITEMS: request_items
+        }
+        if return_consumed_capacity:
+            operation_kwargs.update(self.get_consumed_capacity_map(return_consumed_capacity))
         try:
             return await self.dispatch(BATCH_GET_ITEM, operation_kwargs)
         except BOTOCORE_EXCEPTIONS as e:
@@ -1135,6 +1185,7 @@ class Connection(object):
             total_segments: Optional[int] = None,
             consistent_read: Optional[bool] = None,
             index_name: Optional[str] = None,
+            select: Optional[str] = None,
     ) -> Dict:
         """
         Performs the scan operation
@@ -1165,6 +1216,10 @@ class Connection(object):
             operation_kwargs[TOTAL_SEGMENTS] = total_segments
         if consistent_read:
             operation_kwargs[CONSISTENT_READ] = consistent_read
+        if select:
+            if select.upper() not in SELECT_VALUES:
+                raise ValueError("{} must be one of {}".format(SELECT, SELECT_VALUES))
+            operation_kwargs[SELECT] = str(select).upper()
         if name_placeholders:
             operation_kwargs[EXPRESSION_ATTRIBUTE_NAMES] = self._reverse_dict(name_placeholders)
         if expression_attribute_values:
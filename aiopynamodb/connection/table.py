@@ -2,7 +2,7 @@
 PynamoDB Connection classes
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~
 """
-from typing import Any, Dict, Mapping, Optional, Sequence
+from typing import Any, Dict, List, Mapping, Optional, Sequence
 
 from aiopynamodb.connection.base import Connection, MetaTable
 from aiopynamodb.constants import DEFAULT_BILLING_MODE, KEY
@@ -153,6 +153,16 @@ class TableConnection:
             return_item_collection_metrics=return_item_collection_metrics,
         )
 
+    def get_batch_write_request(
+        self,
+        put_items: Optional[Any] = None,
+        delete_items: Optional[Any] = None,
+    ) -> List[Dict]:
+        """
+        Returns the write requests of this table in a BatchWriteItem operation
+        """
+        return self.connection.get_batch_write_request(self.table_name, put_items=put_items, delete_items=delete_items)
+
     async def batch_write_item(
         self,
         put_items: Optional[Any] = None,
@@ -171,6 +181,22 @@ class TableConnection:
             return_item_collection_metrics=return_item_collection_metrics,
         )
 
+    def get_batch_get_request(
+        self,
+        keys: Sequence[Any],
+        consistent_read: Optional[bool] = None,
+        attributes_to_get: Optional[Any] = None,
+    ) -> Dict:
+        """
+        Returns the request of this table in a BatchGetItem operation
+        """
+        return self.connection.get_batch_get_request(
+            self.table_name,
+            keys,
+            consistent_read=consistent_read,
+            attributes_to_get=attributes_to_get,
+        )
+
     async def batch_get_item(
         self,
         keys: Sequence[str],
@@ -218,6 +244,7 @@ class TableConnection:
         exclusive_start_key: Optional[str] = None,
         consistent_read: Optional[bool] = None,
         index_name: Optional[str] = None,
+        select: Optional[str] = None,
     ) -> Dict:
         """
         Performs the scan operation
@@ -233,6 +260,7 @@ class TableConnection:
             exclusive_start_key=exclusive_start_key,
             consistent_read=consistent_read,
             index_name=index_name,
+            select=select,
         )
 
     async def query(
@@ -202,7 +202,52 @@ DELETE = 'DELETE'
 ADD = 'ADD'
 BATCH_GET_PAGE_LIMIT = 100
 BATCH_WRITE_PAGE_LIMIT = 25
+ITEM_SIZE_LIMIT = 400 * 1024
+BATCH_WRITE_REQUEST_SIZE_LIMIT = 16 * 1024 * 1024
+# Pipelined batch writes resend unprocessed items with exponential backoff
+BATCH_WRITE_RETRY_BASE_DELAY = 0.05
+BATCH_WRITE_RETRY_MAX_DELAY = 1.0
+TRANSACT_WRITE_SIZE_LIMIT = 4 * 1024 * 1024
+TRANSACT_WRITE_ITEM_LIMIT = 100
+# Transactions cancelled only for these reasons, or failing with these errors, are retried with exponential backoff
+TRANSACTION_CANCELED = 'TransactionCanceledException'
+RETRYABLE_CANCELLATION_REASONS = ['TransactionConflict', 'ThrottlingError', 'ProvisionedThroughputExceeded']
+RETRYABLE_TRANSACTION_ERRORS = ['TransactionInProgressException', 'TransactionConflictException']
+TRANSACT_RETRY_BASE_DELAY = 0.025
+TRANSACT_RETRY_MAX_DELAY = 1.0
+PARALLEL_SCAN_CONCURRENCY = 4
+# Parallel scans split the table into this many segments per worker so that idle workers can pick up pending segments
+PARALLEL_SCAN_SEGMENTS_PER_WORKER = 4
+# Compressed attributes store values shorter than this many bytes uncompressed
+COMPRESSION_THRESHOLD = 256
+# Items of models with `large_items` in their Meta that exceed the item size limit are stored in chunks of this many
+# bytes, leaving room under the limit for the key and the attribute names of the chunk records
+LARGE_ITEM_CHUNK_SIZE = 384 * 1024
+LARGE_ITEM_MANIFEST = '__chunks'
+LARGE_ITEM_CHUNK = '__chunk'
+LARGE_ITEM_KEY_SEPARATOR = '#chunk#'
+# Unprocessed chunk records are resent with exponential backoff
+LARGE_ITEM_RETRY_BASE_DELAY = 0.05
+LARGE_ITEM_RETRY_MAX_DELAY = 1.0
+# A manifest write that fails with one of these errors was not applied; other failures are checked with a read
+LARGE_ITEM_UNWRITTEN_ERRORS = ['ConditionalCheckFailedException', 'ValidationException']
+# The hash keys of models with a sharded hash key are stored with the number of the shard after this separator
+SHARD_SEPARATOR = '#shard#'
+SHARD_BY_RANGE_KEY = 'range_key'
+SHARD_BY_RANDOM = 'random'
+SHARD_BY_VALUES = (SHARD_BY_RANGE_KEY, SHARD_BY_RANDOM)
 
 META_CLASS_NAME = "Meta"
 REGION = "region"
 HOST = "host"
+
+# These are the valid result modes of the model read operations (get, query, scan and batch_get)
+RESULT_MODEL = 'model'
+RESULT_DICT = 'dict'
+RESULT_RAW = 'raw'
+RESULT_MODES = [RESULT_MODEL, RESULT_DICT, RESULT_RAW]
+
+# These are the valid modes of Model.save
+SAVE_MODE_PUT = 'put'
+SAVE_MODE_CHANGED = 'changed'
+SAVE_MODES = [SAVE_MODE_PUT, SAVE_MODE_CHANGED]
@@ -137,6 +137,30 @@ class CancellationReason:
     raw_item: Optional[Dict[str, Dict[str, Any]]] = None
 
 
+@dataclass
+class BatchWriteFailure:
+    """
+    A write of a pipelined :class:`~aiopynamodb.models.BatchWrite` that could not be completed.
+
+    `error` is the error of the BatchWriteItem request the write was part of, or None if DynamoDB
+    left the write unprocessed after all the retry attempts.
+    """
+    action: str
+    item: Any
+    error: Optional[Exception] = None
+
+
+class BatchWriteError(PutError):
+    """
+    Raised when writes of a pipelined :class:`~aiopynamodb.models.BatchWrite` fail.
+    """
+    msg = "Failed to batch write items"
+
+    def __init__(self, failures: List[BatchWriteFailure], msg: Optional[str] = None) -> None:
+        super().__init__(msg or "Failed to batch write {} items".format(len(failures)))
+        self.failures = failures
+
+
 class TransactWriteError(PynamoDBException):
     """
     Raised when a :class:`~pynamodb.transactions.TransactWrite` operation fails.
@@ -187,6 +211,13 @@ class InvalidStateError(PynamoDBException):
     msg = "Operation in invalid state"
 
 
+class ChunkedItemError(PynamoDBException):
+    """
+    Raised when the chunks of an item stored in chunks are missing.
+    """
+    msg = "The chunks of the item are missing"
+
+
 class AttributeDeserializationError(TypeError):
     """
     Raised when attribute type is invalid during deserialization.
@@ -196,6 +227,18 @@ class AttributeDeserializationError(TypeError):
         super(AttributeDeserializationError, self).__init__(msg)
 
 
+class SizeLimitExceededError(ValueError):
+    """
+    Raised when an item, or the items of a transaction, exceed a DynamoDB size limit.
+
+    The size is checked before the request is sent, so the request does not fail after a round trip.
+    """
+    def __init__(self, msg: str, size: int, limit: int) -> None:
+        super().__init__(msg)
+        self.size = size
+        self.limit = limit
+
+
 class AttributeNullError(ValueError):
     """
     Raised when an attribute which is not nullable (:code:`null=False`) is unset during serialization.
@@ -211,6 +254,16 @@ class AttributeNullError(ValueError):
         self.attr_path = attr_name + '.' + self.attr_path
 
 
+class AttributeNotProjectedError(AttributeError):
+    """
+    Raised when reading an attribute that a view does not project.
+    """
+
+    def __init__(self, view_name: str, attr_name: str) -> None:
+        super().__init__("Attribute '{}' is not projected by {}".format(attr_name, view_name))
+        self.attr_name = attr_name
+
+
 class VerboseClientError(botocore.exceptions.ClientError):
     def __init__(
         self,
@@ -2,7 +2,7 @@
 PynamoDB Indexes
 """
 from inspect import getmembers
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Type, TypeVar
 from typing import TYPE_CHECKING
 
 from aiopynamodb._schema import IndexSchema, GlobalSecondaryIndexSchema
@@ -11,10 +11,13 @@ from aiopynamodb.constants import (
     INCLUDE, ALL, KEYS_ONLY, ATTR_NAME, ATTR_TYPE, KEY_TYPE,
     PROJECTION_TYPE, NON_KEY_ATTRIBUTES,
     READ_CAPACITY_UNITS, WRITE_CAPACITY_UNITS,
+    RESULT_MODEL, PARALLEL_SCAN_CONCURRENCY,
 )
 from aiopynamodb.attributes import Attribute
 from aiopynamodb.expressions.condition import Condition
+from aiopynamodb.pagination import ParallelScanIterator
 from aiopynamodb.pagination import ResultIterator
+from aiopynamodb.pagination import SegmentProgress
 from aiopynamodb.types import HASH, RANGE
 if TYPE_CHECKING:
     from aiopynamodb.models import Model
@@ -56,6 +59,8 @@ class Index(Generic[_M]):
         consistent_read: bool = False,
         limit: Optional[int] = None,
         rate_limit: Optional[float] = None,
+        range_key_boundaries: Optional[Sequence[Any]] = None,
+        concurrency: int = PARALLEL_SCAN_CONCURRENCY,
     ) -> int:
         """
         Count on an index
@@ -68,6 +73,30 @@ class Index(Generic[_M]):
             consistent_read=consistent_read,
             limit=limit,
             rate_limit=rate_limit,
+            range_key_boundaries=range_key_boundaries,
+            concurrency=concurrency,
+        )
+
+    async def count_scan(
+        self,
+        filter_condition: Optional[Condition] = None,
+        total_segments: Optional[int] = None,
+        concurrency: int = PARALLEL_SCAN_CONCURRENCY,
+        rate_limit: Optional[float] = None,
+        consistent_read: Optional[bool] = None,
+        progress_callback: Optional[Callable[[SegmentProgress], Any]] = None,
+    ) -> int:
+        """
+        Counts the items of an index exactly, scanning several segments concurrently
+        """
+        return await self._model.count_scan(
+            filter_condition=filter_condition,
+            total_segments=total_segments,
+            concurrency=concurrency,
+            rate_limit=rate_limit,
+            consistent_read=consistent_read,
+            index_name=self.Meta.index_name,
+            progress_callback=progress_callback,
         )
 
     def query(
@@ -82,6 +111,9 @@ class Index(Generic[_M]):
         attributes_to_get: Optional[List[str]] = None,
         page_size: Optional[int] = None,
         rate_limit: Optional[float] = None,
+        lazy: Optional[bool] = None,
+        result_mode: str = RESULT_MODEL,
+        prefetch: int = 0,
     ) -> ResultIterator[_M]:
         """
         Queries an index
@@ -98,6 +130,9 @@ class Index(Generic[_M]):
             attributes_to_get=attributes_to_get,
             page_size=page_size,
             rate_limit=rate_limit,
+            lazy=lazy,
+            result_mode=result_mode,
+            prefetch=prefetch,
         )
 
     def scan(
@@ -111,6 +146,9 @@ class Index(Generic[_M]):
         consistent_read: Optional[bool] = None,
         rate_limit: Optional[float] = None,
         attributes_to_get: Optional[List[str]] = None,
+        lazy: Optional[bool] = None,
+        result_mode: str = RESULT_MODEL,
+        prefetch: int = 0,
     ) -> ResultIterator[_M]:
         """
         Scans an index
@@ -126,6 +164,41 @@ class Index(Generic[_M]):
             index_name=self.Meta.index_name,
             rate_limit=rate_limit,
             attributes_to_get=attributes_to_get,
+            lazy=lazy,
+            result_mode=result_mode,
+            prefetch=prefetch,
+        )
+
+    def parallel_scan(
+        self,
+        filter_condition: Optional[Condition] = None,
+        total_segments: Optional[int] = None,
+        concurrency: int = PARALLEL_SCAN_CONCURRENCY,
+        limit: Optional[int] = None,
+        page_size: Optional[int] = None,
+        consistent_read: Optional[bool] = None,
+        rate_limit: Optional[float] = None,
+        attributes_to_get: Optional[List[str]] = None,
+        lazy: Optional[bool] = None,
+        result_mode: str = RESULT_MODEL,
+        progress_callback: Optional[Callable[[SegmentProgress], Any]] = None,
+    ) -> ParallelScanIterator[_M]:
+        """
+        Scans an index, scanning several segments concurrently
+        """
+        return self._model.parallel_scan(
+            filter_condition=filter_condition,
+            total_segments=total_segments,
+            concurrency=concurrency,
+            limit=limit,
+            page_size=page_size,
+            consistent_read=consistent_read,
+            index_name=self.Meta.index_name,
+            rate_limit=rate_limit,
+            attributes_to_get=attributes_to_get,
+            lazy=lazy,
+            result_mode=result_mode,
+            progress_callback=progress_callback,
         )
 
     @classmethod
@@ -1,14 +1,18 @@
 """
 DynamoDB Models for PynamoDB
 """
+import asyncio
+import functools
 import random
 import time
 import logging
 import warnings
 import sys
 from copy import deepcopy
+from decimal import Decimal
 from inspect import getmembers
-from typing import Any, AsyncIterator
+from typing import Any, AsyncIterable, AsyncIterator
+from typing import Callable
 from typing import Dict
 from typing import Generic
 from typing import Iterable
@@ -21,10 +25,28 @@ from typing import Text
 from typing import Tuple
 from typing import Type
 from typing import TypeVar
+from typing import TYPE_CHECKING
 from typing import Union
 from typing import cast
 
 from aiopynamodb._schema import ModelSchema
+from aiopynamodb import _json
+from aiopynamodb._util import attr_value_changes
+from aiopynamodb._util import attr_value_size
+from aiopynamodb._util import attr_values_to_json
+from aiopynamodb._util import attr_values_equal
+from aiopynamodb._util import item_size
+from aiopynamodb.cache import ItemCache
+from aiopynamodb.cache import NegativeLookupCache
+from aiopynamodb.capacity import CapacityEstimate
+from aiopynamodb.capacity import CapacityReport
+from aiopynamodb.capacity import estimate_capacity
+from aiopynamodb.capacity import estimate_sample_capacity
+from aiopynamodb.chunking import chunk_prefix
+from aiopynamodb.chunking import chunk_range_keys
+from aiopynamodb.chunking import get_manifest
+from aiopynamodb.chunking import join_item
+from aiopynamodb.chunking import split_item
 from aiopynamodb.connection.base import MetaTable
 
 if sys.version_info >= (3, 8):
@@ -32,32 +54,56 @@ if sys.version_info >= (3, 8):
 else:
     from typing_extensions import Protocol
 
+from aiopynamodb.expressions.operand import Path
+from aiopynamodb.expressions.operand import Value
 from aiopynamodb.expressions.update import Action
+from aiopynamodb.expressions.update import RemoveAction
+from aiopynamodb.expressions.update import SetAction
 from aiopynamodb.exceptions import DoesNotExist, TableDoesNotExist, TableError, InvalidStateError, PutError, \
-    AttributeNullError
+    AttributeNullError, BatchWriteError, BatchWriteFailure, SizeLimitExceededError, ChunkedItemError, PynamoDBException
 from aiopynamodb.attributes import (
-    AttributeContainer, AttributeContainerMeta, TTLAttribute, VersionAttribute
+    Attribute, AttributeContainer, AttributeContainerMeta, TTLAttribute, VersionAttribute
 )
 from aiopynamodb.connection.table import TableConnection
 from aiopynamodb.expressions.condition import Condition
 from aiopynamodb.types import HASH, RANGE
 from aiopynamodb.indexes import Index
+from aiopynamodb.indexes import LocalSecondaryIndex
+from aiopynamodb.pagination import MergedResultIterator
+from aiopynamodb.pagination import ParallelScanIterator
+from aiopynamodb.pagination import RateLimiter
 from aiopynamodb.pagination import ResultIterator
+from aiopynamodb.pagination import SegmentProgress
 from aiopynamodb.settings import get_settings_value
+from aiopynamodb.sharding import get_shard
+from aiopynamodb.sharding import range_key_shard
+from aiopynamodb.sharding import range_key_sort_key
+from aiopynamodb.sharding import shard_hash_key
+from aiopynamodb.sharding import shard_hash_keys
+from aiopynamodb.sharding import unshard_hash_key
 from aiopynamodb import constants
 from aiopynamodb.constants import (
-    ATTR_NAME, ATTR_TYPE,
+    ATTR_NAME, ATTR_TYPE, ITEMS, LAST_EVALUATED_KEY,
     KEY_TYPE, ITEM,
     ATTRIBUTES, PUT, DELETE, RESPONSES,
-    ALL_NEW,
-    KEYS,
+    ALL_NEW, ALL_OLD,
+    KEYS, STRING,
     TABLE_STATUS, ACTIVE, BATCH_GET_PAGE_LIMIT,
     UNPROCESSED_KEYS, PUT_REQUEST, DELETE_REQUEST,
-    BATCH_WRITE_PAGE_LIMIT,
-    META_CLASS_NAME, REGION, HOST, NULL,
+    BATCH_WRITE_PAGE_LIMIT, BATCH_WRITE_REQUEST_SIZE_LIMIT, BATCH_WRITE_RETRY_BASE_DELAY, BATCH_WRITE_RETRY_MAX_DELAY,
+    ITEM_SIZE_LIMIT,
+    META_CLASS_NAME, REGION, HOST, NULL, NUMBER,
     COUNT, ITEM_COUNT, KEY, UNPROCESSED_ITEMS,
+    RESULT_MODEL, RESULT_DICT, RESULT_RAW, RESULT_MODES,
+    SAVE_MODE_PUT, SAVE_MODE_CHANGED, SAVE_MODES,
+    PARALLEL_SCAN_CONCURRENCY, PARALLEL_SCAN_SEGMENTS_PER_WORKER,
+    LARGE_ITEM_MANIFEST, LARGE_ITEM_RETRY_BASE_DELAY, LARGE_ITEM_RETRY_MAX_DELAY, LARGE_ITEM_UNWRITTEN_ERRORS,
+    SHARD_BY_RANDOM, SHARD_BY_RANGE_KEY,
 )
 
+if TYPE_CHECKING:
+    from aiopynamodb.views import ModelView
+
 _T = TypeVar('_T', bound='Model')
 _KeyType = Any
 
@@ -66,16 +112,55 @@ log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
 
-class BatchWrite(Generic[_T]):
+class _PendingWrites:
     """
-    A class for batch writes
+    The pending operations of a batch write, which are committed before they exceed the item count or the size
+    of a BatchWriteItem request.
+
+    Each operation is a dict with its `action`, the model instance (`item`), its serialized `data` and its `size`.
     """
-    def __init__(self, model: Type[_T], auto_commit: bool = True):
-        self.model = model
+    def __init__(self, auto_commit: bool = True) -> None:
         self.auto_commit = auto_commit
         self.max_operations = BATCH_WRITE_PAGE_LIMIT
+        self.max_request_size = BATCH_WRITE_REQUEST_SIZE_LIMIT
         self.pending_operations: List[Dict[str, Any]] = []
+        self.pending_size = 0
+
+    async def commit(self) -> None:
+        raise NotImplementedError()
+
+    async def _add_operation(self, operation: Dict[str, Any]) -> None:
+        if len(self.pending_operations) == self.max_operations:
+            if not self.auto_commit:
+                raise ValueError("DynamoDB allows a maximum of 25 batch operations")
+            else:
+                await self.commit()
+        elif self.pending_operations and self.pending_size + operation['size'] > self.max_request_size:
+            if not self.auto_commit:
+                raise ValueError("DynamoDB allows a maximum of {} bytes per batch operation".format(self.max_request_size))
+            else:
+                await self.commit()
+        self.pending_operations.append(operation)
+        self.pending_size += operation['size']
+
+    def _take_pending_operations(self) -> List[Dict[str, Any]]:
+        operations = self.pending_operations
+        self.pending_operations = []
+        self.pending_size = 0
+        return operations
+
+
+class BatchWrite(_PendingWrites, Generic[_T]):
+    """
+    A class for batch writes
+    """
+    def __init__(self, model: Type[_T], auto_commit: bool = True):
+        super().__init__(auto_commit=auto_commit)
+        self.model = model
         self.failed_operations: List[Any] = []
+        # Unprocessed items are resent at once, unless the (base, maximum) delays of an exponential backoff are set,
+        # which the pipelined batch writes and the batch writes of chunk records do
+        self._retry_backoff: Optional[Tuple[float, float]] = None
 
     async def save(self, put_item: _T) -> None:
         """
@@ -88,14 +173,15 @@ class BatchWrite(Generic[_T]):
         is False, ValueError is raised to indicate additional items cannot be accepted
         due to the DynamoDB imposed limit.
 
+        The pending operations are also sent when their combined size would exceed the
+        DynamoDB request size limit.
+
         :param put_item: Should be an instance of a `Model` to be written
+        :raises aiopynamodb.exceptions.SizeLimitExceededError: If the item exceeds the DynamoDB item size limit
         """
-        if len(self.pending_operations) == self.max_operations:
-            if not self.auto_commit:
-                raise ValueError("DynamoDB allows a maximum of 25 batch operations")
-            else:
-                await self.commit()
-        self.pending_operations.append({"action": PUT, "item": put_item})
+        data = put_item.serialize()
+        size = self.model._check_item_size(data)
+        await self._add_operation({"action": PUT, "item": put_item, "data": data, "size": size})
 
     async def delete(self, del_item: _T) -> None:
         """
@@ -110,12 +196,17 @@ class BatchWrite(Generic[_T]):
 
         :param del_item: Should be an instance of a `Model` to be deleted
         """
-        if len(self.pending_operations) == self.max_operations:
-            if not self.auto_commit:
-                raise ValueError("DynamoDB allows a maximum of 25 batch operations")
-            else:
-                await self.commit()
-        self.pending_operations.append({"action": DELETE, "item": del_item})
+        data = del_item._get_keys()
+        size = self.model._get_key_size(data)
+        await self._add_operation({"action": DELETE, "item": del_item, "data": data, "size": size})
+
+    async def _back_off(self, retries: int) -> None:
+        """
+        Waits before resending unprocessed items for the given retry, with jittered exponential backoff if it is set
+        """
+        if self._retry_backoff is not None:
+            base_delay, max_delay = self._retry_backoff
+            await asyncio.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** retries)))
 
     async def __aenter__(self):
         return self
@@ -134,43 +225,237 @@ class BatchWrite(Generic[_T]):
         log.debug("%s committing batch operation", self.model)
         put_items = []
         delete_items = []
-        for item in self.pending_operations:
+        for item in self._take_pending_operations():
             if item['action'] == PUT:
-                put_items.append(item['item'].serialize())
+                put_items.append(item['data'])
             elif item['action'] == DELETE:
-                delete_items.append(item['item']._get_keys())
-        self.pending_operations = []
+                delete_items.append(item['data'])
         if not len(put_items) and not len(delete_items):
             return
-        data = await self.model._get_connection().batch_write_item(
-            put_items=put_items,
-            delete_items=delete_items,
-        )
-        if data is None:
-            return
-        retries = 0
-        unprocessed_items = data.get(UNPROCESSED_ITEMS, {}).get(self.model.Meta.table_name)
-        while unprocessed_items:
-            # TODO: we should consider using exponential backoff here
-            # TODO: it is somewhat unintuitive that we retry unprocessed items max_retry_attempts times,
-            # since each `batch_write_item` operation is also subject to max_retry_attempts
-            retries += 1
-            if retries >= self.model.Meta.max_retry_attempts:
-                self.failed_operations = unprocessed_items
-                raise PutError("Failed to batch write items: max_retry_attempts exceeded")
-            put_items = []
-            delete_items = []
-            for item in unprocessed_items:
-                if PUT_REQUEST in item:
-                    put_items.append(item.get(PUT_REQUEST).get(ITEM))  # type: ignore
-                elif DELETE_REQUEST in item:
-                    delete_items.append(item.get(DELETE_REQUEST).get(KEY))  # type: ignore
-            log.info("Resending %d unprocessed keys for batch operation (retry %d)", len(unprocessed_items), retries)
+        written_puts, written_deletes = put_items, delete_items
+        try:
             data = await self.model._get_connection().batch_write_item(
                 put_items=put_items,
                 delete_items=delete_items,
             )
+            if data is None:
+                return
+            retries = 0
             unprocessed_items = data.get(UNPROCESSED_ITEMS, {}).get(self.model.Meta.table_name)
+            while unprocessed_items:
+                # TODO: it is somewhat unintuitive that we retry unprocessed items max_retry_attempts times,
+                # since each `batch_write_item` operation is also subject to max_retry_attempts
+                retries += 1
+                if retries >= self.model.Meta.max_retry_attempts:
+                    self.failed_operations = unprocessed_items
+                    raise PutError("Failed to batch write items: max_retry_attempts exceeded")
+                await self._back_off(retries)
+                put_items = []
+                delete_items = []
+                for item in unprocessed_items:
+                    if PUT_REQUEST in item:
+                        put_items.append(item.get(PUT_REQUEST).get(ITEM))  # type: ignore
+                    elif DELETE_REQUEST in item:
+                        delete_items.append(item.get(DELETE_REQUEST).get(KEY))  # type: ignore
+                log.info("Resending %d unprocessed keys for batch operation (retry %d)", len(unprocessed_items), retries)
+                data = await self.model._get_connection().batch_write_item(
+                    put_items=put_items,
+                    delete_items=delete_items,
+                )
+                unprocessed_items = data.get(UNPROCESSED_ITEMS, {}).get(self.model.Meta.table_name)
+        finally:
+            self.model._invalidate_cached(written_puts, exists=True)
+            self.model._invalidate_cached(written_deletes)
+
+
+class PipelinedBatchWrite(BatchWrite[_T]):
+    """
+    A batch write that sends its writes in the background.
+
+    Writes are queued and sent by `concurrency` flushers, each sending one BatchWriteItem request at a time.
+    Writes to the same key always go to the same flusher, so they are applied in order, and writes to the
+    same key that are sent in the same request are collapsed (the last one wins). When the queues are full,
+    :meth:`save` and :meth:`delete` wait, slowing producers down to the pace of DynamoDB. Unprocessed writes
+    are resent with jittered exponential backoff.
+
+    Writes that fail are recorded in `failures`; :meth:`commit` and leaving the context wait for all queued
+    writes to be sent and raise :class:`~aiopynamodb.exceptions.BatchWriteError` if any failed.
+    """
+    def __init__(self, model: Type[_T], concurrency: int, max_pending: Optional[int] = None) -> None:
+        super().__init__(model, auto_commit=True)
+        if concurrency < 1:
+            raise ValueError("concurrency must be greater than zero")
+        self.concurrency = concurrency
+        if max_pending is None:
+            max_pending = 2 * concurrency * BATCH_WRITE_PAGE_LIMIT
+        self._queue_size = max(BATCH_WRITE_PAGE_LIMIT, max_pending // concurrency)
+        self._queues: List[asyncio.Queue] = []
+        self._flushers: List[asyncio.Task] = []
+        self.failures: List[BatchWriteFailure] = []
+        self.collapsed_operations = 0
+        self._retry_backoff = (BATCH_WRITE_RETRY_BASE_DELAY, BATCH_WRITE_RETRY_MAX_DELAY)
+
+    async def save(self, put_item: _T) -> None:
+        """
+        Queues `put_item` to be written, waiting if the queues are full.
+        """
+        data = put_item.serialize()
+        size = self.model._check_item_size(data)
+        operation = {"action": PUT, "item": put_item, "data": data, "size": size}
+        await self._enqueue(self.model._get_key_identity(data), operation)
+
+    async def delete(self, del_item: _T) -> None:
+        """
+        Queues `del_item` to be deleted, waiting if the queues are full.
+        """
+        data = del_item._get_keys()
+        operation = {"action": DELETE, "item": del_item, "data": data, "size": self.model._get_key_size(data)}
+        await self._enqueue(self.model._get_key_identity(data), operation)
+
+    async def _enqueue(self, identity: Tuple, operation: Dict[str, Any]) -> None:
+        if not self._flushers:
+            self._queues = [asyncio.Queue(maxsize=self._queue_size) for _ in range(self.concurrency)]
+            self._flushers = [asyncio.ensure_future(self._flush(queue)) for queue in self._queues]
+        await self._queues[hash(identity) % self.concurrency].put((identity, operation))
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """
+        Waits for all queued writes to be sent and stops the flushers
+        """
+        try:
+            for queue in self._queues:
+                await queue.put(None)
+            await asyncio.gather(*self._flushers)
+        finally:
+            for flusher in self._flushers:
+                flusher.cancel()
+            self._queues = []
+            self._flushers = []
+        if exc_type is None:
+            self._raise_failures()
+
+    async def commit(self) -> None:
+        """
+        Waits for all the writes queued so far to be sent
+        """
+        for queue in self._queues:
+            await queue.join()
+        self._raise_failures()
+
+    def _raise_failures(self) -> None:
+        if self.failures:
+            raise BatchWriteError(self.failures)
+
+    async def _flush(self, queue: asyncio.Queue) -> None:
+        # An entry taken from the queue that did not fit in the previous request
+        carried = None
+        stop = False
+        while not stop:
+            if carried is not None:
+                entry, carried = carried, None
+            else:
+                entry = await queue.get()
+                if entry is None:
+                    queue.task_done()
+                    return
+            taken = 1
+            window: Dict[Tuple, Dict[str, Any]] = {entry[0]: entry[1]}
+            size = entry[1]['size']
+            while len(window) < self.max_operations and not queue.empty():
+                entry = queue.get_nowait()
+                if entry is None:
+                    taken += 1
+                    stop = True
+                    break
+                if entry[0] in window:
+                    taken += 1
+                    self.collapsed_operations += 1
+                    size += entry[1]['size'] - window[entry[0]]['size']
+                elif size + entry[1]['size'] > self.max_request_size:
+                    carried = entry
+                    break
+                else:
+                    taken += 1
+                    size += entry[1]['size']
+                window[entry[0]] = entry[1]
+            try:
+                await self._send(window)
+            finally:
+                for _ in range(taken):
+                    queue.task_done()
+
+    async def _send(self, operations: Dict[Tuple, Dict[str, Any]]) -> None:
+        log.debug("%s sending %d pipelined batch operations", self.model, len(operations))
+        written_puts = [op['data'] for op in operations.values() if op['action'] == PUT]
+        written_deletes = [op['data'] for op in operations.values() if op['action'] == DELETE]
+        retries = 0
+        try:
+            while True:
+                put_items = [op['data'] for op in operations.values() if op['action'] == PUT]
+                delete_items = [op['data'] for op in operations.values() if op['action'] == DELETE]
+                data = await self.model._get_connection().batch_write_item(
+                    put_items=put_items,
+                    delete_items=delete_items,
+                )
+                unprocessed_items = (data or {}).get(UNPROCESSED_ITEMS, {}).get(self.model.Meta.table_name)
+                if not unprocessed_items:
+                    return
+                unprocessed_keys = {
+                    self.model._get_key_identity(item[PUT_REQUEST][ITEM] if PUT_REQUEST in item else item[DELETE_REQUEST][KEY])
+                    for item in unprocessed_items
+                }
+                operations = {key: op for key, op in operations.items() if key in unprocessed_keys}
+                retries += 1
+                if retries >= self.model.Meta.max_retry_attempts:
+                    self._add_failures(operations, None)
+                    return
+                await self._back_off(retries)
+                log.info("Resending %d unprocessed keys for batch operation (retry %d)", len(operations), retries)
+        except Exception as e:
+            self._add_failures(operations, e)
+        finally:
+            self.model._invalidate_cached(written_puts, exists=True)
+            self.model._invalidate_cached(written_deletes)
+
+    def _add_failures(self, operations: Dict[Tuple, Dict[str, Any]], error: Optional[Exception]) -> None:
+        self.failures.extend(BatchWriteFailure(op['action'], op['item'], error) for op in operations.values())
+
+
+class BatchGetResult(Mapping[_KeyType, _T]):
+    """
+    The results of :meth:`Model.batch_get_mapping`, mapping the requested keys to the items that were found.
+
+    Keys are looked up by value, so a range key pair can be given as a tuple or a list. Iteration follows
+    the order in which the keys were requested, and the keys that were not found are listed in `missing`.
+    """
+
+    def __init__(self, model: Type[_T], keys: List[_KeyType], identities: List[Tuple], items: Dict[Tuple, _T]) -> None:
+        self.model = model
+        self._keys = keys
+        self._identities = identities
+        self._items = items
+
+    def __getitem__(self, key: _KeyType) -> _T:
+        return self._items[self.model._get_key_identity(self.model._batch_get_key(key))]
+
+    def __iter__(self) -> Iterator[_KeyType]:
+        return (key for key, identity in zip(self._keys, self._identities) if identity in self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def missing(self) -> List[_KeyType]:
+        """
+        The requested keys for which no item was found, in request order.
+        """
+        return [key for key, identity in zip(self._keys, self._identities) if identity not in self._items]
+
+    def to_list(self) -> List[Optional[_T]]:
+        """
+        Returns one entry per distinct requested key, in request order, with None for the keys that were not found.
+        """
+        return [self._items.get(identity) for identity in self._identities]
 
 
 class MetaProtocol(Protocol):
@@ -190,18 +475,23 @@ class MetaProtocol(Protocol):
     billing_mode: Optional[str]
     tags: Optional[Dict[str, str]]
     stream_view_type: Optional[str]
+    lazy: bool
+    cache: Optional[ItemCache]
+    negative_cache: Optional[NegativeLookupCache]
+    large_items: bool
+    track_changes: bool
 
 
 class MetaModel(AttributeContainerMeta):
     """
     Model meta class
     """
-    def __new__(cls, name, bases, namespace, discriminator=None):
-        # Defined so that the discriminator can be set in the class definition.
+    def __new__(cls, name, bases, namespace, discriminator=None, compact_storage=None):
+        # Defined so that the discriminator and storage can be set in the class definition.
         return super().__new__(cls, name, bases, namespace)
 
-    def __init__(self, name, bases, namespace, discriminator=None) -> None:
-        super().__init__(name, bases, namespace, discriminator)
+    def __init__(self, name, bases, namespace, discriminator=None, compact_storage=None) -> None:
+        super().__init__(name, bases, namespace, discriminator, compact_storage)
         MetaModel._initialize_indexes(self)
         cls = cast(Type['Model'], self)
         for attr_name, attribute in cls.get_attributes().items():
@@ -209,6 +499,7 @@ class MetaModel(AttributeContainerMeta):
                 if cls._hash_keyname and cls._hash_keyname != attr_name:
                     raise ValueError(f"{cls.__name__} has more than one hash key: {cls._hash_keyname}, {attr_name}")
                 cls._hash_keyname = attr_name
+                cls._hash_key_shards = getattr(attribute, 'shards', None)
             if attribute.is_range_key:
                 if cls._range_keyname and cls._range_keyname != attr_name:
                     raise ValueError(f"{cls.__name__} has more than one range key: {cls._range_keyname}, {attr_name}")
@@ -221,6 +512,9 @@ class MetaModel(AttributeContainerMeta):
                     )
                 cls._version_attribute_name = attr_name
 
+        if cls._hash_key_shards is not None and cls._range_keyname is None:
+            raise ValueError("{} has a sharded hash key, which requires a range key".format(cls.__name__))
+
         ttl_attr_names = [name for name, attr in cls.get_attributes().items() if isinstance(attr, TTLAttribute)]
         if len(ttl_attr_names) > 1:
             raise ValueError("{} has more than one TTL attribute: {}".format(
@@ -251,6 +545,19 @@ class MetaModel(AttributeContainerMeta):
                         setattr(attr_obj, 'aws_secret_access_key', None)
                     if not hasattr(attr_obj, 'aws_session_token'):
                         setattr(attr_obj, 'aws_session_token', None)
+                    if not hasattr(attr_obj, 'lazy'):
+                        setattr(attr_obj, 'lazy', False)
+                    if not hasattr(attr_obj, 'cache'):
+                        setattr(attr_obj, 'cache', None)
+                    if not hasattr(attr_obj, 'negative_cache'):
+                        setattr(attr_obj, 'negative_cache', None)
+                    if not hasattr(attr_obj, 'large_items'):
+                        setattr(attr_obj, 'large_items', False)
+                    if attr_obj.large_items:
+                        range_key_attribute = cls._range_key_attribute()
+                        if range_key_attribute is None or range_key_attribute.attr_type != STRING:
+                            raise ValueError(
+                                "{} stores large items, which requires a string range key".format(cls.__name__))
 
             # create a custom Model.DoesNotExist derived from aiopynamodb.exceptions.DoesNotExist,
             # so that "except Model.DoesNotExist:" would not catch other models' exceptions
@@ -287,9 +594,16 @@ class Model(AttributeContainer, metaclass=MetaModel):
     # DynamoDB attributes
     _hash_keyname: Optional[str] = None
     _range_keyname: Optional[str] = None
+    # The number of shards of the hash key, if it is sharded (see `aiopynamodb.sharding`)
+    _hash_key_shards: Optional[int] = None
     _connection: Optional[TableConnection] = None
     DoesNotExist: Type[DoesNotExist] = DoesNotExist
     _version_attribute_name: Optional[str] = None
+    # The item as it was last loaded from or saved to DynamoDB, which `save(mode='changed')` compares against.
+    # Only kept for the models with `track_changes` in their Meta, and the items whose changes are tracked.
+    _loaded_values: Optional[Dict[str, Dict[str, Any]]] = None
+    # The shard of an item of a model sharded at random
+    _shard: Optional[int] = None
 
     Meta: MetaProtocol
     _indexes: Dict[str, Index]
@@ -319,70 +633,107 @@ class Model(AttributeContainer, metaclass=MetaModel):
     @classmethod
     async def batch_get(
         cls: Type[_T],
-        items: Iterable[Union[_KeyType, Iterable[_KeyType]]],
+        items: Union[Iterable[_KeyType], AsyncIterable[_KeyType]],
         consistent_read: Optional[bool] = None,
         attributes_to_get: Optional[Sequence[str]] = None,
+        lazy: Optional[bool] = None,
+        result_mode: str = RESULT_MODEL,
+        concurrency: int = 1,
+        ordered: bool = False,
     ) -> AsyncIterator[_T]:
         """
         BatchGetItem for this model
 
         :param items: Should be a list of hash keys to retrieve, or a list of
-            tuples if range keys are used.
+            tuples if range keys are used. Can also be an async iterable, in which case keys are
+            read as they are needed. Duplicate keys are only retrieved once.
+        :param lazy: If set, overrides the model's `Meta.lazy` setting (see :meth:`from_raw_data`)
+        :param result_mode: 'model' (the default) returns model instances, 'dict' returns dictionaries of
+            decoded attribute values and 'raw' returns the DynamoDB attribute values as is
+        :param concurrency: The maximum number of BatchGetItem requests in flight at a time
+        :param ordered: If True, items are returned in the order of their keys (items not found are skipped).
+            Otherwise items are returned as soon as they are received.
+        """
+        map_fn = cls._get_result_map_fn(result_mode, lazy)
+        identities: List[Tuple] = []
+        pages = cls._batch_get_raw(
+            cls._batch_get_keys(items, identities=identities),
+            consistent_read=consistent_read,
+            attributes_to_get=attributes_to_get,
+            concurrency=concurrency,
+        )
+        if not ordered:
+            async for _, page in pages:
+                for batch_item in page:
+                    yield map_fn(batch_item)
+            return
+
+        # Items (or None for a miss) of the keys that have been resolved but not returned yet
+        resolved: Dict[Tuple, Optional[Dict[str, Any]]] = {}
+        position = 0
+        async for identities_done, page in pages:
+            resolved.update(dict.fromkeys(identities_done))
+            for batch_item in page:
+                resolved[cls._get_key_identity(batch_item)] = batch_item
+            while position < len(identities) and identities[position] in resolved:
+                resolved_item = resolved.pop(identities[position])
+                position += 1
+                if resolved_item is not None:
+                    yield map_fn(resolved_item)
+
+    @classmethod
+    async def batch_get_mapping(
+        cls: Type[_T],
+        items: Union[Iterable[_KeyType], AsyncIterable[_KeyType]],
+        consistent_read: Optional[bool] = None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+        lazy: Optional[bool] = None,
+        result_mode: str = RESULT_MODEL,
+        concurrency: int = 1,
+    ) -> BatchGetResult[_T]:
         """
-        items = set(items)
-        hash_key_attribute = cls._hash_key_attribute()
-        range_key_attribute = cls._range_key_attribute()
-        keys_to_get: List[Any] = []
-        while items:
-            if len(keys_to_get) == BATCH_GET_PAGE_LIMIT:
-                while keys_to_get:
-                    page, unprocessed_keys = await cls._batch_get_page(
-                        keys_to_get,
-                        consistent_read=consistent_read,
-                        attributes_to_get=attributes_to_get,
-                    )
-                    for batch_item in page:
-                        yield cls.from_raw_data(batch_item)
-                    if unprocessed_keys:
-                        keys_to_get = unprocessed_keys
-                    else:
-                        keys_to_get = []
-            item = items.pop()
-            if range_key_attribute:
-                if isinstance(item, str):
-                    raise ValueError(f'Invalid key value {item!r}: '
-                                     'expected non-str iterable with exactly 2 elements (hash key, range key)')
-                try:
-                    hash_key, range_key = item
-                except (TypeError, ValueError):
-                    raise ValueError(f'Invalid key value {item!r}: '
-                                     'expected iterable with exactly 2 elements (hash key, range key)')
-                hash_key_ser, range_key_ser = cls._serialize_keys(hash_key, range_key)
-                keys_to_get.append({
-                    hash_key_attribute.attr_name: hash_key_ser,
-                    range_key_attribute.attr_name: range_key_ser,
-                })
-            else:
-                hash_key_ser, _ = cls._serialize_keys(item)
-                keys_to_get.append({
-                    hash_key_attribute.attr_name: hash_key_ser
-                })
+        BatchGetItem for this model, returning a mapping of the requested keys to the items found
 
-        while keys_to_get:
-            page, unprocessed_keys = await cls._batch_get_page(
-                keys_to_get,
-                consistent_read=consistent_read,
-                attributes_to_get=attributes_to_get,
-            )
+        See :meth:`batch_get` for the parameters.
+        """
+        map_fn = cls._get_result_map_fn(result_mode, lazy)
+        keys: List[_KeyType] = []
+        identities: List[Tuple] = []
+        found: Dict[Tuple, _T] = {}
+        async for _, page in cls._batch_get_raw(
+            cls._batch_get_keys(items, identities=identities, keys=keys),
+            consistent_read=consistent_read,
+            attributes_to_get=attributes_to_get,
+            concurrency=concurrency,
+        ):
             for batch_item in page:
-                yield cls.from_raw_data(batch_item)
-            if unprocessed_keys:
-                keys_to_get = unprocessed_keys
-            else:
-                keys_to_get = []
+                found[cls._get_key_identity(batch_item)] = map_fn(batch_item)
+        return BatchGetResult(cls, keys, identities, found)
+
+    @classmethod
+    def view(cls: Type[_T], *attributes: Union[str, Attribute, Path]) -> Type['ModelView']:
+        """
+        Returns a read-only view class of the given attributes, to subclass:
+
+            class UserSummary(UserModel.view('user_name', 'email', 'preferences.timezone')):
+                pass
+
+        The `get`, `query`, `scan` and `batch_get` class methods of the view only request and decode
+        the projected attributes (see :class:`~aiopynamodb.views.ModelView`).
+
+        :param attributes: Python attribute names, with `.` to project the keys of a map attribute,
+            or attributes of this model. The key attributes are always projected.
+        """
+        from aiopynamodb.views import make_view
+        return make_view(cls, attributes)
 
     @classmethod
-    def batch_write(cls: Type[_T], auto_commit: bool = True) -> BatchWrite[_T]:
+    def batch_write(
+        cls: Type[_T],
+        auto_commit: bool = True,
+        concurrency: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ) -> BatchWrite[_T]:
         """
         Returns a BatchWrite context manager for a batch operation.
 
@@ -391,7 +742,12 @@ class Model(AttributeContainer, metaclass=MetaModel):
                             in the DynamoDB API (see BatchWrite). Regardless of the value
                             passed here, changes automatically commit on context exit
                             (whether successful or not).
+        :param concurrency: If set, writes are pipelined: they are queued and sent in the background
+                            by this many concurrent flushers (see PipelinedBatchWrite).
+        :param max_pending: The maximum number of queued writes of a pipelined batch write
         """
+        if concurrency is not None:
+            return PipelinedBatchWrite(cls, concurrency, max_pending=max_pending)
         return BatchWrite(cls, auto_commit=auto_commit)
 
     async def delete(self, condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Any:
@@ -409,7 +765,21 @@ class Model(AttributeContainer, metaclass=MetaModel):
         if add_version_condition and version_condition is not None:
             condition &= version_condition
 
-        return await self._get_connection().delete_item(hk_value, range_key=rk_value, condition=condition)
+        if not self._stores_large_items():
+            try:
+                return await self._get_connection().delete_item(hk_value, range_key=rk_value, condition=condition)
+            finally:
+                self._invalidate_cached([self._get_keys()])
+
+        # The deleted item is returned, to delete its chunks if it was stored in chunks
+        try:
+            data = await self._get_connection().delete_item(
+                hk_value, range_key=rk_value, condition=condition, return_values=ALL_OLD,
+            )
+        finally:
+            self._invalidate_cached([self._get_keys()])
+        await self._delete_chunks(data.get(ATTRIBUTES))
+        return data
 
     async def update(self, actions: List[Action], condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Any:
         """
@@ -433,23 +803,360 @@ class Model(AttributeContainer, metaclass=MetaModel):
         if add_version_condition and version_condition is not None:
             condition &= version_condition
 
-        data = await self._get_connection().update_item(hk_value, range_key=rk_value, return_values=ALL_NEW, condition=condition, actions=actions)
+        try:
+            data = await self._get_connection().update_item(hk_value, range_key=rk_value, return_values=ALL_NEW, condition=condition, actions=actions)
+        except Exception:
+            self._invalidate_cached([self._get_keys()], exists=True)
+            raise
         item_data = data[ATTRIBUTES]
+        self._cache_item(item_data)
         stored_cls = self._get_discriminator_class(item_data)
         if stored_cls and stored_cls != type(self):
             raise ValueError("Cannot update this item from the returned class: {}".format(stored_cls.__name__))
         self.deserialize(item_data)
         return data
 
-    async def save(self, condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Dict[str, Any]:
+    async def save(
+        self,
+        condition: Optional[Condition] = None,
+        *,
+        add_version_condition: bool = True,
+        mode: str = SAVE_MODE_PUT,
+    ) -> Dict[str, Any]:
         """
         Save this object to dynamodb
+
+        :param mode: 'put' (the default) writes the whole item with PutItem. 'changed' only writes the attributes
+          that changed since the item was loaded or last saved, with UpdateItem, and does nothing if none did.
+          Changes within maps and within lists of unchanged length are written by document path.
+          Items that were not loaded, or whose key changed, are written with PutItem.
+          Requires `track_changes = True` in the Meta of the model, or a call to :meth:`track_changes`.
+          The whole item is still serialized to find the changes (and to check its size), so this saves write
+          capacity rather than encoding time; only with lazy loading are the attributes that were never read
+          or assigned reused as loaded.
+        """
+        if mode not in SAVE_MODES:
+            raise ValueError("mode must be one of {}".format(SAVE_MODES))
+        if mode == SAVE_MODE_CHANGED and not self._tracks_changes():
+            raise ValueError("The changes of this {} are not tracked: set `track_changes = True` in its Meta, "
+                             "or call `track_changes`".format(type(self).__name__))
+        attribute_values = self.serialize(null_check=True)
+        large_items = self._stores_large_items()
+        if large_items and item_size(attribute_values) > ITEM_SIZE_LIMIT:
+            return await self._save_chunked(attribute_values, condition, add_version_condition)
+        self._check_item_size(attribute_values)
+        # Items stored in chunks are always replaced as a whole
+        if mode == SAVE_MODE_CHANGED and not (large_items and get_manifest(self._loaded_values)):
+            actions = self._get_change_actions(attribute_values)
+            if actions is not None:
+                return await self._save_changes(attribute_values, actions, condition, add_version_condition)
+        args, kwargs = self._get_save_args(
+            condition=condition,
+            add_version_condition=add_version_condition,
+            attribute_values=dict(attribute_values),
+        )
+        if large_items:
+            # The replaced item is returned, to delete its chunks if it was stored in chunks
+            kwargs['return_values'] = ALL_OLD
+        try:
+            data = await self._get_connection().put_item(*args, **kwargs)
+        except Exception:
+            self._invalidate_cached([attribute_values], exists=True)
+            raise
+        if large_items:
+            await self._delete_chunks(data.get(ATTRIBUTES))
+        self.update_local_version_attribute()
+        self._set_saved_version(attribute_values)
+        self._set_loaded_values(attribute_values)
+        self._cache_item(attribute_values)
+        return data
+
+    async def _save_chunked(
+        self,
+        attribute_values: Dict[str, Dict[str, Any]],
+        condition: Optional[Condition],
+        add_version_condition: bool,
+    ) -> Dict[str, Any]:
         """
-        args, kwargs = self._get_save_args(condition=condition, add_version_condition=add_version_condition)
-        data = await self._get_connection().put_item(*args, **kwargs)
+        Writes an item that exceeds the item size limit as chunk records, then as the manifest record that refers
+        to them (see :mod:`aiopynamodb.chunking`), and deletes the chunks of the item it replaces.
+        """
+        args, kwargs = self._get_save_args(
+            condition=condition,
+            add_version_condition=add_version_condition,
+            attribute_values=dict(attribute_values),
+        )
+        # The attributes to save hold the new version, but not the key
+        item = dict(attribute_values)
+        item.update(kwargs['attributes'])
+        version_attribute = self.get_attributes().get(self._version_attribute_name or '')
+        ttl_attribute = self._ttl_attribute()
+        manifest, chunks = split_item(
+            item,
+            self._hash_key_attribute().attr_name,
+            self._range_key_attribute().attr_name,
+            manifest_names=[attr.attr_name for attr in (version_attribute, ttl_attribute) if attr is not None],
+            ttl_name=ttl_attribute.attr_name if ttl_attribute is not None else None,
+        )
+        kwargs['attributes'] = manifest
+        kwargs['return_values'] = ALL_OLD
+        try:
+            await self._write_chunk_records(put_items=chunks)
+        except Exception:
+            self._invalidate_cached([attribute_values], exists=True)
+            # The chunks that were written are not referred to by any manifest
+            await self._delete_chunks(dict(attribute_values, **manifest))
+            raise
+        try:
+            data = await self._get_connection().put_item(*args, **kwargs)
+        except Exception as error:
+            self._invalidate_cached([attribute_values], exists=True)
+            hash_key_attribute, range_key_attribute = self._hash_key_attribute(), self._range_key_attribute()
+            hk_value = item[hash_key_attribute.attr_name][hash_key_attribute.attr_type]
+            rk_value = item[range_key_attribute.attr_name][STRING]
+            if not await self._manifest_was_written(hk_value, rk_value, manifest, error):
+                await self._delete_chunks(dict(attribute_values, **manifest))
+                raise
+            # The replaced item is unknown, so its chunks are left for `delete_orphaned_chunks`
+            log.warning("Saved %s item (%s, %s) despite an error", type(self).__name__, hk_value, rk_value, exc_info=True)
+            data = {}
+        await self._delete_chunks(data.get(ATTRIBUTES))
         self.update_local_version_attribute()
+        self._set_saved_version(attribute_values)
+        attribute_values[LARGE_ITEM_MANIFEST] = manifest[LARGE_ITEM_MANIFEST]
+        self._set_loaded_values(attribute_values)
+        self._cache_item(attribute_values)
         return data
 
+    @classmethod
+    async def _manifest_was_written(
+        cls,
+        hash_key: Any,
+        range_key: Any,
+        manifest: Dict[str, Dict[str, Any]],
+        error: Exception,
+    ) -> bool:
+        """
+        Returns whether a manifest record was stored by a write that failed, since a write may be applied
+        even though it failed (e.g. on a timeout), in which case its chunks must be kept.
+
+        :raises: The error of the write, if the manifest could not be read
+        """
+        if isinstance(error, PynamoDBException) and error.cause_response_code in LARGE_ITEM_UNWRITTEN_ERRORS:
+            return False
+        try:
+            data = await cls._get_connection().get_item(hash_key, range_key=range_key, consistent_read=True)
+        except Exception:
+            # The chunks are kept, as the manifest may refer to them, and are left for `delete_orphaned_chunks`
+            log.warning("Failed to read the manifest of %s item (%s, %s)", cls.__name__, hash_key, range_key, exc_info=True)
+            raise error
+        return get_manifest(data.get(ITEM)) == get_manifest(manifest)
+
+    @classmethod
+    def _stores_large_items(cls) -> bool:
+        return getattr(getattr(cls, 'Meta', None), 'large_items', False)
+
+    @classmethod
+    async def _write_chunk_records(
+        cls,
+        put_items: Iterable[Dict[str, Any]] = (),
+        delete_items: Iterable[Dict[str, Any]] = (),
+    ) -> None:
+        """
+        Writes and deletes chunk records with batch writes, given the records and the keys to delete.
+        Unprocessed records are resent with exponential backoff.
+        """
+        batch = BatchWrite(cls)
+        batch._retry_backoff = (LARGE_ITEM_RETRY_BASE_DELAY, LARGE_ITEM_RETRY_MAX_DELAY)
+        for data in put_items:
+            await batch._add_operation({"action": PUT, "item": None, "data": data, "size": item_size(data)})
+        for key in delete_items:
+            await batch._add_operation({"action": DELETE, "item": None, "data": key, "size": cls._get_key_size(key)})
+        await batch.commit()
+
+    @classmethod
+    async def _delete_chunks(cls, item: Optional[Dict[str, Any]]) -> None:
+        """
+        Deletes the chunk records of a stored item, if it was stored in chunks.
+
+        Failures are logged rather than raised, since the item itself was written: the chunks are left
+        for :meth:`delete_orphaned_chunks`.
+        """
+        manifest = get_manifest(item)
+        if item is None or manifest is None:
+            return
+        hash_key_attribute, range_key_attribute = cls._hash_key_attribute(), cls._range_key_attribute()
+        hash_key = item[hash_key_attribute.attr_name][hash_key_attribute.attr_type]
+        range_key = item[range_key_attribute.attr_name][STRING]
+        try:
+            await cls._write_chunk_records(delete_items=[
+                {hash_key_attribute.attr_name: hash_key, range_key_attribute.attr_name: chunk_range_key}
+                for chunk_range_key in chunk_range_keys(range_key, *manifest)
+            ])
+        except Exception:
+            log.warning("Failed to delete the chunks of %s item (%s, %s)", cls.__name__, hash_key, range_key, exc_info=True)
+
+    @classmethod
+    async def _read_chunks(cls, item: Dict[str, Any], consistent_read: bool = False) -> Dict[str, Any]:
+        """
+        Returns the item stored in a manifest record and its chunk records, which are read with a query,
+        or the item as is if it is not stored in chunks.
+
+        :raises ChunkedItemError: If some chunks are missing, e.g. because the item was replaced since
+            its manifest was read
+        """
+        manifest = get_manifest(item)
+        if manifest is None:
+            return item
+        chunk_id, count = manifest
+        hash_key_attribute, range_key_attribute = cls._hash_key_attribute(), cls._range_key_attribute()
+        hash_key = item[hash_key_attribute.attr_name][hash_key_attribute.attr_type]
+        range_key = item[range_key_attribute.attr_name][STRING]
+        chunks: List[Dict[str, Any]] = []
+        last_evaluated_key = None
+        while True:
+            data = await cls._get_connection().query(
+                hash_key,
+                range_key_condition=range_key_attribute.startswith(chunk_prefix(range_key, chunk_id)),
+                consistent_read=consistent_read,
+                exclusive_start_key=last_evaluated_key,
+            )
+            chunks.extend(data.get(ITEMS, []))
+            last_evaluated_key = data.get(LAST_EVALUATED_KEY)
+            if not last_evaluated_key:
+                break
+        if len(chunks) != count:
+            if not consistent_read:
+                # The chunks may not have reached the replica the query was served by
+                return await cls._read_chunks(item, consistent_read=True)
+            raise ChunkedItemError("Found {} of the {} chunks of {} item ({}, {})".format(
+                len(chunks), count, cls.__name__, hash_key, range_key))
+        return join_item(item, chunks)
+
+    @classmethod
+    async def delete_orphaned_chunks(cls, hash_key: _KeyType, range_key: _KeyType) -> int:
+        """
+        Deletes the chunk records of an item that its manifest does not refer to, such as the chunks left by an
+        interrupted save, and returns the number of records deleted. Only for models that store large items.
+
+        Chunks being written by a concurrent save are deleted too, so this should not run while the item is saved.
+        """
+        if not cls._stores_large_items():
+            raise ValueError("{} does not store large items".format(cls.__name__))
+        hash_key, range_key = cls._serialize_keys(hash_key, range_key)
+        hash_key_attribute, range_key_attribute = cls._hash_key_attribute(), cls._range_key_attribute()
+        data = await cls._get_connection().get_item(hash_key, range_key=range_key, consistent_read=True)
+        manifest = get_manifest(data.get(ITEM) if data else None)
+        referenced = set(chunk_range_keys(range_key, *manifest)) if manifest is not None else set()
+
+        orphaned = []
+        last_evaluated_key = None
+        while True:
+            data = await cls._get_connection().query(
+                hash_key,
+                range_key_condition=range_key_attribute.startswith(chunk_prefix(range_key)),
+                attributes_to_get=[range_key_attribute.attr_name],
+                consistent_read=True,
+                exclusive_start_key=last_evaluated_key,
+            )
+            for record in data.get(ITEMS, []):
+                chunk_range_key = record[range_key_attribute.attr_name][STRING]
+                if chunk_range_key not in referenced:
+                    orphaned.append({hash_key_attribute.attr_name: hash_key, range_key_attribute.attr_name: chunk_range_key})
+            last_evaluated_key = data.get(LAST_EVALUATED_KEY)
+            if not last_evaluated_key:
+                break
+        await cls._write_chunk_records(delete_items=orphaned)
+        return len(orphaned)
+
+    async def _save_changes(
+        self,
+        attribute_values: Dict[str, Dict[str, Any]],
+        actions: List[Action],
+        condition: Optional[Condition],
+        add_version_condition: bool,
+    ) -> Dict[str, Any]:
+        if not actions:
+            return {}
+        hk_value, rk_value = self._get_hash_range_key_serialized_values()
+        version_condition = self._handle_version_attribute(actions=actions)
+        if add_version_condition and version_condition is not None:
+            condition &= version_condition
+        try:
+            data = await self._get_connection().update_item(hk_value, range_key=rk_value, condition=condition, actions=actions)
+        finally:
+            # The item may have attributes that were not loaded, so it is read again rather than cached as is
+            self._invalidate_cached([attribute_values], exists=True)
+        self.update_local_version_attribute()
+        self._set_saved_version(attribute_values)
+        self._set_loaded_values(attribute_values)
+        return data
+
+    def track_changes(self) -> None:
+        """
+        Tracks the changes made to this item from now on, so that :meth:`save` with `mode='changed'` only writes
+        the attributes that change. The changes of the items of models with `track_changes = True` in their Meta
+        are tracked from when they are loaded.
+        """
+        if self._loaded_values is None:
+            self._loaded_values = self.serialize()
+
+    def _tracks_changes(self) -> bool:
+        return self._loaded_values is not None or getattr(getattr(self, 'Meta', None), 'track_changes', False)
+
+    def _set_loaded_values(self, attribute_values: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Records the serialized item as it was loaded from or saved to DynamoDB: its shard, and the item itself
+        if its changes are tracked.
+        """
+        if self._is_sharded_at_random():
+            hash_key = attribute_values.get(self._hash_key_attribute().attr_name)
+            if hash_key is not None and STRING in hash_key:
+                self._shard = get_shard(hash_key[STRING])
+        if self._tracks_changes():
+            self._loaded_values = attribute_values
+
+    def _get_change_actions(self, attribute_values: Dict[str, Dict[str, Any]]) -> Optional[List[Action]]:
+        """
+        Returns the update actions that turn the item as it was loaded into the given serialized item,
+        or None if the item was not loaded or its key changed.
+        """
+        loaded = self._loaded_values
+        if loaded is None:
+            return None
+        key_names = [attr.attr_name for attr in (self._hash_key_attribute(), self._range_key_attribute()) if attr is not None]
+        for name in key_names:
+            if name not in loaded or name not in attribute_values or not attr_values_equal(loaded[name], attribute_values[name]):
+                return None
+        skipped = set(key_names)
+        if self._version_attribute_name is not None:
+            # The version attribute is set by `_handle_version_attribute`
+            skipped.add(self.get_attributes()[self._version_attribute_name].attr_name)
+
+        actions: List[Action] = []
+        for name, value in attribute_values.items():
+            if name in skipped:
+                continue
+            if name not in loaded:
+                actions.append(SetAction(Path([name]), Value(value)))
+                continue
+            for path, new_value in attr_value_changes(loaded[name], value, [name]):
+                if new_value is None:
+                    actions.append(RemoveAction(Path(path)))
+                else:
+                    actions.append(SetAction(Path(path), Value(new_value)))
+        for name in loaded:
+            if name not in attribute_values and name not in skipped:
+                actions.append(RemoveAction(Path([name])))
+        return actions
+
+    def _set_saved_version(self, attribute_values: Dict[str, Dict[str, Any]]) -> None:
+        if self._version_attribute_name is not None:
+            version_attribute = self.get_attributes()[self._version_attribute_name]
+            attribute_values[version_attribute.attr_name] = self._serialize_value(
+                version_attribute, getattr(self, self._version_attribute_name),
+            )
+
     async def refresh(self, consistent_read: bool = False) -> None:
         """
         Retrieves this object's data from dynamodb and syncs this local object
@@ -463,6 +1170,8 @@ class Model(AttributeContainer, metaclass=MetaModel):
         item_data = attrs.get(ITEM, None)
         if item_data is None:
             raise self.DoesNotExist("This item does not exist in the table.")
+        if LARGE_ITEM_MANIFEST in item_data:
+            item_data = await self._read_chunks(item_data, consistent_read)
         stored_cls = self._get_discriminator_class(item_data)
         if stored_cls and stored_cls != type(self):
             raise ValueError("Cannot refresh this item from the returned class: {}".format(stored_cls.__name__))
@@ -516,6 +1225,7 @@ class Model(AttributeContainer, metaclass=MetaModel):
         range_key: Optional[_KeyType] = None,
         condition: Optional[Condition] = None,
     ) -> Dict[str, Any]:
+        cls._check_locatable()
         hash_key, range_key = cls._serialize_keys(hash_key, range_key)
         return cls._get_connection().get_operation_kwargs(
             hash_key=hash_key,
@@ -530,6 +1240,8 @@ class Model(AttributeContainer, metaclass=MetaModel):
         range_key: Optional[_KeyType] = None,
         consistent_read: bool = False,
         attributes_to_get: Optional[Sequence[Text]] = None,
+        lazy: Optional[bool] = None,
+        result_mode: str = RESULT_MODEL,
     ) -> _T:
         """
         Returns a single object using the provided keys
@@ -538,9 +1250,33 @@ class Model(AttributeContainer, metaclass=MetaModel):
         :param range_key: The range key of the desired item, only used when appropriate.
         :param consistent_read:
         :param attributes_to_get:
+        :param lazy: If set, overrides the model's `Meta.lazy` setting (see :meth:`from_raw_data`)
+        :param result_mode: 'model' (the default) returns model instances, 'dict' returns dictionaries of
+            decoded attribute values and 'raw' returns the DynamoDB attribute values as is
         :raises ModelInstance.DoesNotExist: if the object to be updated does not exist
         """
+        map_fn = cls._get_result_map_fn(result_mode, lazy)
         hash_key, range_key = cls._serialize_keys(hash_key, range_key)
+        if cls._is_sharded_at_random():
+            item_data = await cls._get_from_shards(hash_key, range_key, consistent_read, attributes_to_get)
+            if item_data:
+                return map_fn(item_data)
+            raise cls.DoesNotExist()
+
+        has_key = range_key is not None or cls._range_keyname is None
+        cache = cls._get_cache() if attributes_to_get is None and has_key else None
+        negative_cache = cls._get_negative_cache() if has_key else None
+        if cache is not None or negative_cache is not None:
+            identity = cls._get_key_identity(cls._get_key_map(hash_key, range_key))
+        if not consistent_read:
+            if cache is not None:
+                item_data, stale = cache.lookup(identity)
+                if item_data is not None:
+                    if stale:
+                        cache.revalidate(identity, functools.partial(cls._get_raw_item, hash_key, range_key))
+                    return map_fn(item_data)
+            if negative_cache is not None and negative_cache.is_missing(identity):
+                raise cls.DoesNotExist()
 
         data = await cls._get_connection().get_item(
             hash_key,
@@ -548,24 +1284,188 @@ class Model(AttributeContainer, metaclass=MetaModel):
             consistent_read=consistent_read,
             attributes_to_get=attributes_to_get,
         )
-        if data:
-            item_data = data.get(ITEM)
+        item_data = data.get(ITEM) if data else None
+        if item_data and LARGE_ITEM_MANIFEST in item_data and attributes_to_get is None:
+            item_data = await cls._read_chunks(item_data, consistent_read)
+        if cache is not None:
+            if item_data:
+                cache.set(identity, item_data)
+            else:
+                cache.invalidate(identity)
+        if negative_cache is not None:
             if item_data:
-                return cls.from_raw_data(item_data)
+                negative_cache.add_existing(identity)
+            elif attributes_to_get is None:
+                # With a projection, an empty result may be an item that has none of the attributes
+                negative_cache.add_missing(identity)
+        if item_data:
+            return map_fn(item_data)
         raise cls.DoesNotExist()
 
     @classmethod
-    def from_raw_data(cls: Type[_T], data: Dict[str, Any]) -> _T:
+    async def _get_from_shards(
+        cls,
+        hash_key: Any,
+        range_key: Any,
+        consistent_read: bool,
+        attributes_to_get: Optional[Sequence[Text]],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Reads an item of a model sharded at random by serialized key, returning its attribute values or None
+        if it does not exist. The shard of the item is not known, so the key is read from every shard at once.
+        """
+        shards = cast(int, cls._hash_key_shards)
+
+        async def keys() -> AsyncIterator[Dict[str, Any]]:
+            for sharded_hash_key in shard_hash_keys(hash_key, shards):
+                yield cls._get_key_map(sharded_hash_key, range_key)
+
+        item_data = None
+        async for _, page in cls._batch_get_raw(
+            keys(),
+            consistent_read=consistent_read,
+            attributes_to_get=attributes_to_get,
+            concurrency=-(-shards // BATCH_GET_PAGE_LIMIT),
+        ):
+            if page:
+                item_data = page[0]
+        return item_data
+
+    @classmethod
+    def _check_locatable(cls) -> None:
+        if cls._is_sharded_at_random():
+            raise ValueError(
+                "The shard of an item of {} is not known: read it with get or query".format(cls.__name__))
+
+    @classmethod
+    def _get_cache(cls) -> Optional[ItemCache]:
+        return getattr(getattr(cls, 'Meta', None), 'cache', None)
+
+    @classmethod
+    def _get_negative_cache(cls) -> Optional[NegativeLookupCache]:
+        return getattr(getattr(cls, 'Meta', None), 'negative_cache', None)
+
+    @classmethod
+    async def _get_raw_item(cls, hash_key: Any, range_key: Optional[Any] = None) -> Optional[Dict[str, Any]]:
+        """
+        Reads an item by serialized key, returning its attribute values or None if it does not exist
+        """
+        data = await cls._get_connection().get_item(hash_key, range_key=range_key)
+        item_data = data.get(ITEM) if data else None
+        if item_data and LARGE_ITEM_MANIFEST in item_data:
+            item_data = await cls._read_chunks(item_data)
+        return item_data
+
+    @classmethod
+    def _get_key_map(cls, hash_key: Any, range_key: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Returns the key map of serialized hash and range keys
+        """
+        key = {cls._hash_key_attribute().attr_name: hash_key}
+        range_key_attribute = cls._range_key_attribute()
+        if range_key_attribute is not None:
+            key[range_key_attribute.attr_name] = range_key
+        return key
+
+    @classmethod
+    def _get_key_values(cls, key: Dict[str, Any]) -> Tuple[Any, Optional[Any]]:
+        """
+        Returns the serialized hash and range keys of a key map
+        """
+        range_key_attribute = cls._range_key_attribute()
+        return key[cls._hash_key_attribute().attr_name], key[range_key_attribute.attr_name] if range_key_attribute else None
+
+    @classmethod
+    def _cache_item(cls, item: Dict[str, Any]) -> None:
+        cache = cls._get_cache()
+        if cache is not None:
+            cache.set(cls._get_key_identity(item), item)
+        negative_cache = cls._get_negative_cache()
+        if negative_cache is not None:
+            negative_cache.add_existing(cls._get_key_identity(item))
+
+    @classmethod
+    def _invalidate_cached(cls, keys: Iterable[Dict[str, Any]], exists: bool = False) -> None:
+        """
+        Removes items from the cache, given their keys or the items themselves
+
+        :param exists: Whether the items may exist after the write, which the negative cache has to know about
+        """
+        cache = cls._get_cache()
+        negative_cache = cls._get_negative_cache() if exists else None
+        if cache is None and negative_cache is None:
+            return
+        for key in keys:
+            identity = cls._get_key_identity(key)
+            if cache is not None:
+                cache.invalidate(identity)
+            if negative_cache is not None:
+                negative_cache.add_existing(identity)
+
+    @classmethod
+    def from_raw_data(cls: Type[_T], data: Dict[str, Any], lazy: Optional[bool] = None) -> _T:
         """
         Returns an instance of this class
         from the raw data
 
         :param data: A serialized DynamoDB object
+        :param lazy: If True, each attribute is only decoded the first time it is read, and attributes
+            that are never read or assigned are serialized from `data` as is. Defaults to `Meta.lazy`.
         """
         if data is None:
             raise ValueError("Received no data to construct object")
 
-        return cls._instantiate(data)
+        if lazy is None:
+            lazy = getattr(getattr(cls, 'Meta', None), 'lazy', False)
+        instance = cls._instantiate(cls._unshard_item(data), lazy=lazy)
+        instance._set_loaded_values(data)
+        return instance
+
+    @classmethod
+    def _get_result_map_fn(cls, result_mode: str, lazy: Optional[bool]) -> Callable[[Dict[str, Any]], Any]:
+        """
+        Returns the function that converts items read from DynamoDB for the given result mode:
+
+        * 'model' returns instances of this class
+        * 'dict' returns dictionaries keyed by python attribute name with the values decoded by the
+          attribute types, without instantiating models (nested maps are dictionaries as well)
+        * 'raw' returns the DynamoDB attribute value dictionaries as is
+        """
+        if result_mode == RESULT_MODEL:
+            return functools.partial(cls.from_raw_data, lazy=lazy)
+        if result_mode == RESULT_DICT:
+            if cls._hash_key_shards is not None:
+                return lambda item: cls._to_python_dict(cls._unshard_item(item))
+            return cls._to_python_dict
+        if result_mode == RESULT_RAW:
+            return _identity
+        raise ValueError("result_mode must be one of {}".format(RESULT_MODES))
+
+    @classmethod
+    def to_json_lines(cls: Type[_T], items: Iterable[_T], force: bool = False) -> Iterator[str]:
+        """
+        Encodes items as JSON lines: one line (ending with a newline) per item, holding the mapping of
+        :meth:`~aiopynamodb.attributes.AttributeContainer.to_simple_dict`.
+
+        The lines are encoded straight from the serialized attribute values, without building the mappings.
+
+        :param force: If :code:`True`, encodes binary and set attributes (see `to_simple_dict`)
+        """
+        for item in items:
+            yield attr_values_to_json(item._container_serialize(null_check=False), force) + '\n'
+
+    @classmethod
+    def from_json_lines(cls: Type[_T], stream: Iterable[Union[str, bytes]]) -> Iterator[_T]:
+        """
+        Decodes the items of JSON lines produced by :meth:`to_json_lines`, such as the lines of a file.
+        Blank lines are skipped.
+        """
+        for line in stream:
+            if not line.strip():
+                continue
+            item = cls(_user_instantiated=False)
+            item.from_simple_dict(_json.loads(line))
+            yield item
 
     @classmethod
     async def count(
@@ -577,20 +1477,30 @@ class Model(AttributeContainer, metaclass=MetaModel):
         index_name: Optional[str] = None,
         limit: Optional[int] = None,
         rate_limit: Optional[float] = None,
+        range_key_boundaries: Optional[Sequence[Any]] = None,
+        concurrency: int = PARALLEL_SCAN_CONCURRENCY,
     ) -> int:
         """
         Provides a filtered count
 
+        Without a hash key, returns the item count of the table from DescribeTable, which DynamoDB only updates
+        every six hours or so; see :meth:`count_scan` for an exact count.
+
         :param hash_key: The hash key to query. Can be None.
         :param range_key_condition: Condition for range key
         :param filter_condition: Condition used to restrict the query results
         :param consistent_read: If True, a consistent read is performed
         :param index_name: If set, then this index is used
+        :param limit: The maximum number of items evaluated by each request. With a sharded hash key, each shard
+            is counted up to this limit, and the count is capped at it.
         :param rate_limit: If set then consumed capacity will be limited to this amount per second
+        :param range_key_boundaries: If set, the item collection is split at these range key values (in ascending
+            order), and the ranges are counted concurrently. Can't be combined with `range_key_condition` or `limit`.
+        :param concurrency: The number of ranges counted at the same time when `range_key_boundaries` is set
         """
         if hash_key is None:
             if filter_condition is not None:
-                raise ValueError('A hash_key must be given to use filters')
+                raise ValueError('A hash_key must be given to use filters, or use count_scan')
             return (await cls.describe_table()).get(ITEM_COUNT)
 
         if index_name:
@@ -603,7 +1513,22 @@ class Model(AttributeContainer, metaclass=MetaModel):
         if discriminator_attr:
             filter_condition &= discriminator_attr.is_in(*discriminator_attr.get_registered_subclasses(cls))
 
-        query_args = (hash_key,)
+        # The shards of a sharded hash key are counted concurrently
+        hash_keys = cls._get_query_hash_keys(hash_key, index_name)
+
+        if range_key_boundaries is not None:
+            if range_key_condition is not None or limit is not None:
+                raise ValueError("range_key_boundaries can't be combined with range_key_condition or limit")
+            return await cls._count_ranges(
+                hash_keys,
+                range_key_boundaries,
+                filter_condition=filter_condition,
+                consistent_read=consistent_read,
+                index_name=index_name,
+                rate_limit=rate_limit,
+                concurrency=concurrency,
+            )
+
         query_kwargs = dict(
             range_key_condition=range_key_condition,
             filter_condition=filter_condition,
@@ -612,20 +1537,156 @@ class Model(AttributeContainer, metaclass=MetaModel):
             limit=limit,
             select=COUNT
         )
+        rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+
+        async def count_items(hash_key: Any) -> int:
+            result_iterator: ResultIterator[_T] = ResultIterator(
+                cls._get_connection().query,
+                (hash_key,),
+                dict(query_kwargs),
+                limit=limit,
+            )
+            result_iterator.page_iter.rate_limiter = rate_limiter
 
-        result_iterator: ResultIterator[_T] = ResultIterator(
-            cls._get_connection().query,
-            query_args,
-            query_kwargs,
-            limit=limit,
-            rate_limit=rate_limit,
+            # iterate through results
+            async for _ in result_iterator:
+                pass
+
+            return result_iterator.total_count
+
+        counts = await asyncio.gather(*(count_items(hash_key) for hash_key in hash_keys))
+        if len(counts) > 1 and limit is not None:
+            # Each shard of a sharded hash key is counted up to the limit
+            return min(sum(counts), limit)
+        return sum(counts)
+
+    @classmethod
+    async def _count_ranges(
+        cls,
+        hash_keys: Sequence[Any],
+        range_key_boundaries: Sequence[Any],
+        filter_condition: Optional[Condition],
+        consistent_read: bool,
+        index_name: Optional[str],
+        rate_limit: Optional[float],
+        concurrency: int,
+    ) -> int:
+        """
+        Counts an item collection (stored under the given hash keys) split at the given range key values,
+        with concurrent queries.
+
+        A key condition can only hold a single range key condition, so the ranges are `<= b0`, `between(b0, b1)`, ...
+        and `> bn`, and the items equal to the boundaries that are counted twice are counted again and subtracted.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be greater than zero")
+        range_key_attr = cls._get_query_range_key_attribute(index_name)
+        if range_key_attr is None:
+            raise ValueError("range_key_boundaries requires a range key")
+        if not range_key_boundaries:
+            raise ValueError("range_key_boundaries must not be empty")
+
+        conditions: List[Condition] = [range_key_attr <= range_key_boundaries[0]]
+        conditions.extend(
+            range_key_attr.between(lower, upper) for lower, upper in zip(range_key_boundaries, range_key_boundaries[1:])
         )
+        conditions.append(range_key_attr > range_key_boundaries[-1])
+        overlaps = [range_key_attr == boundary for boundary in range_key_boundaries[:-1]]
+
+        rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def count_range(hash_key: Any, range_key_condition: Condition) -> int:
+            async with semaphore:
+                result_iterator: ResultIterator[Dict[str, Any]] = ResultIterator(
+                    cls._get_connection().query,
+                    (hash_key,),
+                    dict(
+                        range_key_condition=range_key_condition,
+                        filter_condition=filter_condition,
+                        index_name=index_name,
+                        consistent_read=consistent_read,
+                        select=COUNT,
+                    ),
+                )
+                result_iterator.page_iter.rate_limiter = rate_limiter
+                async for _ in result_iterator:
+                    pass
+                return result_iterator.total_count
+
+        ranges = [(hash_key, condition) for hash_key in hash_keys for condition in conditions]
+        overlapping_ranges = [(hash_key, condition) for hash_key in hash_keys for condition in overlaps]
+        counts = await asyncio.gather(*(count_range(*args) for args in ranges + overlapping_ranges))
+        return sum(counts[:len(ranges)]) - sum(counts[len(ranges):])
 
-        # iterate through results
-        async for _ in result_iterator:
-            pass
+    @classmethod
+    def _get_query_range_key_attribute(cls, index_name: Optional[str]) -> Optional[Attribute]:
+        """
+        Returns the range key attribute of the table, or of the given index
+        """
+        if index_name:
+            return next((attr for attr in cls._indexes[index_name].Meta.attributes.values() if attr.is_range_key), None)
+        return cls._range_key_attribute()
 
-        return result_iterator.total_count
+    @classmethod
+    def _get_query_hash_keys(cls, hash_key: Any, index_name: Optional[str]) -> List[Any]:
+        """
+        Returns the stored hash keys of the item collection of a serialized hash key: the hash keys of all its shards
+        if it is sharded. Local secondary indexes share the hash key of the table, global secondary indexes have their own.
+        """
+        shards = cls._hash_key_shards
+        if shards is None or (index_name and not isinstance(cls._indexes[index_name], LocalSecondaryIndex)):
+            return [hash_key]
+        return shard_hash_keys(hash_key, shards)
+
+    @classmethod
+    async def count_scan(
+        cls: Type[_T],
+        filter_condition: Optional[Condition] = None,
+        total_segments: Optional[int] = None,
+        concurrency: int = PARALLEL_SCAN_CONCURRENCY,
+        rate_limit: Optional[float] = None,
+        consistent_read: Optional[bool] = None,
+        index_name: Optional[str] = None,
+        progress_callback: Optional[Callable[[SegmentProgress], Any]] = None,
+    ) -> int:
+        """
+        Returns the exact number of items matching `filter_condition`, with a parallel scan that only
+        returns the counts (Select=COUNT). Scanning consumes read capacity for the whole table.
+
+        See :meth:`parallel_scan` for the parameters.
+        """
+        discriminator_attr = cls._get_discriminator_attribute()
+        if discriminator_attr:
+            filter_condition &= discriminator_attr.is_in(*discriminator_attr.get_registered_subclasses(cls))
+        if total_segments is None:
+            total_segments = concurrency * PARALLEL_SCAN_SEGMENTS_PER_WORKER
+
+        def segment_factory(segment: int) -> ResultIterator[Dict[str, Any]]:
+            return ResultIterator(
+                cls._get_connection().scan,
+                (),
+                dict(
+                    filter_condition=filter_condition,
+                    segment=segment,
+                    total_segments=total_segments,
+                    consistent_read=consistent_read,
+                    index_name=index_name,
+                    select=COUNT,
+                ),
+            )
+
+        results: ParallelScanIterator[Dict[str, Any]] = ParallelScanIterator(
+            segment_factory,
+            total_segments=total_segments,
+            concurrency=concurrency,
+            rate_limit=rate_limit,
+            progress_callback=progress_callback,
+        )
+        async with results:
+            async for _ in results:
+                pass
+        return results.total_count
 
     @classmethod
     def query(
@@ -641,6 +1702,9 @@ class Model(AttributeContainer, metaclass=MetaModel):
         attributes_to_get: Optional[Iterable[str]] = None,
         page_size: Optional[int] = None,
         rate_limit: Optional[float] = None,
+        lazy: Optional[bool] = None,
+        result_mode: str = RESULT_MODEL,
+        prefetch: int = 0,
     ) -> ResultIterator[_T]:
         """
         Provides a high level query API
@@ -657,6 +1721,10 @@ class Model(AttributeContainer, metaclass=MetaModel):
         :param attributes_to_get: If set, only returns these elements
         :param page_size: Page size of the query to DynamoDB
         :param rate_limit: If set then consumed capacity will be limited to this amount per second
+        :param lazy: If set, overrides the model's `Meta.lazy` setting (see :meth:`from_raw_data`)
+        :param result_mode: 'model' (the default) returns model instances, 'dict' returns dictionaries of
+            decoded attribute values and 'raw' returns the DynamoDB attribute values as is
+        :param prefetch: If set, up to this many pages are fetched ahead in the background
         """
         if index_name:
             hash_key = cls._indexes[index_name]._hash_key_attribute().serialize(hash_key)
@@ -671,6 +1739,7 @@ class Model(AttributeContainer, metaclass=MetaModel):
         if page_size is None:
             page_size = limit
 
+        hash_keys = cls._get_query_hash_keys(hash_key, index_name)
         query_args = (hash_key,)
         query_kwargs = dict(
             range_key_condition=range_key_condition,
@@ -683,13 +1752,50 @@ class Model(AttributeContainer, metaclass=MetaModel):
             attributes_to_get=attributes_to_get,
         )
 
+        map_fn = cls._get_result_map_fn(result_mode, lazy)
+
+        if hash_keys != [hash_key]:
+            # The shards of the hash key are queried concurrently, and their items merged in range key order
+            if last_evaluated_key is not None:
+                raise ValueError("The queries of a sharded hash key can't be resumed from a last_evaluated_key")
+            range_key_attribute = cast(Attribute, cls._get_query_range_key_attribute(index_name))
+            range_key_name, range_key_type = range_key_attribute.attr_name, range_key_attribute.attr_type
+            if attributes_to_get is not None:
+                # The range keys of the items are needed to merge them
+                attributes_to_get = list(attributes_to_get)
+                # (given as names or as document paths, e.g. by views)
+                if not any(getattr(name, 'path', [name]) == [range_key_name] for name in attributes_to_get):
+                    attributes_to_get.append(range_key_name)
+                query_kwargs['attributes_to_get'] = attributes_to_get
+            sort_key = range_key_sort_key(range_key_type)
+            return MergedResultIterator(
+                [
+                    ResultIterator(
+                        cls._get_connection().query,
+                        (sharded_hash_key,),
+                        dict(query_kwargs),
+                        limit=limit,
+                        prefetch=prefetch,
+                    )
+                    for sharded_hash_key in hash_keys
+                ],
+                sort_key=lambda item: sort_key(item[range_key_name][range_key_type]),
+                descending=scan_index_forward is False,
+                map_fn=map_fn,
+                limit=limit,
+                rate_limit=rate_limit,
+                container_cls=cls,
+            )
+
         return ResultIterator(
             cls._get_connection().query,
             query_args,
             query_kwargs,
-            map_fn=cls.from_raw_data,
+            map_fn=map_fn,
             limit=limit,
             rate_limit=rate_limit,
+            container_cls=cls,
+            prefetch=prefetch,
         )
 
     @classmethod
@@ -705,6 +1811,9 @@ class Model(AttributeContainer, metaclass=MetaModel):
         index_name: Optional[str] = None,
         rate_limit: Optional[float] = None,
         attributes_to_get: Optional[Sequence[str]] = None,
+        lazy: Optional[bool] = None,
+        result_mode: str = RESULT_MODEL,
+        prefetch: int = 0,
     ) -> ResultIterator[_T]:
         """
         Iterates through all items in the table
@@ -719,6 +1828,10 @@ class Model(AttributeContainer, metaclass=MetaModel):
         :param index_name: If set, then this index is used
         :param rate_limit: If set then consumed capacity will be limited to this amount per second
         :param attributes_to_get: If set, specifies the properties to include in the projection expression
+        :param lazy: If set, overrides the model's `Meta.lazy` setting (see :meth:`from_raw_data`)
+        :param result_mode: 'model' (the default) returns model instances, 'dict' returns dictionaries of
+            decoded attribute values and 'raw' returns the DynamoDB attribute values as is
+        :param prefetch: If set, up to this many pages are fetched ahead in the background
         """
         # If this class has a discriminator attribute, filter the scan to only return instances of this class.
         discriminator_attr = cls._get_discriminator_attribute()
@@ -744,9 +1857,71 @@ class Model(AttributeContainer, metaclass=MetaModel):
             cls._get_connection().scan,
             scan_args,
             scan_kwargs,
-            map_fn=cls.from_raw_data,
+            map_fn=cls._get_result_map_fn(result_mode, lazy),
             limit=limit,
             rate_limit=rate_limit,
+            container_cls=cls,
+            prefetch=prefetch,
+        )
+
+    @classmethod
+    def parallel_scan(
+        cls: Type[_T],
+        filter_condition: Optional[Condition] = None,
+        total_segments: Optional[int] = None,
+        concurrency: int = PARALLEL_SCAN_CONCURRENCY,
+        limit: Optional[int] = None,
+        page_size: Optional[int] = None,
+        consistent_read: Optional[bool] = None,
+        index_name: Optional[str] = None,
+        rate_limit: Optional[float] = None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+        lazy: Optional[bool] = None,
+        result_mode: str = RESULT_MODEL,
+        progress_callback: Optional[Callable[[SegmentProgress], Any]] = None,
+    ) -> ParallelScanIterator[_T]:
+        """
+        Iterates through all items in the table, scanning several segments concurrently
+
+        :param filter_condition: Condition used to restrict the scan results
+        :param total_segments: The number of segments to split the table into.
+            Defaults to several segments per worker, so that workers that finish early pick up pending segments.
+        :param concurrency: The number of segments scanned at the same time
+        :param limit: Used to limit the number of results returned
+        :param page_size: Page size of the scan to DynamoDB
+        :param consistent_read: If True, a consistent read is performed
+        :param index_name: If set, then this index is used
+        :param rate_limit: If set then consumed capacity, across all segments, will be limited to this amount per second
+        :param attributes_to_get: If set, specifies the properties to include in the projection expression
+        :param lazy: If set, overrides the model's `Meta.lazy` setting (see :meth:`from_raw_data`)
+        :param result_mode: 'model' (the default) returns model instances, 'dict' returns dictionaries of
+            decoded attribute values and 'raw' returns the DynamoDB attribute values as is
+        :param progress_callback: If set, called with the :class:`~aiopynamodb.pagination.SegmentProgress`
+            of a segment after each of its pages and when it is done
+        """
+        if total_segments is None:
+            total_segments = concurrency * PARALLEL_SCAN_SEGMENTS_PER_WORKER
+
+        def segment_factory(segment: int) -> ResultIterator[_T]:
+            return cls.scan(
+                filter_condition=filter_condition,
+                segment=segment,
+                total_segments=total_segments,
+                page_size=page_size,
+                consistent_read=consistent_read,
+                index_name=index_name,
+                attributes_to_get=attributes_to_get,
+                lazy=lazy,
+                result_mode=result_mode,
+            )
+
+        return ParallelScanIterator(
+            segment_factory,
+            total_segments=total_segments,
+            concurrency=concurrency,
+            limit=limit,
+            rate_limit=rate_limit,
+            progress_callback=progress_callback,
         )
 
     @classmethod
@@ -889,7 +2064,13 @@ class Model(AttributeContainer, metaclass=MetaModel):
 
         return schema
 
-    def _get_save_args(self, condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Tuple[Iterable[Any], Dict[str, Any]]:
+    def _get_save_args(
+        self,
+        condition: Optional[Condition] = None,
+        *,
+        add_version_condition: bool = True,
+        attribute_values: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Tuple[Iterable[Any], Dict[str, Any]]:
         """
         Gets the proper *args, **kwargs for saving and retrieving this object
 
@@ -899,8 +2080,11 @@ class Model(AttributeContainer, metaclass=MetaModel):
         :param add_version_condition: For models which have a :class:`~pynamodb.attributes.VersionAttribute`,
           specifies whether the item should only be saved if its current version matches the expected one.
           Set to `False` for a 'last-write-wins' strategy.
+        :param attribute_values: The item, if it is already serialized and size checked
         """
-        attribute_values = self.serialize(null_check=True)
+        if attribute_values is None:
+            attribute_values = self.serialize(null_check=True)
+            self._check_item_size(attribute_values)
         hash_key_attribute = self._hash_key_attribute()
         hash_key = attribute_values.pop(hash_key_attribute.attr_name, {}).get(hash_key_attribute.attr_type)
         range_key = None
@@ -918,6 +2102,66 @@ class Model(AttributeContainer, metaclass=MetaModel):
         kwargs['condition'] = condition
         return args, kwargs
 
+    def get_item_size(self) -> int:
+        """
+        Returns the size of this item in bytes, as DynamoDB computes it for the item size limit.
+        """
+        return item_size(self.serialize(null_check=False))
+
+    @classmethod
+    def estimate_capacity(cls: Type[_T], item: _T) -> CapacityEstimate:
+        """
+        Returns the size of an item and the capacity units consumed by reading and writing it,
+        including the writes to the secondary indexes it is projected into.
+        """
+        return estimate_capacity(type(item), item.serialize(null_check=False))
+
+    @classmethod
+    def estimate_capacity_from_sample(cls: Type[_T], items: Iterable[Any]) -> CapacityReport:
+        """
+        Returns a report of the item sizes and capacity units of a sample of items, e.g. read with a scan.
+
+        :param items: Instances of this model, or items read with :code:`result_mode='raw'`
+        """
+        return estimate_sample_capacity(cls, items)
+
+    @classmethod
+    def _check_item_size(cls, attribute_values: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Returns the size of the serialized item, raising SizeLimitExceededError if DynamoDB would reject it.
+        """
+        size = item_size(attribute_values)
+        if size > ITEM_SIZE_LIMIT:
+            key = {
+                attr.attr_name: attribute_values.get(attr.attr_name, {}).get(attr.attr_type)
+                for attr in (cls._hash_key_attribute(), cls._range_key_attribute()) if attr is not None
+            }
+            largest = sorted(
+                ((len(name.encode()) + attr_value_size(value), name) for name, value in attribute_values.items()),
+                reverse=True,
+            )[:3]
+            raise SizeLimitExceededError(
+                "{} item {} is {} bytes, which exceeds the DynamoDB item size limit of {} bytes "
+                "(largest attributes: {})".format(
+                    cls.__name__, key, size, ITEM_SIZE_LIMIT,
+                    ', '.join('{} ({} bytes)'.format(name, attr_size) for attr_size, name in largest),
+                ),
+                size=size,
+                limit=ITEM_SIZE_LIMIT,
+            )
+        return size
+
+    @classmethod
+    def _get_key_size(cls, keys: Dict[str, Any]) -> int:
+        """
+        Returns the size of a key map, as returned by `_get_keys`
+        """
+        return item_size({
+            attr.attr_name: {attr.attr_type: keys[attr.attr_name]}
+            for attr in (cls._hash_key_attribute(), cls._range_key_attribute())
+            if attr is not None and attr.attr_name in keys
+        })
+
     def _get_hash_range_key_serialized_values(self) -> Tuple[Any, Optional[Any]]:
         if self._hash_keyname is None:
             raise Exception("The model has no hash key")
@@ -933,6 +2177,7 @@ class Model(AttributeContainer, metaclass=MetaModel):
             if rk_value is not None:
                 rk_serialized_value = attrs[self._range_keyname].serialize(rk_value)
 
+        hk_serialized_value = self._shard_hash_key(hk_serialized_value, rk_serialized_value, self._get_random_shard())
         return hk_serialized_value, rk_serialized_value
 
     def _handle_version_attribute(self, *, attributes: Optional[Dict[str, Any]] = None, actions: Optional[List[Action]] = None) -> Optional[Condition]:
@@ -1007,7 +2252,208 @@ class Model(AttributeContainer, metaclass=MetaModel):
     def _get_serialized_keys(self) -> Tuple[_KeyType, _KeyType]:
         hash_key = getattr(self, self._hash_keyname) if self._hash_keyname else None
         range_key = getattr(self, self._range_keyname) if self._range_keyname else None
-        return self._serialize_keys(hash_key, range_key)
+        return self._serialize_keys(hash_key, range_key, self._get_random_shard())
+
+    @classmethod
+    def _batch_get_key(cls, item: _KeyType) -> Dict[str, Any]:
+        """
+        Returns the serialized key map for a key given to batch_get
+        """
+        cls._check_locatable()
+        hash_key_attribute = cls._hash_key_attribute()
+        range_key_attribute = cls._range_key_attribute()
+        if range_key_attribute:
+            if isinstance(item, str):
+                raise ValueError(f'Invalid key value {item!r}: '
+                                 'expected non-str iterable with exactly 2 elements (hash key, range key)')
+            try:
+                hash_key, range_key = item
+            except (TypeError, ValueError):
+                raise ValueError(f'Invalid key value {item!r}: '
+                                 'expected iterable with exactly 2 elements (hash key, range key)')
+            hash_key_ser, range_key_ser = cls._serialize_keys(hash_key, range_key)
+            return {
+                hash_key_attribute.attr_name: hash_key_ser,
+                range_key_attribute.attr_name: range_key_ser,
+            }
+        hash_key_ser, _ = cls._serialize_keys(item)
+        return {hash_key_attribute.attr_name: hash_key_ser}
+
+    @classmethod
+    def _get_key_identity(cls, key: Dict[str, Any]) -> Tuple:
+        """
+        Returns a hashable identity for a serialized key map, or the key attributes of an item.
+
+        Numbers are compared by value, since DynamoDB does not return them in the form they were sent in.
+        Sharded hash keys are identified without their shard, as the items of models sharded at random
+        are looked up without one.
+        """
+        identity = []
+        for attr in (cls._hash_key_attribute(), cls._range_key_attribute()):
+            if attr is None:
+                continue
+            value = key[attr.attr_name]
+            if isinstance(value, dict):
+                value = value[attr.attr_type]
+            if attr.attr_type == NUMBER:
+                value = Decimal(value)
+            elif attr.is_hash_key and cls._hash_key_shards is not None:
+                value = unshard_hash_key(value)
+            identity.append(value)
+        return tuple(identity)
+
+    @classmethod
+    async def _batch_get_keys(
+        cls,
+        items: Union[Iterable[_KeyType], AsyncIterable[_KeyType]],
+        identities: List[Tuple],
+        keys: Optional[List[_KeyType]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Serializes and de-duplicates the keys given to batch_get, recording their identities in request order
+        """
+        seen = set()
+        if isinstance(items, AsyncIterable):
+            async_items = items
+        else:
+            async def async_items_iter() -> AsyncIterator[_KeyType]:
+                for item in items:  # type: ignore
+                    yield item
+            async_items = async_items_iter()
+        async for item in async_items:
+            key = cls._batch_get_key(item)
+            identity = cls._get_key_identity(key)
+            if identity in seen:
+                continue
+            seen.add(identity)
+            identities.append(identity)
+            if keys is not None:
+                keys.append(item)
+            yield key
+
+    @classmethod
+    async def _batch_get_raw(
+        cls,
+        keys: AsyncIterator[Dict[str, Any]],
+        consistent_read: Optional[bool],
+        attributes_to_get: Optional[Sequence[str]],
+        concurrency: int,
+    ) -> AsyncIterator[Tuple[List[Tuple], List[Dict[str, Any]]]]:
+        """
+        Retrieves the keys with up to `concurrency` BatchGetItem requests in flight, retrying unprocessed keys.
+
+        Yields, for each completed request, the identities of the keys it resolved and the items it returned.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be greater than zero")
+        queue: List[Dict[str, Any]] = []
+        in_flight: Dict[asyncio.Future, List[Dict[str, Any]]] = {}
+        exhausted = False
+        # Keys served from the caches, returned before waiting for the requests in flight
+        cached_identities: List[Tuple] = []
+        cached_items: List[Dict[str, Any]] = []
+        try:
+            while True:
+                while len(in_flight) < concurrency:
+                    while not exhausted and len(queue) < BATCH_GET_PAGE_LIMIT:
+                        try:
+                            key = await keys.__anext__()
+                        except StopAsyncIteration:
+                            exhausted = True
+                            break
+                        cached = cls._lookup_cached(key, consistent_read, attributes_to_get)
+                        if cached is not None:
+                            identity, cached_item = cached
+                            cached_identities.append(identity)
+                            if cached_item is not None:
+                                cached_items.append(cached_item)
+                            continue
+                        queue.append(key)
+                    if not queue:
+                        break
+                    keys_to_get = queue[:BATCH_GET_PAGE_LIMIT]
+                    del queue[:BATCH_GET_PAGE_LIMIT]
+                    future = asyncio.ensure_future(cls._batch_get_page(
+                        keys_to_get,
+                        consistent_read=consistent_read,
+                        attributes_to_get=attributes_to_get,
+                    ))
+                    in_flight[future] = keys_to_get
+                if cached_identities:
+                    yield cached_identities, cached_items
+                    cached_identities, cached_items = [], []
+                if not in_flight:
+                    return
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    keys_to_get = in_flight.pop(future)
+                    page, unprocessed_keys = future.result()
+                    identities = {cls._get_key_identity(key) for key in keys_to_get}
+                    if unprocessed_keys:
+                        queue[:0] = unprocessed_keys
+                        identities.difference_update(cls._get_key_identity(key) for key in unprocessed_keys)
+                    cls._cache_batch_page(identities, page or [], attributes_to_get)
+                    yield list(identities), page or []
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    @classmethod
+    def _lookup_cached(
+        cls,
+        key: Dict[str, Any],
+        consistent_read: Optional[bool],
+        attributes_to_get: Optional[Sequence[str]],
+    ) -> Optional[Tuple[Tuple, Optional[Dict[str, Any]]]]:
+        """
+        Looks up a key of a batch get in the caches, returning its identity and its cached item (None if it
+        is known to be missing), or None if the item has to be read.
+        """
+        if consistent_read:
+            return None
+        cache = cls._get_cache() if attributes_to_get is None else None
+        negative_cache = cls._get_negative_cache()
+        if cache is None and negative_cache is None:
+            return None
+        identity = cls._get_key_identity(key)
+        if cache is not None:
+            item, stale = cache.lookup(identity)
+            if item is not None:
+                if stale:
+                    cache.revalidate(identity, functools.partial(cls._get_raw_item, *cls._get_key_values(key)))
+                return identity, item
+        if negative_cache is not None and negative_cache.is_missing(identity):
+            return identity, None
+        return None
+
+    @classmethod
+    def _cache_batch_page(
+        cls,
+        identities: Iterable[Tuple],
+        page: List[Dict[str, Any]],
+        attributes_to_get: Optional[Sequence[str]],
+    ) -> None:
+        """
+        Updates the caches with the items read for the keys of a batch get
+        """
+        cache = cls._get_cache() if attributes_to_get is None else None
+        negative_cache = cls._get_negative_cache()
+        if cache is None and negative_cache is None:
+            return
+        missing = set(identities)
+        for item in page:
+            identity = cls._get_key_identity(item)
+            missing.discard(identity)
+            if cache is not None:
+                cache.set(identity, item)
+            if negative_cache is not None:
+                negative_cache.add_existing(identity)
+        for identity in missing:
+            if cache is not None:
+                cache.invalidate(identity)
+            # With a projection, an item that has none of the attributes may not be returned
+            if negative_cache is not None and attributes_to_get is None:
+                negative_cache.add_missing(identity)
 
     @classmethod
     async def _batch_get_page(cls, keys_to_get, consistent_read, attributes_to_get):
@@ -1025,6 +2471,11 @@ class Model(AttributeContainer, metaclass=MetaModel):
         )
         item_data = data.get(RESPONSES).get(cls.Meta.table_name)  # type: ignore
         unprocessed_items = data.get(UNPROCESSED_KEYS).get(cls.Meta.table_name, {}).get(KEYS, None)  # type: ignore
+        if item_data and attributes_to_get is None and any(LARGE_ITEM_MANIFEST in item for item in item_data):
+            # The chunks of the items stored in chunks are read concurrently
+            item_data = list(await asyncio.gather(*(
+                cls._read_chunks(item, bool(consistent_read)) for item in item_data
+            )))
         return item_data, unprocessed_items
 
     @classmethod
@@ -1103,18 +2554,63 @@ class Model(AttributeContainer, metaclass=MetaModel):
         return {attr.attr_type: serialized}
 
     @classmethod
-    def _serialize_keys(cls, hash_key, range_key=None) -> Tuple[_KeyType, _KeyType]:
+    def _serialize_keys(cls, hash_key, range_key=None, shard: Optional[int] = None) -> Tuple[_KeyType, _KeyType]:
         """
         Serializes the hash and range keys
 
         :param hash_key: The hash key value
         :param range_key: The range key value
+        :param shard: The shard of the item, for models sharded at random (see :meth:`_shard_hash_key`)
         """
         if hash_key is not None:
             hash_key = cls._hash_key_attribute().serialize(hash_key)
         if range_key is not None:
             range_key = cls._range_key_attribute().serialize(range_key)
-        return hash_key, range_key
+        return cls._shard_hash_key(hash_key, range_key, shard), range_key
+
+    @classmethod
+    def _shard_hash_key(cls, hash_key: Any, range_key: Any, shard: Optional[int] = None) -> Any:
+        """
+        Returns the stored hash key of an item given its serialized keys: for models with a sharded hash key,
+        the hash key of the shard derived from the range key, or of the given shard for models sharded at random.
+        Otherwise (or when the shard is not known) the hash key is returned as is.
+        """
+        shards = cls._hash_key_shards
+        if shards is None or hash_key is None:
+            return hash_key
+        if shard is None:
+            if range_key is None or cls._hash_key_attribute().shard_by != SHARD_BY_RANGE_KEY:
+                return hash_key
+            shard = range_key_shard(range_key, shards, cls._range_key_attribute().attr_type)
+        return shard_hash_key(hash_key, shard)
+
+    @classmethod
+    def _is_sharded_at_random(cls) -> bool:
+        return cls._hash_key_shards is not None and cls._hash_key_attribute().shard_by == SHARD_BY_RANDOM
+
+    def _get_random_shard(self) -> Optional[int]:
+        """
+        Returns the shard of this item if the model is sharded at random: the shard it was loaded from,
+        or else a shard picked at random. Returns None for other models.
+        """
+        if not self._is_sharded_at_random():
+            return None
+        if self._shard is None:
+            self._shard = random.randrange(cast(int, self._hash_key_shards))
+        return self._shard
+
+    @classmethod
+    def _unshard_item(cls, attribute_values: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the attribute values of a stored item with the shard removed from the hash key
+        """
+        if cls._hash_key_shards is None:
+            return attribute_values
+        name = cls._hash_key_attribute().attr_name
+        value = attribute_values.get(name)
+        if value is None or STRING not in value:
+            return attribute_values
+        return {**attribute_values, name: {STRING: unshard_hash_key(value[STRING])}}
 
     def serialize(self, null_check: bool = True) -> Dict[str, Dict[str, Any]]:
         """
@@ -1127,13 +2623,28 @@ class Model(AttributeContainer, metaclass=MetaModel):
             Use :meth:`~pynamodb.attributes.AttributeContainer.to_dynamodb_dict`
             and :meth:`~pynamodb.attributes.AttributeContainer.to_simple_dict` for JSON-serializable mappings.
         """
-        return self._container_serialize(null_check=null_check)
+        attribute_values = self._container_serialize(null_check=null_check)
+        if self._hash_key_shards is not None:
+            hash_key_name = self._hash_key_attribute().attr_name
+            range_key_attribute = self._range_key_attribute()
+            hash_key = attribute_values.get(hash_key_name, {}).get(STRING)
+            range_key = attribute_values.get(range_key_attribute.attr_name, {}).get(range_key_attribute.attr_type)
+            if hash_key is not None:
+                attribute_values[hash_key_name] = {
+                    STRING: self._shard_hash_key(hash_key, range_key, self._get_random_shard()),
+                }
+        return attribute_values
 
     def deserialize(self, attribute_values: Dict[str, Dict[str, Any]]) -> None:
         """
         Deserializes a model from botocore's DynamoDB client.
         """
-        return self._container_deserialize(attribute_values=attribute_values)
+        self._container_deserialize(attribute_values=self._unshard_item(attribute_values))
+        self._set_loaded_values(attribute_values)
+
+
+def _identity(item: Dict[str, Any]) -> Dict[str, Any]:
+    return item
 
 
 class _ModelFuture(Generic[_T]):
@@ -1,8 +1,14 @@
 import asyncio
-from typing import Any, Callable, Dict, Iterable, AsyncIterator, Optional, TypeVar
+import heapq
+import weakref
+from typing import Any, Callable, Dict, Iterable, AsyncIterator, List, Optional, Sequence, Tuple, Type, TypeVar
+from typing import cast
 
 from aiopynamodb.constants import (CAMEL_COUNT, ITEMS, LAST_EVALUATED_KEY, SCANNED_COUNT,
                                 CONSUMED_CAPACITY, TOTAL, CAPACITY_UNITS)
+from aiopynamodb.attributes import AttributeContainer
+from aiopynamodb.columnar import ColumnBatch
+from aiopynamodb.columnar import ColumnBatchBuilder
 
 _T = TypeVar('_T')
 
@@ -20,13 +26,17 @@ class RateLimiter:
 
         And after an operation, update the number of units consumed
             rate_limiter.consume(units)
+
+    A RateLimiter can be shared by concurrent callers (e.g. the workers of a parallel scan): the units consumed
+    by any of them delay the operations of all of them.
     """
 
     def __init__(self, rate_limit: float, time_module: Optional[Any] = None) -> None:
         if rate_limit <= 0:
             raise ValueError("rate_limit must be greater than zero")
         self._rate_limit = rate_limit
-        self._consumed = 0
+        # The time at which the units consumed so far are paid for, and the next operation may start
+        self._available_at = 0.0
         self._time_of_last_acquire = 0.0
         self._time_module: Any = time_module or asyncio
 
@@ -34,18 +44,20 @@ class RateLimiter:
         """
         Records the amount of units consumed.
         """
-        self._consumed += units
+        # Units are paid for after the previous ones, or from the last acquire if those were paid for already
+        self._available_at = max(self._available_at, self._time_of_last_acquire) + units / float(self.rate_limit)
 
     async def acquire(self) -> None:
         """
         Sleeps the appropriate amount of time to follow the rate limit restriction
         """
-        sleep_time = max(0, self._consumed / float(self.rate_limit) -
-                         (self._time_module.get_event_loop().time() - self._time_of_last_acquire))
-        if sleep_time > 0:
+        event_loop = self._time_module.get_event_loop()
+        # Units consumed by other callers while sleeping are waited for as well
+        sleep_time = self._available_at - event_loop.time()
+        while sleep_time > 0:
             await self._time_module.sleep(sleep_time)
-        self._consumed = 0
-        self._time_of_last_acquire = self._time_module.get_event_loop().time()
+            sleep_time = self._available_at - event_loop.time()
+        self._time_of_last_acquire = event_loop.time()
 
     @property
     def rate_limit(self) -> float:
@@ -58,9 +70,57 @@ class RateLimiter:
         self._rate_limit = rate_limit
 
 
+def _cancel_tasks(tasks: List[asyncio.Task]) -> None:
+    # Cancels the background tasks of an iterator that was garbage collected without being closed.
+    # The tasks don't refer to the iterator, so it is collected as soon as it is no longer used.
+    for task in tasks:
+        if not task.done():
+            try:
+                task.cancel()
+            except RuntimeError:
+                # The event loop is closed
+                pass
+    tasks.clear()
+
+
+class _PageFetcher:
+    """
+    Fetches the pages of a PageIterator. Background fetches hold the fetcher rather than the iterator, so
+    that an abandoned iterator is collected and its background fetches cancelled.
+    """
+
+    def __init__(self, operation: Callable, args: Any, kwargs: Dict[str, Any], rate_limiter: Optional[RateLimiter]) -> None:
+        self.operation = operation
+        self.args = args
+        self.kwargs = kwargs
+        self.rate_limiter = rate_limiter
+
+    async def fetch(self, exclusive_start_key: Optional[Dict[str, Dict[str, Any]]]) -> Any:
+        self.kwargs['exclusive_start_key'] = exclusive_start_key
+
+        if self.rate_limiter:
+            await self.rate_limiter.acquire()
+            self.kwargs['return_consumed_capacity'] = TOTAL
+
+        page = await self.operation(*self.args, **self.kwargs)
+
+        if self.rate_limiter:
+            consumed_capacity = page.get(CONSUMED_CAPACITY, {}).get(CAPACITY_UNITS, 0)
+            self.rate_limiter.consume(consumed_capacity)
+
+        return page
+
+
 class PageIterator(AsyncIterator[_T]):
     """
     PageIterator handles Query and Scan result pagination.
+
+    With `prefetch` set, up to that many of the following pages are fetched in the background while the
+    current one is being consumed. Background fetching stops at the last page, and once `prefetch_limit`
+    items have been fetched (any further pages are then fetched on demand). Iterators that are not
+    exhausted should be closed with :meth:`aclose` (or used as an async context manager) to cancel
+    outstanding fetches; the fetches of an iterator that is garbage collected without being closed are
+    cancelled then.
     """
 
     def __init__(
@@ -69,16 +129,22 @@ class PageIterator(AsyncIterator[_T]):
         args: Any,
         kwargs: Dict[str, Any],
         rate_limit: Optional[float] = None,
+        prefetch: int = 0,
+        prefetch_limit: Optional[int] = None,
     ) -> None:
+        if prefetch < 0:
+            raise ValueError("prefetch must not be negative")
         self._operation = operation
-        self._args = args
         self._kwargs = kwargs
+        self._fetcher = _PageFetcher(operation, args, kwargs, RateLimiter(rate_limit) if rate_limit else None)
         self._last_evaluated_key = kwargs.get('exclusive_start_key')
         self._is_last_page = False
         self._total_scanned_count = 0
-        self._rate_limiter = None
-        if rate_limit:
-            self._rate_limiter = RateLimiter(rate_limit)
+        self._prefetch = prefetch
+        self._prefetch_limit = prefetch_limit
+        self._prefetched: Optional[asyncio.Queue] = None
+        self._prefetch_slots: Optional[asyncio.Semaphore] = None
+        self._prefetch_task: Optional[asyncio.Task] = None
 
     def __aiter__(self) -> AsyncIterator[_T]:
         return self
@@ -87,23 +153,82 @@ class PageIterator(AsyncIterator[_T]):
         if self._is_last_page:
             raise StopAsyncIteration()
 
-        self._kwargs['exclusive_start_key'] = self._last_evaluated_key
-
-        if self._rate_limiter:
-            await self._rate_limiter.acquire()
-            self._kwargs['return_consumed_capacity'] = TOTAL
-
-        page = await self._operation(*self._args, **self._kwargs)
+        if self._prefetch:
+            page = await self._next_prefetched_page()
+        else:
+            page = await self._fetcher.fetch(self._last_evaluated_key)
         self._last_evaluated_key = page.get(LAST_EVALUATED_KEY)
         self._is_last_page = self._last_evaluated_key is None
         self._total_scanned_count += page[SCANNED_COUNT]
 
-        if self._rate_limiter:
-            consumed_capacity = page.get(CONSUMED_CAPACITY, {}).get(CAPACITY_UNITS, 0)
-            self._rate_limiter.consume(consumed_capacity)
+        return page
 
+    async def _next_prefetched_page(self) -> Any:
+        if self._prefetch_task is None:
+            self._prefetched = asyncio.Queue()
+            self._prefetch_slots = asyncio.Semaphore(self._prefetch)
+            self._prefetch_task = asyncio.ensure_future(self._prefetch_pages(
+                self._fetcher, self._prefetched, self._prefetch_slots, self._last_evaluated_key, self._prefetch_limit,
+            ))
+            weakref.finalize(self, _cancel_tasks, [self._prefetch_task])
+        assert self._prefetched is not None and self._prefetch_slots is not None
+        page = None
+        if not (self._prefetched.empty() and self._prefetch_task.done()):
+            page = await self._prefetched.get()
+            self._prefetch_slots.release()
+        if page is None:
+            # Background fetching stopped (at the last page, the prefetch limit or on cancellation): continue on demand.
+            return await self._fetcher.fetch(self._last_evaluated_key)
+        if isinstance(page, BaseException):
+            raise page
         return page
 
+    @staticmethod
+    async def _prefetch_pages(
+        fetcher: _PageFetcher,
+        prefetched: asyncio.Queue,
+        prefetch_slots: asyncio.Semaphore,
+        exclusive_start_key: Optional[Dict[str, Dict[str, Any]]],
+        prefetch_limit: Optional[int],
+    ) -> None:
+        count = 0
+        try:
+            while True:
+                await prefetch_slots.acquire()
+                page = await fetcher.fetch(exclusive_start_key)
+                prefetched.put_nowait(page)
+                exclusive_start_key = page.get(LAST_EVALUATED_KEY)
+                count += page[CAMEL_COUNT]
+                if exclusive_start_key is None or (prefetch_limit is not None and count >= prefetch_limit):
+                    return
+        except Exception as e:
+            prefetched.put_nowait(e)
+        finally:
+            # Wakes up a consumer waiting for a page that will not be fetched in the background.
+            prefetched.put_nowait(None)
+
+    def cancel_prefetch(self) -> None:
+        """
+        Cancels any outstanding background fetches. Pages that were already fetched are still returned.
+        """
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+
+    async def aclose(self) -> None:
+        """
+        Cancels any outstanding background fetches and waits for them to exit.
+        """
+        task = self._prefetch_task
+        self.cancel_prefetch()
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def __aenter__(self) -> 'PageIterator[_T]':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
     @property
     def key_names(self) -> Iterable[str]:
         # If the current page has a last_evaluated_key, use it to determine key attributes
@@ -114,6 +239,15 @@ class PageIterator(AsyncIterator[_T]):
         table_meta = self._operation.__self__.get_meta_table()  # type: ignore
         return table_meta.get_key_names(self._kwargs.get('index_name'))
 
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        return self._fetcher.rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, rate_limiter: Optional[RateLimiter]) -> None:
+        # Allows several iterators (e.g. the segments of a parallel scan) to share a rate limit.
+        self._fetcher.rate_limiter = rate_limiter
+
     @property
     def page_size(self) -> Optional[int]:
         return self._kwargs.get('limit')
@@ -144,14 +278,27 @@ class ResultIterator(AsyncIterator[_T]):
         map_fn: Optional[Callable] = None,
         limit: Optional[int] = None,
         rate_limit: Optional[float] = None,
+        container_cls: Optional[Type[AttributeContainer]] = None,
+        prefetch: int = 0,
     ) -> None:
-        self.page_iter: PageIterator = PageIterator(operation, args, kwargs, rate_limit)
+        page_iter: PageIterator = PageIterator(operation, args, kwargs, rate_limit, prefetch=prefetch, prefetch_limit=limit)
+        self._init_results(page_iter, map_fn, limit, container_cls)
+
+    def _init_results(
+        self,
+        page_iter: PageIterator,
+        map_fn: Optional[Callable],
+        limit: Optional[int],
+        container_cls: Optional[Type[AttributeContainer]],
+    ) -> None:
+        self.page_iter: PageIterator = page_iter
         self._map_fn = map_fn
+        self._container_cls = container_cls
         self._limit = limit
         self._total_count = 0
         self._index = 0
         self._count = 0
-        self._items = None
+        self._items: Any = None
 
     async def _get_next_page(self) -> None:
         page = await self.page_iter.__anext__()
@@ -174,10 +321,85 @@ class ResultIterator(AsyncIterator[_T]):
         self._index += 1
         if self._limit is not None:
             self._limit -= 1
+            if self._limit == 0:
+                self.page_iter.cancel_prefetch()
         if self._map_fn:
             item = self._map_fn(item)
         return item
 
+    async def columnar(
+        self,
+        batch_size: Optional[int] = None,
+        attributes: Optional[Iterable[str]] = None,
+    ) -> AsyncIterator[ColumnBatch]:
+        """
+        Iterates through the remaining results as :class:`~aiopynamodb.columnar.ColumnBatch` objects
+        instead of items, without instantiating the model.
+
+        :param batch_size: The number of rows in each batch (the last one may be smaller).
+            If not set, each batch holds the remaining items of one page of results.
+        :param attributes: If set, only these attributes (by python attribute name) are decoded into columns
+        """
+        if batch_size is not None and batch_size <= 0:
+            raise ValueError("batch_size must be greater than zero")
+        builder = self._get_column_batch_builder(attributes)
+        async for _ in self._fill_columns(builder, batch_size):
+            yield builder.build()
+        if builder.num_rows:
+            yield builder.build()
+
+    async def to_columns(self, attributes: Optional[Iterable[str]] = None) -> ColumnBatch:
+        """
+        Reads all remaining results into a single :class:`~aiopynamodb.columnar.ColumnBatch`.
+
+        :param attributes: If set, only these attributes (by python attribute name) are decoded into columns
+        """
+        builder = self._get_column_batch_builder(attributes)
+        async for _ in self._fill_columns(builder, None):
+            pass
+        return builder.build()
+
+    def _get_column_batch_builder(self, attributes: Optional[Iterable[str]]) -> ColumnBatchBuilder:
+        if self._container_cls is None:
+            raise ValueError("Columnar results are only available for model queries and scans")
+        return ColumnBatchBuilder(self._container_cls, attributes)
+
+    async def _fill_columns(self, builder: ColumnBatchBuilder, batch_size: Optional[int]) -> AsyncIterator[None]:
+        # Decodes the remaining items into the builder, yielding whenever a batch is complete.
+        while self._limit != 0:
+            if self._index == self._count:
+                try:
+                    await self._get_next_page()
+                except StopAsyncIteration:
+                    return
+                continue
+            end = self._count
+            if self._limit is not None:
+                end = min(end, self._index + self._limit)
+            if batch_size is not None:
+                end = min(end, self._index + batch_size - builder.num_rows)
+            items = cast(List[Dict[str, Dict[str, Any]]], self._items)
+            builder.extend(items[self._index:end])
+            if self._limit is not None:
+                self._limit -= end - self._index
+                if self._limit == 0:
+                    self.page_iter.cancel_prefetch()
+            self._index = end
+            if batch_size is None or builder.num_rows == batch_size:
+                yield None
+
+    async def aclose(self) -> None:
+        """
+        Cancels any outstanding background page fetches (see the `prefetch` argument).
+        """
+        await self.page_iter.aclose()
+
+    async def __aenter__(self) -> 'ResultIterator[_T]':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
     @property
     def last_evaluated_key(self) -> Optional[Dict[str, Dict[str, Any]]]:
         if self._index == self._count:
@@ -192,3 +414,334 @@ class ResultIterator(AsyncIterator[_T]):
     @property
     def total_count(self) -> int:
         return self._total_count
+
+
+class _Descending:
+    """
+    Inverts the order of a sort key
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+class _MergedPageIterator(PageIterator):
+    """
+    The page iterator of merged results, which applies the rate limit, page size and cancellation to the
+    page iterators of the merged queries. The pages are fetched by the merged queries.
+    """
+
+    def __init__(self, page_iters: Sequence[PageIterator], rate_limit: Optional[float] = None) -> None:
+        super().__init__(self._fetch_merged_page, (), {}, rate_limit)
+        self._page_iters = list(page_iters)
+        self.rate_limiter = self._fetcher.rate_limiter
+
+    async def _fetch_merged_page(self) -> Any:
+        raise TypeError("The pages of merged results are fetched by the merged queries")
+
+    def cancel_prefetch(self) -> None:
+        for page_iter in self._page_iters:
+            page_iter.cancel_prefetch()
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(page_iter.aclose() for page_iter in self._page_iters))
+
+    @property
+    def key_names(self) -> Iterable[str]:
+        return self._page_iters[0].key_names
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        return self._fetcher.rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, rate_limiter: Optional[RateLimiter]) -> None:
+        self._fetcher.rate_limiter = rate_limiter
+        for page_iter in self._page_iters:
+            page_iter.rate_limiter = rate_limiter
+
+    @property
+    def page_size(self) -> Optional[int]:
+        return self._page_iters[0].page_size if self._page_iters else None
+
+    @page_size.setter
+    def page_size(self, page_size: int) -> None:
+        for page_iter in self._page_iters:
+            page_iter.page_size = page_size
+
+    @property
+    def last_evaluated_key(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        raise ValueError("Merged query results can't be resumed from a last_evaluated_key")
+
+    @property
+    def total_scanned_count(self) -> int:
+        return sum(page_iter.total_scanned_count for page_iter in self._page_iters)
+
+
+class MergedResultIterator(ResultIterator[_T]):
+    """
+    MergedResultIterator merges the results of queries that each return their items in sort key order
+    (such as the queries of the shards of a hash key), returning the items in sort key order.
+
+    The first page of every query is fetched concurrently; after that, the next page of a query is only fetched
+    once its items are needed. `limit` and `map_fn` apply to the merged results. The position in the merged
+    results can't be represented as a `last_evaluated_key`, so they can't be resumed.
+    """
+
+    def __init__(
+        self,
+        results: Sequence[ResultIterator[Dict[str, Any]]],
+        sort_key: Callable[[Dict[str, Any]], Any],
+        descending: bool = False,
+        map_fn: Optional[Callable] = None,
+        limit: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        container_cls: Optional[Type[AttributeContainer]] = None,
+    ) -> None:
+        # The pages of this iterator are runs of merged items
+        self._results = list(results)
+        self._init_results(
+            _MergedPageIterator([result.page_iter for result in self._results], rate_limit),
+            map_fn,
+            limit,
+            container_cls,
+        )
+        self._sort_key = sort_key
+        self._descending = descending
+        # The next item of each query that has one, as (sort key, query index, item)
+        self._heap: Optional[List[Tuple[Any, int, Dict[str, Any]]]] = None
+        # The query whose next item has to be fetched before merging on
+        self._refill: Optional[int] = None
+
+    async def _get_next_page(self) -> None:
+        if self._heap is None:
+            self._heap = []
+            await asyncio.gather(*(self._push_next(index) for index in range(len(self._results))))
+        elif self._refill is not None:
+            await self._push_next(self._refill)
+            self._refill = None
+        items = []
+        while self._heap:
+            _, index, item = heapq.heappop(self._heap)
+            items.append(item)
+            result = self._results[index]
+            if result._index == result._count:
+                self._refill = index
+                break
+            await self._push_next(index)
+        if not items:
+            raise StopAsyncIteration
+        self._items = items
+        self._count = len(items)
+        self._index = 0
+
+    async def _push_next(self, index: int) -> None:
+        try:
+            item = await self._results[index].__anext__()
+        except StopAsyncIteration:
+            return
+        key = self._sort_key(item)
+        assert self._heap is not None
+        heapq.heappush(self._heap, (_Descending(key) if self._descending else key, index, item))
+
+    @property
+    def last_evaluated_key(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        return self.page_iter.last_evaluated_key
+
+    @property
+    def total_count(self) -> int:
+        return sum(result.total_count for result in self._results)
+
+
+class SegmentProgress:
+    """
+    The progress of one segment of a :class:`ParallelScanIterator`.
+    """
+
+    def __init__(self, segment: int, total_segments: int) -> None:
+        self.segment = segment
+        self.total_segments = total_segments
+        self.pages = 0
+        self.count = 0
+        self.scanned_count = 0
+        self.started = False
+        self.done = False
+
+    def __repr__(self) -> str:
+        return '{}(segment={}, pages={}, count={}, scanned_count={}, done={})'.format(
+            type(self).__name__, self.segment, self.pages, self.count, self.scanned_count, self.done)
+
+
+_SCAN_DONE = object()
+
+
+class ParallelScanIterator(AsyncIterator[_T]):
+    """
+    ParallelScanIterator runs the segments of a scan concurrently and merges their results.
+
+    The table is split into more segments than there are workers, and each worker picks up the next
+    pending segment when it finishes one, so a few slow (e.g. large) segments do not leave the other
+    workers idle. Results are yielded in the order the pages arrive, not in key order.
+
+    Iteration starts the workers; they are cancelled when iteration stops early, when the iterating
+    task is cancelled, when a segment fails (the error is raised to the caller) or on :meth:`aclose`.
+    An iterator that is left before the end (e.g. with `break`) should be closed with :meth:`aclose` or used
+    as an async context manager; otherwise its workers are only cancelled once it is garbage collected.
+    """
+
+    def __init__(
+        self,
+        segment_factory: Callable[[int], ResultIterator],
+        total_segments: int,
+        concurrency: int,
+        limit: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        progress_callback: Optional[Callable[[SegmentProgress], Any]] = None,
+    ) -> None:
+        if total_segments < 1:
+            raise ValueError("total_segments must be greater than zero")
+        if concurrency < 1:
+            raise ValueError("concurrency must be greater than zero")
+        self._segment_factory = segment_factory
+        self._concurrency = min(concurrency, total_segments)
+        self._limit = limit
+        self._rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self._progress_callback = progress_callback
+        self.progress = [SegmentProgress(segment, total_segments) for segment in range(total_segments)]
+        self._pending = list(reversed(range(total_segments)))
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._items: List[Any] = []
+        self._index = 0
+        self._finished = False
+        weakref.finalize(self, _cancel_tasks, self._tasks)
+
+    def __aiter__(self) -> AsyncIterator[_T]:
+        return self
+
+    async def __anext__(self) -> _T:
+        if self._limit == 0 or self._finished:
+            self._stop()
+            raise StopAsyncIteration
+        if self._queue is None:
+            self._start()
+        assert self._queue is not None
+        while self._index == len(self._items):
+            try:
+                page = await self._queue.get()
+            except BaseException:
+                self._stop()
+                raise
+            if page is _SCAN_DONE:
+                self._stop()
+                raise StopAsyncIteration
+            if isinstance(page, BaseException):
+                self._stop()
+                raise page
+            self._items = page
+            self._index = 0
+        item = self._items[self._index]
+        self._index += 1
+        if self._limit is not None:
+            self._limit -= 1
+            if self._limit == 0:
+                self._stop()
+        return item
+
+    async def aclose(self) -> None:
+        """
+        Cancels the workers and waits for them to exit.
+        """
+        tasks = list(self._tasks)
+        self._stop()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __aenter__(self) -> 'ParallelScanIterator[_T]':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    @property
+    def total_count(self) -> int:
+        return sum(progress.count for progress in self.progress)
+
+    @property
+    def total_scanned_count(self) -> int:
+        return sum(progress.scanned_count for progress in self.progress)
+
+    def _start(self) -> None:
+        # Bounding the queue stops the workers from reading far ahead of the consumer.
+        self._queue = asyncio.Queue(maxsize=self._concurrency)
+        # The workers are given the state they share rather than the iterator, so they don't keep it alive
+        workers = [
+            asyncio.ensure_future(self._work(
+                self._queue,
+                self._pending,
+                self.progress,
+                self._segment_factory,
+                self._rate_limiter,
+                self._progress_callback,
+            ))
+            for _ in range(self._concurrency)
+        ]
+        self._tasks.extend(workers)
+        self._tasks.append(asyncio.ensure_future(self._supervise(self._queue, workers)))
+
+    def _stop(self) -> None:
+        self._finished = True
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+    @staticmethod
+    async def _supervise(queue: asyncio.Queue, workers: List[asyncio.Task]) -> None:
+        try:
+            await asyncio.gather(*workers)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            for worker in workers:
+                worker.cancel()
+            await queue.put(e)
+        else:
+            await queue.put(_SCAN_DONE)
+
+    @staticmethod
+    async def _work(
+        queue: asyncio.Queue,
+        pending: List[int],
+        segments: List[SegmentProgress],
+        segment_factory: Callable[[int], ResultIterator],
+        rate_limiter: Optional[RateLimiter],
+        progress_callback: Optional[Callable[[SegmentProgress], Any]],
+    ) -> None:
+        while pending:
+            progress = segments[pending.pop()]
+            results = segment_factory(progress.segment)
+            results.page_iter.rate_limiter = rate_limiter
+            map_fn = results._map_fn
+            progress.started = True
+            async for page in results.page_iter:
+                items = page.get(ITEMS) or []
+                progress.pages += 1
+                # Scans with Select=COUNT return the count without the items
+                progress.count += page.get(CAMEL_COUNT, len(items))
+                progress.scanned_count = results.page_iter.total_scanned_count
+                if map_fn:
+                    items = [map_fn(item) for item in items]
+                if items:
+                    await queue.put(items)
+                if progress_callback is not None:
+                    progress_callback(progress)
+            progress.done = True
+            if progress_callback is not None:
+                progress_callback(progress)
@@ -0,0 +1,205 @@
+"""
+Identity map and unit of work.
+
+A :class:`Session` loads each item at most once: repeated reads of the same key return the same instance.
+The instances that were loaded or added are written back when the session is committed, in as few requests
+as possible.
+"""
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+
+from aiopynamodb.connection import Connection
+from aiopynamodb.constants import DELETE, PUT, TRANSACT_WRITE_ITEM_LIMIT
+from aiopynamodb.expressions.condition import Condition
+from aiopynamodb.models import Model, _KeyType
+from aiopynamodb.transactions import TransactWrite
+
+_M = TypeVar('_M', bound=Model)
+
+
+class Session:
+    """
+    Keeps the instances loaded through it in an identity map, and writes the changes made to them when committed.
+
+    Used as an async context manager, the session is committed when the context exits without an exception.
+
+    On commit, unconditional puts and deletes are sent with BatchWriteItem, one batch per model running
+    concurrently. Writes with a condition, and writes of models with a
+    :class:`~aiopynamodb.attributes.VersionAttribute`, are sent with TransactWriteItems, in which loaded items
+    only update the attributes that changed. With `atomic=True`, all the writes are sent in a single transaction.
+    Loaded items that did not change are not written.
+
+    :param connection: The connection used for transactions. Defaults to the connection of the first model written.
+    :param atomic: If True, all the writes are committed in a single transaction.
+    """
+
+    def __init__(self, connection: Optional[Connection] = None, atomic: bool = False) -> None:
+        self._connection = connection
+        self.atomic = atomic
+        # The instances by table and key identity, or None for the keys known not to exist
+        self._identity_map: Dict[Tuple[str, Tuple], Optional[Model]] = {}
+        self._conditions: Dict[Tuple[str, Tuple], Condition] = {}
+        self._deleted: Dict[Tuple[str, Tuple], Tuple[Model, Optional[Condition]]] = {}
+
+    async def __aenter__(self) -> 'Session':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            await self.commit()
+
+    @staticmethod
+    def _identity(model_cls: Type[Model], key: Dict[str, Any]) -> Tuple[str, Tuple]:
+        return model_cls.Meta.table_name, model_cls._get_key_identity(key)
+
+    def _lookup(self, model_cls: Type[_M], identity: Tuple[str, Tuple]) -> _M:
+        item = self._identity_map[identity]
+        if item is None:
+            raise model_cls.DoesNotExist()
+        if not isinstance(item, model_cls):
+            raise ValueError("The session holds a {} for this key, not a {}".format(type(item).__name__, model_cls.__name__))
+        return item
+
+    async def get(
+        self,
+        model_cls: Type[_M],
+        hash_key: _KeyType,
+        range_key: Optional[_KeyType] = None,
+        consistent_read: bool = False,
+    ) -> _M:
+        """
+        Returns the item with the given key, loading it the first time it is requested.
+
+        :raises ModelInstance.DoesNotExist: if the item does not exist, or was deleted in this session
+        """
+        key = model_cls._batch_get_key(hash_key if model_cls._range_keyname is None else (hash_key, range_key))
+        identity = self._identity(model_cls, key)
+        if identity not in self._identity_map:
+            try:
+                item = await model_cls.get(hash_key, range_key=range_key, consistent_read=consistent_read)
+                item.track_changes()
+                self._identity_map[identity] = item
+            except model_cls.DoesNotExist:
+                self._identity_map[identity] = None
+                raise
+        return self._lookup(model_cls, identity)
+
+    async def batch_get(
+        self,
+        model_cls: Type[_M],
+        items: Iterable[_KeyType],
+        consistent_read: Optional[bool] = None,
+    ) -> AsyncIterator[_M]:
+        """
+        Returns the items with the given keys, in the order of the keys, loading those that were not requested before
+        with BatchGetItem. Keys of items that don't exist are skipped.
+        """
+        identities: Dict[Tuple[str, Tuple], _KeyType] = {}
+        for item in items:
+            identities.setdefault(self._identity(model_cls, model_cls._batch_get_key(item)), item)
+        missing = [key for identity, key in identities.items() if identity not in self._identity_map]
+        if missing:
+            loaded = {}
+            async for loaded_item in model_cls.batch_get(missing, consistent_read=consistent_read):
+                loaded_item.track_changes()
+                loaded[self._identity(model_cls, loaded_item._get_keys())] = loaded_item
+            for identity in identities:
+                if identity not in self._identity_map:
+                    self._identity_map[identity] = loaded.get(identity)
+        for identity in identities:
+            if self._identity_map[identity] is not None:
+                yield self._lookup(model_cls, identity)
+
+    def add(self, item: Model, condition: Optional[Condition] = None) -> None:
+        """
+        Adds an item to the session, to be written on commit.
+
+        :param condition: If set, the item is only written if the condition holds, in a transaction
+        """
+        identity = self._identity(type(item), item._get_keys())
+        existing = self._identity_map.get(identity)
+        if existing is not None and existing is not item:
+            raise ValueError("The session already holds another instance for the key of this {}".format(type(item).__name__))
+        self._deleted.pop(identity, None)
+        self._identity_map[identity] = item
+        if condition is not None:
+            self._conditions[identity] = condition
+
+    def delete(self, item: Model, condition: Optional[Condition] = None) -> None:
+        """
+        Marks an item to be deleted on commit.
+
+        :param condition: If set, the item is only deleted if the condition holds, in a transaction
+        """
+        identity = self._identity(type(item), item._get_keys())
+        self._identity_map[identity] = None
+        self._conditions.pop(identity, None)
+        self._deleted[identity] = (item, condition)
+
+    async def commit(self) -> None:
+        """
+        Writes the new and changed items, and deletes the deleted items.
+        """
+        # (action, item, condition, serialized item)
+        writes: List[Tuple[str, Model, Optional[Condition], Optional[Dict[str, Dict[str, Any]]]]] = []
+        for identity, item in self._identity_map.items():
+            if item is None:
+                continue
+            attribute_values = item.serialize(null_check=True)
+            item._check_item_size(attribute_values)
+            if item._get_change_actions(attribute_values) == []:
+                continue
+            writes.append((PUT, item, self._conditions.get(identity), attribute_values))
+        for item, condition in self._deleted.values():
+            writes.append((DELETE, item, condition, None))
+        if not writes:
+            return
+
+        if self.atomic:
+            if len(writes) > TRANSACT_WRITE_ITEM_LIMIT:
+                raise ValueError("DynamoDB allows a maximum of {} items per transaction".format(TRANSACT_WRITE_ITEM_LIMIT))
+            transacted, batched = writes, []
+        else:
+            transacted = [write for write in writes if write[2] is not None or write[1]._version_attribute_name is not None]
+            batched = [write for write in writes if write[2] is None and write[1]._version_attribute_name is None]
+
+        batches: Dict[Type[Model], List[Tuple[str, Model]]] = {}
+        for action, item, _, _ in batched:
+            batches.setdefault(type(item), []).append((action, item))
+        await asyncio.gather(
+            *(self._batch_write(model_cls, operations) for model_cls, operations in batches.items()),
+            *(
+                self._transact_write(transacted[idx:idx + TRANSACT_WRITE_ITEM_LIMIT])
+                for idx in range(0, len(transacted), TRANSACT_WRITE_ITEM_LIMIT)
+            ),
+        )
+
+        for action, item, _, saved_values in writes:
+            if saved_values is not None:
+                item._set_saved_version(saved_values)
+                # The changes of the items of the session are tracked, including the items that were added
+                item._loaded_values = saved_values
+        self._conditions.clear()
+        self._deleted.clear()
+
+    @staticmethod
+    async def _batch_write(model_cls: Type[Model], operations: List[Tuple[str, Model]]) -> None:
+        async with model_cls.batch_write() as batch:
+            for action, item in operations:
+                if action == PUT:
+                    await batch.save(item)
+                else:
+                    await batch.delete(item)
+
+    async def _transact_write(self, writes: List[Tuple[str, Model, Optional[Condition], Optional[Dict[str, Dict[str, Any]]]]]) -> None:
+        connection = self._connection or type(writes[0][1])._get_connection().connection
+        async with TransactWrite(connection=connection) as transaction:
+            for action, item, condition, attribute_values in writes:
+                if action == DELETE:
+                    transaction.delete(item, condition=condition)
+                    continue
+                actions = item._get_change_actions(attribute_values) if attribute_values is not None else None
+                if actions:
+                    transaction.update(item, actions, condition=condition)
+                else:
+                    transaction.save(item, condition=condition)
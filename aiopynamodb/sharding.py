@@ -0,0 +1,73 @@
+"""
+Write sharding of the hash keys of models declared with ``UnicodeAttribute(hash_key=True, shards=...)``.
+
+The items of a hash key are spread over a number of shards, each stored under the hash key
+``<hash key>#shard#<shard>``, so that the writes to a hot hash key are spread over several partitions.
+The shard of an item is derived from its range key (so the item can be read with a single request), or is
+picked at random when the item is first saved (and found by reading every shard).
+
+Queries and counts of a hash key read every shard concurrently, and merge the results in range key order.
+"""
+import zlib
+from decimal import Decimal
+from typing import Any, Callable, List
+
+from aiopynamodb.constants import BINARY
+from aiopynamodb.constants import NUMBER
+from aiopynamodb.constants import SHARD_SEPARATOR
+from aiopynamodb.constants import STRING
+
+
+def shard_hash_key(hash_key: str, shard: int) -> str:
+    """
+    Returns the stored hash key of a shard of a (serialized) hash key
+    """
+    return '{}{}{}'.format(hash_key, SHARD_SEPARATOR, shard)
+
+
+def shard_hash_keys(hash_key: str, shards: int) -> List[str]:
+    """
+    Returns the stored hash keys of all the shards of a (serialized) hash key
+    """
+    return [shard_hash_key(hash_key, shard) for shard in range(shards)]
+
+
+def unshard_hash_key(hash_key: str) -> str:
+    """
+    Returns the hash key stored as the given sharded hash key, or the given hash key if it has no shard
+    """
+    value, separator, _ = hash_key.rpartition(SHARD_SEPARATOR)
+    return value if separator else hash_key
+
+
+def get_shard(hash_key: str) -> int:
+    """
+    Returns the shard of a stored hash key
+    """
+    return int(hash_key.rpartition(SHARD_SEPARATOR)[2])
+
+
+def range_key_shard(range_key: Any, shards: int, attr_type: str = STRING) -> int:
+    """
+    Returns the shard of an item derived from its serialized range key of the given type.
+
+    Numbers are hashed by value (DynamoDB treats `1`, `1.0` and `1E+0` as the same key), so they are
+    normalized first.
+    """
+    if attr_type == NUMBER:
+        number = Decimal(range_key)
+        range_key = '0' if number.is_zero() else str(number.normalize())
+    data = range_key if isinstance(range_key, bytes) else str(range_key).encode('utf-8')
+    return zlib.crc32(data) % shards
+
+
+def range_key_sort_key(attr_type: str) -> Callable[[Any], Any]:
+    """
+    Returns the function that turns the serialized range keys of the given type into values that sort
+    in the order DynamoDB sorts them
+    """
+    if attr_type == NUMBER:
+        return Decimal
+    if attr_type == BINARY:
+        return bytes
+    return str
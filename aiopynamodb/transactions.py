@@ -1,28 +1,125 @@
-from typing import Tuple, TypeVar, Type, Any, List, Optional, Dict, Union, Text, Generic
+import asyncio
+import logging
+import random
+import uuid
+from dataclasses import dataclass
+from typing import Tuple, TypeVar, Type, Any, Awaitable, Callable, List, Optional, Dict, Union, Text, Generic
 
+from aiopynamodb._util import item_size
 from aiopynamodb.connection import Connection
-from aiopynamodb.constants import ITEM, RESPONSES
+from aiopynamodb.constants import EXPRESSION_ATTRIBUTE_VALUES, ITEM, KEY, RESPONSES, TRANSACT_WRITE_SIZE_LIMIT
+from aiopynamodb.constants import RETRYABLE_CANCELLATION_REASONS
+from aiopynamodb.constants import RETRYABLE_TRANSACTION_ERRORS
+from aiopynamodb.constants import TRANSACT_RETRY_BASE_DELAY
+from aiopynamodb.constants import TRANSACT_RETRY_MAX_DELAY
+from aiopynamodb.constants import TRANSACTION_CANCELED
+from aiopynamodb.exceptions import SizeLimitExceededError, TransactGetError, TransactWriteError
 from aiopynamodb.expressions.condition import Condition
 from aiopynamodb.expressions.update import Action
 from aiopynamodb.models import Model, _ModelFuture, _KeyType
+from aiopynamodb.settings import get_settings_value
+
+log = logging.getLogger(__name__)
 
 _M = TypeVar('_M', bound=Model)
 _TTransaction = TypeVar('_TTransaction', bound='Transaction')
 
 
+@dataclass
+class TransactionStats:
+    """
+    Counters of the transactions that involved items of a model.
+
+    `conflicts` counts the attempts that were cancelled because of a conflict, or throttling, on an item of the model.
+    """
+    transactions: int = 0
+    attempts: int = 0
+    retries: int = 0
+    conflicts: int = 0
+    failures: int = 0
+
+    @property
+    def conflict_rate(self) -> float:
+        return self.conflicts / self.attempts if self.attempts else 0.0
+
+
+_transaction_stats: Dict[Type[Model], TransactionStats] = {}
+
+
+def get_transaction_stats(model_cls: Type[Model]) -> TransactionStats:
+    """
+    Returns the counters of the transactions that involved items of a model.
+    """
+    return _transaction_stats.setdefault(model_cls, TransactionStats())
+
+
+def _is_retryable(error: Union[TransactWriteError, TransactGetError]) -> bool:
+    code = error.cause_response_code
+    if code in RETRYABLE_TRANSACTION_ERRORS:
+        return True
+    if code != TRANSACTION_CANCELED:
+        return False
+    reasons = [reason for reason in error.cancellation_reasons if reason is not None]
+    return bool(reasons) and all(reason.code in RETRYABLE_CANCELLATION_REASONS for reason in reasons)
+
+
 class Transaction:
 
     """
     Base class for a type of transaction operation
+
+    Transactions cancelled because of a conflict with another transaction, or throttled, are retried up to
+    `max_retry_attempts` times with exponential backoff. Set it to 0 to disable the retries.
     """
 
-    def __init__(self, connection: Connection, return_consumed_capacity: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        connection: Connection,
+        return_consumed_capacity: Optional[str] = None,
+        max_retry_attempts: Optional[int] = None,
+    ) -> None:
         self._connection = connection
         self._return_consumed_capacity = return_consumed_capacity
+        self._max_retry_attempts: int = (
+            max_retry_attempts if max_retry_attempts is not None else get_settings_value('max_retry_attempts')
+        )
 
     def _commit(self):
         raise NotImplementedError()
 
+    async def _send_with_retries(self, send: Callable[[], Awaitable[Any]], item_models: List[Type[Model]]) -> Any:
+        """
+        Sends the transaction, retrying it while it fails for a retryable reason.
+
+        :param item_models: The model of each item of the transaction, in the order of the cancellation reasons
+        """
+        stats = [get_transaction_stats(model_cls) for model_cls in dict.fromkeys(item_models)]
+        for model_stats in stats:
+            model_stats.transactions += 1
+        attempt = 0
+        while True:
+            for model_stats in stats:
+                model_stats.attempts += 1
+            try:
+                return await send()
+            except (TransactWriteError, TransactGetError) as e:
+                conflicting_models = {
+                    model_cls for model_cls, reason in zip(item_models, e.cancellation_reasons)
+                    if reason is not None and reason.code in RETRYABLE_CANCELLATION_REASONS
+                }
+                for model_cls in conflicting_models:
+                    get_transaction_stats(model_cls).conflicts += 1
+                if attempt >= self._max_retry_attempts or not _is_retryable(e):
+                    for model_stats in stats:
+                        model_stats.failures += 1
+                    raise
+            attempt += 1
+            for model_stats in stats:
+                model_stats.retries += 1
+            delay = random.uniform(0, min(TRANSACT_RETRY_MAX_DELAY, TRANSACT_RETRY_BASE_DELAY * 2 ** attempt))
+            log.debug("Retrying a cancelled transaction in %.3f seconds (retry %d)", delay, attempt)
+            await asyncio.sleep(delay)
+
     async def __aenter__(self: _TTransaction) -> _TTransaction:
         return self
 
@@ -62,9 +159,12 @@ class TransactGet(Transaction):
             model.update_with_raw_data(data.get(ITEM))
 
     async def _commit(self) -> Any:
-        response = await self._connection.transact_get_items(
-            get_items=self._get_items,
-            return_consumed_capacity=self._return_consumed_capacity
+        response = await self._send_with_retries(
+            lambda: self._connection.transact_get_items(
+                get_items=self._get_items,
+                return_consumed_capacity=self._return_consumed_capacity
+            ),
+            [future._model_cls for future in self._futures],
         )
 
         results = response[RESPONSES]
@@ -74,6 +174,12 @@ class TransactGet(Transaction):
 
 
 class TransactWrite(Transaction):
+    """
+    Writes items in a single TransactWriteItems operation.
+
+    When the transaction can be retried, a `client_request_token` is generated if none is given, so that
+    a retried transaction that had in fact succeeded is not applied twice.
+    """
 
     def __init__(
         self,
@@ -82,6 +188,8 @@ class TransactWrite(Transaction):
         **kwargs: Any,
     ) -> None:
         super(TransactWrite, self).__init__(**kwargs)
+        if client_request_token is None and self._max_retry_attempts > 0:
+            client_request_token = str(uuid.uuid4())
         self._client_request_token: Optional[str] = client_request_token
         self._return_item_collection_metrics = return_item_collection_metrics
         self._condition_check_items: List[Dict] = []
@@ -89,6 +197,11 @@ class TransactWrite(Transaction):
         self._put_items: List[Dict] = []
         self._update_items: List[Dict] = []
         self._models_for_version_attribute_update: List[Any] = []
+        self._condition_check_models: List[Type[Model]] = []
+        self._deleted_models: List[Any] = []
+        self._put_models: List[Any] = []
+        self._update_models: List[Any] = []
+        self._size = 0
 
     def condition_check(self, model_cls: Type[_M], hash_key: _KeyType, range_key: Optional[_KeyType] = None, condition: Optional[Condition] = None):
         if condition is None:
@@ -98,21 +211,27 @@ class TransactWrite(Transaction):
             range_key=range_key,
             condition=condition
         )
+        self._add_size(operation_kwargs)
         self._condition_check_items.append(operation_kwargs)
+        self._condition_check_models.append(model_cls)
 
     def delete(self, model: _M, condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> None:
         operation_kwargs = model.get_delete_kwargs_from_instance(
             condition=condition,
             add_version_condition=add_version_condition,
         )
+        self._add_size(operation_kwargs)
         self._delete_items.append(operation_kwargs)
+        self._deleted_models.append(model)
 
     def save(self, model: _M, condition: Optional[Condition] = None, return_values: Optional[str] = None) -> None:
         operation_kwargs = model.get_save_kwargs_from_instance(
             condition=condition,
             return_values_on_condition_failure=return_values
         )
+        self._add_size(operation_kwargs)
         self._put_items.append(operation_kwargs)
+        self._put_models.append(model)
         self._models_for_version_attribute_update.append(model)
 
     def update(self, model: _M, actions: List[Action], condition: Optional[Condition] = None,
@@ -125,19 +244,50 @@ class TransactWrite(Transaction):
             return_values_on_condition_failure=return_values,
             add_version_condition=add_version_condition,
         )
+        self._add_size(operation_kwargs)
         self._update_items.append(operation_kwargs)
+        self._update_models.append(model)
         self._models_for_version_attribute_update.append(model)
 
+    def _add_size(self, operation_kwargs: Dict[str, Any]) -> None:
+        # Items that are put count with all their attributes, the other operations with their keys and the values
+        # of their update and condition expressions.
+        size = self._size + item_size(operation_kwargs.get(ITEM) or operation_kwargs.get(KEY) or {})
+        if ITEM not in operation_kwargs:
+            size += item_size(operation_kwargs.get(EXPRESSION_ATTRIBUTE_VALUES) or {})
+        if size > TRANSACT_WRITE_SIZE_LIMIT:
+            raise SizeLimitExceededError(
+                "The items of the transaction total {} bytes, which exceeds the DynamoDB limit of {} bytes".format(
+                    size, TRANSACT_WRITE_SIZE_LIMIT,
+                ),
+                size=size,
+                limit=TRANSACT_WRITE_SIZE_LIMIT,
+            )
+        self._size = size
+
     async def _commit(self) -> Any:
-        response = await self._connection.transact_write_items(
-            condition_check_items=self._condition_check_items,
-            delete_items=self._delete_items,
-            put_items=self._put_items,
-            update_items=self._update_items,
-            client_request_token=self._client_request_token,
-            return_consumed_capacity=self._return_consumed_capacity,
-            return_item_collection_metrics=self._return_item_collection_metrics,
-        )
+        # The items are sent in this order, which is the order of the cancellation reasons
+        item_models = self._condition_check_models + [
+            type(model) for model in self._deleted_models + self._put_models + self._update_models
+        ]
+        try:
+            response = await self._send_with_retries(
+                lambda: self._connection.transact_write_items(
+                    condition_check_items=self._condition_check_items,
+                    delete_items=self._delete_items,
+                    put_items=self._put_items,
+                    update_items=self._update_items,
+                    client_request_token=self._client_request_token,
+                    return_consumed_capacity=self._return_consumed_capacity,
+                    return_item_collection_metrics=self._return_item_collection_metrics,
+                ),
+                item_models,
+            )
+        finally:
+            for model in self._put_models + self._update_models:
+                type(model)._invalidate_cached([model._get_keys()], exists=True)
+            for model in self._deleted_models:
+                type(model)._invalidate_cached([model._get_keys()])
         for model in self._models_for_version_attribute_update:
             model.update_local_version_attribute()
         return response
@@ -0,0 +1,349 @@
+"""
+Read-only views of the projected attributes of a model.
+
+A view is declared by subclassing the class returned by :meth:`~aiopynamodb.models.Model.view`::
+
+    class UserSummary(UserModel.view('user_name', 'email', 'preferences.timezone')):
+        pass
+
+The reads of a view only request its attributes (and the key attributes of the model, which are always
+projected), and only decode those attributes. Reading an attribute of the model that the view does not
+project raises an :class:`~aiopynamodb.exceptions.AttributeNotProjectedError` instead of returning None.
+"""
+from typing import Any, AsyncIterable, AsyncIterator, ClassVar, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+from typing import Union
+from typing import cast
+
+from aiopynamodb.attributes import Attribute
+from aiopynamodb.attributes import AttributeContainer
+from aiopynamodb.attributes import MapAttribute
+from aiopynamodb.constants import NULL
+from aiopynamodb.constants import RESULT_RAW
+from aiopynamodb.exceptions import AttributeNotProjectedError
+from aiopynamodb.expressions.condition import Condition
+from aiopynamodb.expressions.operand import Path
+from aiopynamodb.models import Model, _KeyType
+from aiopynamodb.pagination import ResultIterator
+
+_V = TypeVar('_V', bound='ModelView')
+
+# A projected attribute: its python name, the attribute, and the view of its projected keys if it is a map
+# of which only some keys are projected
+_Field = Tuple[str, Attribute, Optional[Type['ContainerView']]]
+
+
+class _NotProjected:
+    """
+    Stands for an attribute of the container that the view does not project.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: Any) -> Any:
+        if instance is None:
+            return self
+        raise AttributeNotProjectedError(type(instance).__name__, self.name)
+
+
+class ContainerView:
+    """
+    A read-only object holding the projected attributes of an attribute container.
+    """
+    __slots__ = ()
+
+    _container_cls: ClassVar[Type[AttributeContainer]]
+    _fields: ClassVar[Tuple[_Field, ...]] = ()
+    _sub_paths: ClassVar[Dict[str, List[List[str]]]] = {}
+
+    def __init__(self, **attributes: Any) -> None:
+        names = {name for name, _, _ in self._fields}
+        unknown = [name for name in attributes if name not in names]
+        if unknown:
+            raise ValueError("{} does not project: {}".format(type(self).__name__, ', '.join(unknown)))
+        for name in names:
+            object.__setattr__(self, name, attributes.get(name))
+
+    @classmethod
+    def from_raw_data(cls: Type['_C'], data: Dict[str, Dict[str, Any]]) -> '_C':
+        """
+        Returns a view of the projected attributes of the serialized item
+        """
+        view = cls.__new__(cls)
+        for name, attr, nested_view in cls._fields:
+            attribute_value = data.get(attr.attr_name)
+            if not attribute_value or NULL in attribute_value:
+                value = None
+            elif nested_view is not None:
+                value = nested_view.from_raw_data(attr.get_value(attribute_value))
+            else:
+                value = attr.deserialize(attr.get_value(attribute_value))
+            object.__setattr__(view, name, value)
+        return view
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the projected attributes by python attribute name, with nested views as dictionaries
+        """
+        values = {}
+        for name, _, nested_view in self._fields:
+            value = getattr(self, name)
+            values[name] = value.to_dict() if nested_view is not None and value is not None else value
+        return values
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("{} is read-only".format(type(self).__name__))
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("{} is read-only".format(type(self).__name__))
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is type(self) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return '{}({})'.format(
+            type(self).__name__,
+            ', '.join('{}={!r}'.format(name, getattr(self, name)) for name, _, _ in self._fields),
+        )
+
+
+_C = TypeVar('_C', bound=ContainerView)
+
+
+class ModelView(ContainerView):
+    """
+    A read-only view of the projected attributes of the items of a model.
+
+    View classes are created with :meth:`~aiopynamodb.models.Model.view`. Their reads set the ProjectionExpression
+    to the projected attributes and decode the items into views rather than models.
+    """
+    __slots__ = ()
+
+    _model: ClassVar[Type[Model]]
+    _projection: ClassVar[List[Any]]
+
+    @classmethod
+    def from_raw_data(cls: Type[_V], data: Dict[str, Dict[str, Any]]) -> _V:
+        """
+        Returns a view of the projected attributes of the serialized item
+        """
+        return super().from_raw_data(cls._model._unshard_item(data))
+
+    @classmethod
+    def get_projection(cls) -> List[str]:
+        """
+        Returns the projected document paths, with the DynamoDB attribute names
+        """
+        return ['.'.join(path.path) for path in cls._projection]
+
+    @classmethod
+    async def get(
+        cls: Type[_V],
+        hash_key: _KeyType,
+        range_key: Optional[_KeyType] = None,
+        consistent_read: bool = False,
+    ) -> _V:
+        """
+        Returns the view of a single item
+
+        See :meth:`~aiopynamodb.models.Model.get` for the parameters.
+
+        :raises DoesNotExist: if the item does not exist (the `DoesNotExist` of the model)
+        """
+        data = await cls._model.get(
+            hash_key,
+            range_key=range_key,
+            consistent_read=consistent_read,
+            attributes_to_get=cls._projection,
+            result_mode=RESULT_RAW,
+        )
+        return cls.from_raw_data(cast(Dict[str, Dict[str, Any]], data))
+
+    @classmethod
+    def query(
+        cls: Type[_V],
+        hash_key: _KeyType,
+        range_key_condition: Optional[Condition] = None,
+        filter_condition: Optional[Condition] = None,
+        consistent_read: bool = False,
+        index_name: Optional[str] = None,
+        scan_index_forward: Optional[bool] = None,
+        limit: Optional[int] = None,
+        last_evaluated_key: Optional[Dict[str, Dict[str, Any]]] = None,
+        page_size: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        prefetch: int = 0,
+    ) -> ResultIterator[_V]:
+        """
+        Queries the views of the items of a hash key
+
+        See :meth:`~aiopynamodb.models.Model.query` for the parameters.
+        """
+        results = cls._model.query(
+            hash_key,
+            range_key_condition=range_key_condition,
+            filter_condition=filter_condition,
+            consistent_read=consistent_read,
+            index_name=index_name,
+            scan_index_forward=scan_index_forward,
+            limit=limit,
+            last_evaluated_key=last_evaluated_key,
+            attributes_to_get=cls._projection,
+            page_size=page_size,
+            rate_limit=rate_limit,
+            result_mode=RESULT_RAW,
+            prefetch=prefetch,
+        )
+        results._map_fn = cls.from_raw_data
+        return cast(ResultIterator[_V], results)
+
+    @classmethod
+    def scan(
+        cls: Type[_V],
+        filter_condition: Optional[Condition] = None,
+        segment: Optional[int] = None,
+        total_segments: Optional[int] = None,
+        limit: Optional[int] = None,
+        last_evaluated_key: Optional[Dict[str, Dict[str, Any]]] = None,
+        page_size: Optional[int] = None,
+        consistent_read: Optional[bool] = None,
+        index_name: Optional[str] = None,
+        rate_limit: Optional[float] = None,
+        prefetch: int = 0,
+    ) -> ResultIterator[_V]:
+        """
+        Iterates through the views of all items in the table
+
+        See :meth:`~aiopynamodb.models.Model.scan` for the parameters.
+        """
+        results = cls._model.scan(
+            filter_condition=filter_condition,
+            segment=segment,
+            total_segments=total_segments,
+            limit=limit,
+            last_evaluated_key=last_evaluated_key,
+            page_size=page_size,
+            consistent_read=consistent_read,
+            index_name=index_name,
+            rate_limit=rate_limit,
+            attributes_to_get=cls._projection,
+            result_mode=RESULT_RAW,
+            prefetch=prefetch,
+        )
+        results._map_fn = cls.from_raw_data
+        return cast(ResultIterator[_V], results)
+
+    @classmethod
+    async def batch_get(
+        cls: Type[_V],
+        items: Union[Iterable[_KeyType], AsyncIterable[_KeyType]],
+        consistent_read: Optional[bool] = None,
+        concurrency: int = 1,
+        ordered: bool = False,
+    ) -> AsyncIterator[_V]:
+        """
+        Gets the views of the items of the given keys with BatchGetItem
+
+        See :meth:`~aiopynamodb.models.Model.batch_get` for the parameters.
+        """
+        async for item in cls._model.batch_get(
+            items,
+            consistent_read=consistent_read,
+            attributes_to_get=cls._projection,
+            result_mode=RESULT_RAW,
+            concurrency=concurrency,
+            ordered=ordered,
+        ):
+            yield cls.from_raw_data(cast(Dict[str, Dict[str, Any]], item))
+
+
+def make_view(model: Type[Model], attributes: Iterable[Union[str, Attribute, Path]]) -> Type[ModelView]:
+    """
+    Returns a view class of the given attributes of the model.
+
+    Attributes are given as python attribute names, with `.` to project the keys of a map attribute,
+    or as the attributes (or document paths) of the model.
+    """
+    paths = [_get_python_path(model, attribute) for attribute in attributes]
+    if not paths:
+        raise ValueError("A view must project at least one attribute")
+    key_names = [name for name in (model._hash_keyname, model._range_keyname) if name]
+    paths = [[name] for name in key_names if [name] not in paths] + paths
+    view = cast(Type[ModelView], _make_container_view(model, paths, ModelView, '{}View'.format(model.__name__)))
+    view._model = model
+    view._projection = [Path(path) for path in _get_dynamo_paths(view)]
+    return view
+
+
+def _get_python_path(container_cls: Type[AttributeContainer], attribute: Union[str, Attribute, Path]) -> List[str]:
+    if isinstance(attribute, str):
+        return attribute.split('.')
+    # Attributes and document paths hold the DynamoDB attribute names
+    dynamo_path = attribute.attr_path if isinstance(attribute, Attribute) else attribute.path
+    python_path = []
+    current_cls: Optional[Type[AttributeContainer]] = container_cls
+    for segment in dynamo_path:
+        if current_cls is None:
+            python_path.append(segment)
+            continue
+        name = current_cls._dynamo_to_python_attr(segment)
+        python_path.append(name)
+        attr = current_cls.get_attributes().get(name)
+        current_cls = type(attr) if isinstance(attr, MapAttribute) and not attr.is_raw() else None
+    return python_path
+
+
+def _make_container_view(
+    container_cls: Type[AttributeContainer],
+    paths: List[List[str]],
+    base: Type[ContainerView],
+    name: str,
+) -> Type[ContainerView]:
+    attributes = container_cls.get_attributes()
+    sub_paths: Dict[str, List[List[str]]] = {}
+    for path in paths:
+        if '[' in path[0]:
+            raise ValueError("Views cannot project list elements: {}".format('.'.join(path)))
+        if path[0] not in attributes:
+            raise ValueError("{} has no attribute '{}'".format(container_cls.__name__, path[0]))
+        sub_paths.setdefault(path[0], []).append(path[1:])
+
+    fields: List[_Field] = []
+    for attr_name, attr_sub_paths in sub_paths.items():
+        attr = attributes[attr_name]
+        nested_view = None
+        # An attribute projected as a whole covers the keys projected from it
+        if all(attr_sub_paths):
+            if not isinstance(attr, MapAttribute):
+                raise ValueError("Only the keys of map attributes can be projected: {}.{}".format(
+                    attr_name, '.'.join(attr_sub_paths[0])))
+            if not attr.is_raw():
+                nested_view = _make_container_view(
+                    type(attr), attr_sub_paths, ContainerView, '{}{}View'.format(name, type(attr).__name__))
+        fields.append((attr_name, attr, nested_view))
+
+    namespace: Dict[str, Any] = {
+        name: _NotProjected(name) for name in attributes if name not in sub_paths
+    }
+    namespace.update({
+        '__slots__': tuple(sub_paths),
+        '_container_cls': container_cls,
+        '_fields': tuple(fields),
+        '_sub_paths': sub_paths,
+    })
+    return type(name, (base,), namespace)
+
+
+def _get_dynamo_paths(view: Type[ContainerView]) -> List[List[str]]:
+    paths: List[List[str]] = []
+    for attr_name, attr, nested_view in view._fields:
+        if nested_view is not None:
+            paths.extend([attr.attr_name] + path for path in _get_dynamo_paths(nested_view))
+            continue
+        sub_paths = view._sub_paths[attr_name]
+        if all(sub_paths):
+            # The keys of a raw map have no attribute names to translate
+            paths.extend([attr.attr_name] + path for path in sub_paths)
+        else:
+            paths.append([attr.attr_name])
+    return paths
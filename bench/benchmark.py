@@ -1,9 +1,14 @@
 import asyncio
+import calendar
 import io
+import json
 import logging
+import random
 import timeit
+import tracemalloc
 import zlib
 from datetime import datetime
+from datetime import timezone
 
 import urllib3
 
@@ -54,6 +59,40 @@ async def results_record_result(callback, count):
     print(f"{bench_name}: {result:,.02f} calls/sec")
 
 
+def results_record_memory_result(callback, count):
+    callback_name = callback.__name__
+    bench_name = callback_name.split('_', 1)[-1]
+    try:
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            items = [callback() for _ in range(count)]
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+    except Exception:
+        logging.exception(f"error running {bench_name}")
+        return
+
+    result = (after - before) / len(items)
+    benchmark_results.append((bench_name, str(result)))
+    print(f"{bench_name}: {result:,.02f} bytes/item")
+
+
+def results_record_sync_result(callback, count):
+    callback_name = callback.__name__
+    bench_name = callback_name.split('_', 1)[-1]
+    try:
+        results = timeit.repeat(callback, number=count, repeat=10)
+    except Exception:
+        logging.exception(f"error running {bench_name}")
+        return
+
+    result = count / min(results)
+    benchmark_results.append((bench_name, str(result)))
+    print(f"{bench_name}: {result:,.02f} calls/sec")
+
+
 # =============================================================================
 # Monkeypatching
 # =============================================================================
@@ -154,6 +193,11 @@ def patch_urllib3():
 import os
 from aiopynamodb.models import Model
 from aiopynamodb.attributes import UnicodeAttribute, BooleanAttribute, MapAttribute, UTCDateTimeAttribute
+from aiopynamodb.attributes import CompressedBinaryAttribute, CompressedJSONAttribute
+from aiopynamodb.attributes import NumberAttribute, NumberSetAttribute, TTLAttribute
+from aiopynamodb.attributes import ListAttribute, NDArrayAttribute
+from aiopynamodb.constants import DATETIME_FORMAT
+from aiopynamodb.capacity import read_units, write_units
 
 os.environ["AWS_ACCESS_KEY_ID"] = "1"
 os.environ["AWS_SECRET_ACCESS_KEY"] = "1"
@@ -182,6 +226,14 @@ class UserModel(Model):
     last_login = UTCDateTimeAttribute()
 
 
+class CompactUserPreferences(UserPreferences, compact_storage=True):
+    pass
+
+
+class CompactUserModel(UserModel, compact_storage=True):
+    preferences = CompactUserPreferences(null=True)
+
+
 # =============================================================================
 # GetItem
 # =============================================================================
@@ -214,6 +266,264 @@ async def bench_put_item():
     await user.save()
 
 
+# =============================================================================
+# Serialization
+# =============================================================================
+
+USER_ITEM_DATA = {
+    "user_name": {"S": "some_user"},
+    "email": {"S": "some_user@gmail.com"},
+    "first_name": {"S": "John"},
+    "last_name": {"S": "Doe"},
+    "phone_number": {"S": "4155551111"},
+    "country": {"S": "USA"},
+    "preferences": {
+        "M": {
+            "timezone": {"S": "America/New_York"},
+            "allows_notifications": {"BOOL": True},
+            "date_of_birth": {"S": "2022-10-26T20:00:00.000000+0000"}
+        }
+    },
+    "last_login": {"S": "2022-10-27T20:00:00.000000+0000"}
+}
+USER_ITEM = UserModel.from_raw_data(USER_ITEM_DATA)
+
+
+@register_benchmark("deserialize")
+def bench_deserialize():
+    UserModel.from_raw_data(USER_ITEM_DATA)
+
+
+@register_benchmark("deserialize_dict")
+def bench_deserialize_dict():
+    UserModel._get_result_map_fn('dict', lazy=None)(USER_ITEM_DATA)
+
+
+@register_benchmark("serialize")
+def bench_serialize():
+    USER_ITEM.serialize()
+
+
+@register_benchmark("to_json_lines")
+def bench_to_json_lines():
+    next(UserModel.to_json_lines([USER_ITEM]))
+
+
+@register_benchmark("to_simple_dict_json")
+def bench_to_simple_dict_json():
+    json.dumps(USER_ITEM.to_simple_dict())
+
+
+@register_benchmark("memory")
+def bench_memory():
+    return UserModel.from_raw_data(USER_ITEM_DATA)
+
+
+@register_benchmark("memory_compact")
+def bench_memory_compact():
+    return CompactUserModel.from_raw_data(USER_ITEM_DATA)
+
+
+# =============================================================================
+# Attribute codecs
+# =============================================================================
+
+NUMBER_ATTR = NumberAttribute()
+NUMBER_SET_ATTR = NumberSetAttribute()
+DATETIME_ATTR = UTCDateTimeAttribute()
+TTL_ATTR = TTLAttribute()
+DATETIME_VALUE = datetime(2022, 10, 27, 20, 1, 2, 345678, tzinfo=timezone.utc)
+TTL_VALUE = datetime(2022, 10, 27, 20, 1, 2, tzinfo=timezone.utc)
+NUMBER_SET_VALUE = {1, 22, 333, 4.5, 55.25}
+
+
+@register_benchmark("number_int_serialize")
+def bench_number_int_serialize():
+    NUMBER_ATTR.serialize(1234567)
+
+
+@register_benchmark("number_int_deserialize")
+def bench_number_int_deserialize():
+    NUMBER_ATTR.deserialize("1234567")
+
+
+@register_benchmark("number_float_serialize")
+def bench_number_float_serialize():
+    NUMBER_ATTR.serialize(1234.5678)
+
+
+@register_benchmark("number_float_deserialize")
+def bench_number_float_deserialize():
+    NUMBER_ATTR.deserialize("1234.5678")
+
+
+@register_benchmark("number_set_serialize")
+def bench_number_set_serialize():
+    NUMBER_SET_ATTR.serialize(NUMBER_SET_VALUE)
+
+
+@register_benchmark("number_set_deserialize")
+def bench_number_set_deserialize():
+    NUMBER_SET_ATTR.deserialize(["1", "22", "333", "4.5", "55.25"])
+
+
+@register_benchmark("utc_datetime_serialize")
+def bench_utc_datetime_serialize():
+    DATETIME_ATTR.serialize(DATETIME_VALUE)
+
+
+@register_benchmark("utc_datetime_deserialize")
+def bench_utc_datetime_deserialize():
+    DATETIME_ATTR.deserialize("2022-10-27T20:01:02.345678+0000")
+
+
+@register_benchmark("ttl_serialize")
+def bench_ttl_serialize():
+    TTL_ATTR.serialize(TTL_VALUE)
+
+
+@register_benchmark("ttl_deserialize")
+def bench_ttl_deserialize():
+    TTL_ATTR.deserialize("1666900862")
+
+
+# The generic implementations the codecs replace, for reference
+
+@register_benchmark("number_float_serialize_json")
+def bench_number_float_serialize_json():
+    json.dumps(1234.5678)
+
+
+@register_benchmark("number_float_deserialize_json")
+def bench_number_float_deserialize_json():
+    json.loads("1234.5678")
+
+
+@register_benchmark("utc_datetime_serialize_strftime")
+def bench_utc_datetime_serialize_strftime():
+    DATETIME_VALUE.astimezone(timezone.utc).strftime(DATETIME_FORMAT).zfill(31)
+
+
+@register_benchmark("ttl_serialize_timegm")
+def bench_ttl_serialize_timegm():
+    json.dumps(calendar.timegm(TTL_VALUE.utctimetuple()))
+
+
+# =============================================================================
+# Compression
+# =============================================================================
+
+# Representative payloads: a JSON document of repetitive records, log text, and incompressible random bytes
+COMPRESSION_PAYLOADS = {
+    "json": [
+        {
+            "event_id": "evt-{:08d}".format(idx),
+            "type": ("click", "view", "purchase")[idx % 3],
+            "page": "/products/{}".format(idx % 50),
+            "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+            "timestamp": "2022-10-27T20:{:02d}:{:02d}.000000+0000".format(idx // 60 % 60, idx % 60),
+        }
+        for idx in range(300)
+    ],
+    "text": "".join(
+        "2022-10-27 20:{:02d}:{:02d} INFO request handled path=/api/users/{} status=200 duration_ms={}\n".format(
+            idx // 60 % 60, idx % 60, idx % 97, idx % 13)
+        for idx in range(500)
+    ).encode(),
+    "random": random.Random(0).randbytes(32 * 1024),
+}
+
+
+def results_record_compression_result(payload_name, codec_name, count):
+    """
+    Records the capacity units needed to write and read a payload, raw and compressed, and the compression
+    and decompression throughput of the codec.
+    """
+    payload = COMPRESSION_PAYLOADS[payload_name]
+    try:
+        if isinstance(payload, bytes):
+            attr = CompressedBinaryAttribute(codec=codec_name)
+            raw_size = len(payload)
+        else:
+            attr = CompressedJSONAttribute(codec=codec_name)
+            raw_size = len(json.dumps(payload).encode())
+        serialized = attr.serialize(payload)
+        compress_time = min(timeit.repeat(lambda: attr.serialize(payload), number=count, repeat=5))
+        decompress_time = min(timeit.repeat(lambda: attr.deserialize(serialized), number=count, repeat=5))
+    except ImportError:
+        print(f"{payload_name}/{codec_name}: skipped, codec not installed")
+        return
+    except Exception:
+        logging.exception(f"error running {payload_name}/{codec_name}")
+        return
+
+    result = {
+        "bytes": (raw_size, len(serialized)),
+        "wcu": (write_units(raw_size), write_units(len(serialized))),
+        "rcu": (read_units(raw_size), read_units(len(serialized))),
+        "compress_per_sec": count / compress_time,
+        "decompress_per_sec": count / decompress_time,
+    }
+    benchmark_results.append((f"{payload_name}/{codec_name}", str(result)))
+    print(
+        f"{payload_name}/{codec_name}: {raw_size:,} -> {len(serialized):,} bytes, "
+        f"{result['wcu'][0]} -> {result['wcu'][1]} WCU, {result['rcu'][0]} -> {result['rcu'][1]} RCU, "
+        f"{result['compress_per_sec']:,.02f} compress/sec, {result['decompress_per_sec']:,.02f} decompress/sec"
+    )
+
+
+def results_record_array_result(count, dimensions=768, page_size=100):
+    """
+    Records the size and throughput of an embedding vector stored as a list of numbers and as an array,
+    and of decoding a page of arrays into one stacked array.
+    """
+    try:
+        attr = NDArrayAttribute(dtype="float32", shape=(dimensions,))
+    except ImportError:
+        print("arrays: skipped, numpy not installed")
+        return
+    list_attr = ListAttribute(of=NumberAttribute)
+    values = [random.Random(idx).random() for idx in range(dimensions)]
+    vector = attr.deserialize(attr.serialize(values))
+    list_serialized = list_attr.serialize(vector.tolist())
+    array_serialized = attr.serialize(vector)
+    page = [array_serialized] * page_size
+
+    for name, fn in [
+        ("list_serialize", lambda: list_attr.serialize(values)),
+        ("list_deserialize", lambda: list_attr.deserialize(list_serialized)),
+        ("ndarray_serialize", lambda: attr.serialize(vector)),
+        ("ndarray_deserialize", lambda: attr.deserialize(array_serialized)),
+        (f"ndarray_stack_{page_size}", lambda: attr.stack(page)),
+    ]:
+        per_sec = count / min(timeit.repeat(fn, number=count, repeat=5))
+        benchmark_results.append((name, per_sec))
+        print(f"{name}: {per_sec:,.02f} calls/sec")
+
+    list_size = len(json.dumps(list_serialized))
+    print(f"{dimensions} float32 values: {list_size:,} bytes (approx.) as a list, {len(array_serialized):,} bytes as an array")
+
+
+def run_with_generic_codecs(callback):
+    """
+    Runs a benchmark with the compiled codecs disabled, i.e. on the generic (de)serialization path.
+    """
+    def _wrap():
+        callback()
+    _wrap.__name__ = callback.__name__ + '_generic'
+
+    def _run(count):
+        codecs = {cls: cls._container_codec for cls in (UserModel, UserPreferences)}
+        try:
+            for cls in codecs:
+                cls._container_codec = None
+            results_record_sync_result(_wrap, count)
+        finally:
+            for cls, codec in codecs.items():
+                cls._container_codec = codec
+    return _run
+
+
 # =============================================================================
 # Benchmarks
 # =============================================================================
@@ -227,9 +537,53 @@ async def main():
     await results_record_result(benchmark_registry["get_item"], COUNT)
     await results_record_result(benchmark_registry["put_item"], COUNT)
 
+    results_new_benchmark("Serialization")
+
+    results_record_sync_result(benchmark_registry["deserialize"], COUNT * 10)
+    run_with_generic_codecs(benchmark_registry["deserialize"])(COUNT * 10)
+    results_record_sync_result(benchmark_registry["deserialize_dict"], COUNT * 10)
+    run_with_generic_codecs(benchmark_registry["deserialize_dict"])(COUNT * 10)
+    results_record_sync_result(benchmark_registry["serialize"], COUNT * 10)
+    run_with_generic_codecs(benchmark_registry["serialize"])(COUNT * 10)
+    results_record_sync_result(benchmark_registry["to_json_lines"], COUNT * 10)
+    results_record_sync_result(benchmark_registry["to_simple_dict_json"], COUNT * 10)
+
     print()
     print("Above metrics are in call/sec, larger is better.")
 
+    results_new_benchmark("Attribute codecs")
+
+    for name in benchmark_registry:
+        if name.startswith(("number_", "utc_datetime_", "ttl_")):
+            results_record_sync_result(benchmark_registry[name], COUNT * 100)
+
+    print()
+    print("Above metrics are in call/sec, larger is better.")
+
+    results_new_benchmark("Arrays")
+
+    results_record_array_result(COUNT * 10)
+
+    print()
+    print("Above metrics are in call/sec, larger is better.")
+
+    results_new_benchmark("Memory")
+
+    results_record_memory_result(benchmark_registry["memory"], COUNT * 10)
+    results_record_memory_result(benchmark_registry["memory_compact"], COUNT * 10)
+
+    print()
+    print("Above metrics are in bytes/item, smaller is better.")
+
+    results_new_benchmark("Compression")
+
+    for payload_name in COMPRESSION_PAYLOADS:
+        for codec_name in ("zlib", "lzma", "zstd", "lz4"):
+            results_record_compression_result(payload_name, codec_name, COUNT // 10)
+
+    print()
+    print("Above metrics are per item: capacity units are for a single write and a strongly consistent read.")
+
 
 if __name__ == "__main__":
     asyncio.run(main())
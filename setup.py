@@ -35,6 +35,9 @@ setup(
     ],
     extras_require={
         'signals': ['blinker>=1.3,<2.0'],
+        'numpy': ['numpy'],
+        'zstd': ['zstandard'],
+        'lz4': ['lz4'],
     },
     package_data={'aiopynamodb': ['py.typed']},
 )
@@ -2,7 +2,10 @@
 pynamodb attributes tests
 """
 import calendar
+import copy
 import json
+import pickle
+import random
 
 from base64 import b64encode
 from datetime import datetime
@@ -17,9 +20,11 @@ import pytest
 from aiopynamodb.attributes import (
     BinarySetAttribute, BinaryAttribute, DynamicMapAttribute, NumberSetAttribute, NumberAttribute,
     UnicodeAttribute, UnicodeSetAttribute, UTCDateTimeAttribute, BooleanAttribute, MapAttribute, NullAttribute,
-    ListAttribute, JSONAttribute, TTLAttribute, VersionAttribute, Attribute)
+    ListAttribute, JSONAttribute, TTLAttribute, VersionAttribute, Attribute, CompressedBinaryAttribute,
+    CompressedJSONAttribute, NDArrayAttribute, numpy)
+from aiopynamodb.compression import CompressionCodec, LzmaCodec, get_codec, is_compressed, register_codec
 from aiopynamodb.constants import (
-    NUMBER, STRING, STRING_SET, NUMBER_SET, BINARY_SET,
+    DATETIME_FORMAT, NUMBER, STRING, STRING_SET, NUMBER_SET, BINARY_SET,
     BINARY, BOOLEAN,
 )
 from aiopynamodb.models import Model
@@ -164,6 +169,16 @@ class TestUTCDateTimeAttribute:
         self.attr = UTCDateTimeAttribute()
         self.dt = datetime(2047, 1, 6, 8, 21, 30, 2000, tzinfo=timezone.utc)
 
+    def test_format_matches_strftime(self):
+        rng = random.Random(0)
+        values = [datetime(1, 1, 1), datetime(999, 12, 31, 23, 59, 59, 999999, tzinfo=timezone.utc), self.dt]
+        values += [datetime.fromtimestamp(rng.uniform(-6e10, 2.5e11), tz=timezone.utc) for _ in range(500)]
+        values += [value.astimezone(timezone(timedelta(hours=rng.randint(-12, 12)))) for value in values[-100:]]
+        for value in values:
+            expected = value.replace(tzinfo=value.tzinfo or timezone.utc).astimezone(timezone.utc)
+            assert self.attr.serialize(value) == expected.strftime(DATETIME_FORMAT).zfill(31)
+            assert self.attr.deserialize(self.attr.serialize(value)) == expected
+
     def test_utc_datetime_attribute(self):
         """
         UTCDateTimeAttribute.default
@@ -314,6 +329,26 @@ class TestNumberAttribute:
     """
     Tests number attributes
     """
+    def test_number_codec_matches_json(self):
+        """
+        NumberAttribute round-trips numbers exactly, with the encoding of the json module
+        """
+        rng = random.Random(0)
+        values = [0, -0.0, 1, -1, 2 ** 64, -(2 ** 100), 0.1, 1e16, 1.5e-300, 123456789.125, float('inf'), 3 ** 0.5]
+        values += [rng.uniform(-1e9, 1e9) for _ in range(500)] + [rng.randint(-2 ** 70, 2 ** 70) for _ in range(500)]
+        values += [rng.random() * 10 ** rng.randint(-300, 300) for _ in range(500)]
+        attr = NumberAttribute()
+        for value in values:
+            serialized = attr.serialize(value)
+            assert serialized == json.dumps(value)
+            deserialized = attr.deserialize(serialized)
+            assert deserialized == value and type(deserialized) is type(json.loads(serialized))
+        for serialized in ['1E+2', '-5e-3', '100', '-0', '1.0']:
+            assert attr.deserialize(serialized) == json.loads(serialized)
+            assert type(attr.deserialize(serialized)) is type(json.loads(serialized))
+        assert attr.serialize(True) == 'true'
+        assert NumberSetAttribute().deserialize(NumberSetAttribute().serialize({1, 2.5})) == {1, 2.5}
+
     def test_number_attribute(self):
         """
         NumberAttribute.default
@@ -494,6 +529,14 @@ class TestTTLAttribute:
     """
     Test TTLAttribute.
     """
+    def test_timestamp_matches_timegm(self):
+        rng = random.Random(0)
+        attr = TTLAttribute()
+        for _ in range(500):
+            value = datetime.fromtimestamp(rng.uniform(-1e10, 1e10), tz=timezone(timedelta(hours=rng.randint(-12, 12))))
+            assert attr.serialize(value) == str(calendar.timegm(value.utctimetuple()))
+            assert attr.deserialize(attr.serialize(value)) == value.replace(microsecond=0)
+
     def test_default_and_default_for_new(self):
         with pytest.raises(ValueError, match='An attribute cannot have both default and default_for_new parameters'):
             TTLAttribute(default=timedelta(seconds=1), default_for_new=timedelta(seconds=2))
@@ -592,6 +635,173 @@ class TestJSONAttribute:
         assert attr.deserialize(encoded) == item
 
 
+@register_codec
+class ReverseCodec(CompressionCodec):
+    """
+    Reverses values, dropping a leading 'a'
+    """
+    name = 'reverse'
+    codec_id = 200
+
+    def compress(self, data):
+        return data[::-1][:-1]
+
+    def decompress(self, data):
+        return b'a' + data[::-1]
+
+
+class TestCompressedAttributes:
+    """
+    Tests compressed attributes
+    """
+    document = {'events': [{'type': 'click', 'target': 'button-{}'.format(idx % 10)} for idx in range(200)]}
+
+    def test_compressed_binary(self):
+        attr = CompressedBinaryAttribute()
+        assert attr.attr_type == BINARY
+        value = b'abc' * 1000
+        serialized = attr.serialize(value)
+        assert serialized[:4] == b'\xc5\x9a\x01\x01'
+        assert len(serialized) < 100
+        assert attr.deserialize(serialized) == value
+
+        # Short values, and values that do not shrink, are stored with the header of the 'none' codec
+        assert attr.serialize(b'abc') == b'\xc5\x9a\x01\x00abc'
+        random_value = bytes(range(256))
+        assert attr.serialize(random_value)[4:] == random_value
+        assert attr.deserialize(attr.serialize(b'abc')) == b'abc'
+
+        # Values without the header are read as is
+        assert attr.deserialize(b'legacy') == b'legacy'
+
+    def test_codecs(self):
+        value = b'abc' * 1000
+        attr = CompressedBinaryAttribute(codec='lzma', threshold=0)
+        serialized = attr.serialize(value)
+        assert serialized[3] == LzmaCodec.codec_id
+        # Values are decoded with the codec of their header, whatever the codec of the attribute
+        assert CompressedBinaryAttribute().deserialize(serialized) == value
+        assert CompressedBinaryAttribute(codec=LzmaCodec(preset=1)).codec.preset == 1
+
+        with pytest.raises(ValueError):
+            get_codec('unknown')
+        with pytest.raises(ValueError):
+            CompressedBinaryAttribute().deserialize(b'\xc5\x9a\x01\xfe')
+        with pytest.raises(ValueError):
+            CompressedBinaryAttribute().deserialize(b'\xc5\x9a\x09\x01')
+
+        attr = CompressedBinaryAttribute(codec='reverse', threshold=0)
+        assert attr.serialize(b'abc') == b'\xc5\x9a\x01\xc8cb'
+        assert attr.deserialize(attr.serialize(b'abc')) == b'abc'
+        with pytest.raises(ValueError):
+            register_codec(type('Duplicate', (ReverseCodec,), {'name': 'duplicate'}))
+
+    def test_compressed_json(self):
+        attr = CompressedJSONAttribute()
+        serialized = attr.serialize(self.document)
+        assert is_compressed(serialized)
+        assert len(serialized) * 10 < len(json.dumps(self.document))
+        assert attr.deserialize(serialized) == self.document
+        assert attr.serialize(None) is None
+
+        # Values stored by a JSONAttribute are read as well
+        legacy_value = {STRING: json.dumps(self.document)}
+        assert attr.deserialize(attr.get_value(legacy_value)) == self.document
+        assert attr.get_value({BINARY: serialized}) == serialized
+
+    def test_compressed_model(self):
+        class CompressedModel(Model):
+            class Meta:
+                table_name = 'compressed'
+            key = UnicodeAttribute(hash_key=True)
+            document = CompressedJSONAttribute(null=True)
+            blob = CompressedBinaryAttribute(null=True)
+
+        item = CompressedModel('key', document=self.document, blob=b'x' * 2000)
+        serialized = item.serialize()
+        assert set(serialized['document']) == {BINARY}
+        assert CompressedModel.from_raw_data(serialized).document == self.document
+        assert CompressedModel.from_raw_data(serialized).blob == b'x' * 2000
+        legacy_item = {'key': {STRING: 'key'}, 'document': {STRING: json.dumps(self.document)}}
+        assert CompressedModel.from_raw_data(legacy_item).document == self.document
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy is not installed')
+class TestNDArrayAttribute:
+    """
+    Tests numpy array attributes
+    """
+
+    def test_ndarray(self):
+        attr = NDArrayAttribute(dtype='float32', shape=(None, 3))
+        assert attr.attr_type == BINARY
+        value = numpy.arange(12, dtype='float64').reshape(4, 3)
+        serialized = attr.serialize(value)
+        assert len(serialized) == 16 + 12 * 4
+        assert serialized[16:] == value.astype('<f4').tobytes()
+
+        decoded = attr.deserialize(serialized)
+        assert decoded.dtype == numpy.float32
+        assert decoded.shape == (4, 3)
+        assert (decoded == value).all()
+        # The elements are read from the stored value, without a copy
+        assert not decoded.flags.writeable
+        assert not decoded.flags.owndata
+
+        with pytest.raises(ValueError):
+            attr.serialize(numpy.zeros(3))
+        with pytest.raises(ValueError):
+            attr.serialize(numpy.zeros((2, 4)))
+        with pytest.raises(ValueError):
+            attr.deserialize(b'\x00' * 16)
+        with pytest.raises(ValueError):
+            NDArrayAttribute(dtype=object)
+
+    def test_ndarray_values(self):
+        for dtype, value in [
+            ('bool', [True, False]),
+            ('int64', 5),
+            ('>i4', [[1, 2], [3, 4]]),
+            ('complex128', [1 + 2j]),
+            ('uint8', numpy.zeros((0, 3))),
+            ('float64', numpy.arange(10.0)[::2]),
+        ]:
+            attr = NDArrayAttribute(dtype=dtype)
+            decoded = attr.deserialize(attr.serialize(value))
+            assert decoded.dtype == numpy.dtype(dtype)
+            assert numpy.array_equal(decoded, numpy.asarray(value, dtype=dtype))
+
+    def test_ndarray_compressed(self):
+        attr = NDArrayAttribute(codec='zlib')
+        value = numpy.zeros(1000)
+        serialized = attr.serialize(value)
+        assert is_compressed(serialized)
+        assert len(serialized) < 100
+        assert numpy.array_equal(attr.deserialize(serialized), value)
+        # Arrays are read whatever the codec of the attribute
+        assert numpy.array_equal(NDArrayAttribute().deserialize(serialized), value)
+
+    def test_stack(self):
+        attr = NDArrayAttribute(dtype='float32', shape=(3,), codec='zlib', threshold=8)
+        attr.attr_name = 'embedding'
+        rows = [numpy.full(3, idx, dtype='float32') for idx in range(4)]
+        serialized = [attr.serialize(row) for row in rows]
+        stacked = attr.stack(serialized)
+        assert stacked.shape == (4, 3)
+        assert stacked.flags.writeable
+        assert numpy.array_equal(stacked, numpy.stack(rows))
+
+        # Raw items, as read with result_mode='raw'
+        items = [{'id': {'S': str(idx)}, 'embedding': {BINARY: value}} for idx, value in enumerate(serialized)]
+        assert numpy.array_equal(attr.stack(items), stacked)
+        assert attr.stack([]).shape == (0, 3)
+
+        with pytest.raises(ValueError):
+            attr.stack([{'id': {'S': 'x'}}])
+        with pytest.raises(ValueError):
+            attr.stack(serialized + [NDArrayAttribute(dtype='float32').serialize(numpy.zeros(4))])
+
+
 class TestMapAttribute:
     """
     Tests map with str, int, float
@@ -1485,3 +1695,88 @@ class TestDynamoDBDict:
         assert test_model.raw_map_attr.string == 'bar'
         assert test_model.ttl_attr == expected_dt
         assert test_model.null_attr is None
+
+
+class CompactMapAttribute(MapAttribute, compact_storage=True):
+    street = UnicodeAttribute()
+    zip_code = NumberAttribute(attr_name='zip', null=True)
+
+
+class CompactModel(Model, compact_storage=True):
+    class Meta:
+        table_name = 'compact'
+
+    user_id = UnicodeAttribute(hash_key=True)
+    score = NumberAttribute(default=0)
+    address = CompactMapAttribute(null=True)
+    tags = ListAttribute(of=CompactMapAttribute, null=True)
+
+
+class CompactSubModel(CompactModel):
+    nickname = UnicodeAttribute(null=True)
+
+
+class TestCompactStorage:
+
+    def test_attribute_values_are_slotted(self):
+        item = CompactModel('alice', address=CompactMapAttribute(street='Main St'))
+        assert not isinstance(item.attribute_values, dict)
+        assert not hasattr(item.attribute_values, '__dict__')
+        assert dict(item.attribute_values) == {'user_id': 'alice', 'score': 0, 'address': item.address}
+        assert dict(item.address.attribute_values) == {'street': 'Main St'}
+        assert type(Model.__new__(Model)._attribute_values_cls()) is dict
+
+    def test_get_set_delete(self):
+        item = CompactModel('alice')
+        assert item.address is None
+        item.address = {'street': 'Main St', 'zip_code': 12345}
+        assert item.address.zip_code == 12345
+        del item.attribute_values['score']
+        assert 'score' not in item.attribute_values
+        assert item.score is None
+        assert len(item.attribute_values) == 2
+        with pytest.raises(KeyError):
+            item.attribute_values['unknown'] = 1
+        with pytest.raises(KeyError):
+            del item.attribute_values['score']
+
+    def test_serialize_round_trip(self):
+        data = {
+            'user_id': {'S': 'alice'},
+            'score': {'N': '3'},
+            'address': {'M': {'street': {'S': 'Main St'}, 'zip': {'N': '12345'}}},
+            'tags': {'L': [{'M': {'street': {'S': 'Side St'}}}]},
+        }
+        item = CompactModel.from_raw_data(data)
+        assert item.serialize() == data
+        assert item.tags[0].street == 'Side St'
+        assert not isinstance(item.tags[0].attribute_values, dict)
+        assert CompactModel.from_raw_data({'user_id': {'S': 'bob'}}).score == 0
+        # Loaded maps are initialized like the maps created by hand
+        assert item.address.attribute_kwargs == {}
+        assert item.address.__dict__.keys() == CompactMapAttribute(street='Main St').__dict__.keys()
+
+    def test_copy(self):
+        item = CompactModel('alice', address=CompactMapAttribute(street='Main St'))
+        clone = copy.deepcopy(item)
+        assert clone.address.street == 'Main St'
+        clone.address.street = 'Side St'
+        assert item.address.street == 'Main St'
+        values = pickle.loads(pickle.dumps(item.attribute_values))
+        assert type(values) is type(item.attribute_values)
+        assert values['address'].street == 'Main St'
+
+    def test_inheritance(self):
+        assert CompactSubModel._compact_storage
+        item = CompactSubModel('alice', nickname='al')
+        assert dict(item.attribute_values) == {'user_id': 'alice', 'score': 0, 'nickname': 'al'}
+
+        class ExpandedModel(CompactModel, compact_storage=False):
+            pass
+
+        assert isinstance(ExpandedModel('alice').attribute_values, dict)
+
+    def test_raw_map_is_rejected(self):
+        with pytest.raises(ValueError, match='cannot use compact storage'):
+            class RawCompactMap(DynamicMapAttribute, compact_storage=True):
+                pass
@@ -0,0 +1,179 @@
+"""
+Multi-table batch operation tests
+"""
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+
+import aiopynamodb
+from aiopynamodb.attributes import NumberAttribute
+from aiopynamodb.attributes import UnicodeAttribute
+from aiopynamodb.batch import BatchGetRequest
+from aiopynamodb.batch import MultiBatchWrite
+from aiopynamodb.constants import BATCH_GET_ITEM
+from aiopynamodb.constants import BATCH_WRITE_ITEM
+from aiopynamodb.exceptions import PutError
+from aiopynamodb.models import Model
+
+PATCH_METHOD = 'aiopynamodb.connection.Connection._make_api_call'
+
+
+class Order(Model):
+    class Meta:
+        table_name = 'orders'
+
+    order_id = UnicodeAttribute(hash_key=True)
+    customer_id = UnicodeAttribute()
+
+
+class Customer(Model):
+    class Meta:
+        table_name = 'customers'
+
+    customer_id = UnicodeAttribute(hash_key=True)
+    name = UnicodeAttribute(null=True)
+
+
+class LineItem(Model):
+    class Meta:
+        table_name = 'line_items'
+
+    order_id = UnicodeAttribute(hash_key=True)
+    line = NumberAttribute(range_key=True)
+
+
+TABLES = {
+    'orders': {'o1': {'order_id': {'S': 'o1'}, 'customer_id': {'S': 'c1'}}},
+    'customers': {'c1': {'customer_id': {'S': 'c1'}, 'name': {'S': 'Ada'}}},
+    'line_items': {
+        ('o1', '1'): {'order_id': {'S': 'o1'}, 'line': {'N': '1'}},
+        ('o1', '2'): {'order_id': {'S': 'o1'}, 'line': {'N': '2'}},
+    },
+}
+
+
+def item_key(key):
+    values = tuple(list(value.values())[0] for value in key.values())
+    return values[0] if len(values) == 1 else values
+
+
+def fake_batch_get(unprocessed_tables=()):
+    calls = []
+
+    async def make_api_call(operation_name, operation_kwargs):
+        assert operation_name == BATCH_GET_ITEM
+        calls.append(operation_kwargs['RequestItems'])
+        responses = {}
+        unprocessed = {}
+        for table_name, request in operation_kwargs['RequestItems'].items():
+            if table_name in unprocessed_tables and len(calls) == 1:
+                unprocessed[table_name] = request
+                continue
+            items = TABLES[table_name]
+            responses[table_name] = [items[item_key(key)] for key in request['Keys'] if item_key(key) in items]
+        return {'Responses': responses, 'UnprocessedKeys': unprocessed}
+    return make_api_call, calls
+
+
+@pytest.mark.asyncio
+async def test_batch_get():
+    make_api_call, calls = fake_batch_get(unprocessed_tables=('customers',))
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=make_api_call):
+        orders, customers, line_items = await aiopynamodb.batch_get(
+            BatchGetRequest(Order, ['o1', 'o2', 'o1']),
+            BatchGetRequest(Customer, ['c1'], consistent_read=True),
+            BatchGetRequest(LineItem, [('o1', 1), ('o1', 2), ('o1', 3)]),
+        )
+
+    assert list(orders) == ['o1']
+    assert orders.missing == ['o2']
+    assert orders['o1'].customer_id == 'c1'
+    assert customers['c1'].name == 'Ada'
+    assert [item.line for item in line_items.values()] == [1, 2]
+    assert line_items.missing == [('o1', 3)]
+
+    # The three tables share the first request, and the unprocessed keys are sent again
+    assert len(calls) == 2
+    assert sorted(calls[0]) == ['customers', 'line_items', 'orders']
+    assert len(calls[0]['orders']['Keys']) == 2
+    assert calls[0]['customers']['ConsistentRead'] is True
+    assert list(calls[1]) == ['customers']
+
+
+@pytest.mark.asyncio
+async def test_batch_get_pages():
+    make_api_call, calls = fake_batch_get()
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=make_api_call):
+        orders, more_orders, customers = await aiopynamodb.batch_get(
+            BatchGetRequest(Order, ['o{}'.format(idx) for idx in range(150)]),
+            BatchGetRequest(Order, ['o1'], attributes_to_get=['order_id']),
+            BatchGetRequest(Customer, ['c1']),
+        )
+    assert len(orders) == len(more_orders) == len(customers) == 1
+
+    # Requests are split at 100 keys, and a table is read for one request at a time
+    assert [{table_name: len(request['Keys']) for table_name, request in call.items()} for call in calls] == [
+        {'orders': 100},
+        {'orders': 50, 'customers': 1},
+        {'orders': 1},
+    ]
+    assert await aiopynamodb.batch_get() == []
+
+
+@pytest.mark.asyncio
+async def test_batch_write():
+    calls = []
+
+    async def make_api_call(operation_name, operation_kwargs):
+        assert operation_name == BATCH_WRITE_ITEM
+        request_items = operation_kwargs['RequestItems']
+        calls.append(request_items)
+        if len(calls) == 1:
+            return {'UnprocessedItems': {'customers': request_items['customers']}}
+        return {'UnprocessedItems': {}}
+
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=make_api_call):
+        async with aiopynamodb.batch_write() as batch:
+            for idx in range(20):
+                await batch.save(Order('o{}'.format(idx), customer_id='c1'))
+            await batch.save(Customer('c1', name='Ada'))
+            for line in range(10):
+                await batch.save(LineItem('o1', line))
+            await batch.delete(Customer('c2'))
+
+    assert [{table_name: len(requests) for table_name, requests in call.items()} for call in calls] == [
+        {'orders': 20, 'customers': 1, 'line_items': 4},
+        {'customers': 1},
+        {'line_items': 6, 'customers': 1},
+    ]
+    assert calls[2]['customers'] == [{'DeleteRequest': {'Key': {'customer_id': {'S': 'c2'}}}}]
+
+
+@pytest.mark.asyncio
+async def test_batch_write_failures():
+    async def make_api_call(operation_name, operation_kwargs):
+        return {'UnprocessedItems': operation_kwargs['RequestItems']}
+
+    batch = MultiBatchWrite(max_retry_attempts=2)
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=make_api_call) as req:
+        await batch.save(Order('o1', customer_id='c1'))
+        await batch.save(Customer('c1'))
+        with pytest.raises(PutError):
+            await batch.commit()
+    assert req.call_count == 2
+    assert sorted(batch.failed_operations) == ['customers', 'orders']
+
+    batch = MultiBatchWrite(auto_commit=False)
+    for idx in range(25):
+        await batch.save(Order('o{}'.format(idx), customer_id='c1'))
+    with pytest.raises(ValueError):
+        await batch.save(Customer('c1'))
+
+    # The pending items are also limited by the size of a request
+    batch = MultiBatchWrite(auto_commit=False)
+    batch.max_request_size = 2 * Order('o1', customer_id='c1').get_item_size()
+    for idx in range(2):
+        await batch.save(Order('o{}'.format(idx), customer_id='c1'))
+    with pytest.raises(ValueError):
+        await batch.save(Order('o2', customer_id='c1'))
@@ -0,0 +1,249 @@
+"""
+Item cache tests
+"""
+import asyncio
+from decimal import Decimal
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+
+from aiopynamodb.attributes import NumberAttribute
+from aiopynamodb.attributes import UnicodeAttribute
+from aiopynamodb.cache import BloomFilter
+from aiopynamodb.cache import LRUItemCache
+from aiopynamodb.cache import NegativeLookupCache
+from aiopynamodb.constants import BATCH_GET_ITEM
+from aiopynamodb.constants import GET_ITEM
+from aiopynamodb.constants import SCAN
+from aiopynamodb.constants import TRANSACT_WRITE_ITEMS
+from aiopynamodb.constants import UPDATE_ITEM
+from aiopynamodb.connection import Connection
+from aiopynamodb.models import Model
+from aiopynamodb.transactions import TransactWrite
+
+PATCH_METHOD = 'aiopynamodb.connection.Connection._make_api_call'
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Flag(Model):
+    class Meta:
+        table_name = 'flags'
+        cache = LRUItemCache(max_size=2, ttl=10, stale_ttl=5, clock=Clock())
+
+    name = UnicodeAttribute(hash_key=True)
+    value = NumberAttribute(default=0)
+
+
+class Account(Model):
+    class Meta:
+        table_name = 'accounts'
+        negative_cache = NegativeLookupCache(ttl=10, max_size=2, clock=Clock())
+
+    name = UnicodeAttribute(hash_key=True)
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    Flag.Meta.cache.clear()
+    Flag.Meta.cache.stats.__init__()
+    Flag.Meta.cache.clock.now = 0.0
+    Account.Meta.negative_cache.clear()
+    Account.Meta.negative_cache.key_filter = None
+    Account.Meta.negative_cache.stats.__init__()
+    Account.Meta.negative_cache.clock.now = 0.0
+
+
+def fake_api(items):
+    async def make_api_call(operation_name, operation_kwargs):
+        if operation_name == GET_ITEM:
+            key = operation_kwargs['Key']['name']['S']
+            return {'Item': items[key]} if key in items else {}
+        if operation_name == BATCH_GET_ITEM:
+            table_name, request = next(iter(operation_kwargs['RequestItems'].items()))
+            return {
+                'Responses': {table_name: [items[key['name']['S']] for key in request['Keys'] if key['name']['S'] in items]},
+                'UnprocessedKeys': {},
+            }
+        if operation_name == SCAN:
+            return {'Items': [{'name': item['name']} for item in items.values()], 'Count': len(items), 'ScannedCount': len(items)}
+        if operation_name == UPDATE_ITEM:
+            return {'Attributes': {'name': operation_kwargs['Key']['name'], 'value': {'N': '7'}}}
+        return {}
+    return make_api_call
+
+
+def calls(req, operation_name):
+    return [call[0][1] for call in req.call_args_list if call[0][0] == operation_name]
+
+
+@pytest.mark.asyncio
+async def test_get():
+    items = {'a': {'name': {'S': 'a'}, 'value': {'N': '1'}}}
+    cache = Flag.Meta.cache
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=fake_api(items)) as req:
+        flag = await Flag.get('a')
+        assert (await Flag.get('a')).value == 1
+        assert await Flag.get('a') is not flag
+        assert len(calls(req, GET_ITEM)) == 1
+        assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+
+        await Flag.get('a', consistent_read=True)
+        await Flag.get('a', attributes_to_get=['value'])
+        assert len(calls(req, GET_ITEM)) == 3
+
+        with pytest.raises(Flag.DoesNotExist):
+            await Flag.get('b')
+
+        cache.clock.now = 11
+        items['a'] = {'name': {'S': 'a'}, 'value': {'N': '2'}}
+        # Stale items are served while they are read again in the background
+        assert (await Flag.get('a')).value == 1
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert cache.stats.stale_hits == 1
+        assert (await Flag.get('a')).value == 2
+        assert len(calls(req, GET_ITEM)) == 5
+
+        cache.clock.now = 100
+        await Flag.get('a')
+        assert len(calls(req, GET_ITEM)) == 6
+
+
+@pytest.mark.asyncio
+async def test_batch_get():
+    items = {name: {'name': {'S': name}, 'value': {'N': '1'}} for name in 'abc'}
+    cache = Flag.Meta.cache
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=fake_api(items)) as req:
+        await Flag.get('a')
+        flags = [flag async for flag in Flag.batch_get(['a', 'b', 'd'], ordered=True)]
+        assert [flag.name for flag in flags] == ['a', 'b']
+        assert [key['name']['S'] for key in calls(req, BATCH_GET_ITEM)[0]['RequestItems']['flags']['Keys']] == ['b', 'd']
+
+        flags = [flag async for flag in Flag.batch_get(['b', 'a'])]
+        assert sorted(flag.name for flag in flags) == ['a', 'b']
+        assert len(calls(req, BATCH_GET_ITEM)) == 1
+
+        # The cache holds up to 2 items
+        await Flag.get('c')
+        assert cache.stats.evictions == 1
+        assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_writes():
+    items = {'a': {'name': {'S': 'a'}, 'value': {'N': '1'}}}
+    cache = Flag.Meta.cache
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=fake_api(items)) as req:
+        flag = await Flag.get('a')
+        flag.value = 5
+        await flag.save()
+        assert (await Flag.get('a')).value == 5
+
+        await flag.update(actions=[Flag.value.set(7)])
+        assert (await Flag.get('a')).value == 7
+
+        await flag.delete()
+        assert len(cache) == 0
+
+        await Flag.get('a')
+        async with Flag.batch_write() as batch:
+            await batch.save(Flag('a', value=3))
+        assert len(cache) == 0
+        assert len(calls(req, GET_ITEM)) == 2
+
+
+def test_bloom_filter():
+    key_filter = BloomFilter(capacity=1000, false_positive_rate=0.01)
+    assert (key_filter.num_bits, key_filter.num_hashes, key_filter.size_in_bytes) == (9586, 7, 1199)
+    key_filter.update(('key-{}'.format(i),) for i in range(1000))
+    assert len(key_filter) == 1000
+    assert all(('key-{}'.format(i),) in key_filter for i in range(1000))
+    false_positives = sum(('other-{}'.format(i),) in key_filter for i in range(10000))
+    assert false_positives < 200
+    assert key_filter.current_false_positive_rate == pytest.approx(0.01, rel=0.1)
+
+    # Numbers are the same key in any form
+    key_filter.add((Decimal('1.0'), 'a'))
+    assert (Decimal('1'), 'a') in key_filter
+
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=0)
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=10, false_positive_rate=1)
+
+
+@pytest.mark.asyncio
+async def test_negative_cache():
+    items = {'a': {'name': {'S': 'a'}}}
+    negative_cache = Account.Meta.negative_cache
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=fake_api(items)) as req:
+        for _ in range(3):
+            with pytest.raises(Account.DoesNotExist):
+                await Account.get('b')
+        assert len(calls(req, GET_ITEM)) == 1
+        assert (negative_cache.stats.hits, negative_cache.stats.misses) == (2, 1)
+
+        with pytest.raises(Account.DoesNotExist):
+            await Account.get('b', consistent_read=True)
+        assert len(calls(req, GET_ITEM)) == 2
+
+        # Misses expire
+        negative_cache.clock.now = 11
+        with pytest.raises(Account.DoesNotExist):
+            await Account.get('b')
+        assert len(calls(req, GET_ITEM)) == 3
+
+        # Writes forget the misses
+        await Account('b').save()
+        items['b'] = {'name': {'S': 'b'}}
+        assert (await Account.get('b')).name == 'b'
+        assert len(calls(req, GET_ITEM)) == 4
+
+        accounts = [account async for account in Account.batch_get(['a', 'c', 'd'])]
+        assert [account.name for account in accounts] == ['a']
+        assert len(negative_cache) == 2
+        accounts = [account async for account in Account.batch_get(['c', 'd'])]
+        assert accounts == []
+        assert len(calls(req, BATCH_GET_ITEM)) == 1
+
+        # Up to 2 misses are remembered
+        with pytest.raises(Account.DoesNotExist):
+            await Account.get('e')
+        assert negative_cache.stats.evictions == 1
+        assert negative_cache.memory_usage > 0
+
+
+@pytest.mark.asyncio
+async def test_negative_cache_key_filter():
+    items = {name: {'name': {'S': name}} for name in 'ab'}
+    negative_cache = Account.Meta.negative_cache
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=fake_api(items)) as req:
+        key_filter = await negative_cache.load_key_filter(Account, capacity=100)
+        assert negative_cache.key_filter is key_filter
+        assert len(key_filter) == 2
+        assert calls(req, SCAN)[0]['ProjectionExpression'] == '#0'
+
+        assert (await Account.get('a')).name == 'a'
+        with pytest.raises(Account.DoesNotExist):
+            await Account.get('z')
+        assert len(calls(req, GET_ITEM)) == 1
+        assert negative_cache.stats.filter_hits == 1
+        assert negative_cache.memory_usage >= key_filter.size_in_bytes
+
+        # Items written by this process are added to the filter
+        await Account('z').save()
+        items['z'] = {'name': {'S': 'z'}}
+        assert (await Account.get('z')).name == 'z'
+
+        async with TransactWrite(connection=Connection()) as transaction:
+            transaction.save(Account('y'))
+        assert ('y',) in key_filter
+        assert len(calls(req, TRANSACT_WRITE_ITEMS)) == 1
@@ -0,0 +1,112 @@
+"""
+Capacity estimate tests
+"""
+import pytest
+
+from aiopynamodb.attributes import NumberAttribute
+from aiopynamodb.attributes import UnicodeAttribute
+from aiopynamodb.capacity import read_units
+from aiopynamodb.capacity import write_units
+from aiopynamodb.indexes import AllProjection
+from aiopynamodb.indexes import GlobalSecondaryIndex
+from aiopynamodb.indexes import IncludeProjection
+from aiopynamodb.indexes import KeysOnlyProjection
+from aiopynamodb.indexes import LocalSecondaryIndex
+from aiopynamodb.models import Model
+
+
+class EmailIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = 'email_index'
+        projection = AllProjection()
+
+    email = UnicodeAttribute(hash_key=True)
+
+
+class CityIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = 'city_index'
+        projection = IncludeProjection(['name'])
+
+    city = UnicodeAttribute(hash_key=True)
+
+
+class ScoreIndex(LocalSecondaryIndex):
+    class Meta:
+        index_name = 'score_index'
+        projection = KeysOnlyProjection()
+
+    user_id = UnicodeAttribute(hash_key=True)
+    score = NumberAttribute(range_key=True)
+
+
+class UserModel(Model):
+    class Meta:
+        table_name = 'users'
+
+    user_id = UnicodeAttribute(hash_key=True)
+    name = UnicodeAttribute(null=True)
+    email = UnicodeAttribute(null=True)
+    city = UnicodeAttribute(null=True)
+    score = NumberAttribute(null=True)
+    bio = UnicodeAttribute(null=True)
+
+    email_index = EmailIndex()
+    city_index = CityIndex()
+    score_index = ScoreIndex()
+
+
+def test_units():
+    assert write_units(0) == 1
+    assert write_units(1024) == 1
+    assert write_units(1025) == 2
+    assert read_units(4096) == 1
+    assert read_units(4097) == 2
+
+
+def test_estimate_capacity():
+    item = UserModel('u1', name='Alice', email='a@example.com', city='Paris', bio='x' * 5000)
+    estimate = UserModel.estimate_capacity(item)
+    size = len('user_id') + 2 + len('name') + 5 + len('email') + 13 + len('city') + 5 + len('bio') + 5000
+    assert estimate.size == size == item.get_item_size()
+    assert estimate.write_units == 5
+    assert estimate.strong_read_units == 2
+    assert estimate.eventual_read_units == 1
+
+    indexes = {index.index_name: index for index in estimate.indexes}
+    assert indexes['email_index'].is_global
+    assert indexes['email_index'].size == 100 + size
+    assert indexes['email_index'].write_units == 6
+    assert indexes['city_index'].size == 100 + len('city') + 5 + len('user_id') + 2 + len('name') + 5
+    assert indexes['city_index'].write_units == 1
+    # The item has no score, so it is not written to the sparse index
+    assert not indexes['score_index'].is_global
+    assert indexes['score_index'].size == 0
+    assert indexes['score_index'].write_units == 0
+    assert estimate.total_write_units == 5 + 6 + 1
+
+
+def test_estimate_capacity_from_sample():
+    items = [
+        UserModel('u1', name='Alice', score=1),
+        UserModel('u2', city='Paris', bio='x' * 2000),
+    ]
+    report = UserModel.estimate_capacity_from_sample(items + [items[1].serialize()])
+    assert report.item_count == 3
+    assert report.min_size == items[0].get_item_size()
+    assert report.max_size == items[1].get_item_size()
+    assert report.max_total_write_units == 2 + 1
+    assert next(iter(report.attribute_sizes)) == 'bio'
+    assert report.attribute_sizes['bio'] == pytest.approx((len('bio') + 2000) * 2 / 3)
+
+    indexes = {index.index_name: index for index in report.indexes}
+    assert indexes['email_index'].item_count == 0
+    assert indexes['city_index'].item_count == 2
+    assert indexes['city_index'].mean_write_units == pytest.approx(2 / 3)
+    assert indexes['score_index'].item_count == 1
+    assert indexes['score_index'].mean_size == 100 + len('user_id') + 2 + len('score') + 2
+
+    assert 'GSI city_index: 2 of 3 items' in str(report)
+
+    with pytest.raises(ValueError):
+        UserModel.estimate_capacity_from_sample([])
@@ -0,0 +1,294 @@
+"""
+Large item (chunked storage) tests
+"""
+import random
+from datetime import timedelta
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from aiopynamodb.attributes import BinaryAttribute
+from aiopynamodb.attributes import ListAttribute
+from aiopynamodb.attributes import NumberAttribute
+from aiopynamodb.attributes import TTLAttribute
+from aiopynamodb.attributes import UnicodeAttribute
+from aiopynamodb.attributes import VersionAttribute
+from aiopynamodb.chunking import join_item
+from aiopynamodb.chunking import split_item
+from aiopynamodb.constants import BATCH_GET_ITEM
+from aiopynamodb.constants import BATCH_WRITE_ITEM
+from aiopynamodb.constants import DELETE_ITEM
+from aiopynamodb.constants import GET_ITEM
+from aiopynamodb.constants import PUT_ITEM
+from aiopynamodb.constants import QUERY
+from aiopynamodb.exceptions import ChunkedItemError
+from aiopynamodb.exceptions import PutError
+from aiopynamodb.exceptions import SizeLimitExceededError
+from aiopynamodb.models import Model
+
+PATCH_METHOD = 'aiopynamodb.connection.Connection._make_api_call'
+
+
+class Document(Model):
+    class Meta:
+        table_name = 'documents'
+        large_items = True
+        track_changes = True
+
+    owner = UnicodeAttribute(hash_key=True)
+    name = UnicodeAttribute(range_key=True)
+    title = UnicodeAttribute(null=True)
+    body = BinaryAttribute(null=True, legacy_encoding=False)
+    lines = ListAttribute(of=UnicodeAttribute, null=True)
+    views = NumberAttribute(default=0)
+    version = VersionAttribute()
+    expires = TTLAttribute(null=True)
+
+
+class FakeTable:
+    """
+    An in-memory table, serving the operations used by large items
+    """
+
+    def __init__(self, page_size=1):
+        self.items = {}
+        self.operations = []
+        self.page_size = page_size
+        self.fail_puts = False
+        # The error code of the failed puts, if any
+        self.put_error_code = None
+        # Puts that store the item, then fail as if their response was lost
+        self.fail_put_responses = False
+        # The number of batch writes that only process their first request
+        self.partial_batch_writes = 0
+
+    @staticmethod
+    def _key(item):
+        return item['owner']['S'], item['name']['S']
+
+    async def make_api_call(self, operation_name, operation_kwargs):
+        self.operations.append(operation_name)
+        if operation_name == PUT_ITEM:
+            if self.fail_puts:
+                cause = ClientError({'Error': {'Code': self.put_error_code}}, PUT_ITEM) if self.put_error_code else None
+                raise PutError(cause=cause)
+            old = self.items.get(self._key(operation_kwargs['Item']))
+            self.items[self._key(operation_kwargs['Item'])] = operation_kwargs['Item']
+            if self.fail_put_responses:
+                raise PutError()
+            return {'Attributes': old} if old and operation_kwargs.get('ReturnValues') == 'ALL_OLD' else {}
+        if operation_name == DELETE_ITEM:
+            old = self.items.pop(self._key(operation_kwargs['Key']), None)
+            return {'Attributes': old} if old and operation_kwargs.get('ReturnValues') == 'ALL_OLD' else {}
+        if operation_name == GET_ITEM:
+            item = self.items.get(self._key(operation_kwargs['Key']))
+            return {'Item': item} if item else {}
+        if operation_name == BATCH_WRITE_ITEM:
+            requests, unprocessed = operation_kwargs['RequestItems']['documents'], []
+            if self.partial_batch_writes:
+                self.partial_batch_writes -= 1
+                requests, unprocessed = requests[:1], requests[1:]
+            for request in requests:
+                if 'PutRequest' in request:
+                    self.items[self._key(request['PutRequest']['Item'])] = request['PutRequest']['Item']
+                else:
+                    self.items.pop(self._key(request['DeleteRequest']['Key']), None)
+            return {'UnprocessedItems': {'documents': unprocessed} if unprocessed else {}}
+        if operation_name == BATCH_GET_ITEM:
+            keys = operation_kwargs['RequestItems']['documents']['Keys']
+            found = [self.items[self._key(key)] for key in keys if self._key(key) in self.items]
+            return {'Responses': {'documents': found}, 'UnprocessedKeys': {}}
+        assert operation_name == QUERY
+        values = operation_kwargs['ExpressionAttributeValues']
+        owner, prefix = values[':0']['S'], values[':1']['S']
+        matches = sorted(
+            (key, item) for key, item in self.items.items() if key[0] == owner and key[1].startswith(prefix)
+        )
+        start = operation_kwargs.get('ExclusiveStartKey')
+        if start is not None:
+            matches = [(key, item) for key, item in matches if key > self._key(start)]
+        page = [item for _, item in matches[:self.page_size]]
+        result = {'Items': page, 'Count': len(page), 'ScannedCount': len(page)}
+        if len(matches) > self.page_size:
+            result['LastEvaluatedKey'] = {'owner': page[-1]['owner'], 'name': page[-1]['name']}
+        return result
+
+    def chunk_names(self):
+        return sorted(key[1] for key in self.items if '#chunk#' in key[1])
+
+
+def make_document(size, name='report'):
+    body = random.Random(0).randbytes(size)
+    return Document('ada', name, title='Report', body=body, lines=['a', 'b'], expires=timedelta(days=1))
+
+
+def test_split_item():
+    item = make_document(300 * 1024).serialize()
+    manifest, chunks = split_item(item, 'owner', 'name', ['version', 'expires'], 'expires', chunk_size=100 * 1024)
+    assert set(manifest) == {'expires', '__chunks'}
+    assert len(chunks) == 4
+    assert all(chunk['expires'] == item['expires'] and chunk['owner'] == item['owner'] for chunk in chunks)
+    assert [chunk['name']['S'][-5:] for chunk in chunks] == ['00000', '00001', '00002', '00003']
+    stored = {'owner': item['owner'], 'name': item['name'], **manifest}
+    assert join_item(stored, chunks) == {**item, '__chunks': manifest['__chunks']}
+
+
+def test_large_items_require_string_range_key():
+    with pytest.raises(ValueError):
+        class Invalid(Model):
+            class Meta:
+                table_name = 'invalid'
+                large_items = True
+
+            key = UnicodeAttribute(hash_key=True)
+
+
+@pytest.mark.asyncio
+async def test_save_and_get_large_item():
+    table = FakeTable()
+    document = make_document(1024 * 1024)
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=table.make_api_call):
+        await document.save()
+        assert document.version == 1
+        chunk_names = table.chunk_names()
+        assert len(chunk_names) == 3
+        # The chunks are written before the manifest
+        assert table.operations == [BATCH_WRITE_ITEM, PUT_ITEM]
+        manifest = table.items[('ada', 'report')]
+        assert set(manifest) == {'owner', 'name', 'version', 'expires', '__chunks'}
+
+        table.operations = []
+        loaded = await Document.get('ada', 'report')
+        assert table.operations == [GET_ITEM, QUERY, QUERY, QUERY]
+        assert loaded.body == document.body
+        assert loaded.lines == ['a', 'b']
+        assert loaded.version == 1
+
+        # Replacing the item deletes the chunks of the previous version
+        loaded.body = loaded.body[:500 * 1024]
+        await loaded.save(mode='changed')
+        assert loaded.version == 2
+        assert len(table.chunk_names()) == 2
+        assert not set(chunk_names) & set(table.chunk_names())
+
+        # An item that fits the item size limit is stored as is, and replaces the chunks
+        loaded.body = b'small'
+        await loaded.save()
+        assert table.chunk_names() == []
+        assert '__chunks' not in table.items[('ada', 'report')]
+        assert (await Document.get('ada', 'report')).body == b'small'
+
+
+@pytest.mark.asyncio
+async def test_batch_get_and_delete_large_items():
+    table = FakeTable(page_size=2)
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=table.make_api_call):
+        for name in ('a', 'b'):
+            await make_document(600 * 1024, name).save()
+        await Document('ada', 'c', title='small').save()
+        documents = {doc.name: doc async for doc in Document.batch_get([('ada', 'a'), ('ada', 'b'), ('ada', 'c')])}
+        assert len(documents['a'].body) == 600 * 1024
+        assert documents['c'].title == 'small'
+
+        await documents['a'].delete()
+        assert all(name.startswith('b#') for name in table.chunk_names())
+
+
+@pytest.mark.asyncio
+async def test_orphaned_chunks():
+    table = FakeTable()
+    document = make_document(500 * 1024)
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=table.make_api_call):
+        await document.save()
+        # A failed save deletes the chunks it wrote
+        table.fail_puts = True
+        document.body = document.body[::-1]
+        with pytest.raises(PutError):
+            await document.save()
+        table.fail_puts = False
+        assert len(table.chunk_names()) == 2
+
+        # Chunks left behind by an interrupted save are found by their id
+        table.items[('ada', 'report#chunk#0123#00000')] = {
+            'owner': {'S': 'ada'}, 'name': {'S': 'report#chunk#0123#00000'}, '__chunk': {'B': b'x'},
+        }
+        assert await Document.delete_orphaned_chunks('ada', 'report') == 1
+        assert len(table.chunk_names()) == 2
+
+        # Missing chunks are reported
+        del table.items[('ada', table.chunk_names()[0])]
+        with pytest.raises(ChunkedItemError):
+            await Document.get('ada', 'report')
+
+
+@pytest.mark.asyncio
+async def test_failed_manifest_write_was_applied():
+    table = FakeTable()
+    document = make_document(500 * 1024)
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=table.make_api_call):
+        await document.save()
+        chunk_names = table.chunk_names()
+
+        # The chunks of a manifest that was stored are kept, and the chunks it replaced are left behind
+        table.fail_put_responses = True
+        table.operations = []
+        document.body = document.body[::-1]
+        await document.save()
+        table.fail_put_responses = False
+        assert table.operations == [BATCH_WRITE_ITEM, PUT_ITEM, GET_ITEM]
+        assert document.version == 2
+        assert len(table.chunk_names()) == 4
+        assert (await Document.get('ada', 'report')).body == document.body
+
+        assert await Document.delete_orphaned_chunks('ada', 'report') == 2
+        assert not set(chunk_names) & set(table.chunk_names())
+        assert (await Document.get('ada', 'report')).body == document.body
+
+        # A failed condition is not checked with a read
+        table.fail_puts = True
+        table.put_error_code = 'ConditionalCheckFailedException'
+        table.operations = []
+        with pytest.raises(PutError):
+            await document.save()
+        table.fail_puts = False
+        assert table.operations == [BATCH_WRITE_ITEM, PUT_ITEM, BATCH_WRITE_ITEM]
+        assert len(table.chunk_names()) == 2
+
+
+@pytest.mark.asyncio
+async def test_unprocessed_chunks():
+    table = FakeTable()
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=table.make_api_call):
+        # Unprocessed chunks are resent after a delay
+        table.partial_batch_writes = 2
+        with patch('aiopynamodb.models.asyncio.sleep', new_callable=AsyncMock) as sleep:
+            await make_document(1024 * 1024).save()
+        assert sleep.call_count == 2
+        assert sleep.call_args_list[1][0][0] <= 0.2
+        assert len(table.chunk_names()) == 3
+        assert table.operations == [BATCH_WRITE_ITEM] * 3 + [PUT_ITEM]
+
+        # A save that fails to write all its chunks deletes the chunks it wrote, and leaves the item as it was
+        chunk_names = table.chunk_names()
+        table.operations = []
+        table.partial_batch_writes = 3
+        with patch('aiopynamodb.models.asyncio.sleep', new_callable=AsyncMock):
+            with pytest.raises(PutError):
+                await make_document(1800 * 1024).save()
+        assert PUT_ITEM not in table.operations
+        assert table.chunk_names() == chunk_names
+        assert len((await Document.get('ada', 'report')).body) == 1024 * 1024
+
+
+def test_other_models_keep_the_size_limit():
+    class Small(Model):
+        class Meta:
+            table_name = 'small'
+
+        key = UnicodeAttribute(hash_key=True)
+        body = BinaryAttribute(legacy_encoding=False)
+
+    with pytest.raises(SizeLimitExceededError):
+        Small._check_item_size(Small('a', body=b'x' * 500 * 1024).serialize())
@@ -0,0 +1,161 @@
+"""
+Compiled codec tests
+"""
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+import pytest
+
+from aiopynamodb.attributes import AttributeContainer
+from aiopynamodb.attributes import DiscriminatorAttribute
+from aiopynamodb.attributes import DynamicMapAttribute
+from aiopynamodb.attributes import ListAttribute
+from aiopynamodb.attributes import MapAttribute
+from aiopynamodb.attributes import NumberAttribute
+from aiopynamodb.attributes import TTLAttribute
+from aiopynamodb.attributes import UnicodeAttribute
+from aiopynamodb.attributes import UTCDateTimeAttribute
+from aiopynamodb.attributes import VersionAttribute
+from aiopynamodb.exceptions import AttributeDeserializationError
+from aiopynamodb.exceptions import AttributeNullError
+from aiopynamodb.models import Model
+
+
+class Address(MapAttribute):
+    street = UnicodeAttribute()
+    zip_code = NumberAttribute(attr_name='zip', null=True)
+
+
+class Shape(MapAttribute):
+    cls = DiscriminatorAttribute()
+    name = UnicodeAttribute()
+
+
+class Circle(Shape, discriminator='circle'):
+    radius = NumberAttribute()
+
+
+class CodecModel(Model):
+    class Meta:
+        table_name = 'codec'
+
+    user_id = UnicodeAttribute(hash_key=True)
+    nickname = UnicodeAttribute(attr_name='nick', null=True)
+    score = NumberAttribute(default=0)
+    created = UTCDateTimeAttribute(null=True)
+    expires = TTLAttribute(null=True)
+    address = Address(null=True)
+    addresses = ListAttribute(of=Address, null=True)
+    shape = Shape(null=True)
+    version = VersionAttribute()
+
+
+class CustomInitModel(Model):
+    class Meta:
+        table_name = 'codec'
+
+    user_id = UnicodeAttribute(hash_key=True)
+    greeting = UnicodeAttribute(null=True)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.initialized = True
+
+
+class DynamicAddress(DynamicMapAttribute):
+    street = UnicodeAttribute()
+
+
+ITEM_DATA = {
+    'user_id': {'S': 'alice'},
+    'nick': {'S': 'al'},
+    'score': {'N': '42'},
+    'created': {'S': '2022-10-26T20:00:00.000000+0000'},
+    'expires': {'N': '1666814400'},
+    'address': {'M': {'street': {'S': 'Main St'}, 'zip': {'N': '12345'}}},
+    'addresses': {'L': [{'M': {'street': {'S': 'Side St'}}}, {'NULL': True}]},
+    'shape': {'M': {'cls': {'S': 'circle'}, 'name': {'S': 'unit'}, 'radius': {'N': '1'}}},
+    'version': {'N': '3'},
+}
+
+
+def _generic_instantiate(cls, attribute_values):
+    instance = cls(_user_instantiated=False)
+    AttributeContainer._generic_container_deserialize(instance, attribute_values)
+    return instance
+
+
+def test_compiled_deserialize_matches_generic():
+    compiled = CodecModel.from_raw_data(ITEM_DATA)
+    generic = _generic_instantiate(CodecModel, ITEM_DATA)
+    assert compiled.attribute_values.keys() == generic.attribute_values.keys()
+    assert compiled.serialize() == generic._generic_container_serialize() == ITEM_DATA
+    assert compiled.nickname == 'al'
+    assert compiled.created == datetime(2022, 10, 26, 20, tzinfo=timezone.utc)
+    assert compiled.expires == datetime(2022, 10, 26, 20, tzinfo=timezone.utc)
+    assert type(compiled.shape) is Circle
+    assert compiled.addresses[1] is None
+    assert compiled.version == 3
+
+
+def test_compiled_deserialize_applies_defaults():
+    item = CodecModel.from_raw_data({'user_id': {'S': 'bob'}})
+    assert item.score == 0
+    assert item.version is None
+
+
+def test_compiled_serialize_null_check():
+    item = CodecModel('carol', address=Address())
+    with pytest.raises(AttributeNullError) as excinfo:
+        item.serialize()
+    assert str(excinfo.value) == "Attribute 'address.street' cannot be None"
+    assert item.serialize(null_check=False)['address'] == {'M': {}}
+
+
+def test_compiled_serialize_validates_maps():
+    # Map values are validated whatever the attribute they are assigned to
+    item = CodecModel('erin', nickname=Address())
+    for serialize in (item.serialize, item._generic_container_serialize):
+        with pytest.raises(AttributeNullError) as excinfo:
+            serialize()
+        assert str(excinfo.value) == "Attribute 'nickname.street' cannot be None"
+
+
+def test_compiled_deserialize_type_mismatch():
+    with pytest.raises(AttributeDeserializationError):
+        CodecModel.from_raw_data({'user_id': {'N': '1'}})
+
+
+def test_custom_init_is_called():
+    item = CustomInitModel.from_raw_data({'user_id': {'S': 'dave'}, 'greeting': {'S': 'hi'}})
+    assert item.initialized
+    assert item.greeting == 'hi'
+
+
+def test_raw_maps_are_not_compiled():
+    assert MapAttribute._get_container_codec() is None
+    assert DynamicAddress._get_container_codec() is None
+    assert Address._get_container_codec() is not None
+
+
+def test_codec_is_compiled_per_class():
+    assert Shape._get_container_codec() is not Circle._get_container_codec()
+    assert 'radius' in Circle._get_container_codec().source
+    assert 'radius' not in Shape._get_container_codec().source
+
+
+def test_compiled_to_dict_matches_generic():
+    compiled = CodecModel._to_python_dict(ITEM_DATA)
+    codec = CodecModel._container_codec
+    CodecModel._container_codec = None
+    try:
+        generic = CodecModel._to_python_dict(ITEM_DATA)
+    finally:
+        CodecModel._container_codec = codec
+    assert compiled == generic
+    assert list(compiled) == list(generic)
+    assert compiled['address'] == {'street': 'Main St', 'zip_code': 12345}
+    assert compiled['addresses'] == [{'street': 'Side St'}, None]
+    assert compiled['shape'] == {'cls': Circle, 'name': 'unit', 'radius': 1}
+    assert CodecModel._to_python_dict({'user_id': {'S': 'bob'}}) == {'user_id': 'bob', 'score': 0}
@@ -0,0 +1,165 @@
+"""
+Columnar result tests
+"""
+from datetime import datetime
+from datetime import timezone
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+
+from aiopynamodb.attributes import BooleanAttribute
+from aiopynamodb.attributes import ListAttribute
+from aiopynamodb.attributes import MapAttribute
+from aiopynamodb.attributes import NumberAttribute
+from aiopynamodb.attributes import TTLAttribute
+from aiopynamodb.attributes import UnicodeAttribute
+from aiopynamodb.attributes import UTCDateTimeAttribute
+from aiopynamodb.attributes import VersionAttribute
+from aiopynamodb.columnar import numpy
+from aiopynamodb.exceptions import AttributeDeserializationError
+from aiopynamodb.models import Model
+from aiopynamodb.pagination import ResultIterator
+
+PATCH_METHOD = 'aiopynamodb.connection.Connection._make_api_call'
+
+
+class Address(MapAttribute):
+    street = UnicodeAttribute()
+
+
+class ColumnarModel(Model):
+    class Meta:
+        table_name = 'columnar'
+
+    user_id = UnicodeAttribute(hash_key=True)
+    score = NumberAttribute(null=True)
+    active = BooleanAttribute(null=True)
+    created = UTCDateTimeAttribute(null=True)
+    expires = TTLAttribute(null=True)
+    version = VersionAttribute()
+    address = Address(null=True)
+    tags = ListAttribute(of=UnicodeAttribute, null=True)
+
+
+def _item(idx):
+    return {
+        'user_id': {'S': f'user-{idx}'},
+        'score': {'N': str(idx * 1.5)},
+        'active': {'BOOL': idx % 2 == 0},
+        'created': {'S': '2022-10-26T20:00:00.000000+0000'},
+        'expires': {'N': '1666814400'},
+        'version': {'N': str(idx)},
+        'address': {'M': {'street': {'S': f'{idx} Main St'}}},
+        'tags': {'L': [{'S': 'a'}]},
+    }
+
+
+PAGES = [
+    {'Count': 3, 'ScannedCount': 3, 'Items': [_item(0), _item(1), _item(2)], 'LastEvaluatedKey': {'user_id': {'S': 'user-2'}}},
+    {'Count': 2, 'ScannedCount': 2, 'Items': [_item(3), {'user_id': {'S': 'user-4'}, 'score': {'NULL': True}}]},
+]
+
+
+@pytest.mark.asyncio
+async def test_to_columns():
+    with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+        req.side_effect = PAGES
+        batch = await ColumnarModel.scan().to_columns()
+
+    assert batch.num_rows == 5
+    assert batch.column_names == list(ColumnarModel.get_attributes())
+    columns = batch.to_pydict()
+    assert columns['user_id'] == ['user-0', 'user-1', 'user-2', 'user-3', 'user-4']
+    assert columns['score'] == [0.0, 1.5, 3.0, 4.5, None]
+    assert columns['active'] == [True, False, True, False, None]
+    assert columns['created'][0] == datetime(2022, 10, 26, 20, tzinfo=timezone.utc)
+    assert columns['expires'][3] == datetime(2022, 10, 26, 20, tzinfo=timezone.utc)
+    assert columns['version'] == [0, 1, 2, 3, None]
+    assert columns['address'][1] == {'street': '1 Main St'}
+    assert columns['tags'][4] is None
+    assert list(batch['score'].mask) == [0, 0, 0, 0, 1]
+    assert batch['created'].dtype == 'datetime64[us]'
+    assert batch['address'].dtype == 'object'
+
+
+@pytest.mark.asyncio
+async def test_columnar_batches():
+    with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+        req.side_effect = PAGES
+        batches = [batch async for batch in ColumnarModel.scan().columnar(batch_size=2, attributes=['user_id'])]
+    assert [batch.to_pydict()['user_id'] for batch in batches] == [
+        ['user-0', 'user-1'], ['user-2', 'user-3'], ['user-4'],
+    ]
+    assert batches[0].column_names == ['user_id']
+
+    with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+        req.side_effect = PAGES
+        batches = [batch async for batch in ColumnarModel.scan().columnar()]
+    assert [batch.num_rows for batch in batches] == [3, 2]
+
+
+@pytest.mark.asyncio
+async def test_number_columns():
+    def page(*scores):
+        items = [{'user_id': {'S': str(idx)}, 'score': {'N': score}} for idx, score in enumerate(scores)]
+        items.append({'user_id': {'S': 'null'}})
+        return {'Count': len(items), 'ScannedCount': len(items), 'Items': items}
+
+    with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+        # Integers that fit are stored as int64, and fractions as float64
+        req.return_value = page('1', '-9223372036854775808', '9007199254740993')
+        column = (await ColumnarModel.scan().to_columns(attributes=['score']))['score']
+        assert column.dtype == 'int64'
+        assert column.to_pylist() == [1, -9223372036854775808, 9007199254740993, None]
+        assert all(type(value) is int for value in column.to_pylist()[:3])
+
+        req.return_value = page('1', '2.5', '9007199254740992')
+        column = (await ColumnarModel.scan().to_columns(attributes=['score']))['score']
+        assert column.dtype == 'float64'
+        assert column.to_pylist() == [1.0, 2.5, 9007199254740992.0, None]
+
+        # Integers that can't be stored exactly in either are kept as decoded
+        for scores in (('2.5', '9007199254740993'), ('1', '12345678909876543211234234324234')):
+            req.return_value = page(*scores)
+            column = (await ColumnarModel.scan().to_columns(attributes=['score']))['score']
+            assert column.dtype == 'object'
+            assert column.to_pylist() == [NumberAttribute().deserialize(score) for score in scores] + [None]
+
+
+@pytest.mark.asyncio
+async def test_columnar_limit_and_resume():
+    with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+        req.side_effect = PAGES
+        results = ColumnarModel.scan(limit=4)
+        first = await results.__anext__()
+        assert first.user_id == 'user-0'
+        batch = await results.to_columns(attributes=['user_id'])
+    assert batch.to_pydict() == {'user_id': ['user-1', 'user-2', 'user-3']}
+    assert results.last_evaluated_key == {'user_id': {'S': 'user-3'}}
+
+
+@pytest.mark.asyncio
+async def test_columnar_errors():
+    with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+        req.return_value = {'Count': 1, 'ScannedCount': 1, 'Items': [{'user_id': {'S': 'a'}, 'score': {'S': 'x'}}]}
+        with pytest.raises(AttributeDeserializationError):
+            await ColumnarModel.scan().to_columns()
+
+    with pytest.raises(ValueError, match='does not exist'):
+        await ColumnarModel.scan().to_columns(attributes=['unknown'])
+    with pytest.raises(ValueError, match='batch_size'):
+        await ColumnarModel.scan().columnar(batch_size=0).__anext__()
+    with pytest.raises(ValueError, match='only available'):
+        await ResultIterator(AsyncMock(), (), {}).to_columns()
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy is not installed')
+@pytest.mark.asyncio
+async def test_columns_are_numpy_arrays():
+    with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+        req.side_effect = PAGES
+        batch = await ColumnarModel.scan().to_columns()
+    assert batch['score'].values.dtype == numpy.float64
+    assert batch['created'].values.dtype == numpy.dtype('datetime64[us]')
+    assert batch['score'].mask.tolist() == [False, False, False, False, True]
@@ -0,0 +1,171 @@
+"""
+JSON backend and JSON lines tests
+"""
+import io
+import json
+import math
+import uuid
+from dataclasses import dataclass
+from datetime import date
+from datetime import datetime
+from datetime import timezone
+
+import pytest
+
+from aiopynamodb import _json
+from aiopynamodb.attributes import BinaryAttribute
+from aiopynamodb.attributes import BooleanAttribute
+from aiopynamodb.attributes import JSONAttribute
+from aiopynamodb.attributes import ListAttribute
+from aiopynamodb.attributes import MapAttribute
+from aiopynamodb.attributes import NumberAttribute
+from aiopynamodb.attributes import NumberSetAttribute
+from aiopynamodb.attributes import UnicodeAttribute
+from aiopynamodb.attributes import UTCDateTimeAttribute
+from aiopynamodb.models import Model
+
+
+class Address(MapAttribute):
+    street = UnicodeAttribute()
+    number = NumberAttribute(null=True)
+
+
+class Customer(Model):
+    class Meta:
+        table_name = 'customers'
+
+    customer_id = UnicodeAttribute(hash_key=True)
+    name = UnicodeAttribute(null=True)
+    score = NumberAttribute(null=True)
+    active = BooleanAttribute(null=True)
+    created = UTCDateTimeAttribute(null=True)
+    address = Address(null=True)
+    tags = ListAttribute(of=UnicodeAttribute, null=True)
+    lucky_numbers = NumberSetAttribute(null=True)
+    avatar = BinaryAttribute(null=True, legacy_encoding=False)
+    settings = JSONAttribute(null=True)
+
+
+@pytest.fixture
+def json_backend():
+    yield _json.set_backend
+    _json.set_backend('json')
+
+
+DOCUMENT = {'name': 'Zoë', 'nested': {'values': [1, 2.5, None, True]}, 'big': 12345678909876543211234234324234}
+
+
+@pytest.mark.parametrize('backend', ['json', 'orjson', 'ujson'])
+def test_backends(json_backend, backend):
+    if backend != 'json':
+        pytest.importorskip(backend)
+    assert json_backend(backend) == backend
+
+    encoded = _json.dumps(DOCUMENT)
+    assert json.loads(encoded) == DOCUMENT
+    assert _json.loads(encoded) == DOCUMENT
+    assert _json.loads(encoded.encode()) == DOCUMENT
+    # Strings with control characters are accepted by every backend
+    assert _json.loads('{"a": "b\tc"}') == {'a': 'b\tc'}
+    assert _json.loads('12345678909876543211234234324234') == 12345678909876543211234234324234
+
+    attr = JSONAttribute()
+    assert attr.deserialize(attr.serialize(DOCUMENT)) == DOCUMENT
+    assert NumberAttribute().deserialize(NumberAttribute().serialize(3.5)) == 3.5
+
+
+@dataclass
+class Point:
+    x: int
+
+
+@pytest.mark.parametrize('backend', ['json', 'orjson', 'ujson'])
+def test_backend_differences(json_backend, backend):
+    if backend != 'json':
+        pytest.importorskip(backend)
+    json_backend(backend)
+
+    # Every backend rejects the types the standard library rejects
+    for value in (datetime(2022, 10, 27), date(2022, 10, 27), Point(1)):
+        with pytest.raises(TypeError):
+            _json.dumps({'value': value})
+    assert _json.loads(_json.dumps({'name': 'Zoë'})) == {'name': 'Zoë'}
+
+    # ...except for these values, which orjson encodes
+    value = uuid.UUID(int=1)
+    if backend == 'orjson':
+        assert _json.loads(_json.dumps(value)) == str(value)
+        assert 'Zoë' in _json.dumps('Zoë')
+    else:
+        with pytest.raises(TypeError):
+            _json.dumps(value)
+        assert _json.dumps('Zoë') == '"Zo\\u00eb"'
+
+
+@pytest.mark.parametrize('backend', ['json', 'orjson', 'ujson'])
+def test_non_finite_floats(json_backend, backend):
+    if backend != 'json':
+        pytest.importorskip(backend)
+    json_backend(backend)
+
+    # Every backend encodes NaN and infinite floats as the standard library does, rather than as null
+    for value in (float('nan'), float('inf'), float('-inf')):
+        assert NumberAttribute().serialize(value) == json.dumps(value)
+        assert _json.dumps({'a': [value, None]}) == json.dumps({'a': [value, None]})
+        assert _json.dumps({value: None}) == json.dumps({value: None})
+    assert math.isnan(NumberAttribute().deserialize(NumberAttribute().serialize(float('nan'))))
+    assert _json.loads(_json.dumps([float('inf')])) == [float('inf')]
+    assert _json.dumps([1.5, None]).replace(' ', '') == '[1.5,null]'
+
+
+def test_backend_selection(json_backend):
+    assert json_backend('auto') in ('orjson', 'ujson', 'json')
+    with pytest.raises(ValueError):
+        json_backend('simplejson')
+    assert json_backend('json') == 'json'
+    assert _json.dumps({'a': 1}) == '{"a": 1}'
+
+
+def test_missing_configured_backend(json_backend, monkeypatch):
+    def import_module(name):
+        raise ImportError(name)
+
+    monkeypatch.setattr(_json, 'import_module', import_module)
+    with pytest.raises(ImportError):
+        json_backend('orjson')
+    # The configured backend falls back to the standard library
+    with pytest.warns(UserWarning, match='orjson'):
+        assert _json._set_configured_backend('orjson') == 'json'
+    assert _json.dumps({'a': 1}) == '{"a": 1}'
+
+
+def test_json_lines():
+    customers = [
+        Customer(
+            'c1',
+            name='Zoë "the" customer',
+            score=12.5,
+            active=True,
+            created=datetime(2022, 10, 27, 20, 0, tzinfo=timezone.utc),
+            address=Address(street='Main St', number=3),
+            tags=['a', 'b'],
+            settings={'theme': 'dark'},
+        ),
+        Customer('c2', address=Address(street='Side St'), tags=[]),
+    ]
+    lines = list(Customer.to_json_lines(customers))
+    assert all(line.endswith('\n') for line in lines)
+    assert [json.loads(line) for line in lines] == [customer.to_simple_dict() for customer in customers]
+
+    decoded = list(Customer.from_json_lines(io.StringIO(''.join(lines) + '\n')))
+    assert [customer.to_simple_dict() for customer in decoded] == [customer.to_simple_dict() for customer in customers]
+    assert decoded[0].created == customers[0].created
+    assert decoded[0].address.number == 3
+
+    # Binary and set attributes are only encoded with force, as in to_simple_dict
+    customer = Customer('c3', lucky_numbers={7}, avatar=b'\x00')
+    with pytest.raises(ValueError):
+        list(Customer.to_json_lines([customer]))
+    line = next(Customer.to_json_lines([customer], force=True))
+    assert json.loads(line) == customer.to_simple_dict(force=True)
+    assert next(Customer.from_json_lines([line.encode()])).avatar == b'\x00'
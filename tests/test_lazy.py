@@ -0,0 +1,171 @@
+"""
+Lazy deserialization tests
+"""
+import copy
+import pickle
+from datetime import datetime
+from datetime import timezone
+from unittest.mock import patch
+
+import pytest
+
+from aiopynamodb.attributes import DiscriminatorAttribute
+from aiopynamodb.attributes import JSONAttribute
+from aiopynamodb.attributes import LazyAttributeValues
+from aiopynamodb.attributes import ListAttribute
+from aiopynamodb.attributes import MapAttribute
+from aiopynamodb.attributes import NumberAttribute
+from aiopynamodb.attributes import TTLAttribute
+from aiopynamodb.attributes import UnicodeAttribute
+from aiopynamodb.attributes import VersionAttribute
+from aiopynamodb.exceptions import AttributeDeserializationError
+from aiopynamodb.models import Model
+
+from .deep_eq import deep_eq
+
+PATCH_METHOD = 'aiopynamodb.connection.Connection._make_api_call'
+
+
+class Address(MapAttribute):
+    street = UnicodeAttribute()
+    zip_code = NumberAttribute(attr_name='zip', null=True)
+
+
+class LazyModel(Model):
+    class Meta:
+        table_name = 'lazy'
+
+    user_id = UnicodeAttribute(hash_key=True)
+    score = NumberAttribute(default=0)
+    payload = JSONAttribute(null=True)
+    address = Address(null=True)
+    addresses = ListAttribute(of=Address, null=True)
+    expires = TTLAttribute(null=True)
+    version = VersionAttribute()
+
+
+class DefaultLazyModel(Model):
+    class Meta:
+        table_name = 'lazy'
+        lazy = True
+
+    user_id = UnicodeAttribute(hash_key=True)
+    nickname = UnicodeAttribute(attr_name='nick', null=True)
+
+
+class Animal(Model):
+    class Meta:
+        table_name = 'lazy'
+        lazy = True
+
+    cls = DiscriminatorAttribute()
+    name = UnicodeAttribute(hash_key=True)
+
+
+class Dog(Animal, discriminator='dog'):
+    breed = UnicodeAttribute(null=True)
+
+
+ITEM_DATA = {
+    'user_id': {'S': 'alice'},
+    'score': {'N': '42'},
+    'payload': {'S': '{"a": [1, 2, 3]}'},
+    'address': {'M': {'street': {'S': 'Main St'}, 'zip': {'N': '12345'}}},
+    'addresses': {'L': [{'M': {'street': {'S': 'Side St'}}}]},
+    'expires': {'N': '1666814400'},
+    'version': {'N': '3'},
+}
+
+
+def test_attributes_are_decoded_on_first_access():
+    item = LazyModel.from_raw_data(ITEM_DATA, lazy=True)
+    values = item.attribute_values
+    assert isinstance(values, LazyAttributeValues)
+    assert set(values._raw_values) == set(LazyModel.get_attributes())
+
+    assert item.payload == {'a': [1, 2, 3]}
+    assert 'payload' not in values._raw_values
+    assert item.payload is item.payload
+    assert item.address.zip_code == 12345
+    assert item.addresses[0].street == 'Side St'
+    assert item.expires == datetime(2022, 10, 26, 20, tzinfo=timezone.utc)
+    assert item.version == 3
+    assert set(values._raw_values) == {'user_id', 'score'}
+
+
+def test_lazy_matches_eager():
+    lazy = LazyModel.from_raw_data(ITEM_DATA, lazy=True)
+    eager = LazyModel.from_raw_data(ITEM_DATA)
+    assert lazy.serialize() == eager.serialize() == ITEM_DATA
+    assert dict(lazy.attribute_values).keys() == eager.attribute_values.keys()
+    assert lazy.to_simple_dict() == eager.to_simple_dict()
+
+
+def test_serialize_reuses_raw_values():
+    item = LazyModel.from_raw_data(copy.deepcopy(ITEM_DATA), lazy=True)
+    raw_payload = item.attribute_values._raw_values['payload']
+    assert item.serialize()['payload'] is raw_payload
+
+    item.score = 7
+    item.address.street = 'Other St'
+    serialized = item.serialize()
+    assert serialized['score'] == {'N': '7'}
+    assert serialized['address'] == {'M': {'street': {'S': 'Other St'}, 'zip': {'N': '12345'}}}
+    assert serialized['payload'] is raw_payload
+
+
+def test_defaults_and_missing_attributes():
+    item = LazyModel.from_raw_data({'user_id': {'S': 'bob'}, 'payload': {'NULL': True}}, lazy=True)
+    assert item.score == 0
+    assert item.payload is None
+    assert item.version is None
+    assert 'payload' not in item.attribute_values
+    assert item.serialize(null_check=False) == {'user_id': {'S': 'bob'}, 'score': {'N': '0'}}
+
+
+def test_assign_and_delete_pending_attribute():
+    item = LazyModel.from_raw_data(ITEM_DATA, lazy=True)
+    item.payload = None
+    assert 'payload' not in item.serialize()
+    del item.attribute_values['score']
+    assert item.score is None
+    with pytest.raises(KeyError):
+        del item.attribute_values['score']
+    assert len(item.attribute_values) == len(ITEM_DATA) - 1
+
+
+def test_decode_errors_are_raised_on_access():
+    item = LazyModel.from_raw_data({'user_id': {'S': 'carol'}, 'score': {'S': 'oops'}}, lazy=True)
+    with pytest.raises(AttributeDeserializationError):
+        item.score
+    assert 'score' in item.attribute_values._raw_values
+
+
+def test_meta_lazy_and_discriminator():
+    item = DefaultLazyModel.from_raw_data({'user_id': {'S': 'dave'}, 'nick': {'S': 'd'}})
+    assert isinstance(item.attribute_values, LazyAttributeValues)
+    assert item.nickname == 'd'
+    assert not isinstance(DefaultLazyModel.from_raw_data({'user_id': {'S': 'dave'}}, lazy=False).attribute_values, LazyAttributeValues)
+
+    dog = Animal.from_raw_data({'cls': {'S': 'dog'}, 'name': {'S': 'rex'}, 'breed': {'S': 'pug'}})
+    assert type(dog) is Dog
+    assert dog.cls is Dog
+    assert 'cls' not in dog.attribute_values._raw_values
+    assert dog.breed == 'pug'
+
+
+def test_copy_and_pickle():
+    item = LazyModel.from_raw_data(ITEM_DATA, lazy=True)
+    clone = copy.deepcopy(item)
+    assert clone.address.street == 'Main St'
+    assert 'address' in item.attribute_values._raw_values
+    assert deep_eq(pickle.loads(pickle.dumps(item)).serialize(), ITEM_DATA)
+
+
+@pytest.mark.asyncio
+async def test_query_lazy():
+    with patch(PATCH_METHOD) as req:
+        req.return_value = {'Count': 1, 'ScannedCount': 1, 'Items': [ITEM_DATA]}
+        items = [item async for item in LazyModel.query('alice', lazy=True)]
+    assert isinstance(items[0].attribute_values, LazyAttributeValues)
+    assert items[0].address.street == 'Main St'
@@ -1,6 +1,7 @@
 """
 Test model API
 """
+import asyncio
 import base64
 import copy
 import json
@@ -19,12 +20,16 @@ from aiopynamodb.attributes import (
     DiscriminatorAttribute, UnicodeAttribute, NumberAttribute, BinaryAttribute, UTCDateTimeAttribute,
     UnicodeSetAttribute, NumberSetAttribute, BinarySetAttribute, MapAttribute,
     BooleanAttribute, ListAttribute, TTLAttribute, VersionAttribute)
+from aiopynamodb._util import attr_value_size
+from aiopynamodb._util import item_size
 from aiopynamodb.constants import (
     ITEM, STRING, ALL, KEYS_ONLY, INCLUDE, REQUEST_ITEMS, UNPROCESSED_KEYS, CAMEL_COUNT,
     RESPONSES, KEYS, ITEMS, LAST_EVALUATED_KEY, EXCLUSIVE_START_KEY, ATTRIBUTES, BINARY,
-    UNPROCESSED_ITEMS, DEFAULT_ENCODING, MAP, LIST, NUMBER, SCANNED_COUNT,
+    UNPROCESSED_ITEMS, DEFAULT_ENCODING, MAP, LIST, NUMBER, SCANNED_COUNT, ITEM_SIZE_LIMIT,
+    BATCH_WRITE_RETRY_BASE_DELAY,
 )
-from aiopynamodb.exceptions import DoesNotExist, TableError, PutError, AttributeDeserializationError
+from aiopynamodb.exceptions import DoesNotExist, TableError, PutError, AttributeDeserializationError, BatchWriteError
+from aiopynamodb.exceptions import SizeLimitExceededError
 from aiopynamodb.indexes import (
     GlobalSecondaryIndex, LocalSecondaryIndex, AllProjection,
     IncludeProjection, KeysOnlyProjection, Index
@@ -348,6 +353,12 @@ class CarModel(Model):
     car_info = CarInfoMap(null=False)
 
 
+class TrackedCarModel(CarModel):
+    class Meta:
+        table_name = 'CarModel'
+        track_changes = True
+
+
 class CarModelWithNull(Model):
     class Meta:
         table_name = 'CarModelWithNull'
@@ -1061,6 +1072,64 @@ class ModelTestCase(IsolatedAsyncioTestCase):
         with pytest.raises(ValueError):
             await UserModel.count(filter_condition=(UserModel.zip_code <= '94117'))
 
+    @pytest.mark.asyncio
+    async def test_count_range_key_boundaries(self):
+        user_ids = ['a', 'b', 'b2', 'c', 'd', 'e', 'f']
+
+        async def fake_query(operation_name, operation_kwargs):
+            expression = operation_kwargs['KeyConditionExpression']
+            values = [value['S'] for name, value in sorted(operation_kwargs['ExpressionAttributeValues'].items())][1:]
+            if 'BETWEEN' in expression:
+                matches = [user_id for user_id in user_ids if values[0] <= user_id <= values[1]]
+            elif '<=' in expression:
+                matches = [user_id for user_id in user_ids if user_id <= values[0]]
+            elif '>' in expression:
+                matches = [user_id for user_id in user_ids if user_id > values[0]]
+            else:
+                matches = [user_id for user_id in user_ids if user_id == values[0]]
+            assert operation_kwargs['Select'] == 'COUNT'
+            return {'Count': len(matches), 'ScannedCount': len(matches)}
+
+        with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=fake_query) as req:
+            self.assertEqual(await UserModel.count('foo', range_key_boundaries=['b', 'c', 'e'], concurrency=2), 7)
+            # 4 ranges, and the items equal to the 2 boundaries shared by two ranges
+            self.assertEqual(req.call_count, 6)
+            self.assertEqual(await UserModel.count('foo', range_key_boundaries=['z']), 7)
+
+        with pytest.raises(ValueError):
+            await UserModel.count('foo', range_key_condition=UserModel.user_id > 'a', range_key_boundaries=['b'])
+        with pytest.raises(ValueError):
+            await SimpleUserModel.count('foo', range_key_boundaries=['b'])
+
+    @pytest.mark.asyncio
+    async def test_count_range_key_boundaries_rate_limit(self):
+        # Every range is read in 5 pages of 5 units
+        in_flight = max_in_flight = 0
+
+        async def fake_query(operation_name, operation_kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.005)
+            in_flight -= 1
+            start = operation_kwargs.get('ExclusiveStartKey')
+            page = 0 if start is None else int(start['user_id']['S']) + 1
+            result = {'Count': 1, 'ScannedCount': 1, 'ConsumedCapacity': {'CapacityUnits': 5}}
+            if page < 4:
+                result['LastEvaluatedKey'] = {'user_name': {'S': 'foo'}, 'user_id': {'S': str(page)}}
+            return result
+
+        loop = asyncio.get_event_loop()
+        with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=fake_query):
+            start = loop.time()
+            count = await UserModel.count('foo', range_key_boundaries=['b', 'c'], rate_limit=200, concurrency=4)
+            elapsed = loop.time() - start
+        # 3 ranges, less the overlap counted again, of 5 pages each
+        self.assertEqual(count, 10)
+        self.assertGreater(max_in_flight, 1)
+        # The ranges share the rate limit: 100 units at 200 units per second, less the pages in flight
+        self.assertGreaterEqual(elapsed, (100 - 4 * 5) / 200)
+
     @pytest.mark.asyncio
     async def test_index_count(self):
         """
@@ -1796,6 +1865,39 @@ class ModelTestCase(IsolatedAsyncioTestCase):
             self.assertEqual(item.overidden_user_id, CUSTOM_ATTR_NAME_ITEM_DATA['Item']['user_id']['S'])
 
     @pytest.mark.asyncio
+    async def test_result_modes(self):
+        """
+        Model.get, Model.query, Model.scan and Model.batch_get result modes
+        """
+        item_data = GET_MODEL_ITEM_DATA[ITEM]
+        expected = {
+            'custom_user_name': 'foo',
+            'user_id': 'bar',
+            'zip_code': 88030,
+            'email': 'needs_email',
+            'callable_field': 42,
+        }
+        with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+            req.return_value = GET_MODEL_ITEM_DATA
+            self.assertEqual(await UserModel.get('foo', 'bar', result_mode='dict'), expected)
+            self.assertIs(await UserModel.get('foo', 'bar', result_mode='raw'), item_data)
+            self.assertIsInstance(await UserModel.get('foo', 'bar', result_mode='model'), UserModel)
+
+        with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+            req.return_value = {'Count': 1, 'ScannedCount': 1, 'Items': [item_data]}
+            self.assertEqual([item async for item in UserModel.query('foo', result_mode='dict')], [expected])
+            self.assertEqual([item async for item in UserModel.scan(result_mode='raw')], [item_data])
+            self.assertEqual(
+                [item async for item in IndexedModel.email_index.scan(result_mode='raw')], [item_data])
+
+        with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+            req.return_value = SIMPLE_BATCH_GET_ITEMS
+            items = [item async for item in SimpleUserModel.batch_get(['hash-0'], result_mode='raw')]
+            self.assertEqual(items, SIMPLE_BATCH_GET_ITEMS['Responses']['SimpleModel'])
+
+        with pytest.raises(ValueError, match='result_mode'):
+            UserModel.scan(result_mode='json')
+
     async def test_batch_get(self):
         """
         Model.batch_get
@@ -2007,6 +2109,76 @@ class ModelTestCase(IsolatedAsyncioTestCase):
                     pass
                 # _ = list(UserModel.batch_get([('a', 'b', 'c')]))
 
+    @staticmethod
+    def _fake_batch_get(found, in_flight, delays=None, unprocessed=None):
+        # Returns the requested keys in `found`, after an optional delay keyed on the first key of the request
+        async def side_effect(operation_name, kwargs):
+            keys = kwargs[REQUEST_ITEMS][UserModel.Meta.table_name][KEYS]
+            in_flight.append(in_flight[-1] + 1 if in_flight else 1)
+            await asyncio.sleep((delays or {}).get(keys[0]['user_name']['S'], 0))
+            in_flight.append(in_flight[-1] - 1)
+            retry = [key for key in keys if unprocessed and unprocessed.pop(key['user_name']['S'], None)]
+            items = [
+                dict(key, email={'S': 'email'}) for key in keys
+                if key['user_name']['S'] in found and key not in retry
+            ]
+            return {RESPONSES: {UserModel.Meta.table_name: items}, UNPROCESSED_KEYS: {UserModel.Meta.table_name: {KEYS: retry}}}
+        return side_effect
+
+    @pytest.mark.asyncio
+    async def test_batch_get__concurrency(self):
+        in_flight = []
+        item_keys = [(f'hash-{x}', str(x)) for x in range(250)]
+        with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+            req.side_effect = self._fake_batch_get({k for k, _ in item_keys}, in_flight, unprocessed={'hash-5': True})
+            items = [item async for item in UserModel.batch_get(item_keys, concurrency=2)]
+
+        self.assertEqual(sorted(item.user_id for item in items), sorted(r for _, r in item_keys))
+        self.assertEqual(max(in_flight), 2)
+        # The unprocessed key is retried with the last 50 keys
+        self.assertEqual(req.call_count, 3)
+        self.assertEqual(len(req.call_args_list[2][0][1][REQUEST_ITEMS]['UserModel'][KEYS]), 51)
+
+        with self.assertRaises(ValueError):
+            async for _ in UserModel.batch_get(item_keys, concurrency=0):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_batch_get__ordered_and_deduplicated(self):
+        in_flight = []
+
+        async def keys():
+            for x in range(150):
+                yield [f'hash-{x}', str(x)]  # lists are not hashable
+            yield ('hash-3', '3')
+
+        # The first request (keys 0-99) completes after the second one; odd keys are missing
+        found = {f'hash-{x}' for x in range(0, 150, 2)}
+        with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+            req.side_effect = self._fake_batch_get(found, in_flight, delays={'hash-0': 0.05})
+            items = [item async for item in UserModel.batch_get(keys(), concurrency=2, ordered=True)]
+
+        self.assertEqual([item.user_id for item in items], [str(x) for x in range(0, 150, 2)])
+        self.assertEqual(req.call_count, 2)
+        requested = sum(len(call[0][1][REQUEST_ITEMS]['UserModel'][KEYS]) for call in req.call_args_list)
+        self.assertEqual(requested, 150)
+
+    @pytest.mark.asyncio
+    async def test_batch_get_mapping(self):
+        in_flight = []
+        with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+            req.side_effect = self._fake_batch_get({'hash-1', 'hash-3'}, in_flight)
+            result = await UserModel.batch_get_mapping(
+                [('hash-3', '3'), ('hash-1', '1'), ['hash-2', '2'], ('hash-1', '1')], result_mode='dict',
+            )
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(list(result), [('hash-3', '3'), ('hash-1', '1')])
+        self.assertEqual(result[['hash-1', '1']]['user_id'], '1')
+        self.assertNotIn(('hash-2', '2'), result)
+        self.assertEqual(result.missing, [['hash-2', '2']])
+        self.assertEqual([item and item['user_id'] for item in result.to_list()], ['3', '1', None])
+
     @pytest.mark.asyncio
     async def test_batch_write(self):
         """
@@ -2124,6 +2296,274 @@ class ModelTestCase(IsolatedAsyncioTestCase):
                         await batch.save(item)
             self.assertEqual(len(batch.failed_operations), 3)
 
+    @pytest.mark.asyncio
+    async def test_batch_write_pipelined(self):
+        requests = []
+        release = asyncio.Event()
+
+        async def fake_batch_write(operation_name, kwargs):
+            requests.append(kwargs[REQUEST_ITEMS][UserModel.Meta.table_name])
+            await release.wait()
+            return {}
+
+        with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+            req.side_effect = fake_batch_write
+            async with UserModel.batch_write(concurrency=1) as batch:
+                await batch.save(UserModel('daniel', '0', email='first'))
+                await asyncio.sleep(0)
+                # The first request is in flight: the following writes are queued, and collapse by key
+                for idx in range(30):
+                    await batch.save(UserModel('daniel', str(idx % 10), email=str(idx)))
+                await batch.delete(UserModel('daniel', '9'))
+                release.set()
+
+        self.assertEqual([len(request) for request in requests], [1, 10])
+        puts = {r['PutRequest']['Item']['user_id']['S']: r['PutRequest']['Item']['email']['S'] for r in requests[1] if 'PutRequest' in r}
+        self.assertEqual(puts, {str(idx): str(20 + idx) for idx in range(9)})
+        self.assertEqual(requests[1][0], {'DeleteRequest': {'Key': {'user_name': {'S': 'daniel'}, 'user_id': {'S': '9'}}}})
+        self.assertEqual(batch.collapsed_operations, 21)
+        self.assertEqual(batch.failures, [])
+
+    @pytest.mark.asyncio
+    async def test_batch_write_pipelined_concurrency_and_backpressure(self):
+        in_flight = []
+        release = asyncio.Event()
+
+        async def fake_batch_write(operation_name, kwargs):
+            in_flight.append(in_flight[-1] + 1 if in_flight else 1)
+            await release.wait()
+            in_flight.append(in_flight[-1] - 1)
+            return {}
+
+        with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+            req.side_effect = fake_batch_write
+            async with UserModel.batch_write(concurrency=3, max_pending=75) as batch:
+                producer = asyncio.ensure_future(asyncio.gather(*(
+                    batch.save(UserModel(f'user-{idx}', '0')) for idx in range(300)
+                )))
+                for _ in range(10):
+                    await asyncio.sleep(0)
+                # Three requests in flight and 75 writes queued: the producer is waiting
+                self.assertFalse(producer.done())
+                self.assertEqual(max(in_flight), 3)
+                release.set()
+                await producer
+
+        self.assertEqual(sum(len(call[0][1][REQUEST_ITEMS]['UserModel']) for call in req.call_args_list), 300)
+        self.assertTrue(all(len(call[0][1][REQUEST_ITEMS]['UserModel']) <= 25 for call in req.call_args_list))
+
+        with self.assertRaises(ValueError):
+            UserModel.batch_write(concurrency=0)
+
+    @pytest.mark.asyncio
+    async def test_batch_write_pipelined_failures(self):
+        async def fake_batch_write(operation_name, kwargs):
+            write_requests = kwargs[REQUEST_ITEMS][UserModel.Meta.table_name]
+            if any(r['PutRequest']['Item']['user_id']['S'] == 'fail' for r in write_requests):
+                raise ClientError({'Error': {'Code': 'ValidationException'}}, 'BatchWriteItem')
+            # Writes to user '1' are never processed
+            unprocessed = [r for r in write_requests if r['PutRequest']['Item']['user_name']['S'] == '1']
+            return {UNPROCESSED_ITEMS: {UserModel.Meta.table_name: unprocessed}}
+
+        items = [UserModel(str(idx), '0') for idx in range(3)]
+        with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+            req.side_effect = fake_batch_write
+            with self.assertRaises(BatchWriteError) as cm:
+                async with UserModel.batch_write(concurrency=1) as batch:
+                    for item in items:
+                        await batch.save(item)
+                    await asyncio.sleep(0)
+                    await batch.commit()
+
+            failures = cm.exception.failures
+            self.assertEqual([(f.action, f.item, f.error) for f in failures], [('PUT', items[1], None)])
+            self.assertEqual(req.call_count, UserModel.Meta.max_retry_attempts)
+
+            failing = UserModel('5', 'fail')
+            with self.assertRaises(BatchWriteError) as cm:
+                async with UserModel.batch_write(concurrency=2) as batch:
+                    await batch.save(failing)
+            self.assertEqual(cm.exception.failures[0].item, failing)
+            self.assertIsInstance(cm.exception.failures[0].error, PutError)
+
+    @pytest.mark.asyncio
+    async def test_batch_write_pipelined_backoff(self):
+        unprocessed_rounds = [2]
+
+        async def fake_batch_write(operation_name, kwargs):
+            write_requests = kwargs[REQUEST_ITEMS][UserModel.Meta.table_name]
+            if unprocessed_rounds[0]:
+                unprocessed_rounds[0] -= 1
+                return {UNPROCESSED_ITEMS: {UserModel.Meta.table_name: write_requests[1:]}}
+            return {}
+
+        with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+            req.side_effect = fake_batch_write
+            with patch('aiopynamodb.models.asyncio.sleep', new_callable=AsyncMock) as sleep:
+                async with UserModel.batch_write(concurrency=1) as batch:
+                    for idx in range(3):
+                        await batch.save(UserModel(str(idx), '0'))
+            # Unprocessed writes are resent after a jittered delay, which grows exponentially
+            self.assertEqual(req.call_count, 3)
+            self.assertEqual(sleep.call_count, 2)
+            first_delay, second_delay = (call[0][0] for call in sleep.call_args_list)
+            self.assertTrue(0 <= first_delay <= 2 * BATCH_WRITE_RETRY_BASE_DELAY)
+            self.assertTrue(0 <= second_delay <= 4 * BATCH_WRITE_RETRY_BASE_DELAY)
+            self.assertEqual(batch.failures, [])
+
+    def test_item_size(self):
+        self.assertEqual(attr_value_size({'S': 'héllo'}), 6)
+        self.assertEqual(attr_value_size({'N': '-12.3400'}), 4)
+        self.assertEqual(attr_value_size({'N': '0.00012'}), 2)
+        self.assertEqual(attr_value_size({'B': b'abc'}), 3)
+        self.assertEqual(attr_value_size({'BOOL': True}), 1)
+        self.assertEqual(attr_value_size({'SS': ['a', 'bc']}), 3)
+        self.assertEqual(attr_value_size({'L': [{'S': 'a'}, {'NULL': True}]}), 3 + 2 + 2)
+        self.assertEqual(attr_value_size({'M': {'ab': {'S': 'c'}}}), 3 + 2 + 1 + 1)
+
+        item = UserModel('hash', 'range', email='e', zip_code=123)
+        self.assertEqual(item.get_item_size(), item_size(item.serialize()))
+        self.assertEqual(
+            item.get_item_size(),
+            len('user_name') + 4 + len('user_id') + 5 + len('email') + 1 + len('zip_code') + 3
+            + len('callable_field') + 2,
+        )
+
+    @pytest.mark.asyncio
+    async def test_save_oversized_item(self):
+        item = UserModel('hash', 'range', email='x' * ITEM_SIZE_LIMIT)
+        with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+            with self.assertRaises(SizeLimitExceededError) as cm:
+                await item.save()
+            with self.assertRaises(SizeLimitExceededError):
+                async with UserModel.batch_write() as batch:
+                    await batch.save(item)
+            req.assert_not_called()
+        self.assertEqual(cm.exception.limit, ITEM_SIZE_LIMIT)
+        self.assertGreater(cm.exception.size, ITEM_SIZE_LIMIT)
+        self.assertIn("'user_name': 'hash'", str(cm.exception))
+        self.assertIn('largest attributes: email ({} bytes)'.format(ITEM_SIZE_LIMIT + len('email')), str(cm.exception))
+
+    @pytest.mark.asyncio
+    async def test_batch_write_splits_by_size(self):
+        items = [UserModel('hash', str(idx), email='x' * 1000) for idx in range(10)]
+        with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+            req.return_value = {}
+            async with UserModel.batch_write() as batch:
+                batch.max_request_size = 3 * items[0].get_item_size()
+                for item in items:
+                    await batch.save(item)
+            self.assertEqual([len(call[0][1][REQUEST_ITEMS]['UserModel']) for call in req.call_args_list], [3, 3, 3, 1])
+
+            with self.assertRaises(ValueError):
+                async with UserModel.batch_write(auto_commit=False) as batch:
+                    batch.max_request_size = 3 * items[0].get_item_size()
+                    for item in items:
+                        await batch.save(item)
+
+        with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+            req.return_value = {}
+            async with UserModel.batch_write(concurrency=1) as batch:
+                batch.max_request_size = 4 * items[0].get_item_size()
+                for item in items:
+                    await batch.save(item)
+            self.assertEqual([len(call[0][1][REQUEST_ITEMS]['UserModel']) for call in req.call_args_list], [4, 4, 2])
+
+    @pytest.mark.asyncio
+    async def test_save_changed(self):
+        item = CarModel.from_raw_data({
+            'car_id': {'N': '1'},
+            'car_info': {'M': {
+                'make': {'S': 'Volvo'},
+                'location': {'M': {'lat': {'N': '1'}, 'lng': {'N': '2.5'}}},
+            }},
+        })
+        # The changes are only tracked for the models with `track_changes` in their Meta, or once requested
+        self.assertIsNone(item._loaded_values)
+        with self.assertRaises(ValueError):
+            await item.save(mode='changed')
+        item.track_changes()
+        with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+            req.return_value = {}
+            self.assertEqual(await item.save(mode='changed'), {})
+            req.assert_not_called()
+
+            item.car_info.location.lat = 3
+            item.car_info.model = 'V70'
+            await item.save(mode='changed')
+            self.assertEqual(req.call_count, 1)
+            args = req.call_args[0][1]
+            self.assertEqual(args['Key'], {'car_id': {'N': '1'}})
+            self.assertEqual(args['UpdateExpression'], 'SET #0.#1.#2 = :0, #0.#3 = :1')
+            self.assertEqual(args['ExpressionAttributeNames'], {'#0': 'car_info', '#1': 'location', '#2': 'lat', '#3': 'model'})
+            self.assertEqual(args['ExpressionAttributeValues'], {':0': {'N': '3'}, ':1': {'S': 'V70'}})
+
+            await item.save(mode='changed')
+            self.assertEqual(req.call_count, 1)
+
+            item.car_info.location = None
+            await item.save(mode='changed')
+            args = req.call_args[0][1]
+            self.assertEqual(args['UpdateExpression'], 'REMOVE #0.#1')
+            self.assertEqual(args['ExpressionAttributeNames'], {'#0': 'car_info', '#1': 'location'})
+
+            # A new item of a model that tracks changes is written as a whole
+            await TrackedCarModel(2, car_info=CarInfoMap(make='Saab')).save(mode='changed')
+            self.assertIn('Item', req.call_args[0][1])
+            self.assertEqual(TrackedCarModel.from_raw_data({'car_id': {'N': '3'}, 'car_info': {'M': {}}})._loaded_values,
+                             {'car_id': {'N': '3'}, 'car_info': {'M': {}}})
+
+    @pytest.mark.asyncio
+    async def test_save_changed_map_keys_not_in_paths(self):
+        item = ExplicitRawMapModel.from_raw_data({
+            'map_id': {'N': '1'},
+            'map_attr': {'M': {'a[0]': {'S': 'x'}, 'b': {'S': 'y'}}},
+        })
+        item.track_changes()
+        with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+            req.return_value = {}
+            # Keys that can't be used in document paths, added or removed, replace the map as a whole
+            item.map_attr = MapAttribute(b='y')
+            await item.save(mode='changed')
+            args = req.call_args[0][1]
+            self.assertEqual(args['UpdateExpression'], 'SET #0 = :0')
+            self.assertEqual(args['ExpressionAttributeValues'], {':0': {'M': {'b': {'S': 'y'}}}})
+
+            item.map_attr = MapAttribute(b='y', **{'c[1]': 'z'})
+            await item.save(mode='changed')
+            args = req.call_args[0][1]
+            self.assertEqual(args['UpdateExpression'], 'SET #0 = :0')
+            self.assertEqual(args['ExpressionAttributeValues'], {':0': {'M': {'b': {'S': 'y'}, 'c[1]': {'S': 'z'}}}})
+
+    @pytest.mark.asyncio
+    async def test_save_changed_version(self):
+        item = VersionedModel.from_raw_data({
+            'name': {'S': 'foo'},
+            'email': {'S': 'foo@example.com'},
+            'version': {'N': '1'},
+        })
+        item.track_changes()
+        with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+            req.return_value = {}
+            await item.save(mode='changed')
+            req.assert_not_called()
+
+            item.email = 'bar@example.com'
+            await item.save(mode='changed')
+            args = req.call_args[0][1]
+            self.assertEqual(args['UpdateExpression'], 'SET #1 = :1 ADD #0 :2')
+            self.assertEqual(args['ConditionExpression'], '#0 = :0')
+            self.assertEqual(args['ExpressionAttributeNames'], {'#0': 'version', '#1': 'email'})
+            self.assertEqual(args['ExpressionAttributeValues'], {':0': {'N': '1'}, ':1': {'S': 'bar@example.com'}, ':2': {'N': '1'}})
+            self.assertEqual(item.version, 2)
+
+            item.email = 'baz@example.com'
+            await item.save(mode='changed')
+            self.assertEqual(req.call_args[0][1]['ExpressionAttributeValues'][':0'], {'N': '2'})
+
+        with self.assertRaises(ValueError):
+            await item.save(mode='patch')
+
     @pytest.mark.asyncio
     async def test_index_queries(self):
         """
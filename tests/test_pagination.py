@@ -1,6 +1,10 @@
+import asyncio
+
 import pytest
 
+from aiopynamodb.pagination import PageIterator
 from aiopynamodb.pagination import RateLimiter
+from aiopynamodb.pagination import ResultIterator
 
 
 class MockEventLoop:
@@ -92,3 +96,158 @@ async def test_basic_rate_limiting_large_increment():
 
     # The operation takes longer than the minimum wait, so rate limiting should have no effect
     assert mock_time.current_time == 1100.0
+
+
+async def run_rate_limited_workers(rate_limiter, workers, units, duration):
+    """
+    Runs workers that consume `units` per operation through a shared rate limiter, returning the units consumed
+    per second
+    """
+    consumed = 0
+
+    async def work():
+        nonlocal consumed
+        while True:
+            await rate_limiter.acquire()
+            await asyncio.sleep(0.005)
+            rate_limiter.consume(units)
+            consumed += units
+
+    loop = asyncio.get_event_loop()
+    start = loop.time()
+    tasks = [asyncio.ensure_future(work()) for _ in range(workers)]
+    await asyncio.sleep(duration)
+    elapsed = loop.time() - start
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return consumed / elapsed
+
+
+@pytest.mark.asyncio
+async def test_rate_limiting_concurrent_callers():
+    for workers in (1, 8):
+        rate = await run_rate_limited_workers(RateLimiter(100), workers, 2, 0.5)
+        # Each worker may have one operation in flight that is not paid for yet
+        assert 50 <= rate <= 100 + workers * 2 / 0.5
+
+
+class MockOperation:
+    """
+    Returns `num_pages` pages of one item each, recording the calls.
+    """
+
+    def __init__(self, num_pages, fail_on=None):
+        self.num_pages = num_pages
+        self.fail_on = fail_on
+        self.calls = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, **kwargs):
+        start = kwargs['exclusive_start_key']
+        page = 0 if start is None else start['id']['N'] + 1
+        self.calls.append(page)
+        await self.release.wait()
+        if page == self.fail_on:
+            self.fail_on = None
+            raise ValueError('page failed')
+        result = {'Count': 1, 'ScannedCount': 1, 'Items': [{'id': {'N': page}}]}
+        if page < self.num_pages - 1:
+            result['LastEvaluatedKey'] = {'id': {'N': page}}
+        if kwargs.get('return_consumed_capacity'):
+            result['ConsumedCapacity'] = {'CapacityUnits': 0.5}
+        return result
+
+
+async def _settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_reads_ahead():
+    operation = MockOperation(10)
+    page_iter = PageIterator(operation, (), {}, prefetch=2)
+
+    page = await page_iter.__anext__()
+    await _settle()
+    assert page['Items'] == [{'id': {'N': 0}}]
+    assert operation.calls == [0, 1, 2]
+    assert page_iter.last_evaluated_key == {'id': {'N': 0}}
+
+    await page_iter.__anext__()
+    await _settle()
+    assert operation.calls == [0, 1, 2, 3]
+    assert page_iter.total_scanned_count == 2
+    await page_iter.aclose()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_stops_at_last_page_and_limit():
+    operation = MockOperation(3)
+    pages = [page async for page in PageIterator(operation, (), {}, prefetch=5)]
+    assert len(pages) == 3
+    assert operation.calls == [0, 1, 2]
+
+    operation = MockOperation(10)
+    results = ResultIterator(operation, (), {}, limit=2, prefetch=5)
+    assert [item['id']['N'] async for item in results] == [0, 1]
+    await _settle()
+    assert operation.calls == [0, 1]
+
+    # Pages past the prefetch limit are still fetched on demand
+    operation = MockOperation(4)
+    page_iter = PageIterator(operation, (), {}, prefetch=5, prefetch_limit=2)
+    assert len([page async for page in page_iter]) == 4
+    assert operation.calls == [0, 1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_aclose_cancels_fetches():
+    operation = MockOperation(10)
+    async with ResultIterator(operation, (), {}, prefetch=2) as results:
+        await results.__anext__()
+        operation.release.clear()
+        await _settle()
+        task = results.page_iter._prefetch_task
+        assert not task.done()
+    assert task.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_abandoned():
+    operation = MockOperation(10)
+    results = ResultIterator(operation, (), {}, prefetch=2)
+    async for _ in results:
+        break
+    operation.release.clear()
+    await _settle()
+    task = results.page_iter._prefetch_task
+    calls = list(operation.calls)
+
+    # Leaving the iterator without closing it cancels the background fetches once it is collected
+    del results
+    await asyncio.sleep(0.01)
+    assert task.cancelled()
+    operation.release.set()
+    await _settle()
+    assert operation.calls == calls
+
+
+@pytest.mark.asyncio
+async def test_prefetch_errors_and_rate_limit():
+    operation = MockOperation(3, fail_on=1)
+    kwargs = {}
+    page_iter = PageIterator(operation, (), kwargs, rate_limit=10, prefetch=2)
+    await page_iter.__anext__()
+    with pytest.raises(ValueError, match='page failed'):
+        await page_iter.__anext__()
+    # The failed page is fetched again on demand
+    assert len([page async for page in page_iter]) == 2
+    assert operation.calls == [0, 1, 1, 2]
+    assert kwargs['return_consumed_capacity'] == 'TOTAL'
+
+    with pytest.raises(ValueError):
+        PageIterator(operation, (), {}, prefetch=-1)
+
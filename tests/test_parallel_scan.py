@@ -0,0 +1,261 @@
+"""
+Parallel scan tests
+"""
+import asyncio
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+
+from aiopynamodb.attributes import NumberAttribute
+from aiopynamodb.attributes import UnicodeAttribute
+from aiopynamodb.indexes import AllProjection
+from aiopynamodb.indexes import GlobalSecondaryIndex
+from aiopynamodb.models import Model
+from aiopynamodb.pagination import ParallelScanIterator
+
+PATCH_METHOD = 'aiopynamodb.connection.Connection._make_api_call'
+
+
+class NameIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = 'name_index'
+        projection = AllProjection()
+
+    name = UnicodeAttribute(hash_key=True)
+
+
+class ScanModel(Model):
+    class Meta:
+        table_name = 'parallel_scan'
+
+    user_id = UnicodeAttribute(hash_key=True)
+    name = UnicodeAttribute(null=True)
+    score = NumberAttribute(null=True)
+    name_index = NameIndex()
+
+
+def _pages(segment):
+    # Two pages per segment, with one item each.
+    return [
+        {
+            'Count': 1,
+            'ScannedCount': 2,
+            'Items': [{'user_id': {'S': f'{segment}-0'}, 'score': {'N': str(segment)}}],
+            'LastEvaluatedKey': {'user_id': {'S': f'{segment}-0'}},
+        },
+        {
+            'Count': 1,
+            'ScannedCount': 2,
+            'Items': [{'user_id': {'S': f'{segment}-1'}, 'score': {'N': str(segment)}}],
+        },
+    ]
+
+
+def _scan_side_effect(calls, delays=None):
+    async def side_effect(operation_name, operation_kwargs):
+        calls.append(operation_kwargs)
+        segment = operation_kwargs['Segment']
+        if delays:
+            await asyncio.sleep(delays.get(segment, 0))
+        page = 1 if 'ExclusiveStartKey' in operation_kwargs else 0
+        return _pages(segment)[page]
+    return side_effect
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_merges_all_segments():
+    calls = []
+    progress = []
+    with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+        req.side_effect = _scan_side_effect(calls)
+        results = ScanModel.parallel_scan(
+            total_segments=6, concurrency=2, page_size=1, progress_callback=lambda p: progress.append((p.segment, p.pages, p.done)),
+        )
+        items = [item async for item in results]
+
+    assert sorted(item.user_id for item in items) == sorted(f'{s}-{i}' for s in range(6) for i in range(2))
+    assert {c['Segment'] for c in calls} == set(range(6))
+    assert all(c['TotalSegments'] == 6 and c['Limit'] == 1 for c in calls)
+    assert results.total_count == 12
+    assert results.total_scanned_count == 24
+    assert all(p.done and p.pages == 2 for p in results.progress)
+    assert (0, 2, True) in progress
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_oversubscription():
+    # Segment 0 is slow, so the other worker picks up all the remaining segments.
+    calls = []
+    with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+        req.side_effect = _scan_side_effect(calls, delays={0: 0.05})
+        items = [item async for item in ScanModel.parallel_scan(total_segments=4, concurrency=2)]
+
+    assert len(items) == 8
+    assert [item.user_id for item in items[-2:]] == ['0-0', '0-1']
+
+    results = ScanModel.parallel_scan(concurrency=3)
+    assert len(results.progress) == 12
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_limit_and_result_mode():
+    calls = []
+    with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+        req.side_effect = _scan_side_effect(calls)
+        items = [item async for item in ScanModel.parallel_scan(total_segments=4, concurrency=2, limit=3, result_mode='dict')]
+        await asyncio.sleep(0)
+
+    assert len(items) == 3
+    assert all(isinstance(item, dict) and 'user_id' in item for item in items)
+
+    with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+        assert [item async for item in ScanModel.parallel_scan(limit=0)] == []
+        req.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_index():
+    calls = []
+    with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+        req.side_effect = _scan_side_effect(calls)
+        items = [item async for item in ScanModel.name_index.parallel_scan(total_segments=2, concurrency=2)]
+
+    assert len(items) == 4
+    assert all(c['IndexName'] == 'name_index' for c in calls)
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_error_cancels_workers():
+    cancelled = []
+
+    async def side_effect(operation_name, operation_kwargs):
+        if operation_kwargs['Segment'] == 1:
+            raise ValueError('segment failed')
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(operation_kwargs['Segment'])
+            raise
+
+    with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+        req.side_effect = side_effect
+        results = ScanModel.parallel_scan(total_segments=4, concurrency=2)
+        with pytest.raises(ValueError, match='segment failed'):
+            async for _ in results:
+                pass
+        await asyncio.sleep(0)
+
+    assert cancelled == [0]
+    assert not results.progress[2].started
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_aclose():
+    started = asyncio.Event()
+
+    async def side_effect(operation_name, operation_kwargs):
+        started.set()
+        await asyncio.sleep(10)
+
+    with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+        req.side_effect = side_effect
+        async with ScanModel.parallel_scan(total_segments=2, concurrency=2) as results:
+            consumer = asyncio.ensure_future(results.__anext__())
+            await started.wait()
+            consumer.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await consumer
+        tasks = results._tasks
+    assert tasks == []
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_abandoned():
+    calls = []
+    with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+        req.side_effect = _scan_side_effect(calls)
+        results = ScanModel.parallel_scan(total_segments=8, concurrency=2)
+        async for _ in results:
+            break
+        tasks = list(results._tasks)
+        # The workers are blocked on the full queue
+        await asyncio.sleep(0.01)
+        assert tasks and not any(task.done() for task in tasks)
+
+        # Dropping the iterator without closing it cancels its workers
+        del results
+        await asyncio.sleep(0.01)
+        assert all(task.cancelled() for task in tasks)
+        scanned = len(calls)
+        await asyncio.sleep(0.01)
+        assert len(calls) == scanned
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_shares_rate_limiter():
+    segments = {}
+
+    def segment_factory(segment):
+        segments[segment] = ScanModel.scan(segment=segment, total_segments=3)
+        return segments[segment]
+
+    calls = []
+    with patch(PATCH_METHOD, new_callable=AsyncMock) as req:
+        req.side_effect = _scan_side_effect(calls)
+        results = ParallelScanIterator(segment_factory, total_segments=3, concurrency=2, rate_limit=1000)
+        items = [item async for item in results]
+
+    assert len(items) == 6
+    limiters = {id(results.page_iter.rate_limiter) for results in segments.values()}
+    assert len(limiters) == 1 and None not in [r.page_iter.rate_limiter for r in segments.values()]
+    assert all(c['ReturnConsumedCapacity'] == 'TOTAL' for c in calls)
+
+
+@pytest.mark.asyncio
+async def test_count_scan():
+    calls = []
+
+    async def side_effect(operation_name, operation_kwargs):
+        calls.append(operation_kwargs)
+        if 'ExclusiveStartKey' in operation_kwargs:
+            return {'Count': 3, 'ScannedCount': 10}
+        return {'Count': 2, 'ScannedCount': 10, 'LastEvaluatedKey': {'user_id': {'S': 'x'}}}
+
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=side_effect):
+        count = await ScanModel.count_scan(ScanModel.score > 1, total_segments=4, concurrency=2)
+        assert count == 20
+        assert {c['Segment'] for c in calls} == set(range(4))
+        assert all(c['Select'] == 'COUNT' and c['TotalSegments'] == 4 and 'FilterExpression' in c for c in calls)
+
+        calls.clear()
+        assert await ScanModel.name_index.count_scan(total_segments=1) == 5
+        assert calls[0]['IndexName'] == 'name_index'
+
+
+@pytest.mark.asyncio
+async def test_count_scan_rate_limit():
+    # Every segment is read in 5 pages of 5 units
+    async def side_effect(operation_name, operation_kwargs):
+        await asyncio.sleep(0.005)
+        start = operation_kwargs.get('ExclusiveStartKey')
+        page = 0 if start is None else int(start['user_id']['S']) + 1
+        result = {'Count': 1, 'ScannedCount': 1, 'ConsumedCapacity': {'CapacityUnits': 5}}
+        if page < 4:
+            result['LastEvaluatedKey'] = {'user_id': {'S': str(page)}}
+        return result
+
+    loop = asyncio.get_event_loop()
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=side_effect):
+        start = loop.time()
+        assert await ScanModel.count_scan(total_segments=4, concurrency=4, rate_limit=200) == 20
+        elapsed = loop.time() - start
+    # The workers share the rate limit: 100 units at 200 units per second, less the pages in flight
+    assert elapsed >= (100 - 4 * 5) / 200
+
+
+def test_parallel_scan_validation():
+    with pytest.raises(ValueError, match='total_segments'):
+        ScanModel.parallel_scan(total_segments=0)
+    with pytest.raises(ValueError, match='concurrency'):
+        ScanModel.parallel_scan(total_segments=1, concurrency=0)
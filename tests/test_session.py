@@ -0,0 +1,143 @@
+"""
+Session tests
+"""
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+
+import aiopynamodb
+from aiopynamodb.attributes import NumberAttribute
+from aiopynamodb.attributes import UnicodeAttribute
+from aiopynamodb.attributes import VersionAttribute
+from aiopynamodb.constants import BATCH_GET_ITEM
+from aiopynamodb.constants import BATCH_WRITE_ITEM
+from aiopynamodb.constants import GET_ITEM
+from aiopynamodb.constants import TRANSACT_WRITE_ITEMS
+from aiopynamodb.models import Model
+
+PATCH_METHOD = 'aiopynamodb.connection.Connection._make_api_call'
+
+
+class User(Model):
+    class Meta:
+        table_name = 'users'
+
+    user_id = UnicodeAttribute(hash_key=True)
+    name = UnicodeAttribute(null=True)
+    visits = NumberAttribute(default=0)
+
+
+class Account(Model):
+    class Meta:
+        table_name = 'accounts'
+
+    account_id = UnicodeAttribute(hash_key=True)
+    balance = NumberAttribute(default=0)
+    version = VersionAttribute()
+
+
+def fake_api(items):
+    async def make_api_call(operation_name, operation_kwargs):
+        if operation_name == GET_ITEM:
+            key = operation_kwargs['Key']['user_id']['S']
+            return {'Item': items[key]} if key in items else {}
+        if operation_name == BATCH_GET_ITEM:
+            keys = operation_kwargs['RequestItems']['users']['Keys']
+            return {
+                'Responses': {'users': [items[key['user_id']['S']] for key in keys if key['user_id']['S'] in items]},
+                'UnprocessedKeys': {},
+            }
+        return {}
+    return make_api_call
+
+
+def calls(req, operation_name):
+    return [call[0][1] for call in req.call_args_list if call[0][0] == operation_name]
+
+
+@pytest.mark.asyncio
+async def test_identity_map():
+    items = {
+        'u1': {'user_id': {'S': 'u1'}, 'visits': {'N': '1'}},
+        'u2': {'user_id': {'S': 'u2'}, 'visits': {'N': '2'}},
+    }
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=fake_api(items)) as req:
+        async with aiopynamodb.session() as s:
+            user = await s.get(User, 'u1')
+            assert await s.get(User, 'u1') is user
+            with pytest.raises(User.DoesNotExist):
+                await s.get(User, 'u3')
+            with pytest.raises(User.DoesNotExist):
+                await s.get(User, 'u3')
+            assert len(calls(req, GET_ITEM)) == 2
+
+            users = [item async for item in s.batch_get(User, ['u2', 'u1', 'u3', 'u2'])]
+            assert [u.user_id for u in users] == ['u2', 'u1']
+            assert users[1] is user
+            assert [key['user_id']['S'] for key in calls(req, BATCH_GET_ITEM)[0]['RequestItems']['users']['Keys']] == ['u2']
+
+            assert [item async for item in s.batch_get(User, ['u1', 'u2'])] == users[::-1]
+            assert len(calls(req, BATCH_GET_ITEM)) == 1
+        # Nothing changed, nothing is written
+        assert calls(req, BATCH_WRITE_ITEM) == []
+        assert calls(req, TRANSACT_WRITE_ITEMS) == []
+
+
+@pytest.mark.asyncio
+async def test_commit():
+    items = {
+        'u1': {'user_id': {'S': 'u1'}, 'visits': {'N': '1'}},
+        'u2': {'user_id': {'S': 'u2'}, 'visits': {'N': '2'}},
+    }
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=fake_api(items)) as req:
+        async with aiopynamodb.session() as s:
+            user1 = await s.get(User, 'u1')
+            user1.visits += 1
+            await s.get(User, 'u2')
+            s.add(User('u3', name='New'))
+            s.delete(User('u4'))
+            s.add(Account('a1', balance=10))
+            with pytest.raises(User.DoesNotExist):
+                await s.get(User, 'u4')
+
+        batch_writes = calls(req, BATCH_WRITE_ITEM)
+        assert len(batch_writes) == 1
+        requests = batch_writes[0]['RequestItems']['users']
+        assert [r['PutRequest']['Item']['user_id']['S'] for r in requests if 'PutRequest' in r] == ['u1', 'u3']
+        assert [r['DeleteRequest']['Key']['user_id']['S'] for r in requests if 'DeleteRequest' in r] == ['u4']
+
+        # Versioned models need a condition, so they are written in a transaction
+        transact_writes = calls(req, TRANSACT_WRITE_ITEMS)
+        assert len(transact_writes) == 1
+        assert [list(item) for item in transact_writes[0]['TransactItems']] == [['Put']]
+
+        req.reset_mock()
+        await s.commit()
+        assert req.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_commit_atomic():
+    items = {'u1': {'user_id': {'S': 'u1'}, 'visits': {'N': '1'}}}
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=fake_api(items)) as req:
+        async with aiopynamodb.session(atomic=True) as s:
+            user = await s.get(User, 'u1')
+            user.name = 'Alice'
+            s.add(User('u2'), condition=User.user_id.does_not_exist())
+            s.delete(User('u3'))
+
+        assert calls(req, BATCH_WRITE_ITEM) == []
+        transact_items = {
+            action: operation for item in calls(req, TRANSACT_WRITE_ITEMS)[0]['TransactItems'] for action, operation in item.items()
+        }
+        assert sorted(transact_items) == ['Delete', 'Put', 'Update']
+        assert transact_items['Update']['UpdateExpression'] == 'SET #0 = :0'
+        assert 'ConditionExpression' in transact_items['Put']
+
+        req.reset_mock()
+        with pytest.raises(RuntimeError):
+            async with aiopynamodb.session() as s:
+                s.add(User('u5'))
+                raise RuntimeError()
+        assert req.call_count == 0
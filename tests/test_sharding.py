@@ -0,0 +1,309 @@
+"""
+Write sharding tests
+"""
+import asyncio
+from decimal import Decimal
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+
+from aiopynamodb.attributes import NumberAttribute
+from aiopynamodb.attributes import UnicodeAttribute
+from aiopynamodb.cache import NegativeLookupCache
+from aiopynamodb.constants import BATCH_GET_ITEM
+from aiopynamodb.constants import DELETE_ITEM
+from aiopynamodb.constants import GET_ITEM
+from aiopynamodb.constants import PUT_ITEM
+from aiopynamodb.constants import QUERY
+from aiopynamodb.constants import SCAN
+from aiopynamodb.models import Model
+from aiopynamodb.sharding import get_shard
+from aiopynamodb.sharding import range_key_shard
+from aiopynamodb.sharding import shard_hash_key
+from aiopynamodb.sharding import unshard_hash_key
+
+PATCH_METHOD = 'aiopynamodb.connection.Connection._make_api_call'
+
+
+class Event(Model):
+    class Meta:
+        table_name = 'events'
+
+    stream = UnicodeAttribute(hash_key=True, shards=4)
+    sequence = NumberAttribute(range_key=True)
+    payload = UnicodeAttribute(null=True)
+
+
+class Visit(Model):
+    class Meta:
+        table_name = 'visits'
+
+    page = UnicodeAttribute(hash_key=True, shards=3, shard_by='random')
+    visitor = UnicodeAttribute(range_key=True)
+    views = NumberAttribute(default=0)
+
+
+class FakeTable:
+    """
+    An in-memory table with a hash key and a range key, serving the operations used by sharded models
+    """
+
+    def __init__(self, hash_key_name, range_key_name, page_size=None):
+        self.hash_key_name = hash_key_name
+        self.range_key_name = range_key_name
+        self.page_size = page_size
+        self.items = {}
+        self.operations = []
+        # The time queries take, and the capacity they consume
+        self.query_delay = 0
+        self.query_capacity = 1
+
+    def _key(self, item):
+        range_key = item[self.range_key_name]
+        value = Decimal(range_key['N']) if 'N' in range_key else range_key['S']
+        return item[self.hash_key_name]['S'], value
+
+    async def make_api_call(self, operation_name, operation_kwargs):
+        self.operations.append(operation_name)
+        if operation_name == PUT_ITEM:
+            self.items[self._key(operation_kwargs['Item'])] = operation_kwargs['Item']
+            return {}
+        if operation_name == DELETE_ITEM:
+            self.items.pop(self._key(operation_kwargs['Key']), None)
+            return {}
+        if operation_name == GET_ITEM:
+            item = self.items.get(self._key(operation_kwargs['Key']))
+            return {'Item': item} if item else {}
+        if operation_name == BATCH_GET_ITEM:
+            (table_name, request), = operation_kwargs['RequestItems'].items()
+            found = [self.items[self._key(key)] for key in request['Keys'] if self._key(key) in self.items]
+            return {'Responses': {table_name: found}, 'UnprocessedKeys': {}}
+        if operation_name == SCAN:
+            items = list(self.items.values())
+            return {'Items': items, 'Count': len(items), 'ScannedCount': len(items)}
+        assert operation_name == QUERY
+        await asyncio.sleep(self.query_delay)
+        hash_key = operation_kwargs['ExpressionAttributeValues'][':0']['S']
+        matches = sorted(
+            ((key, item) for key, item in self.items.items() if key[0] == hash_key),
+            reverse=operation_kwargs.get('ScanIndexForward') is False,
+        )
+        start = operation_kwargs.get('ExclusiveStartKey')
+        if start is not None:
+            position = [key for key, _ in matches].index(self._key(start))
+            matches = matches[position + 1:]
+        page_size = operation_kwargs.get('Limit', self.page_size)
+        page = [item for _, item in matches[:page_size]]
+        result = {'Count': len(page), 'ScannedCount': len(page)}
+        if operation_kwargs.get('Select') != 'COUNT':
+            result['Items'] = page
+        if page_size is not None and len(matches) > page_size:
+            result['LastEvaluatedKey'] = {name: page[-1][name] for name in (self.hash_key_name, self.range_key_name)}
+        if operation_kwargs.get('ReturnConsumedCapacity'):
+            result['ConsumedCapacity'] = {'CapacityUnits': self.query_capacity}
+        return result
+
+
+def test_shard_hash_keys():
+    assert shard_hash_key('a#b', 3) == 'a#b#shard#3'
+    assert unshard_hash_key('a#b#shard#3') == 'a#b'
+    assert unshard_hash_key('a#b') == 'a#b'
+    assert get_shard('a#b#shard#3') == 3
+    assert range_key_shard('12', 4) == range_key_shard('12', 4) < 4
+    # Numbers are sharded by value
+    assert range_key_shard('1', 16, 'N') == range_key_shard('1.0', 16, 'N') == range_key_shard('1E+0', 16, 'N')
+    assert range_key_shard('10', 16, 'N') == range_key_shard('1E+1', 16, 'N')
+    assert range_key_shard('0', 16, 'N') == range_key_shard('-0.00', 16, 'N')
+
+
+def test_invalid_sharding():
+    with pytest.raises(ValueError):
+        UnicodeAttribute(range_key=True, shards=4)
+    with pytest.raises(ValueError):
+        UnicodeAttribute(hash_key=True, shards=0)
+    with pytest.raises(ValueError):
+        UnicodeAttribute(hash_key=True, shards=4, shard_by='hash')
+    with pytest.raises(ValueError):
+        class Invalid(Model):
+            class Meta:
+                table_name = 'invalid'
+
+            key = UnicodeAttribute(hash_key=True, shards=4)
+
+
+@pytest.mark.asyncio
+async def test_range_key_sharding():
+    table = FakeTable('stream', 'sequence')
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=table.make_api_call):
+        for sequence in range(20):
+            await Event('orders', sequence, payload='event {}'.format(sequence)).save()
+        assert {unshard_hash_key(key[0]) for key in table.items} == {'orders'}
+        assert len({key[0] for key in table.items}) > 1
+        for (hash_key, sequence), item in table.items.items():
+            assert get_shard(hash_key) == range_key_shard(item['sequence']['N'], 4, 'N')
+
+        # Items are read from the shard derived from their range key
+        table.operations = []
+        event = await Event.get('orders', 7)
+        assert table.operations == [GET_ITEM]
+        assert (event.stream, event.sequence, event.payload) == ('orders', 7, 'event 7')
+        assert (await Event.get('orders', 7, result_mode='dict'))['stream'] == 'orders'
+
+        # Saving a loaded item does not move it to another shard
+        event.payload = 'updated'
+        await event.save()
+        assert len(table.items) == 20
+        await event.refresh()
+        assert event.payload == 'updated'
+
+        # Numbers equal to the range key in another form address the same shard
+        assert (await Event.get('orders', 7.0)).payload == 'updated'
+        await Event('orders', 1).save()
+        assert (await Event.get('orders', 1.0)).sequence == 1
+
+        await event.delete()
+        assert len(table.items) == 19
+        with pytest.raises(Event.DoesNotExist):
+            await Event.get('orders', 7)
+
+
+@pytest.mark.asyncio
+async def test_query_and_count_merge_the_shards():
+    table = FakeTable('stream', 'sequence', page_size=2)
+    expected = [sequence for sequence in range(20) if sequence != 7]
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=table.make_api_call):
+        for sequence in expected:
+            await Event('orders', sequence).save()
+        await Event('other', 7).save()
+
+        table.operations = []
+        results = Event.query('orders')
+        assert [event.sequence async for event in results] == expected
+        assert results.total_count == len(expected)
+        # Every shard is queried, and paged through
+        assert table.operations.count(QUERY) > 4
+
+        descending = Event.query('orders', scan_index_forward=False)
+        assert [event.sequence async for event in descending] == expected[::-1]
+
+        async with Event.query('orders', limit=5, page_size=2) as results:
+            assert [event.sequence async for event in results] == expected[:5]
+            with pytest.raises(ValueError):
+                results.last_evaluated_key
+
+        raw = [item async for item in Event.query('orders', result_mode='raw')]
+        assert all(item['stream']['S'].startswith('orders#shard#') for item in raw)
+        assert [item['stream'] async for item in Event.query('orders', result_mode='dict')] == ['orders'] * 19
+
+        with pytest.raises(ValueError):
+            Event.query('orders', last_evaluated_key={'stream': {'S': 'orders#shard#0'}, 'sequence': {'N': '1'}})
+
+        table.operations = []
+        assert await Event.count('orders') == len(expected)
+        assert table.operations.count(QUERY) >= 4
+        assert await Event.count('other') == 1
+        # Each shard is counted up to the limit, and so is the total
+        assert await Event.count('orders', limit=3) == 3
+
+
+@pytest.mark.asyncio
+async def test_merged_results():
+    table = FakeTable('stream', 'sequence', page_size=3)
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=table.make_api_call):
+        for sequence in range(10):
+            await Event('orders', sequence, payload=str(sequence)).save()
+
+        results = Event.query('orders', rate_limit=100)
+        rate_limiter = results.page_iter.rate_limiter
+        assert rate_limiter is not None
+        assert all(result.page_iter.rate_limiter is rate_limiter for result in results._results)
+        assert [event.sequence async for event in results] == list(range(10))
+        assert results.page_iter.total_scanned_count == 10
+        with pytest.raises(ValueError):
+            results.page_iter.last_evaluated_key
+
+        # Columnar results and views hold the hash key as declared
+        columns = await Event.query('orders', limit=4).to_columns(['stream', 'sequence'])
+        assert columns.to_pydict() == {'stream': ['orders'] * 4, 'sequence': [0, 1, 2, 3]}
+        EventView = Event.view('stream', 'payload')
+        views = [view async for view in EventView.query('orders')]
+        assert [(view.stream, view.payload) for view in views] == [('orders', str(sequence)) for sequence in range(10)]
+        assert (await EventView.get('orders', 4)).stream == 'orders'
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_is_shared_by_the_shards():
+    table = FakeTable('stream', 'sequence', page_size=1)
+    loop = asyncio.get_event_loop()
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=table.make_api_call):
+        for sequence in range(12):
+            await Event('orders', sequence).save()
+        table.query_delay = 0.005
+        table.query_capacity = 5
+
+        reads = [lambda: Event.query('orders', rate_limit=200).to_columns(), lambda: Event.count('orders', rate_limit=200)]
+        for read in reads:
+            table.operations = []
+            start = loop.time()
+            await read()
+            elapsed = loop.time() - start
+            # The shards are read concurrently, within the rate limit less the pages in flight
+            units = table.operations.count(QUERY) * 5
+            assert units >= 60
+            assert elapsed >= (units - 4 * 5) / 200
+
+
+class CachedVisit(Model):
+    class Meta:
+        table_name = 'visits'
+        negative_cache = NegativeLookupCache()
+
+    page = UnicodeAttribute(hash_key=True, shards=3, shard_by='random')
+    visitor = UnicodeAttribute(range_key=True)
+
+
+@pytest.mark.asyncio
+async def test_key_filter():
+    table = FakeTable('page', 'visitor')
+    negative_cache = CachedVisit.Meta.negative_cache
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=table.make_api_call):
+        for visitor in ('ada', 'bob'):
+            await CachedVisit('home', visitor).save()
+        negative_cache.key_filter = None
+        await negative_cache.load_key_filter(CachedVisit, capacity=100)
+
+        # The filter holds the keys without their shard
+        table.operations = []
+        assert (await CachedVisit.get('home', 'ada')).visitor == 'ada'
+        assert table.operations == [BATCH_GET_ITEM]
+        with pytest.raises(CachedVisit.DoesNotExist):
+            await CachedVisit.get('home', 'cy')
+        assert table.operations == [BATCH_GET_ITEM]
+
+
+@pytest.mark.asyncio
+async def test_random_sharding():
+    table = FakeTable('page', 'visitor')
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=table.make_api_call):
+        for visitor in ('ada', 'bob', 'cy'):
+            await Visit('home', visitor).save()
+        (stored_key, _), = [key for key in table.items if key[1] == 'ada']
+        assert unshard_hash_key(stored_key) == 'home'
+
+        # The shard of an item is not known, so every shard is read at once
+        table.operations = []
+        visit = await Visit.get('home', 'ada')
+        assert table.operations == [BATCH_GET_ITEM]
+        assert (visit.page, visit.visitor) == ('home', 'ada')
+        with pytest.raises(Visit.DoesNotExist):
+            await Visit.get('home', 'dan')
+
+        # A loaded item is saved to the shard it was loaded from
+        visit.views += 1
+        await visit.save()
+        assert [key for key in table.items if key[1] == 'ada'] == [(stored_key, 'ada')]
+
+        assert [visit.visitor async for visit in Visit.query('home')] == ['ada', 'bob', 'cy']
+        with pytest.raises(ValueError):
+            [visit async for visit in Visit.batch_get([('home', 'ada')])]
@@ -4,8 +4,10 @@ from aiopynamodb.attributes import NumberAttribute, UnicodeAttribute, VersionAtt
 from aiopynamodb.connection import Connection
 from aiopynamodb.connection.base import MetaTable
 from aiopynamodb.constants import TABLE_KEY
+from aiopynamodb.exceptions import CancellationReason, SizeLimitExceededError, TransactGetError, TransactWriteError
+from aiopynamodb.exceptions import VerboseClientError
 from aiopynamodb.models import Model
-from aiopynamodb.transactions import Transaction, TransactGet, TransactWrite
+from aiopynamodb.transactions import Transaction, TransactGet, TransactWrite, get_transaction_stats
 
 
 class MockModel(Model):
@@ -121,7 +123,110 @@ class TestTransactWrite:
             delete_items=expected_deletes,
             put_items=expected_puts,
             update_items=expected_updates,
-            client_request_token=None,
+            client_request_token=t._client_request_token,
             return_consumed_capacity=None,
             return_item_collection_metrics=None
         )
+        assert isinstance(t._client_request_token, str)
+
+    @pytest.mark.asyncio
+    async def test_size_limit(self, mocker):
+        connection = Connection()
+        mock_connection_transact_write = mocker.patch.object(connection, 'transact_write_items')
+        with pytest.raises(SizeLimitExceededError, match='exceeds the DynamoDB limit of 4194304 bytes') as e:
+            async with TransactWrite(connection=connection) as t:
+                for i in range(11):
+                    t.save(MockModel(i, 0, mock_toot='x' * 399_000))
+        assert e.value.size > e.value.limit
+        assert len(t._put_items) == 10
+        mock_connection_transact_write.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_size_limit_update_values(self, mocker):
+        connection = Connection()
+        mock_connection_transact_write = mocker.patch.object(connection, 'transact_write_items')
+        # Updates and condition checks count with the values of their expressions
+        with pytest.raises(SizeLimitExceededError):
+            async with TransactWrite(connection=connection) as t:
+                t.condition_check(MockModel, 0, 0, condition=MockModel.mock_toot == 'x' * 399_000)
+                for i in range(1, 11):
+                    t.update(MockModel(i, 0), [MockModel.mock_toot.set('x' * 399_000)], add_version_condition=False)
+        assert len(t._condition_check_items) == 1
+        assert len(t._update_items) == 9
+        mock_connection_transact_write.assert_not_called()
+
+
+class ConflictModel(Model):
+    class Meta:
+        table_name = 'conflict'
+
+    key = UnicodeAttribute(hash_key=True)
+
+
+def cancelled(error_cls, *codes, error_code='TransactionCanceledException'):
+    cause = VerboseClientError(
+        {'Error': {'Code': error_code, 'Message': 'Transaction cancelled'}},
+        'TransactWriteItems',
+        cancellation_reasons=[CancellationReason(code=code) if code else None for code in codes],
+    )
+    return error_cls('Failed to write transaction items', cause)
+
+
+class TestTransactionRetries:
+
+    @pytest.mark.asyncio
+    async def test_write_retries_conflicts(self, mocker):
+        sleep = mocker.patch('asyncio.sleep')
+        connection = Connection()
+        transact_write = mocker.patch.object(connection, 'transact_write_items', side_effect=[
+            cancelled(TransactWriteError, None, 'TransactionConflict'),
+            cancelled(TransactWriteError, None, None, error_code='TransactionInProgressException'),
+            {},
+        ])
+        stats = get_transaction_stats(ConflictModel)
+        mock_stats = get_transaction_stats(MockModel)
+        before = (mock_stats.transactions, mock_stats.conflicts)
+        async with TransactWrite(connection=connection) as t:
+            t.condition_check(MockModel, 1, 2, condition=MockModel.mock_hash.exists())
+            t.save(ConflictModel('a'))
+
+        assert transact_write.call_count == 3
+        assert sleep.call_count == 2
+        # Every attempt sends the same token, which makes the retries idempotent
+        tokens = {call.kwargs['client_request_token'] for call in transact_write.call_args_list}
+        assert tokens == {t._client_request_token}
+        assert (stats.transactions, stats.attempts, stats.retries, stats.conflicts, stats.failures) == (1, 3, 2, 1, 0)
+        assert stats.conflict_rate == pytest.approx(1 / 3)
+        assert (mock_stats.transactions, mock_stats.conflicts) == (before[0] + 1, before[1])
+
+    @pytest.mark.asyncio
+    async def test_write_does_not_retry_failed_conditions(self, mocker):
+        mocker.patch('asyncio.sleep')
+        connection = Connection()
+        transact_write = mocker.patch.object(connection, 'transact_write_items', side_effect=[
+            cancelled(TransactWriteError, 'ConditionalCheckFailed', 'TransactionConflict'),
+        ])
+        with pytest.raises(TransactWriteError):
+            async with TransactWrite(connection=connection) as t:
+                t.save(ConflictModel('a'), condition=ConflictModel.key.does_not_exist())
+                t.save(ConflictModel('b'))
+        assert transact_write.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_retries_exhausted(self, mocker):
+        mocker.patch('asyncio.sleep')
+        connection = Connection()
+        connection.add_meta_table(MetaTable(MOCK_TABLE_DESCRIPTOR[TABLE_KEY]))
+        transact_get = mocker.patch.object(connection, 'transact_get_items', side_effect=[
+            cancelled(TransactGetError, 'TransactionConflict'),
+        ] * 3)
+        failures = get_transaction_stats(MockModel).failures
+        with pytest.raises(TransactGetError):
+            async with TransactGet(connection=connection, max_retry_attempts=2) as t:
+                t.get(MockModel, 1, 2)
+        assert transact_get.call_count == 3
+        assert get_transaction_stats(MockModel).failures == failures + 1
+
+    def test_no_retries(self):
+        assert TransactWrite(connection=Connection(), max_retry_attempts=0)._client_request_token is None
+        assert TransactWrite(connection=Connection(), client_request_token='token')._client_request_token == 'token'
@@ -0,0 +1,114 @@
+"""
+Projection view tests
+"""
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+
+from aiopynamodb.attributes import MapAttribute
+from aiopynamodb.attributes import NumberAttribute
+from aiopynamodb.attributes import UnicodeAttribute
+from aiopynamodb.constants import BATCH_GET_ITEM
+from aiopynamodb.constants import GET_ITEM
+from aiopynamodb.constants import QUERY
+from aiopynamodb.exceptions import AttributeNotProjectedError
+from aiopynamodb.models import Model
+from aiopynamodb.views import ModelView
+
+PATCH_METHOD = 'aiopynamodb.connection.Connection._make_api_call'
+
+
+class Preferences(MapAttribute):
+    timezone = UnicodeAttribute(null=True)
+    language = UnicodeAttribute(attr_name='lang', default='en')
+
+
+class User(Model):
+    class Meta:
+        table_name = 'users'
+
+    user_name = UnicodeAttribute(hash_key=True)
+    email = UnicodeAttribute(null=True)
+    age = NumberAttribute(null=True)
+    preferences = Preferences(null=True)
+    extra = MapAttribute(null=True)
+
+
+class UserSummary(User.view('email', 'preferences.timezone', 'extra.source')):
+    @property
+    def domain(self):
+        return self.email.split('@')[1]
+
+
+ITEM = {
+    'user_name': {'S': 'ada'},
+    'email': {'S': 'ada@example.com'},
+    'preferences': {'M': {'timezone': {'S': 'UTC'}}},
+    'extra': {'M': {'source': {'S': 'web'}}},
+}
+
+
+def test_view_projection():
+    assert UserSummary.get_projection() == ['user_name', 'email', 'preferences.timezone', 'extra.source']
+    assert User.view(User.email, User.preferences.language).get_projection() == [
+        'user_name', 'email', 'preferences.lang',
+    ]
+    # A whole attribute covers its keys
+    assert User.view('preferences.timezone', 'preferences').get_projection() == ['user_name', 'preferences']
+
+    with pytest.raises(ValueError):
+        User.view('missing')
+    with pytest.raises(ValueError):
+        User.view('email.domain')
+    with pytest.raises(ValueError):
+        User.view('preferences.missing')
+
+
+def test_view_from_raw_data():
+    summary = UserSummary.from_raw_data(ITEM)
+    assert summary.user_name == 'ada'
+    assert summary.domain == 'example.com'
+    assert summary.preferences.timezone == 'UTC'
+    assert summary.extra['source'] == 'web'
+    assert summary.to_dict() == {
+        'user_name': 'ada',
+        'email': 'ada@example.com',
+        'preferences': {'timezone': 'UTC'},
+        'extra': summary.extra,
+    }
+    assert summary == UserSummary.from_raw_data(ITEM)
+
+    # Attributes that are not projected raise, rather than reading as None
+    with pytest.raises(AttributeNotProjectedError):
+        summary.age
+    with pytest.raises(AttributeNotProjectedError):
+        summary.preferences.language
+    with pytest.raises(AttributeError):
+        summary.email = 'grace@example.com'
+
+    assert UserSummary.from_raw_data({'user_name': {'S': 'ada'}}).preferences is None
+    assert isinstance(summary, ModelView)
+
+
+@pytest.mark.asyncio
+async def test_view_reads():
+    async def make_api_call(operation_name, operation_kwargs):
+        request = operation_kwargs['RequestItems']['users'] if operation_name == BATCH_GET_ITEM else operation_kwargs
+        names = sorted(request['ExpressionAttributeNames'].values())
+        assert names == ['email', 'extra', 'preferences', 'source', 'timezone', 'user_name']
+        assert request['ProjectionExpression'] == '#0, #1, #2.#3, #4.#5'
+        if operation_name == GET_ITEM:
+            return {'Item': ITEM}
+        if operation_name == QUERY:
+            return {'Items': [ITEM], 'Count': 1, 'ScannedCount': 1}
+        assert operation_name == BATCH_GET_ITEM
+        return {'Responses': {'users': [ITEM]}, 'UnprocessedKeys': {}}
+
+    with patch(PATCH_METHOD, new_callable=AsyncMock, side_effect=make_api_call):
+        summary = await UserSummary.get('ada')
+        assert isinstance(summary, UserSummary)
+        assert summary.email == 'ada@example.com'
+
+        assert [item async for item in UserSummary.query('ada')] == [summary]
+        assert [item async for item in UserSummary.batch_get(['ada'])] == [summary]